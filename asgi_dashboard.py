@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Async (ASGI) server mode for the web dashboard.
+
+Read-heavy routes (time, prices, exchange info, symbols, balance,
+positions, exposure, stream) are native async handlers built on
+AsyncBinanceFuturesClient, so concurrent dashboard requests are multiplexed
+on one event loop instead of each holding a server thread while Binance
+answers. Every other route (the page, assets, orders, executions,
+accounts) is served by the Flask app from run_local_dashboard, mounted
+as WSGI, so both modes expose the same API.
+
+Usage:
+    uvicorn asgi_dashboard:app --port 5000
+    python asgi_dashboard.py
+"""
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Optional, TYPE_CHECKING
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+import run_local_dashboard as dashboard
+from bot.tracing import (
+    SPAN_KIND_SERVER, clean_request_id, get_tracer, new_id, parse_traceparent,
+    reset_request_id, set_request_id, span
+)
+from bot.http_cache import (
+    MIN_COMPRESS_SIZE, NO_STORE, choose_encoding, compress, etag_for, etag_matches,
+    is_compressible, market_data_policy
+)
+
+try:
+    from a2wsgi import WSGIMiddleware
+except ImportError:
+    from starlette.middleware.wsgi import WSGIMiddleware
+
+if TYPE_CHECKING:
+    from bot.async_client import AsyncBinanceFuturesClient
+    from bot.symbols import SymbolIndex
+
+
+# Upstream connections shared by all in-flight requests on the loop
+ASGI_MAX_CONNECTIONS = int(os.getenv('ASGI_MAX_CONNECTIONS', '20'))
+
+_async_client: Optional['AsyncBinanceFuturesClient'] = None
+
+
+def get_async_client() -> 'AsyncBinanceFuturesClient':
+    """Return the shared async Binance client (created on first use)."""
+    global _async_client
+    if _async_client is None:
+        from bot.async_client import AsyncBinanceFuturesClient
+        _async_client = AsyncBinanceFuturesClient(
+            dashboard.API_KEY, dashboard.API_SECRET, dashboard.BASE_URL,
+            max_connections=ASGI_MAX_CONNECTIONS
+        )
+    return _async_client
+
+
+def traced(handler: Callable[[Request], Awaitable[Response]]) -> Callable[[Request], Awaitable[Response]]:
+    """
+    Give a native route the Flask app's request ID and server span.
+
+    For /api/stream the span covers setting up the stream, not its lifetime.
+    """
+    async def endpoint(request: Request) -> Response:
+        request_id = (clean_request_id(request.headers.get('X-Request-ID'))
+                      or clean_request_id(request.headers.get('x-vercel-id'))
+                      or new_id())
+        token = set_request_id(request_id)
+        try:
+            with span(
+                f"GET {request.url.path}", SPAN_KIND_SERVER,
+                {'http.method': request.method, 'http.route': request.url.path, 'url.path': request.url.path},
+                parent=parse_traceparent(request.headers.get('traceparent')),
+            ) as trace_span:
+                response = await handler(request)
+                trace_span.set_attribute('http.status_code', response.status_code)
+                if response.status_code >= 500:
+                    trace_span.set_error(f"HTTP {response.status_code}")
+        finally:
+            reset_request_id(token)
+        if dashboard.TRACE_FLUSH_PER_REQUEST:
+            get_tracer().flush()
+        response.headers['X-Request-ID'] = request_id
+        return response
+
+    endpoint.__name__ = handler.__name__
+    endpoint.__doc__ = handler.__doc__
+    return endpoint
+
+
+def check_token(request: Request, allow_query: bool = False) -> Optional[Response]:
+    """Return a 401 response if DASHBOARD_TOKEN is set and not supplied."""
+    if not dashboard.DASHBOARD_TOKEN:
+        return None
+    token = request.headers.get('X-Dashboard-Token', '')
+    if not token and allow_query:
+        token = request.query_params.get('token', '')
+    if token != dashboard.DASHBOARD_TOKEN:
+        return JSONResponse({'error': 'Invalid dashboard token'}, status_code=401)
+    return None
+
+
+def json_response(
+    request: Request, payload: Any, status_code: int = 200, stale: bool = False
+) -> Response:
+    """
+    JSON response with the same Cache-Control/ETag/compression as the Flask mode.
+
+    ``stale`` marks last-good data served while upstream is failing.
+    """
+    response = JSONResponse(payload, status_code=status_code)
+    body = response.body
+    headers = {}
+
+    if request.method == 'GET' and status_code == 200:
+        policy = dashboard.MARKET_DATA_CACHE.get(request.url.path)
+        if stale:
+            headers['Cache-Control'] = NO_STORE
+            headers['Warning'] = '110 - "Response is Stale"'
+        elif policy:
+            headers['Cache-Control'] = market_data_policy(
+                *policy, shared=not dashboard.DASHBOARD_TOKEN
+            )
+        else:
+            headers['Cache-Control'] = NO_STORE
+
+        etag = etag_for(body)
+        headers['ETag'] = etag
+        if etag_matches(request.headers.get('If-None-Match'), etag):
+            return Response(status_code=304, headers=headers)
+
+    encoding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+    if encoding and len(body) >= MIN_COMPRESS_SIZE and is_compressible('application/json'):
+        body = compress(body, encoding)
+        headers['Content-Encoding'] = encoding
+        headers['Vary'] = 'Accept-Encoding'
+
+    return Response(body, status_code=status_code, headers=headers, media_type='application/json')
+
+
+def error_response(e: Exception) -> Response:
+    """Error body in the shape the dashboard expects; 503 + Retry-After for upstream outages."""
+    status_code, headers = dashboard.upstream_error_status(e)
+    return JSONResponse({'error': str(e)}, status_code=status_code, headers=headers)
+
+
+async def serve_stale_on_error(key: str, load: Callable[[], Awaitable[Any]]) -> tuple:
+    """
+    Await ``load``; on upstream failure (or an open circuit) fall back to the
+    last good value cached under ``key``.
+
+    Returns:
+        (value, stale)
+    """
+    try:
+        return await load(), False
+    except Exception as e:
+        stale = dashboard._cache.get_stale(key)
+        if stale is None:
+            raise
+        print(f"[WARN] Serving stale {key}: {e}")
+        return stale, True
+
+
+async def get_symbol_index() -> 'SymbolIndex':
+    """exchangeInfo index shared with the Flask routes (one upstream call per hour)."""
+    from bot.symbols import DEFAULT_TTL, load_symbol_index
+
+    async def load() -> 'SymbolIndex':
+        # Fresh disk snapshot first; otherwise fetch without blocking the loop
+        index = load_symbol_index()
+        if index is None:
+            data = await get_async_client().get_exchange_info()
+            index = load_symbol_index(lambda: data)
+        return index
+
+    return await dashboard._cache.get_or_load_async('symbol_index', load, ttl=DEFAULT_TTL)
+
+
+async def fetch_all_prices() -> dict:
+    """Latest price for every symbol, shared for one second across requests."""
+    return await dashboard._cache.get_or_load_async(
+        'prices', get_async_client().get_ticker_prices, ttl=1.0
+    )
+
+
+async def fetch_account_state() -> dict:
+    """
+    Fetch positionRisk and balance concurrently and recompute risk from them.
+
+    Returns:
+        {'balance': USDT balance row, 'exposure': exposure dict}
+    """
+    client = get_async_client()
+    positions, balances = await asyncio.gather(client.get_position_risk(), client.get_balance())
+
+    usdt = [b for b in balances if b['asset'] == 'USDT']
+    wallet_balance = float(usdt[0]['balance']) if usdt else 0.0
+
+    engine = dashboard.get_risk_engine()
+    engine.load_position_risk(positions, wallet_balance)
+    dashboard.get_risk_gate().load_position_risk(positions)
+    state = {'balance': usdt[0] if usdt else None, 'exposure': engine.exposure().to_dict()}
+    dashboard._cache.set('account_state', state, ttl=0)
+    dashboard.store_account_snapshot(balances, positions)
+    return state
+
+
+def requested_symbols(request: Request) -> list:
+    """Symbols from ?symbols=A,B (default: DEFAULT_SYMBOLS)."""
+    raw = request.query_params.get('symbols', '')
+    symbols = [s.strip().upper() for s in raw.split(',') if s.strip()]
+    return symbols or dashboard.DEFAULT_SYMBOLS
+
+
+async def api_time(request: Request) -> Response:
+    """Test connection to Binance API."""
+    denied = check_token(request)
+    if denied:
+        return denied
+    try:
+        # ttl=0: concurrent requests share one in-flight call, nothing is kept
+        server_time = await dashboard._cache.get_or_load_async(
+            'server_time', get_async_client().get_server_time, ttl=0
+        )
+        return json_response(request, {
+            'serverTime': server_time,
+            'baseUrl': dashboard.BASE_URL,
+            'message': 'Connection successful!'
+        })
+    except Exception as e:
+        return error_response(e)
+
+
+async def api_prices(request: Request) -> Response:
+    """Get current market prices (?symbols=A,B, or ?symbols=ALL) in one upstream call."""
+    denied = check_token(request)
+    if denied:
+        return denied
+    try:
+        all_prices, stale = await serve_stale_on_error('prices', fetch_all_prices)
+        symbols = requested_symbols(request)
+        if symbols == ['ALL']:
+            return json_response(request, {'prices': all_prices}, stale=stale)
+        return json_response(request, {
+            'prices': {s: all_prices[s] for s in symbols if s in all_prices}
+        }, stale=stale)
+    except Exception as e:
+        return error_response(e)
+
+
+async def api_exchange_info(request: Request) -> Response:
+    """Get exchange filters for ?symbols=A,B (default: DEFAULT_SYMBOLS)."""
+    denied = check_token(request)
+    if denied:
+        return denied
+    try:
+        index, stale = await serve_stale_on_error('symbol_index', get_symbol_index)
+        symbol_info = {}
+        for symbol in requested_symbols(request):
+            info = index.get(symbol)
+            if info is not None:
+                symbol_info[symbol] = info.to_dict()
+        return json_response(
+            request, {'symbols': symbol_info, 'totalSymbols': len(index)}, stale=stale
+        )
+    except Exception as e:
+        return error_response(e)
+
+
+async def api_symbols(request: Request) -> Response:
+    """Autocomplete tradable symbols by prefix (?q=BT&limit=10)."""
+    denied = check_token(request)
+    if denied:
+        return denied
+    try:
+        limit = min(int(request.query_params.get('limit', 10)), 100)
+        index, stale = await serve_stale_on_error('symbol_index', get_symbol_index)
+        matches = index.search(request.query_params.get('q', ''), limit=limit)
+        return json_response(request, {'symbols': matches}, stale=stale)
+    except ValueError:
+        return JSONResponse({'error': 'limit must be an integer'}, status_code=400)
+    except Exception as e:
+        return error_response(e)
+
+
+async def api_balance(request: Request) -> Response:
+    """Get account balance."""
+    denied = check_token(request)
+    if denied:
+        return denied
+    try:
+        balances = await get_async_client().get_balance()
+        usdt = [b for b in balances if b['asset'] == 'USDT']
+        return json_response(request, {'balance': usdt[0] if usdt else None})
+    except Exception as e:
+        return error_response(e)
+
+
+async def api_positions(request: Request) -> Response:
+    """Get current open positions and algo orders (fetched concurrently)."""
+    denied = check_token(request)
+    if denied:
+        return denied
+    try:
+        client = get_async_client()
+        positions, algo_orders = await asyncio.gather(
+            client.get_position_risk(), client.get_algo_orders(), return_exceptions=True
+        )
+
+        # No positions must not look like a flat account: fail like the Flask route
+        if isinstance(positions, Exception):
+            return error_response(positions)
+        active_positions = [p for p in positions if float(p.get('positionAmt', 0)) != 0]
+        engine = dashboard.get_risk_engine()
+        engine.load_position_risk(positions)
+        dashboard.get_risk_gate().load_position_risk(positions)
+        risk = engine.positions()
+
+        # Algo orders are secondary: show positions without them
+        if isinstance(algo_orders, Exception):
+            active_algos = []
+        else:
+            active_algos = [a for a in algo_orders if a.get('algoStatus') in ['NEW', 'WORKING']]
+
+        return json_response(request, {
+            'positions': active_positions,
+            'risk': risk,
+            'algoOrders': active_algos
+        })
+    except Exception as e:
+        return error_response(e)
+
+
+async def api_exposure(request: Request) -> Response:
+    """Get aggregate exposure: notional, unrealized PnL, margin ratio, liquidation distance."""
+    denied = check_token(request)
+    if denied:
+        return denied
+    try:
+        state, stale = await serve_stale_on_error('account_state', fetch_account_state)
+        return json_response(request, state['exposure'], stale=stale)
+    except Exception as e:
+        return error_response(e)
+
+
+async def api_stream(request: Request) -> Response:
+    """
+    Server-Sent Events, as in the Flask mode, with each viewer awaiting on
+    the event loop rather than holding a thread.
+    """
+    denied = check_token(request, allow_query=True)
+    if denied:
+        return denied
+
+    stream = dashboard.get_state_stream()
+    subscription = stream.subscribe_async()
+    return StreamingResponse(
+        stream.aevents(subscription),
+        media_type='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',
+        }
+    )
+
+
+async def warmup() -> None:
+    """
+    Prepare this worker before it takes traffic: open the upstream pool
+    while syncing the clock, and load the exchangeInfo index.
+    """
+    offset = await get_async_client().sync_time()
+    # Routes served by the mounted Flask app sign with the same offset
+    dashboard.TIME_OFFSET_MS = offset
+    index = await get_symbol_index()
+    print(f"[INFO] Worker {os.getpid()} warm: clock offset {offset}ms, {len(index)} symbols")
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    """Warm up on startup (if DASHBOARD_WARMUP=1); close the client pool on shutdown."""
+    global _async_client
+    if os.getenv('DASHBOARD_WARMUP') == '1':
+        try:
+            await warmup()
+        except Exception as e:
+            print(f"[WARN] Worker {os.getpid()} warmup failed: {e}")
+    yield
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+app = Starlette(
+    routes=[
+        Route('/api/time', traced(api_time), methods=['GET']),
+        Route('/api/prices', traced(api_prices), methods=['GET']),
+        Route('/api/exchange-info', traced(api_exchange_info), methods=['GET']),
+        Route('/api/symbols', traced(api_symbols), methods=['GET']),
+        Route('/api/balance', traced(api_balance), methods=['GET']),
+        Route('/api/positions', traced(api_positions), methods=['GET']),
+        Route('/api/exposure', traced(api_exposure), methods=['GET']),
+        Route('/api/stream', traced(api_stream), methods=['GET']),
+        # Orders, executions, accounts, the page and its assets
+        Mount('/', app=WSGIMiddleware(dashboard.app)),
+    ],
+    lifespan=lifespan,
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("\n" + "="*60)
+    print("🚀 Binance Futures Trading Dashboard - Async (ASGI) Server")
+    print("="*60)
+    print(f"\n📡 Base URL: {dashboard.BASE_URL}")
+    print(f"🔐 Token Auth: {'Enabled' if dashboard.DASHBOARD_TOKEN else 'Disabled'}")
+    print(f"\n🌐 Dashboard: http://localhost:5000")
+    print("\nPress Ctrl+C to stop the server\n")
+
+    uvicorn.run(app, host='localhost', port=5000)
@@ -0,0 +1,133 @@
+# trading_bot/benchmarks/alerts.py
+"""
+Tick throughput of the price-alert index with many pending alerts.
+
+Registers 100k alerts spread over 50 symbols at random levels around the
+current price, then streams random-walk ticks through AlertIndex.on_tick.
+Every alert that fires is replaced by a new one, so the index stays at
+full size for the whole run (only on_tick is timed, not the refill).
+Reports ticks per second and how many alerts fired, and checks the fired
+set against a linear scan of all alerts.
+
+Usage:
+    python benchmarks/alerts.py                          # 100k alerts, 200k ticks
+    python benchmarks/alerts.py --alerts 1000000 --ticks 500000
+    python benchmarks/alerts.py --check                  # exit 1 on mismatch or too slow
+"""
+
+import argparse
+import logging
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.alerts import AlertIndex  # noqa: E402
+
+
+# Minimum rate for --check, with --alerts pending throughout
+TICKS_PER_SECOND_BUDGET = 100_000
+
+
+def add_random(index: AlertIndex, rng: random.Random, symbol: str, price: float) -> None:
+    """One alert within 5% of ``price``, above or below it."""
+    level = price * (1 + rng.uniform(-0.05, 0.05))
+    index.add(symbol, level, "above" if level >= price else "below")
+
+
+def check_against_scan(seed: int = 3) -> bool:
+    """Replay ticks into the index and into a brute-force list; compare what fires."""
+    rng = random.Random(seed)
+    index = AlertIndex()
+    naive = []
+    for _ in range(3000):
+        symbol = f"SYM{rng.randrange(5)}USDT"
+        level = round(rng.uniform(90, 110), 1)  # coarse, so levels repeat
+        alert = index.add(symbol, level, rng.choice(["above", "below"]))
+        naive.append(alert)
+
+    for i in range(0, 3000, 7):
+        index.remove(naive[i].alert_id)
+    removed = {naive[i].alert_id for i in range(0, 3000, 7)}
+    naive = [a for a in naive if a.alert_id not in removed]
+
+    prices = {f"SYM{i}USDT": 100.0 for i in range(5)}
+    for _ in range(5000):
+        symbol = f"SYM{rng.randrange(5)}USDT"
+        prices[symbol] = round(prices[symbol] + rng.uniform(-0.5, 0.5), 2)
+        price = prices[symbol]
+        fired = {a.alert_id for a in index.on_tick(symbol, price)}
+        expected = {
+            a.alert_id for a in naive
+            if a.symbol == symbol
+            and (price >= a.price if a.direction == "above" else price <= a.price)
+        }
+        if fired != expected:
+            print(f"✗ {symbol} @ {price}: fired {len(fired)}, expected {len(expected)}")
+            return False
+        naive = [a for a in naive if a.alert_id not in expected]
+    return len(index) == len(naive)
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the price-alert index")
+    parser.add_argument("--alerts", type=int, default=100_000, help="Pending alerts (default: 100000)")
+    parser.add_argument("--symbols", type=int, default=50, help="Symbols (default: 50)")
+    parser.add_argument("--ticks", type=int, default=200_000, help="Streamed ticks (default: 200000)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 on mismatch or below budget")
+    args = parser.parse_args()
+
+    # One log line per fired alert would be timed along with the ticks
+    logging.getLogger("trading_bot").setLevel(logging.WARNING)
+
+    rng = random.Random(0)
+    symbols = [f"SYM{i}USDT" for i in range(args.symbols)]
+    prices = {symbol: 100.0 for symbol in symbols}
+    index = AlertIndex()
+
+    started = time.perf_counter()
+    for i in range(args.alerts):
+        symbol = symbols[i % args.symbols]
+        add_random(index, rng, symbol, prices[symbol])
+    add_s = time.perf_counter() - started
+
+    ticks = []
+    for _ in range(args.ticks):
+        symbol = rng.choice(symbols)
+        prices[symbol] *= 1 + rng.gauss(0, 0.001)
+        ticks.append((symbol, prices[symbol]))
+
+    on_tick = index.on_tick
+    clock = time.perf_counter
+    fired = 0
+    stream_s = 0.0
+    for symbol, price in ticks:
+        started = clock()
+        crossed = on_tick(symbol, price)
+        stream_s += clock() - started
+        if crossed:
+            # Refill outside the timed section: only tick evaluation counts
+            fired += len(crossed)
+            for _ in crossed:
+                add_random(index, rng, symbol, price)
+    rate = args.ticks / stream_s
+
+    print(f"{args.alerts:,} alerts over {args.symbols} symbols")
+    print(f"add     {args.alerts:,} alerts: {add_s * 1000:8.1f} ms ({add_s / args.alerts * 1e6:.2f} µs/alert)")
+    print(f"stream  {args.ticks:,} ticks: {rate:,.0f} ticks/s ({stream_s / args.ticks * 1e6:.2f} µs/tick), "
+          f"{fired:,} alerts fired and replaced, {len(index):,} pending")
+
+    if not args.check:
+        return 0
+    matches = check_against_scan()
+    fast = rate >= TICKS_PER_SECOND_BUDGET
+    print(f"{'✓' if matches else '✗'} Fired alerts match a linear scan")
+    print(f"{'✓' if fast else '✗'} {rate:,.0f} ticks/s (budget {TICKS_PER_SECOND_BUDGET:,})")
+    return 0 if matches and fast else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+# trading_bot/benchmarks/backtest.py
+"""
+Matching throughput of the event-driven SimulatedExchange, plus fill-rule checks.
+
+Places resting LIMIT, STOP and STOP_MARKET orders on a random-walk price
+series and advances the clock bar by bar, so both the vectorized fill
+search in _schedule and the queued fills in advance are timed.
+
+--check also replays hand-built bars whose fill price and maker/taker side
+are known, e.g. a stop-limit that triggers mid-bar above the open must not
+fill at that open.
+
+Usage:
+    python benchmarks/backtest.py                        # 200k bars, 20k orders
+    python benchmarks/backtest.py --bars 1000000 --orders 100000
+    python benchmarks/backtest.py --check                # exit 1 on a wrong fill or too slow
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.backtest import KlineData, SimulatedExchange  # noqa: E402
+
+
+# Minimum rate for --check: orders placed and filled per second
+ORDERS_PER_SECOND_BUDGET = 10_000
+
+# (side, type, price, stop, bars as (open, high, low), expected fill price, maker)
+FILL_CASES = [
+    # Stop-limit triggered mid-bar: the open (100) was before the trigger
+    ("BUY", "STOP", 107.0, 105.0, [(100, 100, 100), (100, 110, 99)], 105.0, False),
+    ("SELL", "STOP", 93.0, 95.0, [(100, 100, 100), (100, 101, 90)], 95.0, False),
+    # Gapped through the stop and past the limit: rests, fills at the limit
+    ("BUY", "STOP", 107.0, 105.0, [(100, 100, 100), (108, 109, 106)], 107.0, True),
+    # Gapped through the stop but inside the limit: fills at the open
+    ("BUY", "STOP", 107.0, 105.0, [(100, 100, 100), (106, 108, 105.5)], 106.0, False),
+    # Triggered, limit reached only on a later bar
+    ("BUY", "STOP", 104.0, 105.0, [(100, 100, 100), (100, 106, 104.5), (105, 105, 103)], 104.0, True),
+    ("BUY", "STOP_MARKET", None, 105.0, [(100, 100, 100), (100, 110, 99)], 105.0, False),
+    ("BUY", "LIMIT", 99.0, None, [(100, 100, 100), (100, 101, 98)], 99.0, True),
+    ("BUY", "LIMIT", 101.0, None, [(100, 100, 100), (100, 101, 98)], 100.0, False),
+]
+
+
+def klines(symbol: str, ohlc: np.ndarray) -> KlineData:
+    """KlineData from an (n, 3) array of open, high, low (close = open)."""
+    n = len(ohlc)
+    return KlineData(
+        symbol=symbol,
+        open_time=np.arange(n, dtype=np.int64) * 60_000,
+        open=ohlc[:, 0], high=ohlc[:, 1], low=ohlc[:, 2], close=ohlc[:, 0].copy(),
+        volume=np.ones(n),
+    )
+
+
+def check_fill_rules() -> bool:
+    """Replay FILL_CASES; print and fail on the first wrong fill."""
+    ok = True
+    for side, order_type, price, stop, bars, expected, maker in FILL_CASES:
+        exchange = SimulatedExchange({"TESTUSDT": klines("TESTUSDT", np.array(bars, dtype=float))})
+        exchange.advance("TESTUSDT", 0)
+        order_id = exchange.place_order(
+            "TESTUSDT", side, order_type, 1.0, price=price, stop_price=stop
+        ).order_id
+        for index in range(1, len(bars)):
+            exchange.advance("TESTUSDT", index)
+        order = exchange.orders[order_id]
+        if order.status != "FILLED" or order.fill_price != expected or order.is_maker != maker:
+            print(f"✗ {side} {order_type} price={price} stop={stop}: {order.status} "
+                  f"@ {order.fill_price} maker={order.is_maker}, expected {expected} maker={maker}")
+            ok = False
+    return ok
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the backtest matching engine")
+    parser.add_argument("--bars", type=int, default=200_000, help="Bars in the series (default: 200000)")
+    parser.add_argument("--orders", type=int, default=20_000, help="Orders placed (default: 20000)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 on a wrong fill or below budget")
+    args = parser.parse_args()
+
+    logging.getLogger("trading_bot").setLevel(logging.WARNING)
+
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, args.bars)))
+    spread = np.abs(rng.normal(0, 0.0015, args.bars)) * close
+    data = klines("BTCUSDT", np.column_stack([close, close + spread, close - spread]))
+    exchange = SimulatedExchange({"BTCUSDT": data})
+
+    every = max(args.bars // args.orders, 1)
+    kinds = [("BUY", "LIMIT", 0.99, None), ("SELL", "LIMIT", 1.01, None),
+             ("BUY", "STOP", 1.02, 1.01), ("SELL", "STOP_MARKET", None, 0.99)]
+    placed = 0
+    started = time.perf_counter()
+    for index in range(args.bars):
+        exchange.advance("BTCUSDT", index)
+        if index % every == 0 and placed < args.orders:
+            side, order_type, price, stop = kinds[placed % len(kinds)]
+            last = data.close[index]
+            exchange.place_order(
+                "BTCUSDT", side, order_type, 0.001,
+                price=last * price if price else None, stop_price=last * stop if stop else None
+            )
+            placed += 1
+    elapsed = time.perf_counter() - started
+    filled = sum(order.status == "FILLED" for order in exchange.orders.values())
+    rate = placed / elapsed
+
+    print(f"{args.bars:,} bars, {placed:,} orders ({filled:,} filled) in {elapsed * 1000:.0f} ms "
+          f"({rate:,.0f} orders/s, {elapsed / args.bars * 1e6:.2f} µs/bar)")
+
+    if not args.check:
+        return 0
+    correct = check_fill_rules()
+    fast = rate >= ORDERS_PER_SECOND_BUDGET
+    print(f"{'✓' if correct else '✗'} Fill prices and maker/taker sides match the expected cases")
+    print(f"{'✓' if fast else '✗'} {rate:,.0f} orders/s (budget {ORDERS_PER_SECOND_BUDGET:,})")
+    return 0 if correct and fast else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# trading_bot/benchmarks/history_query.py
+"""
+Query latency for the local trade history store.
+
+Fills a HistoryStore with synthetic fills (one year, several symbols) and
+funding records, then times the `history pnl` / `history fees` queries:
+whole-range totals, per-symbol and per-day breakdowns, and a range that
+starts and ends mid-day.
+
+Usage:
+    python benchmarks/history_query.py                   # 500k fills
+    python benchmarks/history_query.py --fills 1000000
+    python benchmarks/history_query.py --check           # exit 1 if over budget
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.history import DAY_MS, HistoryStore  # noqa: E402
+
+
+# Slowest query allowed (the request target is "milliseconds")
+QUERY_BUDGET_MS = 20.0
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT", "XRPUSDT", "DOGEUSDT", "ADAUSDT", "LINKUSDT"]
+
+
+def fill_store(store: HistoryStore, fills: int, days: int, seed: int = 0) -> float:
+    """Insert ``fills`` random fills in pages of 1000; returns seconds taken."""
+    rng = random.Random(seed)
+    start_ms = int(time.time() * 1000) - days * DAY_MS
+    step = days * DAY_MS // fills
+    next_id = dict.fromkeys(SYMBOLS, 1)
+
+    started = time.perf_counter()
+    for page_start in range(0, fills, 1000):
+        page = []
+        for i in range(page_start, min(page_start + 1000, fills)):
+            symbol = rng.choice(SYMBOLS)
+            price, qty = rng.uniform(1, 60000), rng.uniform(0.001, 2)
+            page.append({
+                "symbol": symbol, "id": next_id[symbol], "orderId": i, "side": rng.choice(["BUY", "SELL"]),
+                "positionSide": "BOTH", "price": price, "qty": qty, "quoteQty": price * qty,
+                "realizedPnl": rng.gauss(0, 5), "commission": price * qty * 0.0004,
+                "commissionAsset": "USDT", "maker": rng.random() < 0.3, "time": start_ms + i * step,
+            })
+            next_id[symbol] += 1
+        store.add_trades(page)
+
+    store.add_income([
+        {"tranId": day * 100 + n, "incomeType": "FUNDING_FEE", "symbol": symbol, "asset": "USDT",
+         "income": rng.gauss(0, 1), "time": start_ms + day * DAY_MS + n * 8 * 3_600_000}
+        for day in range(days) for n, symbol in enumerate(SYMBOLS[:3])
+    ])
+    return time.perf_counter() - started
+
+
+def time_query(run, repeat: int = 20) -> float:
+    """Median wall time of ``run()`` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        samples.append((time.perf_counter() - started) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Time history store queries")
+    parser.add_argument("--fills", type=int, default=500_000, help="Synthetic fills (default: 500000)")
+    parser.add_argument("--days", type=int, default=365, help="Days of history (default: 365)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if a query exceeds the budget")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = HistoryStore(os.path.join(tmp, "history.db"))
+        seconds = fill_store(store, args.fills, args.days)
+        print(f"Inserted {args.fills} fills in {seconds:.1f}s ({args.fills / seconds:,.0f}/s)")
+
+        now = int(time.time() * 1000)
+        mid_start = now - 90 * DAY_MS + 12_345_678
+        mid_end = now - 10 * DAY_MS + 7_654_321
+        queries = {
+            "total": lambda: store.summary("total"),
+            "by symbol": lambda: store.summary("symbol"),
+            "by day": lambda: store.summary("day"),
+            "one symbol, 80 days mid-day": lambda: store.summary("total", "BTCUSDT", mid_start, mid_end),
+            "by symbol, 80 days mid-day": lambda: store.summary("symbol", None, mid_start, mid_end),
+        }
+
+        worst = 0.0
+        print(f"{'query':<32}{'median ms':>12}")
+        for name, run in queries.items():
+            ms = time_query(run)
+            worst = max(worst, ms)
+            print(f"{name:<32}{ms:>12.2f}")
+        store.close()
+
+    if args.check:
+        ok = worst <= QUERY_BUDGET_MS
+        print(f"{'✓' if ok else '✗'} Slowest query {worst:.2f}ms (budget {QUERY_BUDGET_MS:.0f}ms)")
+        return 0 if ok else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
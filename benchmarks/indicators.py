@@ -0,0 +1,135 @@
+# trading_bot/benchmarks/indicators.py
+"""
+Throughput of the streaming indicator engine.
+
+Warms 500 symbols x 10 indicators (bot.indicators.DEFAULT_INDICATORS) from
+random-walk history in batch mode, then streams random ticks through
+IndicatorEngine.on_tick and reports ticks per second. Also checks that
+streaming and batch mode agree bit for bit, and that Bollinger bands stay
+accurate after the price trends far from where the stream started.
+
+Usage:
+    python benchmarks/indicators.py                      # 500 symbols, 200k ticks
+    python benchmarks/indicators.py --symbols 1000 --ticks 500000
+    python benchmarks/indicators.py --check              # exit 1 on mismatch or too slow
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.indicators import Bollinger, DEFAULT_INDICATORS, IndicatorEngine  # noqa: E402
+
+
+# Minimum streaming rate for --check (ticks, each updating 10 indicators)
+TICKS_PER_SECOND_BUDGET = 20_000
+
+# Largest relative error of the Bollinger band width vs np.std for --check
+BAND_RELATIVE_ERROR = 1e-9
+
+
+def random_walk(steps: int, symbols: int, seed: int = 0) -> tuple:
+    """Close, high, low and volume arrays of shape (steps, symbols)."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, (steps, symbols)), axis=0))
+    spread = close * rng.uniform(0, 0.002, (steps, symbols))
+    return close, close + spread, close - spread, rng.uniform(0, 10, (steps, symbols))
+
+
+def check_identical(history: tuple, symbols: int) -> bool:
+    """Stream a few symbols tick by tick and compare with batch() over all symbols."""
+    close, high, low, volume = history
+    ok = True
+    for name, factory in DEFAULT_INDICATORS.items():
+        batch = factory().batch(close, high, low, volume)
+        for j in range(min(symbols, 5)):
+            indicator = factory()
+            streamed = []
+            for t in range(len(close)):
+                indicator.update(float(close[t, j]), float(high[t, j]), float(low[t, j]), float(volume[t, j]))
+                streamed.append(
+                    (indicator.value, indicator.upper, indicator.lower)
+                    if isinstance(indicator, Bollinger) else indicator.value
+                )
+            if not np.array_equal(np.array(streamed), batch[:, j], equal_nan=True):
+                print(f"✗ {name} differs between streaming and batch (symbol {j})")
+                ok = False
+    return ok
+
+
+def check_band_accuracy() -> bool:
+    """Bollinger width vs np.std on a long series that trends 150x from its start."""
+    rng = np.random.default_rng(3)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.00005, 0.0001, 100_000)))
+    expected = np.lib.stride_tricks.sliding_window_view(close, 20).std(axis=1)
+    bands = Bollinger(20, 1.0).batch(close)[19:]
+    error = float(np.max(np.abs(bands[:, 1] - bands[:, 0] - expected) / expected))
+    print(f"{'✓' if error <= BAND_RELATIVE_ERROR else '✗'} Bollinger width within "
+          f"{error:.1e} of np.std (limit {BAND_RELATIVE_ERROR:.0e})")
+    return error <= BAND_RELATIVE_ERROR
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark streaming indicators")
+    parser.add_argument("--symbols", type=int, default=500, help="Symbols (default: 500)")
+    parser.add_argument("--history", type=int, default=1500, help="Warmup bars per symbol (default: 1500)")
+    parser.add_argument("--ticks", type=int, default=200_000, help="Streamed ticks (default: 200000)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 on mismatch or below budget")
+    args = parser.parse_args()
+
+    history = random_walk(args.history, args.symbols)
+    names = list(DEFAULT_INDICATORS)
+
+    # Batch mode: all symbols at once, shape (history, symbols)
+    started = time.perf_counter()
+    for factory in DEFAULT_INDICATORS.values():
+        factory().batch(*history)
+    batch_s = time.perf_counter() - started
+
+    # Per-symbol warm() then streaming
+    engine = IndicatorEngine(DEFAULT_INDICATORS)
+    symbols = [f"SYM{i}USDT" for i in range(args.symbols)]
+    started = time.perf_counter()
+    for j, symbol in enumerate(symbols):
+        for indicator in engine.indicators(symbol):
+            indicator.warm(*(column[:, j] for column in history))
+    warm_s = time.perf_counter() - started
+
+    rng = np.random.default_rng(1)
+    picks = rng.integers(0, args.symbols, args.ticks).tolist()
+    last = history[0][-1]
+    prices = (last[picks] * np.exp(rng.normal(0, 0.001, args.ticks))).tolist()
+    volumes = rng.uniform(0, 10, args.ticks).tolist()
+    ticks = [(symbols[i], p, v) for i, p, v in zip(picks, prices, volumes)]
+
+    on_tick = engine.on_tick
+    started = time.perf_counter()
+    for symbol, price, volume in ticks:
+        on_tick(symbol, price, volume)
+    stream_s = time.perf_counter() - started
+    rate = args.ticks / stream_s
+
+    print(f"{args.symbols} symbols x {len(names)} indicators ({', '.join(names)})")
+    print(f"batch   {args.history} bars x {args.symbols} symbols: {batch_s * 1000:8.1f} ms")
+    print(f"warm    per-symbol batch + state load:  {warm_s * 1000:8.1f} ms")
+    print(f"stream  {args.ticks} ticks: {rate:,.0f} ticks/s "
+          f"({rate * len(names):,.0f} indicator updates/s, {stream_s / args.ticks * 1e6:.1f} µs/tick)")
+
+    if not args.check:
+        return 0
+    identical = check_identical(random_walk(600, 5, seed=2), 5)
+    fast = rate >= TICKS_PER_SECOND_BUDGET
+    print(f"{'✓' if identical else '✗'} Streaming and batch results identical")
+    print(f"{'✓' if fast else '✗'} {rate:,.0f} ticks/s (budget {TICKS_PER_SECOND_BUDGET:,})")
+    accurate = check_band_accuracy()
+    return 0 if identical and fast and accurate else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
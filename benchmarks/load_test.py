@@ -0,0 +1,254 @@
+# trading_bot/benchmarks/load_test.py
+"""
+Load test: Flask (threaded WSGI) vs. async (ASGI) dashboard server.
+
+Starts a mock Binance upstream with fixed latency, runs each server mode
+against it in a subprocess, and drives N concurrent keep-alive clients at
+one route. Reports requests per second, p50/p99 latency and errors.
+
+The default route, /api/time, makes one upstream call per request and is
+not cached, so it measures how each server waits on Binance.
+
+Usage:
+    python benchmarks/load_test.py                         # 500 clients, both modes
+    python benchmarks/load_test.py --clients 200 --duration 20
+    python benchmarks/load_test.py --mode asgi --path "/api/prices?symbols=ALL"
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+MODES = {
+    "flask": [
+        sys.executable, "-c",
+        "import sys, run_local_dashboard as d; "
+        "d.app.run(host='127.0.0.1', port=int(sys.argv[1]), threaded=True)",
+    ],
+    "asgi": [
+        sys.executable, "-c",
+        "import sys, uvicorn; "
+        "uvicorn.run('asgi_dashboard:app', host='127.0.0.1', port=int(sys.argv[1]), "
+        "log_level='warning', access_log=False, backlog=4096)",
+    ],
+}
+
+
+def free_port() -> int:
+    """Ask the OS for an unused TCP port."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_for_port(port: int, timeout: float = 15.0) -> None:
+    """Block until something accepts connections on ``port``."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Nothing listening on port {port} after {timeout}s")
+
+
+# --- mock upstream --------------------------------------------------------
+
+MOCK_BODIES = {
+    "/testnet/fapi/v1/time": lambda: {"serverTime": int(time.time() * 1000)},
+    "/testnet/fapi/v1/ticker/price": lambda: [
+        {"symbol": f"SYM{i}USDT", "price": str(100 + i)} for i in range(300)
+    ] + [{"symbol": "BTCUSDT", "price": "65000.0"}],
+    "/testnet/fapi/v2/balance": lambda: [
+        {"asset": "USDT", "balance": "1000", "availableBalance": "1000", "crossUnPnl": "0"}
+    ],
+    "/testnet/fapi/v1/exchangeInfo": lambda: {"symbols": [
+        {"symbol": f"SYM{i}USDT", "baseAsset": f"SYM{i}", "quoteAsset": "USDT",
+         "status": "TRADING", "filters": []} for i in range(300)
+    ]},
+    "/testnet/fapi/v2/positionRisk": lambda: [],
+    "/testnet/fapi/v1/algoOrders": lambda: [],
+}
+
+
+async def serve_mock(port: int, latency: float) -> None:
+    """Minimal keep-alive HTTP/1.1 server answering like the Binance API."""
+    calls: dict = {}
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                path = head.split(b" ", 2)[1].decode().split("?", 1)[0]
+                if path == "/_mock/calls":
+                    # Upstream calls per path so far (not delayed, not counted)
+                    make_body = lambda: calls
+                else:
+                    calls[path] = calls.get(path, 0) + 1
+                    await asyncio.sleep(latency)
+                    make_body = MOCK_BODIES.get(path)
+                status = "200 OK" if make_body else "404 Not Found"
+                body = json.dumps(make_body() if make_body else {"code": -1, "msg": path}).encode()
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", port, backlog=4096)
+    async with server:
+        await server.serve_forever()
+
+
+# --- load generator -------------------------------------------------------
+
+async def fetch(host: str, port: int, path: str, conn: list) -> int:
+    """
+    One GET over a reused connection; returns the status code.
+
+    A bare asyncio client keeps generator overhead small next to the
+    servers under test. ``conn`` holds [reader, writer] or is empty.
+    """
+    if not conn:
+        conn.extend(await asyncio.open_connection(host, port))
+    reader, writer = conn
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode())
+    await writer.drain()
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    version, status = lines[0].split(" ", 2)[:2]
+    headers = {k.lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:] if line)}
+    length = int(headers.get("content-length", 0))
+    if length:
+        await reader.readexactly(length)
+
+    if version == "HTTP/1.0" or headers.get("connection", "").lower() == "close":
+        writer.close()
+        conn.clear()
+    return int(status)
+
+
+async def drive(host: str, port: int, path: str, clients: int, duration: float, warmup: float) -> dict:
+    """Run ``clients`` concurrent request loops for ``duration`` seconds."""
+    latencies: list = []
+    errors = 0
+    start = time.monotonic()
+    measure_from = start + warmup
+    stop_at = measure_from + duration
+
+    async def worker() -> None:
+        nonlocal errors
+        conn: list = []
+        while True:
+            sent = time.monotonic()
+            if sent >= stop_at:
+                break
+            try:
+                ok = await fetch(host, port, path, conn) == 200
+            except (OSError, asyncio.IncompleteReadError, ValueError):
+                ok = False
+                if conn:
+                    conn[1].close()
+                    conn.clear()
+            done = time.monotonic()
+            if sent >= measure_from:
+                if ok:
+                    latencies.append(done - sent)
+                else:
+                    errors += 1
+        if conn:
+            conn[1].close()
+
+    await asyncio.gather(*(worker() for _ in range(clients)))
+    latencies.sort()
+
+    def pct(p: float) -> float:
+        return latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000 if latencies else 0.0
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration,
+        "p50_ms": pct(0.50),
+        "p99_ms": pct(0.99),
+    }
+
+
+def run_mode(mode: str, args: argparse.Namespace, upstream: str) -> dict:
+    """Start one server mode, load it, and stop it."""
+    port = free_port()
+    env = dict(
+        os.environ,
+        BINANCE_BASE_URL=upstream,
+        BINANCE_API_KEY="load-test",
+        BINANCE_API_SECRET="load-test",
+        DASHBOARD_TOKEN="",
+    )
+    server = subprocess.Popen(
+        MODES[mode] + [str(port)], cwd=ROOT, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for_port(port)
+        return asyncio.run(
+            drive("127.0.0.1", port, args.path, args.clients, args.duration, args.warmup)
+        )
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Load test the dashboard server modes")
+    parser.add_argument("--mode", choices=["flask", "asgi", "both"], default="both")
+    parser.add_argument("--clients", type=int, default=500, help="Concurrent clients (default: 500)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per mode")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds first")
+    parser.add_argument("--path", default="/api/time", help="Route to request")
+    parser.add_argument("--latency", type=float, default=0.05, help="Mock upstream latency (s)")
+    parser.add_argument("--mock-upstream", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mock_upstream:
+        asyncio.run(serve_mock(args.mock_upstream, args.latency))
+        return 0
+
+    mock_port = free_port()
+    mock = subprocess.Popen([
+        sys.executable, __file__, "--mock-upstream", str(mock_port),
+        "--latency", str(args.latency)
+    ])
+    try:
+        wait_for_port(mock_port)
+        upstream = f"http://127.0.0.1:{mock_port}/testnet"
+        modes = ["flask", "asgi"] if args.mode == "both" else [args.mode]
+
+        print(f"{args.clients} clients, {args.duration:.0f}s, GET {args.path}, "
+              f"upstream latency {args.latency * 1000:.0f}ms")
+        print(f"{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+        for mode in modes:
+            r = run_mode(mode, args, upstream)
+            print(f"{mode:<8}{r['rps']:>10.0f}{r['p50_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['errors']:>8}")
+    finally:
+        mock.terminate()
+        mock.wait(timeout=10)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+# trading_bot/benchmarks/risk_engine.py
+"""
+Latency check for the vectorized risk engine.
+
+Fills a RiskEngine with random positions and times a full recompute
+(one mark-price update across every symbol) and the exposure aggregate.
+
+Usage:
+    python benchmarks/risk_engine.py                    # 500 symbols
+    python benchmarks/risk_engine.py --symbols 2000
+    python benchmarks/risk_engine.py --check            # exit 1 if over budget
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.portfolio import RiskEngine  # noqa: E402
+
+
+# Full recompute budget (the request target is "well under 1 ms")
+RECOMPUTE_BUDGET_US = 250.0
+
+
+def build_engine(symbols: int, seed: int = 0) -> RiskEngine:
+    """Create an engine with ``symbols`` random open positions."""
+    rng = np.random.default_rng(seed)
+    engine = RiskEngine(wallet_balance=1_000_000.0)
+    for i in range(symbols):
+        entry = float(rng.uniform(1, 50_000))
+        engine.set_position(
+            f"SYM{i}USDT",
+            qty=float(rng.normal()),
+            entry_price=entry,
+            mark_price=entry * float(rng.uniform(0.95, 1.05)),
+            leverage=float(rng.integers(1, 50)),
+        )
+    engine.recompute()
+    return engine
+
+
+def time_call(func, iterations: int) -> float:
+    """Return the median call time in microseconds."""
+    samples = np.empty(iterations)
+    for i in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples[i] = time.perf_counter() - start
+    return float(np.median(samples) * 1e6)
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Time RiskEngine recompute and exposure")
+    parser.add_argument("--symbols", type=int, default=500, help="Open positions (default: 500)")
+    parser.add_argument("--iterations", type=int, default=2000, help="Timed calls per measurement")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if recompute is over budget")
+    args = parser.parse_args()
+
+    engine = build_engine(args.symbols)
+    marks = {symbol: float(price) for symbol, price in
+             zip(engine.symbols, engine.mark[:engine.size] * 1.001)}
+
+    recompute_us = time_call(engine.recompute, args.iterations)
+    tick_us = time_call(lambda: engine.update_marks(marks), args.iterations // 10 or 1)
+    exposure_us = time_call(lambda: engine.exposure(include_positions=False), args.iterations)
+
+    print(f"Symbols:                   {args.symbols}")
+    print(f"recompute():               {recompute_us:8.1f} µs")
+    print(f"update_marks(all symbols): {tick_us:8.1f} µs")
+    print(f"exposure():                {exposure_us:8.1f} µs")
+
+    if recompute_us > RECOMPUTE_BUDGET_US:
+        print(f"\n✗ recompute {recompute_us:.1f} µs > budget {RECOMPUTE_BUDGET_US} µs")
+        return 1 if args.check else 0
+
+    print(f"\n✓ recompute within {RECOMPUTE_BUDGET_US} µs budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
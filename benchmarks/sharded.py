@@ -0,0 +1,148 @@
+# trading_bot/benchmarks/sharded.py
+"""
+Throughput of the sharded market-data runtime as workers are added.
+
+Runs ShardedMarketData over a synthetic feed: each worker generates
+aggTrade and bookTicker messages as raw JSON for its own symbols (three
+trades per book update), then parses them and updates 10 indicators
+exactly as with a live feed. The parent counts the records arriving
+through the shared-memory rings.
+
+For each worker count it reports messages per second, from the first
+record to the last, and the scaling efficiency against one worker. It
+also checks that no records were lost and that the final indicator
+values match an in-process IndicatorEngine fed the same trades.
+
+Usage:
+    python benchmarks/sharded.py                         # 1, 2, 4 ... up to the CPU count
+    python benchmarks/sharded.py --workers 1 2 4 8 --messages 50000
+    python benchmarks/sharded.py --check                 # exit 1 on lost records, mismatch or poor scaling
+"""
+
+import argparse
+import json
+import logging
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.indicators import DEFAULT_INDICATORS, IndicatorEngine  # noqa: E402
+from bot.sharded import ShardedMarketData  # noqa: E402
+
+
+# Minimum rate(n) / (n * rate(1)) for --check, for n up to the CPU count
+SCALING_EFFICIENCY_BUDGET = 0.7
+
+
+def synthetic_price(symbol_no: int, i: int) -> float:
+    """Deterministic price path for one symbol."""
+    return round(100.0 + symbol_no + 5 * math.sin(i / 50.0) + (i % 7) * 0.01, 4)
+
+
+class SyntheticFeed:
+    """Picklable feed: ``messages`` raw combined-stream messages per symbol."""
+
+    def __init__(self, messages: int):
+        self.messages = messages
+
+    def __call__(self, symbols: list):
+        for i in range(self.messages):
+            for symbol in symbols:
+                n = int(symbol[3:-4])
+                if i % 4 == 3:
+                    data = {"e": "bookTicker", "s": symbol, "T": i, "b": "99.9", "B": "3", "a": "100.1", "A": "2"}
+                    name = "bookTicker"
+                else:
+                    data = {"e": "aggTrade", "s": symbol, "T": i, "p": str(synthetic_price(n, i)), "q": "0.5"}
+                    name = "aggTrade"
+                yield json.dumps({"stream": f"{symbol.lower()}@{name}", "data": data})
+
+
+def expected_values(symbol: str, messages: int) -> dict:
+    """Indicator values after feeding the symbol's synthetic trades in-process."""
+    engine = IndicatorEngine(DEFAULT_INDICATORS)
+    n = int(symbol[3:-4])
+    for i in range(messages):
+        if i % 4 != 3:
+            engine.on_tick(symbol, synthetic_price(n, i), 0.5)
+    return engine.values(symbol)
+
+
+def run(workers: int, symbols: list, messages: int) -> tuple:
+    """One run: (messages per second, runtime after join) — caller stops the runtime."""
+    first = []
+    runtime = ShardedMarketData(symbols, workers=workers, feed=SyntheticFeed(messages))
+    runtime.subscribe(lambda batch: first or first.append(time.perf_counter()))
+    runtime.start()
+    runtime.join()
+    elapsed = time.perf_counter() - first[0]
+    return runtime.received / elapsed, runtime
+
+
+def values_match(runtime: ShardedMarketData, symbol: str, messages: int) -> bool:
+    """Compare the runtime's final record for ``symbol`` with expected_values."""
+    latest = runtime.latest(symbol)
+    for name, value in expected_values(symbol, messages).items():
+        got = (latest[name], latest[f"{name}_upper"], latest[f"{name}_lower"]) \
+            if isinstance(value, tuple) else latest[name]
+        if got != value and not (isinstance(value, float) and math.isnan(value) and math.isnan(got)):
+            print(f"✗ {symbol} {name}: {got} != {value}")
+            return False
+    return True
+
+
+def main() -> int:
+    """Main entry point."""
+    cpus = os.cpu_count() or 1
+    default_workers = [n for n in (1, 2, 4, 8, 16) if n <= cpus]
+
+    parser = argparse.ArgumentParser(description="Benchmark sharded market-data processing")
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers,
+                        help="Worker counts to run (default: powers of two up to the CPU count)")
+    parser.add_argument("--symbols", type=int, default=64, help="Symbols (default: 64)")
+    parser.add_argument("--messages", type=int, default=2000, help="Messages per symbol (default: 2000)")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit 1 on lost records, mismatched values or poor scaling")
+    args = parser.parse_args()
+
+    logging.getLogger("trading_bot").setLevel(logging.WARNING)
+    symbols = [f"SYM{i}USDT" for i in range(args.symbols)]
+    total = args.symbols * args.messages
+
+    print(f"{args.symbols} symbols x {args.messages} messages, 10 indicators, {cpus} CPUs")
+    print(f"{'workers':>8}{'msgs/s':>12}{'efficiency':>12}")
+    ok = True
+    base = None
+    for workers in args.workers:
+        rate, runtime = run(workers, symbols, args.messages)
+        try:
+            base = base or rate
+            efficiency = rate / (workers * base)
+            print(f"{workers:>8}{rate:>12,.0f}{efficiency:>11.0%}")
+
+            if runtime.received != total:
+                print(f"✗ {workers} workers: {runtime.received} records, expected {total}")
+                ok = False
+            if args.check and not values_match(runtime, symbols[-1], args.messages):
+                ok = False
+            if args.check and 1 < workers <= cpus and efficiency < SCALING_EFFICIENCY_BUDGET:
+                print(f"✗ {workers} workers: efficiency {efficiency:.0%} "
+                      f"(budget {SCALING_EFFICIENCY_BUDGET:.0%})")
+                ok = False
+        finally:
+            runtime.stop()
+
+    if not args.check:
+        return 0
+    if cpus == 1:
+        print("  (one CPU: scaling not measurable here)")
+    print(f"{'✓' if ok else '✗'} No lost records, values match, scaling within budget")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
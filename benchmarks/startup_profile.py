@@ -0,0 +1,171 @@
+# trading_bot/benchmarks/startup_profile.py
+"""
+Startup-time profile and budget check for the CLI and serverless entry.
+
+Runs each entry point in a fresh interpreter with ``python -X importtime``
+and reports total import time, module count and the slowest imports.
+
+Usage:
+    python benchmarks/startup_profile.py            # report
+    python benchmarks/startup_profile.py --top 25   # longer report
+    python benchmarks/startup_profile.py --check    # exit 1 if over budget
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+@dataclass
+class StartupTarget:
+    """An entry point to profile and its budget."""
+    name: str
+    argv: list
+    max_import_ms: float
+    max_modules: int
+    forbidden: list = field(default_factory=list)
+
+
+# Budgets leave headroom over a warm-cache run on a developer laptop; they
+# exist to catch a heavy import sneaking back onto these paths, not to
+# benchmark the machine.
+TARGETS = [
+    StartupTarget(
+        name="cli --help",
+        argv=["cli.py", "--help"],
+        max_import_ms=150,
+        max_modules=220,
+        forbidden=["httpx", "asyncio", "dotenv"],
+    ),
+    StartupTarget(
+        name="cli place-order --dry-run",
+        argv=["cli.py", "place-order", "--symbol", "BTCUSDT", "--side", "BUY",
+              "--type", "MARKET", "--quantity", "0.001", "--dry-run"],
+        max_import_ms=150,
+        max_modules=220,
+        forbidden=["httpx", "asyncio"],
+    ),
+    StartupTarget(
+        name="serverless entry (api/index.py)",
+        argv=["-c", "import api.index"],
+        max_import_ms=400,
+        max_modules=400,
+        forbidden=["httpx", "asyncio", "bot.client"],
+    ),
+]
+
+
+@dataclass
+class ImportRecord:
+    """One line of -X importtime output."""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile(target: StartupTarget) -> tuple[list, float]:
+    """
+    Run a target under -X importtime.
+
+    Args:
+        target: Entry point to run
+
+    Returns:
+        Tuple of (import records, wall-clock seconds)
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    # Credentials are irrelevant for import cost; keep the dashboard's
+    # testnet guard from tripping on a developer's production .env
+    env.setdefault("BINANCE_BASE_URL", "https://testnet.binancefuture.com")
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *target.argv],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+
+    records = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append(ImportRecord(
+                module=module,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=len(indent) // 2,
+            ))
+
+    return records, wall
+
+
+def summarize(target: StartupTarget, records: list, wall: float, top: int) -> list:
+    """
+    Print a report for one target.
+
+    Returns:
+        List of budget violations (empty if within budget)
+    """
+    total_ms = sum(r.cumulative_us for r in records if r.depth == 0) / 1000
+    modules = {r.module for r in records}
+
+    print(f"\n=== {target.name} ===")
+    print(f"wall: {wall * 1000:.0f} ms | imports: {total_ms:.1f} ms | modules: {len(modules)}")
+
+    for record in sorted(records, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+        print(f"  {record.cumulative_us / 1000:8.1f} ms  {record.module}")
+
+    violations = []
+    if total_ms > target.max_import_ms:
+        violations.append(f"import time {total_ms:.1f} ms > budget {target.max_import_ms} ms")
+    if len(modules) > target.max_modules:
+        violations.append(f"module count {len(modules)} > budget {target.max_modules}")
+    for name in target.forbidden:
+        if any(m == name or m.startswith(name + ".") for m in modules):
+            violations.append(f"'{name}' imported but should be deferred")
+
+    return violations
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Profile cold-start import cost")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any budget is exceeded")
+    args = parser.parse_args()
+
+    failures = {}
+    for target in TARGETS:
+        records, wall = profile(target)
+        violations = summarize(target, records, wall, args.top)
+        if violations:
+            failures[target.name] = violations
+
+    if failures:
+        print("\nBudget violations:")
+        for name, violations in failures.items():
+            for violation in violations:
+                print(f"  ✗ {name}: {violation}")
+        return 1 if args.check else 0
+
+    print("\n✓ All startup budgets met")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
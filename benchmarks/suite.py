@@ -0,0 +1,412 @@
+# trading_bot/benchmarks/suite.py
+"""
+Micro-benchmark suite for the hot paths, with saved baselines.
+
+Cases:
+- sign_request: HMAC signing of an order's parameters
+- validate_order: validate_order_params for a LIMIT order with a symbol index
+- parse_order_response: OrderResponse.from_api_response on a recorded order
+- json_decode_*: json.loads of recorded payloads (order, positionRisk,
+  a 300-symbol exchangeInfo, the all-symbols ticker)
+- route_*: Flask test-client requests against a mock upstream (httpx
+  MockTransport), so only the dashboard's own overhead is timed
+- log_*: the rotating file handler setup_logger() installs, for a record
+  that is written and one below the level
+- audit_record: one order.response record appended to the audit log
+- simulate_order: a dry-run MARKET order walking a 100-level book
+
+Each case is timed like timeit: the loop count is calibrated so one repeat
+takes about --min-time seconds, and the per-call time of every repeat is
+recorded. Results compare on the fastest repeat, which is the least
+affected by other load on the machine.
+
+Usage:
+    python benchmarks/suite.py list
+    python benchmarks/suite.py run                        # print results
+    python benchmarks/suite.py run --save main            # -> benchmarks/baselines/main.json
+    python benchmarks/suite.py compare main               # run now, compare with the baseline
+    python benchmarks/suite.py compare main after.json --threshold 5
+    python benchmarks/suite.py run -k route --min-time 0.5
+
+compare exits 1 if any case is slower than the baseline by more than
+--threshold percent (default 10). Baselines are machine-specific, so
+create one on the machine you compare on. Saved baselines are not
+committed.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+PAYLOAD_DIR = Path(__file__).resolve().parent / "payloads"
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+
+DEFAULT_THRESHOLD_PCT = 10.0
+
+# name -> (description, setup); setup returns the zero-argument callable to time
+CASES: dict = {}
+
+
+def case(name: str, description: str) -> Callable:
+    """Register a benchmark case."""
+    def register(setup: Callable[[], Callable[[], object]]) -> Callable:
+        CASES[name] = (description, setup)
+        return setup
+    return register
+
+
+def load_payload(name: str):
+    """Decoded JSON fixture from benchmarks/payloads/."""
+    return json.loads((PAYLOAD_DIR / name).read_text(encoding="utf-8"))
+
+
+def exchange_info(symbols: int = 300) -> dict:
+    """The recorded exchangeInfo with its one symbol repeated as SYM<i>USDT."""
+    info = load_payload("exchange_info.json")
+    template = info["symbols"][0]
+    info["symbols"] = [
+        dict(template, symbol=f"SYM{i}USDT", pair=f"SYM{i}USDT", baseAsset=f"SYM{i}")
+        for i in range(symbols - 1)
+    ] + [template]
+    return info
+
+
+# --- cases ------------------------------------------------------------------
+
+@case("sign_request", "BinanceFuturesClient._sign_request (HMAC SHA256)")
+def _sign_request():
+    from bot.client import BinanceFuturesClient
+
+    client = BinanceFuturesClient("bench-key", "bench-secret" * 4)
+    params = {"symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT", "quantity": "0.002",
+              "price": "64000.1", "timeInForce": "GTC"}
+    return lambda: client._sign_request(params)
+
+
+@case("validate_order", "validate_order_params, LIMIT order with a symbol index")
+def _validate_order():
+    from bot.symbols import SymbolIndex
+    from bot.validators import validate_order_params
+
+    index = SymbolIndex.from_exchange_info(exchange_info())
+    return lambda: validate_order_params("btcusdt", "buy", "limit", "0.002", "64000.1", index)
+
+
+@case("parse_order_response", "OrderResponse.from_api_response on a recorded order")
+def _parse_order_response():
+    from bot.models import OrderResponse
+
+    data = load_payload("order.json")
+    return lambda: OrderResponse.from_api_response(data)
+
+
+def _decode_case(raw: str) -> Callable[[], object]:
+    loads = json.loads
+    return lambda: loads(raw)
+
+
+@case("json_decode_order", "json.loads of a recorded order response")
+def _json_order():
+    return _decode_case((PAYLOAD_DIR / "order.json").read_text(encoding="utf-8"))
+
+
+@case("json_decode_position_risk", "json.loads of a recorded /fapi/v2/positionRisk")
+def _json_position_risk():
+    return _decode_case((PAYLOAD_DIR / "position_risk.json").read_text(encoding="utf-8"))
+
+
+@case("json_decode_exchange_info", "json.loads of exchangeInfo with 300 symbols")
+def _json_exchange_info():
+    return _decode_case(json.dumps(exchange_info()))
+
+
+@case("json_decode_ticker_all", "json.loads of the all-symbols /fapi/v1/ticker/price")
+def _json_ticker_all():
+    return _decode_case(json.dumps([
+        {"symbol": f"SYM{i}USDT", "price": f"{100 + i * 0.37:.4f}", "time": 1718000000000 + i}
+        for i in range(300)
+    ]))
+
+
+def _dashboard():
+    """The Flask app wired to a mock upstream that answers from the payloads."""
+    import httpx
+    import run_local_dashboard as dashboard
+    from bot.symbols import SymbolIndex
+
+    order = (PAYLOAD_DIR / "order.json").read_bytes()
+    ticker = {"symbol": "BTCUSDT", "price": "64987.10"}
+    routes = {
+        "/fapi/v1/time": b'{"serverTime": 1718000000000}',
+        "/fapi/v1/ticker/price": json.dumps([ticker]).encode(),
+        "/fapi/v1/order": order,
+    }
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        content = routes[request.url.path]
+        if request.url.path == "/fapi/v1/ticker/price" and "symbol" in request.url.params:
+            content = json.dumps(ticker).encode()
+        return httpx.Response(200, content=content, headers={"Content-Type": "application/json"})
+
+    # Orders are audited: keep the records out of logs/audit
+    os.environ.setdefault("AUDIT_LOG_DIR", tempfile.mkdtemp(prefix="bench-audit-"))
+    dashboard._http_client = httpx.Client(transport=httpx.MockTransport(upstream))
+    index = SymbolIndex.from_exchange_info(exchange_info())
+    dashboard.get_symbol_index = lambda: index
+    dashboard.API_KEY = dashboard.API_KEY or "bench-key"
+    dashboard.API_SECRET = dashboard.API_SECRET or "bench-secret"
+    return dashboard.app.test_client()
+
+
+def _quiet(call: Callable[[], object]) -> Callable[[], object]:
+    """Discard the route's [DEBUG] prints (their cost is still timed)."""
+    sink = io.StringIO()
+
+    def run():
+        with contextlib.redirect_stdout(sink):
+            call()
+        sink.seek(0)
+        sink.truncate()
+    return run
+
+
+@case("route_time", "GET /api/time, one mock upstream call")
+def _route_time():
+    client = _dashboard()
+    return _quiet(lambda: client.get("/api/time"))
+
+
+@case("route_prices_cached", "GET /api/prices with the ticker fetch stubbed out")
+def _route_prices():
+    import run_local_dashboard as dashboard
+
+    client = _dashboard()
+    dashboard.fetch_all_prices = lambda: {"BTCUSDT": 64987.1, "ETHUSDT": 3498.77}
+    return _quiet(lambda: client.get("/api/prices?symbols=BTCUSDT"))
+
+
+@case("route_place_order", "POST /api/place-order, LIMIT order over mock REST")
+def _route_place_order():
+    client = _dashboard()
+    body = {"symbol": "BTCUSDT", "side": "BUY", "type": "LIMIT", "quantity": "0.002", "price": "64000.1"}
+    return _quiet(lambda: client.post("/api/place-order", json=body))
+
+
+def _file_logger() -> logging.Logger:
+    """A logger configured like setup_logger(), writing to a temp directory."""
+    from bot.logging_config import setup_logger
+
+    # setup_logger() returns early for a logger that already has handlers
+    return setup_logger("trading_bot.bench", tempfile.mkdtemp(prefix="bench-logs-"))
+
+
+@case("log_info", "logger.info through the rotating file handler")
+def _log_info():
+    logger = _file_logger()
+    logger.propagate = False
+    return lambda: logger.info("GET /fapi/v1/order response: status=200")
+
+
+@case("log_debug_filtered", "logger.debug with the logger at INFO (record dropped)")
+def _log_debug_filtered():
+    logger = logging.getLogger("trading_bot.bench_filtered")
+    logger.handlers = _file_logger().handlers
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    return lambda: logger.debug("Request params: %s", {"symbol": "BTCUSDT"})
+
+
+@case("audit_record", "AuditLog.record of an order response (JSON line, flushed)")
+def _audit_record():
+    from bot.audit import AuditLog
+
+    audit_log = AuditLog(tempfile.mkdtemp(prefix="bench-audit-"))
+    response = json.loads((PAYLOAD_DIR / "order.json").read_bytes())
+    return lambda: audit_log.record(
+        "order.response", symbol=response["symbol"], orderId=response["orderId"],
+        status=response["status"], response=response
+    )
+
+
+@case("simulate_order", "simulate_order, MARKET order across a 100-level book")
+def _simulate_order():
+    from bot.simulator import AccountSnapshot, OrderBook, simulate_order
+
+    book = OrderBook(
+        "BTCUSDT",
+        bids=[(64000.0 - i * 0.1, 0.05) for i in range(100)],
+        asks=[(64000.1 + i * 0.1, 0.05) for i in range(100)],
+        fetched_at=time.time()
+    )
+    account = AccountSnapshot(5000.0, 5000.0, leverage={"BTCUSDT": 20}, fetched_at=time.time())
+    return lambda: simulate_order("BTCUSDT", "BUY", "MARKET", 1.5, book=book, account=account)
+
+
+# --- runner -----------------------------------------------------------------
+
+def measure(func: Callable[[], object], min_time: float, repeat: int) -> dict:
+    """Calibrate a loop count, then time ``repeat`` loops. Times in microseconds."""
+    clock = time.perf_counter
+    loops = 1
+    while True:
+        started = clock()
+        for _ in range(loops):
+            func()
+        elapsed = clock() - started
+        if elapsed >= min_time / 2 or loops >= 10 ** 7:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed)))
+
+    per_call = []
+    for _ in range(repeat):
+        started = clock()
+        for _ in range(loops):
+            func()
+        per_call.append((clock() - started) / loops * 1e6)
+    return {
+        "loops": loops,
+        "best_us": min(per_call),
+        "median_us": statistics.median(per_call),
+        "stdev_us": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+    }
+
+
+def git_revision() -> Optional[str]:
+    """Current commit (with -dirty), or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=10, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(pattern: Optional[str], min_time: float, repeat: int) -> dict:
+    """Run matching cases and return the results document."""
+    # Route and client log lines would be timed along with the cases
+    logging.getLogger("trading_bot").setLevel(logging.WARNING)
+    os.chdir(PROJECT_ROOT)
+
+    results = {}
+    for name, (description, setup) in CASES.items():
+        if pattern and pattern not in name:
+            continue
+        func = setup()
+        func()  # warm caches and lazy imports
+        results[name] = {"description": description, **measure(func, min_time, repeat)}
+        print(f"{name:<28}{results[name]['best_us']:>12.2f} µs  "
+              f"(median {results[name]['median_us']:.2f}, {results[name]['loops']} loops)")
+
+    return {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "min_time": min_time,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def baseline_path(name: str) -> Path:
+    """A path as given if it ends in .json, else benchmarks/baselines/<name>.json."""
+    return Path(name) if name.endswith(".json") else BASELINE_DIR / f"{name}.json"
+
+
+def compare(baseline: dict, current: dict, threshold_pct: float, pattern: Optional[str] = None) -> list:
+    """Print a comparison table. Returns the names of regressed cases."""
+    regressions = []
+    print(f"\n{'case':<28}{'baseline µs':>13}{'current µs':>13}{'change':>9}")
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<28}{'-':>13}{result['best_us']:>13.2f}{'new':>9}")
+            continue
+        change = (result["best_us"] / before["best_us"] - 1) * 100
+        flag = ""
+        if change > threshold_pct:
+            flag = "  ✗ regression"
+            regressions.append(name)
+        elif change < -threshold_pct:
+            flag = "  ✓ faster"
+        print(f"{name:<28}{before['best_us']:>13.2f}{result['best_us']:>13.2f}{change:>+8.1f}%{flag}")
+    for name in baseline["results"].keys() - current["results"].keys():
+        if pattern and pattern not in name:
+            continue
+        print(f"{name:<28}{baseline['results'][name]['best_us']:>13.2f}{'-':>13}{'missing':>9}")
+    if baseline.get("platform") != current.get("platform") or baseline.get("python") != current.get("python"):
+        print(f"\nNote: baseline from Python {baseline.get('python')} on {baseline.get('platform')}")
+    return regressions
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks with baselines")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="List benchmark cases")
+
+    parser_run = commands.add_parser("run", help="Run the suite")
+    parser_run.add_argument("--save", metavar="NAME", help="Save results as a baseline (NAME or path.json)")
+
+    parser_compare = commands.add_parser("compare", help="Compare with a saved baseline")
+    parser_compare.add_argument("baseline", help="Baseline NAME or path.json")
+    parser_compare.add_argument("current", nargs="?", help="Results to compare (default: run the suite now)")
+    parser_compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD_PCT,
+                                help=f"Regression threshold in percent (default: {DEFAULT_THRESHOLD_PCT:g})")
+
+    for sub in (parser_run, parser_compare):
+        sub.add_argument("-k", dest="pattern", help="Only cases whose name contains this")
+        sub.add_argument("--min-time", type=float, default=0.2, help="Seconds per repeat (default: 0.2)")
+        sub.add_argument("--repeat", type=int, default=5, help="Repeats per case (default: 5)")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name, (description, _) in CASES.items():
+            print(f"{name:<28}{description}")
+        return 0
+
+    if args.command == "run":
+        document = run_suite(args.pattern, args.min_time, args.repeat)
+        if args.save:
+            path = baseline_path(args.save)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+            print(f"\nSaved baseline: {path}")
+        return 0
+
+    path = baseline_path(args.baseline)
+    if not path.exists():
+        print(f"Baseline not found: {path} (create it with: run --save {args.baseline})")
+        return 2
+    baseline = json.loads(path.read_text(encoding="utf-8"))
+    if args.current:
+        current = json.loads(baseline_path(args.current).read_text(encoding="utf-8"))
+    else:
+        current = run_suite(args.pattern, args.min_time, args.repeat)
+
+    regressions = compare(baseline, current, args.threshold, args.pattern)
+    if regressions:
+        print(f"\n✗ {len(regressions)} regression(s) over {args.threshold:g}%: {', '.join(regressions)}")
+        return 1
+    print(f"\n✓ No regressions over {args.threshold:g}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,214 @@
+# trading_bot/benchmarks/ws_orders.py
+"""
+Order round-trip latency: REST vs. the WebSocket trading API.
+
+Starts a fake exchange in a subprocess that answers ``POST /fapi/v1/order``
+over HTTP/1.1 and ``order.place`` over a WebSocket, both after the same
+simulated matching delay. Then places orders through BinanceFuturesClient
+and reports per-order latency:
+
+- rest-cold: a new client, so a new connection, per order (like a
+  serverless invocation)
+- rest: one pooled keep-alive connection
+- ws: one WebSocket session, one order at a time
+- ws-pipelined: one WebSocket session, ``--pipeline`` orders in flight
+
+On localhost a new connection is cheap. Against Binance the cold path also
+pays the TCP and TLS handshakes, a few network round trips on top.
+
+Usage:
+    python benchmarks/ws_orders.py                   # 500 orders per path
+    python benchmarks/ws_orders.py --orders 2000 --latency 0.002
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.load_test import free_port, wait_for_port  # noqa: E402
+
+
+def order_body(params: dict, order_id: int) -> dict:
+    """Order response in the shape Binance returns for a filled MARKET order."""
+    return {
+        "orderId": order_id,
+        "clientOrderId": params.get("newClientOrderId", f"bench-{order_id}"),
+        "symbol": params.get("symbol", "BTCUSDT"),
+        "status": "FILLED",
+        "side": params.get("side", "BUY"),
+        "type": params.get("type", "MARKET"),
+        "origQty": params.get("quantity", "0.001"),
+        "executedQty": params.get("quantity", "0.001"),
+        "avgPrice": "65000.0",
+    }
+
+
+# --- fake exchange ----------------------------------------------------------
+
+async def serve_fake_exchange(http_port: int, ws_port: int, latency: float) -> None:
+    """Answer REST and WebSocket order requests after ``latency`` seconds."""
+    from urllib.parse import parse_qsl
+
+    from websockets.asyncio.server import serve
+
+    order_ids = iter(range(1, 10 ** 9))
+
+    async def handle_http(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                target = lines[0].split(" ", 2)[1]
+                headers = {k.lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:] if line)}
+                length = int(headers.get("content-length", 0))
+                if length:
+                    await reader.readexactly(length)
+
+                await asyncio.sleep(latency)
+                params = dict(parse_qsl(target.partition("?")[2]))
+                body = json.dumps(order_body(params, next(order_ids))).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_ws(ws) -> None:
+        async def answer(request: dict) -> None:
+            await asyncio.sleep(latency)
+            await ws.send(json.dumps({
+                "id": request["id"],
+                "status": 200,
+                "result": order_body(request.get("params", {}), next(order_ids)),
+            }))
+
+        tasks = set()
+        async for message in ws:
+            # Requests are answered concurrently, like the real API
+            task = asyncio.ensure_future(answer(json.loads(message)))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    http_server = await asyncio.start_server(handle_http, "127.0.0.1", http_port)
+    async with http_server, serve(handle_ws, "127.0.0.1", ws_port, compression=None):
+        await http_server.serve_forever()
+
+
+# --- measurements -------------------------------------------------------------
+
+def summarize(latencies: list, elapsed: float) -> dict:
+    """Median/p99 latency in ms and orders per second."""
+    latencies = sorted(latencies)
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))] * 1000,
+        "orders_per_s": len(latencies) / elapsed,
+    }
+
+
+def place_sequential(client, orders: int) -> dict:
+    """Place ``orders`` MARKET orders one after another."""
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(orders):
+        sent = time.perf_counter()
+        client.place_order("BTCUSDT", "BUY", "MARKET", 0.001)
+        latencies.append(time.perf_counter() - sent)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def place_cold(make_client, orders: int) -> dict:
+    """Like place_sequential, but every order opens (and closes) its own client."""
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(orders):
+        sent = time.perf_counter()
+        with make_client() as client:
+            client.place_order("BTCUSDT", "BUY", "MARKET", 0.001)
+        latencies.append(time.perf_counter() - sent)
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def place_pipelined(session, orders: int, depth: int) -> dict:
+    """Keep ``depth`` order.place requests in flight on one WebSocket session."""
+    params = {"symbol": "BTCUSDT", "side": "BUY", "type": "MARKET", "quantity": "0.001"}
+    latencies = []
+    start = time.perf_counter()
+    remaining = orders
+    while remaining:
+        batch = min(depth, remaining)
+        sent = time.perf_counter()
+        futures = [session.submit("order.place", params) for _ in range(batch)]
+        for future in futures:
+            session.result(future, "order.place")
+            latencies.append(time.perf_counter() - sent)
+        remaining -= batch
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Compare REST and WebSocket order latency")
+    parser.add_argument("--orders", type=int, default=500, help="Orders per path (default: 500)")
+    parser.add_argument("--latency", type=float, default=0.001,
+                        help="Simulated matching delay in seconds (default: 0.001)")
+    parser.add_argument("--pipeline", type=int, default=20, help="In-flight orders for ws-pipelined")
+    parser.add_argument("--serve", type=int, nargs=2, metavar=("HTTP", "WS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        asyncio.run(serve_fake_exchange(args.serve[0], args.serve[1], args.latency))
+        return 0
+
+    from bot.client import BinanceFuturesClient
+
+    # Per-order log lines would be timed along with the orders
+    logging.getLogger("trading_bot").setLevel(logging.ERROR)
+
+    http_port, ws_port = free_port(), free_port()
+    exchange = subprocess.Popen([
+        sys.executable, __file__, "--serve", str(http_port), str(ws_port),
+        "--latency", str(args.latency)
+    ])
+    try:
+        wait_for_port(http_port)
+        wait_for_port(ws_port)
+        base_url = f"http://127.0.0.1:{http_port}/testnet"
+        ws_url = f"ws://127.0.0.1:{ws_port}/testnet/ws-fapi/v1"
+
+        def make_client(ws_api_url=None) -> BinanceFuturesClient:
+            return BinanceFuturesClient("bench", "bench", base_url, ws_api_url=ws_api_url)
+
+        results = {"rest-cold": place_cold(make_client, args.orders)}
+        with make_client() as client:
+            place_sequential(client, 20)  # open the pooled connection
+            results["rest"] = place_sequential(client, args.orders)
+        with make_client(ws_url) as client:
+            place_sequential(client, 20)  # connect the session
+            results["ws"] = place_sequential(client, args.orders)
+            results["ws-pipelined"] = place_pipelined(client._ws(), args.orders, args.pipeline)
+
+        print(f"{args.orders} orders per path, matching delay {args.latency * 1000:.1f}ms")
+        print(f"{'path':<14}{'p50 ms':>10}{'p99 ms':>10}{'orders/s':>10}")
+        for path, r in results.items():
+            print(f"{path:<14}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['orders_per_s']:>10.0f}")
+    finally:
+        exchange.terminate()
+        exchange.wait(timeout=10)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
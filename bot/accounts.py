@@ -0,0 +1,325 @@
+# trading_bot/bot/accounts.py
+"""
+Multi-account registry with concurrent broadcast operations.
+
+Each account gets its own pooled BinanceFuturesClient and an order-rate
+limiter (order limits are per account). Request weight is limited per IP,
+so one weight limiter is shared by every account in the registry.
+
+Broadcasts run the same operation for N accounts in a thread pool and
+return per-account results plus an aggregated view.
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, is_dataclass
+from typing import Any, Callable, Optional, TYPE_CHECKING
+
+from .logging_config import setup_logger
+from .models import OrderRequest
+from .orders import place_order
+from .ratelimit import RateLimiter
+
+if TYPE_CHECKING:
+    from .client import BinanceFuturesClient
+    from .risk import RiskGate
+
+
+logger = setup_logger()
+
+DEFAULT_ACCOUNT = "default"
+
+
+class AccountError(Exception):
+    """Exception raised for unknown or misconfigured accounts."""
+    pass
+
+
+@dataclass
+class Account:
+    """One API key pair and its lazily created client."""
+
+    name: str
+    api_key: str
+    api_secret: str
+    base_url: str = "https://testnet.binancefuture.com"
+    order_limiter: RateLimiter = field(
+        default_factory=lambda: RateLimiter.per_window(300, 10), repr=False
+    )
+    _client: Optional["BinanceFuturesClient"] = field(default=None, repr=False)
+
+    @property
+    def client(self) -> "BinanceFuturesClient":
+        """Pooled client for this account, created on first use."""
+        if self._client is None:
+            from .client import BinanceFuturesClient
+            self._client = BinanceFuturesClient(
+                self.api_key, self.api_secret, self.base_url,
+                ws_api_url=os.getenv("BINANCE_WS_API_URL") or None
+            )
+        return self._client
+
+    def close(self) -> None:
+        """Close the client if it was created."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+
+@dataclass
+class AccountResult:
+    """Outcome of a broadcast operation for one account."""
+
+    account: str
+    ok: bool
+    result: Any = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-friendly dictionary."""
+        return {
+            "account": self.account,
+            "ok": self.ok,
+            "result": asdict(self.result) if is_dataclass(self.result) else self.result,
+            "error": self.error,
+            "errorType": self.error_type,
+        }
+
+
+@dataclass
+class BroadcastResult:
+    """Per-account results of a broadcast, plus an aggregate."""
+
+    results: dict
+    aggregate: dict = field(default_factory=dict)
+
+    @property
+    def succeeded(self) -> list:
+        """Names of accounts where the operation succeeded."""
+        return [name for name, r in self.results.items() if r.ok]
+
+    @property
+    def failed(self) -> list:
+        """Names of accounts where the operation failed."""
+        return [name for name, r in self.results.items() if not r.ok]
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-friendly dictionary."""
+        return {
+            "accounts": [r.to_dict() for r in self.results.values()],
+            "succeeded": len(self.succeeded),
+            "failed": len(self.failed),
+            "aggregate": self.aggregate,
+        }
+
+
+class AccountRegistry:
+    """
+    Holds the configured accounts and runs operations across them.
+    """
+
+    def __init__(self, weight_limiter: Optional[RateLimiter] = None, max_workers: int = 16):
+        """
+        Initialize registry.
+
+        Args:
+            weight_limiter: Shared request-weight limiter (default: 2400/min,
+                the per-IP limit)
+            max_workers: Maximum accounts served concurrently
+        """
+        self.accounts: dict[str, Account] = {}
+        self.weight_limiter = weight_limiter or RateLimiter.per_window(2400, 60)
+        self.max_workers = max_workers
+
+    @classmethod
+    def from_env(cls, base_url: Optional[str] = None) -> "AccountRegistry":
+        """
+        Build a registry from environment variables.
+
+        - BINANCE_API_KEY / BINANCE_API_SECRET register the "default" account.
+        - BINANCE_ACCOUNTS=sub1,sub2 registers each name from
+          BINANCE_API_KEY_SUB1 / BINANCE_API_SECRET_SUB1, ...
+        - ACCOUNTS_FILE may point to a JSON file of the form
+          ``{"sub1": {"api_key": "...", "api_secret": "..."}}``. An entry
+          may set its own ``base_url``, which must be a testnet URL.
+
+        Args:
+            base_url: API base URL (default: BINANCE_BASE_URL or testnet)
+
+        Raises:
+            AccountError: If a listed account has no credentials, or a file
+                entry's base_url is not a testnet URL
+        """
+        base_url = base_url or os.getenv("BINANCE_BASE_URL", "https://testnet.binancefuture.com")
+        registry = cls()
+
+        api_key = os.getenv("BINANCE_API_KEY")
+        api_secret = os.getenv("BINANCE_API_SECRET")
+        if api_key and api_secret:
+            registry.add(DEFAULT_ACCOUNT, api_key, api_secret, base_url)
+
+        for name in filter(None, (n.strip() for n in os.getenv("BINANCE_ACCOUNTS", "").split(","))):
+            suffix = name.upper().replace("-", "_")
+            api_key = os.getenv(f"BINANCE_API_KEY_{suffix}")
+            api_secret = os.getenv(f"BINANCE_API_SECRET_{suffix}")
+            if not api_key or not api_secret:
+                raise AccountError(
+                    f"Account '{name}' needs BINANCE_API_KEY_{suffix} and BINANCE_API_SECRET_{suffix}"
+                )
+            registry.add(name, api_key, api_secret, base_url)
+
+        path = os.getenv("ACCOUNTS_FILE")
+        if path:
+            with open(path, encoding="utf-8") as f:
+                for name, creds in json.load(f).items():
+                    if not creds.get("api_key") or not creds.get("api_secret"):
+                        raise AccountError(f"Account '{name}' in {path} needs api_key and api_secret")
+                    account_url = creds.get("base_url", base_url)
+                    # Same rule the dashboard applies to BINANCE_BASE_URL
+                    if "testnet" not in account_url.lower():
+                        raise AccountError(
+                            f"Account '{name}' in {path}: only testnet base URLs are allowed "
+                            f"(got {account_url})"
+                        )
+                    registry.add(name, creds["api_key"], creds["api_secret"], account_url)
+
+        return registry
+
+    def add(self, name: str, api_key: str, api_secret: str, base_url: str) -> Account:
+        """Register (or replace) an account."""
+        if name in self.accounts:
+            self.accounts[name].close()
+        account = Account(name, api_key, api_secret, base_url)
+        self.accounts[name] = account
+        return account
+
+    def get(self, name: str) -> Account:
+        """
+        Look up an account by name.
+
+        Raises:
+            AccountError: If no such account is registered
+        """
+        try:
+            return self.accounts[name]
+        except KeyError:
+            known = ", ".join(self.accounts) or "none"
+            raise AccountError(f"Unknown account '{name}' (configured: {known})") from None
+
+    @property
+    def names(self) -> list:
+        """Registered account names."""
+        return list(self.accounts)
+
+    def broadcast(
+        self,
+        operation: Callable[[Account], Any],
+        names: Optional[list] = None,
+        weight: int = 1,
+        is_order: bool = False
+    ) -> dict:
+        """
+        Run an operation for several accounts concurrently.
+
+        Args:
+            operation: Called with each Account; its return value is the result
+            names: Accounts to use (default: all)
+            weight: Request weight taken from the shared limiter per account
+            is_order: Also take a token from each account's order limiter
+
+        Returns:
+            Mapping of account name -> AccountResult, in the order requested
+        """
+        accounts = [self.get(name) for name in (names or self.names)]
+        if not accounts:
+            raise AccountError("No accounts configured")
+
+        def run(account: Account) -> AccountResult:
+            self.weight_limiter.acquire(weight)
+            if is_order:
+                account.order_limiter.acquire()
+            try:
+                return AccountResult(account.name, True, operation(account))
+            except Exception as e:
+                logger.error(f"Account {account.name}: {type(e).__name__}: {e}")
+                return AccountResult(account.name, False, error=str(e), error_type=type(e).__name__)
+
+        workers = min(self.max_workers, len(accounts))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="account") as pool:
+            results = list(pool.map(run, accounts))
+        return {r.account: r for r in results}
+
+    def place_order_all(
+        self,
+        order_request: OrderRequest,
+        names: Optional[list] = None,
+        risk_gates: Optional[dict] = None
+    ) -> BroadcastResult:
+        """
+        Place the same order on several accounts concurrently.
+
+        Args:
+            order_request: Validated OrderRequest
+            names: Accounts to use (default: all)
+            risk_gates: Optional mapping of account name -> RiskGate
+
+        Returns:
+            BroadcastResult with one OrderResponse per account and the total
+            executed quantity
+        """
+        logger.info(
+            f"Broadcasting order {order_request.symbol} {order_request.side} "
+            f"{order_request.quantity} to {len(names or self.names)} account(s)"
+        )
+        gates: dict = risk_gates or {}
+        results = self.broadcast(
+            lambda account: place_order(account.client, order_request, gates.get(account.name)),
+            names,
+            is_order=True,
+        )
+        executed = sum(float(r.result.executed_qty or 0) for r in results.values() if r.ok)
+        return BroadcastResult(results, {
+            "symbol": order_request.symbol,
+            "side": order_request.side,
+            "requestedQty": order_request.quantity * len(results),
+            "executedQty": executed,
+        })
+
+    def get_balances(self, names: Optional[list] = None, asset: str = "USDT") -> BroadcastResult:
+        """
+        Fetch balances from several accounts concurrently.
+
+        Args:
+            names: Accounts to use (default: all)
+            asset: Asset to report and total
+
+        Returns:
+            BroadcastResult with each account's balance row for ``asset`` and
+            totals of balance, availableBalance and crossUnPnl
+        """
+        def fetch(account: Account) -> Optional[dict]:
+            rows = account.client.get_balance()
+            return next((row for row in rows if row.get("asset") == asset), None)
+
+        results = self.broadcast(fetch, names, weight=5)
+        totals = {"asset": asset, "balance": 0.0, "availableBalance": 0.0, "crossUnPnl": 0.0}
+        for r in results.values():
+            if r.ok and r.result:
+                for key in ("balance", "availableBalance", "crossUnPnl"):
+                    totals[key] += float(r.result.get(key, 0) or 0)
+        return BroadcastResult(results, totals)
+
+    def close(self) -> None:
+        """Close every account's client."""
+        for account in self.accounts.values():
+            account.close()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
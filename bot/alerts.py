@@ -0,0 +1,418 @@
+# trading_bot/bot/alerts.py
+"""
+Price alerts indexed for cheap per-tick evaluation.
+
+Each symbol keeps two sorted arrays of trigger levels: one for alerts that
+fire when the price rises to a level ("above"), one for alerts that fire
+when it falls to a level ("below"). Both are ordered so that the alerts a
+tick crosses form a suffix of the array, found with one bisect:
+
+    above: keys are -level, ascending   -> fired if -level >= -price
+    below: keys are  level, ascending   -> fired if  level >=  price
+
+A tick that crosses nothing costs two binary searches, whatever the
+number of alerts. A tick that crosses k alerts removes them with one
+slice delete. Alerts are one-shot: once fired they leave the index.
+
+Fired alerts call their callback (in the thread that fed the tick) and/or
+POST a JSON event to a webhook. Webhooks are limited to loopback hosts and
+sent from a background thread, so a slow receiver never stalls ticks.
+"""
+
+import itertools
+import queue
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+from urllib.parse import urlparse
+
+from .logging_config import setup_logger
+
+
+logger = setup_logger()
+
+DIRECTIONS = ("above", "below")
+
+# Webhook targets must resolve to this machine
+LOOPBACK_HOSTS = {"127.0.0.1", "localhost", "::1"}
+
+
+class AlertError(Exception):
+    """Exception raised for an invalid alert."""
+    pass
+
+
+@dataclass
+class Alert:
+    """One price level to watch."""
+    alert_id: int
+    symbol: str
+    price: float
+    direction: str
+    webhook: Optional[str] = None
+    note: str = ""
+    callback: Optional[Callable[["Alert"], None]] = field(default=None, repr=False)
+    created_at: float = field(default_factory=time.time)
+    triggered_at: Optional[float] = None
+    triggered_price: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "alertId": self.alert_id,
+            "symbol": self.symbol,
+            "price": self.price,
+            "direction": self.direction,
+            "webhook": self.webhook,
+            "note": self.note,
+            "createdAt": self.created_at,
+            "triggeredAt": self.triggered_at,
+            "triggeredPrice": self.triggered_price,
+        }
+
+
+def validate_webhook(url: str) -> str:
+    """
+    Check that a webhook URL is http(s) on a loopback host.
+
+    Raises:
+        AlertError: If the URL points anywhere else
+    """
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or parsed.hostname not in LOOPBACK_HOSTS:
+        raise AlertError(
+            f"Webhook must be an http(s) URL on {', '.join(sorted(LOOPBACK_HOSTS))}: {url}"
+        )
+    return url
+
+
+class _Levels:
+    """Sorted trigger keys and the alerts they belong to, kept in step."""
+
+    __slots__ = ("keys", "alerts")
+
+    def __init__(self):
+        self.keys = array("d")
+        self.alerts: list = []
+
+    def insert(self, key: float, alert: Alert) -> None:
+        # After equal keys, so alerts on one level fire in creation order
+        i = bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.alerts.insert(i, alert)
+
+    def remove(self, key: float, alert: Alert) -> bool:
+        i = bisect_left(self.keys, key)
+        end = bisect_right(self.keys, key, i)
+        for j in range(i, end):
+            if self.alerts[j] is alert:
+                del self.keys[j]
+                del self.alerts[j]
+                return True
+        return False
+
+    def pop_from(self, key: float) -> list:
+        """Remove and return every alert whose key is >= ``key``."""
+        i = bisect_left(self.keys, key)
+        if i == len(self.keys):
+            return []
+        fired = self.alerts[i:]
+        del self.keys[i:]
+        del self.alerts[i:]
+        return fired
+
+
+class AlertIndex:
+    """
+    Thread-safe store of one-shot price alerts.
+
+    Feed it prices with ``on_tick`` or ``on_prices``; each call returns the
+    alerts that fired.
+    """
+
+    def __init__(self, dispatcher: Optional["WebhookDispatcher"] = None):
+        """
+        Initialize index.
+
+        Args:
+            dispatcher: Sends webhook events (default: a new WebhookDispatcher)
+        """
+        self.dispatcher = dispatcher or WebhookDispatcher()
+        self.last_prices: dict = {}
+        self.fired_count = 0
+        self._books: dict = {}  # symbol -> (above, below)
+        self._by_id: dict = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of alerts still waiting to fire."""
+        return len(self._by_id)
+
+    def add(
+        self,
+        symbol: str,
+        price: float,
+        direction: Optional[str] = None,
+        callback: Optional[Callable[[Alert], None]] = None,
+        webhook: Optional[str] = None,
+        note: str = ""
+    ) -> Alert:
+        """
+        Register an alert.
+
+        Args:
+            symbol: Trading pair, e.g. BTCUSDT
+            price: Trigger level
+            direction: "above" or "below"; if omitted, inferred from the
+                last price seen for the symbol (a level at or over it is "above")
+            callback: Called with the Alert when it fires
+            webhook: Loopback URL that receives a JSON POST when it fires
+            note: Free text echoed in the event
+
+        Returns:
+            The registered Alert
+
+        Raises:
+            AlertError: If the level, direction or webhook is invalid
+        """
+        symbol = symbol.upper()
+        price = float(price)
+        if not price > 0:
+            raise AlertError(f"Alert price must be positive, got {price}")
+        if webhook:
+            validate_webhook(webhook)
+
+        with self._lock:
+            if direction is None:
+                last = self.last_prices.get(symbol)
+                if last is None:
+                    raise AlertError(
+                        f"No price seen for {symbol} yet; pass direction 'above' or 'below'"
+                    )
+                direction = "above" if price >= last else "below"
+            direction = direction.lower()
+            if direction not in DIRECTIONS:
+                raise AlertError(f"Direction must be 'above' or 'below', got {direction!r}")
+
+            alert = Alert(
+                alert_id=next(self._ids),
+                symbol=symbol,
+                price=price,
+                direction=direction,
+                webhook=webhook,
+                note=note,
+                callback=callback,
+            )
+            above, below = self._book(symbol)
+            if direction == "above":
+                above.insert(-price, alert)
+            else:
+                below.insert(price, alert)
+            self._by_id[alert.alert_id] = alert
+        return alert
+
+    def _book(self, symbol: str) -> tuple:
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = (_Levels(), _Levels())
+        return book
+
+    def remove(self, alert_id: int) -> bool:
+        """Remove a pending alert. Returns False if it is unknown or already fired."""
+        with self._lock:
+            alert = self._by_id.pop(alert_id, None)
+            if alert is None:
+                return False
+            above, below = self._books[alert.symbol]
+            if alert.direction == "above":
+                return above.remove(-alert.price, alert)
+            return below.remove(alert.price, alert)
+
+    def get(self, alert_id: int) -> Optional[Alert]:
+        """Return a pending alert by id."""
+        return self._by_id.get(alert_id)
+
+    def list_alerts(self, symbol: Optional[str] = None) -> list:
+        """Pending alerts, oldest first, optionally for one symbol."""
+        with self._lock:
+            alerts = list(self._by_id.values())
+        if symbol:
+            alerts = [a for a in alerts if a.symbol == symbol.upper()]
+        return alerts
+
+    def _cross(self, symbol: str, price: float) -> list:
+        """Pop the alerts ``price`` crosses. Caller holds _lock."""
+        self.last_prices[symbol] = price
+        book = self._books.get(symbol)
+        if book is None:
+            return []
+        above, below = book
+        fired = above.pop_from(-price)
+        fired += below.pop_from(price)
+        for alert in fired:
+            del self._by_id[alert.alert_id]
+        return fired
+
+    def on_tick(self, symbol: str, price: float) -> list:
+        """
+        Record a price and fire every alert it crosses.
+
+        Args:
+            symbol: Trading pair
+            price: Latest price
+
+        Returns:
+            Alerts that fired, in trigger order
+        """
+        with self._lock:
+            fired = self._cross(symbol, price)
+        if fired:
+            self._fire(fired, price)
+        return fired
+
+    def on_prices(self, prices: dict) -> list:
+        """on_tick for a {symbol: price} snapshot, e.g. the all-symbols ticker."""
+        fired = []
+        with self._lock:
+            for symbol, price in prices.items():
+                crossed = self._cross(symbol, price)
+                if crossed:
+                    fired.append((crossed, price))
+        for alerts, price in fired:
+            self._fire(alerts, price)
+        return [alert for alerts, _ in fired for alert in alerts]
+
+    def _fire(self, alerts: Iterable[Alert], price: float) -> None:
+        now = time.time()
+        for alert in alerts:
+            alert.triggered_at = now
+            alert.triggered_price = price
+            self.fired_count += 1
+            logger.info(
+                f"Alert {alert.alert_id} fired: {alert.symbol} {alert.direction} "
+                f"{alert.price:g} (price {price:g})"
+            )
+            if alert.callback is not None:
+                try:
+                    alert.callback(alert)
+                except Exception as e:
+                    logger.error(f"Alert {alert.alert_id} callback failed: {e}", exc_info=True)
+            if alert.webhook:
+                self.dispatcher.send(alert.webhook, {"event": "alert", **alert.to_dict()})
+
+
+class WebhookDispatcher:
+    """
+    Background sender for alert webhooks.
+
+    Events wait in a bounded queue for one daemon thread. When the queue is
+    full (receiver down or too slow) new events are dropped and counted,
+    rather than blocking the price feed.
+    """
+
+    def __init__(self, timeout: float = 2.0, queue_size: int = 1000):
+        """
+        Initialize dispatcher (the thread starts with the first event).
+
+        Args:
+            timeout: Seconds to wait for each webhook response
+            queue_size: Events allowed to wait for delivery
+        """
+        self.timeout = timeout
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def send(self, url: str, payload: dict) -> bool:
+        """Queue one event. Returns False if it was dropped."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="alert-webhooks", daemon=True
+                )
+                self._thread.start()
+        try:
+            self._queue.put_nowait((url, payload))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logger.warning(f"Webhook queue full, dropped event for {url}")
+            return False
+
+    def _run(self) -> None:
+        import httpx
+
+        with httpx.Client(timeout=self.timeout) as client:
+            while True:
+                url, payload = self._queue.get()
+                try:
+                    client.post(url, json=payload).raise_for_status()
+                    self.sent += 1
+                except Exception as e:
+                    self.failed += 1
+                    logger.warning(f"Webhook {url} failed: {e}")
+
+    def snapshot(self) -> dict:
+        """Delivery counters."""
+        return {
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "queued": self._queue.qsize(),
+        }
+
+
+class PriceWatcher:
+    """
+    Polls a price snapshot into an AlertIndex while it has alerts.
+
+    The polling thread starts with ``ensure_running`` and stops by itself
+    once every alert has fired or been removed, so an idle dashboard makes
+    no upstream calls for alerts.
+    """
+
+    def __init__(self, index: AlertIndex, fetch: Callable[[], dict], interval: float = 1.0):
+        """
+        Initialize watcher.
+
+        Args:
+            index: Alerts to evaluate
+            fetch: Returns {symbol: price}
+            interval: Seconds between polls
+        """
+        self.index = index
+        self.fetch = fetch
+        self.interval = interval
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def ensure_running(self) -> None:
+        """Start the polling thread if it is not running."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="alert-watcher", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        logger.info("Alert price watcher started")
+        while True:
+            with self._lock:
+                if not len(self.index):
+                    # ensure_running() starts a new thread once this is cleared
+                    self._thread = None
+                    break
+            try:
+                self.index.on_prices(self.fetch())
+            except Exception as e:
+                logger.warning(f"Alert price poll failed: {e}")
+            time.sleep(self.interval)
+        logger.info("Alert price watcher stopped (no alerts)")
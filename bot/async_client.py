@@ -0,0 +1,304 @@
+# trading_bot/bot/async_client.py
+"""
+Asyncio variant of the Binance Futures REST client.
+
+Same endpoints, signing and error types as BinanceFuturesClient, built on
+httpx.AsyncClient so many requests can be in flight on one event loop.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+import httpx
+
+from . import audit
+from .client import BinanceFuturesClient
+from .exceptions import BinanceClientError, BinanceNetworkError
+from .logging_config import setup_logger, sanitize_params
+from .models import APIError, OrderResponse
+from .resilience import build_async_transport
+from .tracing import decode_json, span
+
+
+class AsyncBinanceFuturesClient:
+    """
+    Async client for the Binance Futures API.
+
+    Use as ``async with AsyncBinanceFuturesClient(...) as client``.
+    """
+
+    # Signing is identical to the blocking client
+    _generate_signature = BinanceFuturesClient._generate_signature
+    _sign_request = BinanceFuturesClient._sign_request
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        base_url: str = "https://testnet.binancefuture.com",
+        timeout: float = 10.0,
+        max_connections: int = 20
+    ):
+        """
+        Initialize async Binance Futures client.
+
+        Args:
+            api_key: Binance API key
+            api_secret: Binance API secret
+            base_url: Base URL for API (default: testnet)
+            timeout: Request timeout in seconds
+            max_connections: Connection pool size
+        """
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.time_offset_ms = 0
+        self.logger = setup_logger()
+
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            headers={"X-MBX-APIKEY": self.api_key},
+            transport=build_async_transport(
+                limits=httpx.Limits(max_connections=max_connections)
+            ),
+        )
+        # Requests beyond the pool size wait here rather than in httpcore's
+        # queue, whose bookkeeping scales with (waiters x connections)
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        signed: bool = False
+    ):
+        """
+        Send a request and return the decoded JSON body.
+
+        Args:
+            method: HTTP method (GET, POST, DELETE)
+            endpoint: API path, e.g. /fapi/v1/order
+            params: Query parameters
+            signed: Whether to add timestamp and signature
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            BinanceClientError: If API returns an error
+            BinanceNetworkError: If network error occurs
+        """
+        with span(f"binance {method} {endpoint}", attributes={"http.method": method, "url.path": endpoint}):
+            return await self._send(method, endpoint, params or {}, signed)
+
+    async def _send(self, method: str, endpoint: str, params: dict, signed: bool):
+        """_request without the span: sign, send, decode."""
+        if signed:
+            with span("sign"):
+                params = self._sign_request(params)
+            self.logger.debug(f"Request params: {sanitize_params(params)}")
+
+        try:
+            async with self._slots:
+                response = await self.client.request(method, endpoint, params=params)
+
+            self.logger.info(
+                f"{method} {endpoint} response: status={response.status_code} "
+                f"elapsed={response.elapsed.total_seconds() * 1000:.1f}ms"
+            )
+
+            response_data = decode_json(response)
+
+            if response.status_code != 200:
+                error = APIError.from_api_response(response_data)
+                self.logger.error(f"API error: {error}")
+                raise BinanceClientError(str(error), error.code)
+
+            return response_data
+
+        except httpx.TimeoutException as e:
+            self.logger.error(f"Timeout during {method} {endpoint}: {e}")
+            if method == "POST":
+                raise BinanceNetworkError(
+                    "Request timeout. The order may or may not have been placed."
+                ) from e
+            raise BinanceNetworkError("Request timeout.") from e
+
+        except httpx.NetworkError as e:
+            self.logger.error(f"Network error during {method} {endpoint}: {e}")
+            raise BinanceNetworkError(
+                "Network error. Please check your connection."
+            ) from e
+
+        except (BinanceClientError, BinanceNetworkError):
+            raise
+
+        except Exception as e:
+            self.logger.error(
+                f"Unexpected error during {method} {endpoint}: {e}", exc_info=True
+            )
+            raise BinanceNetworkError(f"Unexpected error: {e}") from e
+
+    async def sync_time(self) -> int:
+        """Measure and store the server clock offset in milliseconds."""
+        sent = time.time() * 1000
+        data = await self._request("GET", "/fapi/v1/time")
+        received = time.time() * 1000
+
+        self.time_offset_ms = int(data["serverTime"] - (sent + received) / 2)
+        self.logger.info(f"Clock synced: offset={self.time_offset_ms}ms")
+        return self.time_offset_ms
+
+    async def get_server_time(self) -> int:
+        """Get the exchange server time in milliseconds."""
+        data = await self._request("GET", "/fapi/v1/time")
+        return data["serverTime"]
+
+    async def test_connectivity(self) -> bool:
+        """Return True if /fapi/v1/time answers."""
+        await self._request("GET", "/fapi/v1/time")
+        return True
+
+    async def place_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: float,
+        price: Optional[float] = None,
+        time_in_force: Optional[str] = None
+    ) -> OrderResponse:
+        """Place a MARKET or LIMIT order. See BinanceFuturesClient.place_order."""
+        params = {
+            "symbol": symbol,
+            "side": side,
+            "type": order_type,
+            "quantity": str(quantity),
+        }
+
+        if order_type == "LIMIT":
+            if price is None:
+                raise ValueError("Price is required for LIMIT orders")
+            params["price"] = str(price)
+            params["timeInForce"] = time_in_force or "GTC"
+
+        self.logger.info("Placing order: POST /fapi/v1/order")
+        audit.order_submitted(params, via="rest")
+        try:
+            response_data = await self._request("POST", "/fapi/v1/order", params, signed=True)
+        except Exception as e:
+            audit.order_error(params, e)
+            raise
+        audit.order_response(params, response_data)
+        order_response = OrderResponse.from_api_response(response_data)
+        self.logger.info(f"Order placed successfully: {order_response.order_id}")
+        return order_response
+
+    async def get_order(self, symbol: str, order_id: int) -> OrderResponse:
+        """Query the current state of an order."""
+        response_data = await self._request(
+            "GET", "/fapi/v1/order", {"symbol": symbol, "orderId": order_id}, signed=True
+        )
+        return OrderResponse.from_api_response(response_data)
+
+    async def cancel_order(self, symbol: str, order_id: int) -> OrderResponse:
+        """Cancel an open order."""
+        response_data = await self._request(
+            "DELETE", "/fapi/v1/order", {"symbol": symbol, "orderId": order_id}, signed=True
+        )
+        return OrderResponse.from_api_response(response_data)
+
+    async def get_exchange_info(self) -> dict:
+        """Get exchange trading rules and symbol information."""
+        return await self._request("GET", "/fapi/v1/exchangeInfo")
+
+    async def get_ticker_price(self, symbol: str) -> float:
+        """Get the latest traded price for a symbol."""
+        data = await self._request("GET", "/fapi/v1/ticker/price", {"symbol": symbol})
+        return float(data["price"])
+
+    async def get_ticker_prices(self) -> dict:
+        """Get the latest price of every symbol in one call (weight 2)."""
+        data = await self._request("GET", "/fapi/v1/ticker/price")
+        return {t["symbol"]: float(t["price"]) for t in data}
+
+    async def get_balance(self) -> list:
+        """Get futures account balances per asset."""
+        return await self._request("GET", "/fapi/v2/balance", signed=True)
+
+    async def get_position_risk(self, symbol: Optional[str] = None) -> list:
+        """Get positions with mark price, leverage and liquidation price."""
+        params = {"symbol": symbol} if symbol else {}
+        return await self._request("GET", "/fapi/v2/positionRisk", params, signed=True)
+
+    async def get_algo_orders(self) -> list:
+        """Get conditional (algo) orders, e.g. STOP orders."""
+        return await self._request("GET", "/fapi/v1/algoOrders", signed=True)
+
+    async def get_user_trades(
+        self,
+        symbol: str,
+        from_id: Optional[int] = None,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = 1000
+    ) -> list:
+        """
+        Get account fills for a symbol, oldest first (weight 5).
+
+        Pass ``from_id`` to page forward by trade ID, or a start/end window
+        of at most 7 days.
+        """
+        params = {"symbol": symbol, "limit": limit}
+        if from_id is not None:
+            params["fromId"] = from_id
+        if start_time is not None:
+            params["startTime"] = start_time
+        if end_time is not None:
+            params["endTime"] = end_time
+        return await self._request("GET", "/fapi/v1/userTrades", params, signed=True)
+
+    async def get_income(
+        self,
+        start_time: int,
+        end_time: int,
+        income_type: Optional[str] = None,
+        limit: int = 1000
+    ) -> list:
+        """Get income records (PnL, fees, funding) in a time window, oldest first (weight 30)."""
+        params = {"startTime": start_time, "endTime": end_time, "limit": limit}
+        if income_type:
+            params["incomeType"] = income_type
+        return await self._request("GET", "/fapi/v1/income", params, signed=True)
+
+    async def get_klines(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = 1500
+    ) -> list:
+        """Get candlestick bars. See BinanceFuturesClient.get_klines."""
+        params = {"symbol": symbol, "interval": interval, "limit": limit}
+        if start_time is not None:
+            params["startTime"] = start_time
+        if end_time is not None:
+            params["endTime"] = end_time
+        return await self._request("GET", "/fapi/v1/klines", params)
+
+    async def aclose(self):
+        """Close the HTTP client."""
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.aclose()
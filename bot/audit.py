@@ -0,0 +1,498 @@
+# trading_bot/bot/audit.py
+"""
+Structured audit log of order activity, in compressed time-ordered segments.
+
+Every order placement writes JSON records: ``order.submitted`` (the
+parameters), then ``order.response`` (the exchange's answer) or
+``order.error``. Each record carries its time, symbol, order IDs and the
+request ID from tracing.py. This holds for the CLI, the clients, and the
+dashboard.
+
+Layout under ``logs/audit/`` (AUDIT_LOG_DIR):
+
+- ``<first-ms>-<pid>.jsonl``: the segment a process is appending to. It is
+  plain text and flushed after each record. Each process has its own.
+- ``<first-ms>-<pid>.jsonl.gz``: a sealed segment. A segment is sealed once
+  its hour is over, it reaches ``max_segment_bytes``, or its process exits.
+  The file is a run of independent gzip members ("blocks") of up to
+  ``block_records`` records. ``zcat`` still reads it as one file.
+- ``index.db``: a sparse SQLite index. It has one row per block (file
+  offset, length, first/last time) and the distinct symbols, order IDs,
+  client order IDs and request IDs in each block.
+
+A query finds the matching blocks in the index. It then reads and
+decompresses only those byte ranges, so it does not scan gigabytes of
+history. The few open segments are scanned in full.
+"""
+
+import atexit
+import gzip
+import heapq
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .logging_config import setup_logger
+from .tracing import current_request_id
+
+
+logger = setup_logger()
+
+DEFAULT_AUDIT_DIR = "logs/audit"
+
+HOUR_MS = 3_600_000
+
+# Parameters that never go into the audit log
+_OMIT_PARAMS = ("signature", "timestamp", "recvWindow", "apiKey")
+
+_SEGMENT_NAME = re.compile(r"^(\d+)-(\d+)\.jsonl(\.gz)?$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blocks (
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    first_ts INTEGER NOT NULL,
+    last_ts INTEGER NOT NULL,
+    records INTEGER NOT NULL,
+    PRIMARY KEY (segment, offset)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS blocks_time ON blocks (first_ts, last_ts);
+
+CREATE TABLE IF NOT EXISTS block_keys (
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    PRIMARY KEY (kind, value, segment, offset)
+) WITHOUT ROWID;
+"""
+
+# Record field -> block_keys.kind
+KEY_FIELDS = {
+    "symbol": "symbol",
+    "orderId": "order",
+    "clientOrderId": "client_order",
+    "requestId": "request",
+}
+
+
+class AuditError(Exception):
+    """Exception raised for audit log errors."""
+    pass
+
+
+@dataclass
+class QueryStats:
+    """How much of the log a query had to read."""
+    blocks_read: int = 0
+    blocks_total: int = 0
+    open_segments: int = 0
+    records_scanned: int = 0
+
+
+def _connect(directory: Path) -> sqlite3.Connection:
+    db = sqlite3.connect(str(directory / "index.db"), isolation_level=None, timeout=10)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(SCHEMA)
+    return db
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def _record_keys(record: dict) -> Iterator[tuple]:
+    for field, kind in KEY_FIELDS.items():
+        value = record.get(field)
+        if value not in (None, ""):
+            yield kind, str(value)
+
+
+def seal_segment(path: Path, db: sqlite3.Connection, block_records: int = 512) -> Path:
+    """
+    Compress an open segment into blocks and index them.
+
+    Safe to repeat after a crash: the compressed file is written under a
+    temporary name, and its index rows replace any earlier ones.
+
+    Returns:
+        Path of the sealed ``.jsonl.gz`` segment
+    """
+    sealed = path.with_name(path.name + ".gz")
+    try:
+        with open(path, "rb") as f:
+            lines = [line for line in f.read().splitlines() if line.strip()]
+    except FileNotFoundError:
+        return sealed  # another process sealed this orphan first
+
+    blocks, keys = [], []
+    offset = 0
+    tmp = sealed.with_name(f"{sealed.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as out:
+        for start in range(0, len(lines), block_records):
+            chunk, records = [], []
+            for line in lines[start:start + block_records]:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue  # torn last line of a crashed writer
+                chunk.append(line)
+            if not records:
+                continue
+            data = gzip.compress(b"\n".join(chunk) + b"\n", compresslevel=6)
+            out.write(data)
+            times = [r.get("ts", 0) for r in records]
+            blocks.append((sealed.name, offset, len(data), min(times), max(times), len(records)))
+            keys.extend({(kind, value, sealed.name, offset)
+                         for r in records for kind, value in _record_keys(r)})
+            offset += len(data)
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp, sealed)
+
+    db.execute("BEGIN")
+    try:
+        db.execute("DELETE FROM blocks WHERE segment = ?", (sealed.name,))
+        db.execute("DELETE FROM block_keys WHERE segment = ?", (sealed.name,))
+        db.executemany("INSERT INTO blocks VALUES (?, ?, ?, ?, ?, ?)", blocks)
+        db.executemany("INSERT OR IGNORE INTO block_keys VALUES (?, ?, ?, ?)", keys)
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+    db.execute("COMMIT")
+    path.unlink(missing_ok=True)
+    return sealed
+
+
+class AuditLog:
+    """
+    Appends audit records to this process's open segment and seals it on
+    rotation. Thread-safe; each process writes its own segment files.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_AUDIT_DIR,
+        segment_ms: int = HOUR_MS,
+        max_segment_bytes: int = 16 * 1024 * 1024,
+        block_records: int = 512
+    ):
+        """
+        Initialize audit log (files are created on the first record).
+
+        Args:
+            directory: Segment and index directory
+            segment_ms: Time span of one segment (segments are aligned to it)
+            max_segment_bytes: Seal a segment early once it is this large
+            block_records: Records per compressed block (the index granularity)
+        """
+        self.directory = Path(directory)
+        self.segment_ms = segment_ms
+        self.max_segment_bytes = max_segment_bytes
+        self.block_records = block_records
+        self._lock = threading.Lock()
+        self._file = None
+        self._path: Optional[Path] = None
+        self._bucket = None
+        self._size = 0
+        self._pid = None
+        self._sealers: list = []
+
+    def record(self, event: str, **fields) -> dict:
+        """
+        Append one record.
+
+        Args:
+            event: Event name, e.g. ``order.submitted``
+            **fields: Record fields (None values are dropped)
+
+        Returns:
+            The record as written
+        """
+        record = {"ts": int(time.time() * 1000), "event": event}
+        request_id = current_request_id()
+        if request_id:
+            record["requestId"] = request_id
+        record.update((k, v) for k, v in fields.items() if v is not None)
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+
+        with self._lock:
+            if self._pid != os.getpid():
+                # First record, or a forked child: never share the parent's file
+                self._open_state()
+            bucket = record["ts"] // self.segment_ms
+            if self._file is not None and (bucket != self._bucket or self._size >= self.max_segment_bytes):
+                self._rotate()
+            if self._file is None:
+                self._path = self.directory / f"{record['ts']}-{self._pid}.jsonl"
+                self._file = open(self._path, "a", encoding="utf-8")
+                self._bucket = bucket
+                self._size = 0
+            self._file.write(line)
+            self._file.flush()
+            self._size += len(line)
+        return record
+
+    def _open_state(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._pid = os.getpid()
+        self._file = None
+        self._path = None
+        self._sealers = []
+        orphans = []
+        for path in self.directory.glob("*.jsonl"):
+            match = _SEGMENT_NAME.match(path.name)
+            if match is None:
+                continue
+            pid = int(match.group(2))
+            # Left behind by a process that exited (or an earlier process with our PID)
+            if pid == self._pid or not _pid_alive(pid):
+                orphans.append(path)
+        if orphans:
+            self._start_sealer(orphans)
+        atexit.register(self.close)
+
+    def _rotate(self) -> None:
+        """Close the open segment and seal it in the background."""
+        self._file.close()
+        self._file = None
+        self._start_sealer([self._path])
+
+    def _start_sealer(self, paths: list) -> None:
+        self._sealers = [t for t in self._sealers if t.is_alive()]
+        thread = threading.Thread(target=self._seal, args=(paths,), name="audit-sealer", daemon=True)
+        self._sealers.append(thread)
+        thread.start()
+
+    def _seal(self, paths: list) -> None:
+        try:
+            with closing(_connect(self.directory)) as db:
+                for path in paths:
+                    seal_segment(path, db, self.block_records)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Could not seal audit segment: {e}")
+
+    def close(self) -> None:
+        """Seal the open segment and wait for pending seals."""
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._seal([self._path])
+            for thread in self._sealers:
+                thread.join()
+            self._sealers = []
+            self._pid = None
+
+
+def query(
+    directory: str = DEFAULT_AUDIT_DIR,
+    since: Optional[int] = None,
+    until: Optional[int] = None,
+    symbol: Optional[str] = None,
+    order_id: Optional[str] = None,
+    client_order_id: Optional[str] = None,
+    request_id: Optional[str] = None,
+    event: Optional[str] = None,
+    limit: Optional[int] = None,
+    stats: Optional[QueryStats] = None
+) -> list:
+    """
+    Audit records matching every given filter, oldest first.
+
+    Args:
+        directory: Audit log directory
+        since: Epoch ms, inclusive
+        until: Epoch ms, exclusive
+        symbol: Symbol (case-insensitive)
+        order_id: Exchange order ID
+        client_order_id: Client order ID
+        request_id: Dashboard/CLI request ID
+        event: Event name, or a prefix ending in ``.`` (e.g. ``order.``)
+        limit: Return only the newest ``limit`` matches; blocks are read
+            newest first and reading stops once older blocks cannot matter
+        stats: Filled in with how many blocks were read
+
+    Raises:
+        AuditError: If the directory does not exist
+    """
+    root = Path(directory)
+    if not root.is_dir():
+        raise AuditError(f"No audit log at {directory}")
+    stats = stats if stats is not None else QueryStats()
+    symbol = symbol.upper() if symbol else None
+    filters = {"symbol": symbol, "order": order_id, "client_order": client_order_id, "request": request_id}
+    filters = {kind: str(value) for kind, value in filters.items() if value is not None}
+
+    def matches(record: dict) -> bool:
+        ts = record.get("ts", 0)
+        if since is not None and ts < since or until is not None and ts >= until:
+            return False
+        if event and not (record.get("event") == event or event.endswith(".") and record.get("event", "").startswith(event)):
+            return False
+        keys = dict(_record_keys(record))
+        return all(keys.get(kind) == value for kind, value in filters.items())
+
+    where, params = [], []
+    if since is not None:
+        where.append("b.last_ts >= ?")
+        params.append(since)
+    if until is not None:
+        where.append("b.first_ts < ?")
+        params.append(until)
+    for kind, value in filters.items():
+        where.append(
+            "EXISTS (SELECT 1 FROM block_keys k WHERE k.kind = ? AND k.value = ? "
+            "AND k.segment = b.segment AND k.offset = b.offset)"
+        )
+        params.extend((kind, value))
+    sql = "SELECT b.segment, b.offset, b.length, b.last_ts FROM blocks b"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY b.last_ts DESC, b.segment, b.offset"
+
+    results = []
+    with closing(_connect(root)) as db:
+        stats.blocks_total = db.execute("SELECT COUNT(*) FROM blocks").fetchone()[0]
+        blocks = db.execute(sql, params).fetchall()
+        # Open segments are listed after the index is read: one sealed in
+        # between is then seen in neither. Rare, and the next query sees it.
+        open_segments = sorted(root.glob("*.jsonl"))
+
+    for path in open_segments:
+        match = _SEGMENT_NAME.match(path.name)
+        if match is None or until is not None and int(match.group(1)) >= until:
+            continue
+        stats.open_segments += 1
+        try:
+            with open(path, "rb") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            continue  # sealed since it was listed
+        for line in lines:
+            stats.records_scanned += 1
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # line being written
+            if matches(record):
+                results.append(record)
+
+    handles = {}
+    try:
+        for segment, offset, length, last_ts in blocks:
+            if limit and len(results) >= limit:
+                # Blocks come newest last_ts first: stop once none can beat the current top N
+                if last_ts < heapq.nlargest(limit, (r.get("ts", 0) for r in results))[-1]:
+                    break
+            f = handles.get(segment)
+            if f is None:
+                try:
+                    f = handles[segment] = open(root / segment, "rb")
+                except FileNotFoundError:
+                    continue
+            f.seek(offset)
+            stats.blocks_read += 1
+            for line in gzip.decompress(f.read(length)).splitlines():
+                stats.records_scanned += 1
+                record = json.loads(line)
+                if matches(record):
+                    results.append(record)
+    finally:
+        for f in handles.values():
+            f.close()
+
+    results.sort(key=lambda r: r.get("ts", 0))
+    return results[-limit:] if limit else results
+
+
+# --- order events -------------------------------------------------------------
+
+_default_log: Optional[AuditLog] = None
+_default_lock = threading.Lock()
+_failed = False
+
+
+def get_audit_log() -> Optional[AuditLog]:
+    """The process-wide audit log (AUDIT_LOG_DIR, default logs/audit; empty disables)."""
+    global _default_log
+    if _default_log is None:
+        with _default_lock:
+            if _default_log is None:
+                directory = os.getenv("AUDIT_LOG_DIR", DEFAULT_AUDIT_DIR)
+                if not directory:
+                    return None
+                _default_log = AuditLog(directory)
+    return _default_log
+
+
+def _write(event: str, **fields) -> None:
+    """Record an event; audit failures are logged once and never raised."""
+    global _failed
+    audit_log = get_audit_log()
+    if audit_log is None:
+        return
+    try:
+        audit_log.record(event, **fields)
+        _failed = False
+    except (OSError, sqlite3.Error, TypeError, ValueError) as e:
+        if not _failed:
+            logger.warning(f"Audit log write failed: {e}")
+        _failed = True
+
+
+def _order_fields(params: dict) -> dict:
+    return {
+        "symbol": params.get("symbol"),
+        "clientOrderId": params.get("newClientOrderId") or params.get("clientAlgoId"),
+    }
+
+
+def order_submitted(params: dict, via: Optional[str] = None) -> None:
+    """Record an order about to be sent (signature and timestamps omitted)."""
+    _write(
+        "order.submitted",
+        **_order_fields(params),
+        via=via,
+        params={k: v for k, v in params.items() if k not in _OMIT_PARAMS},
+    )
+
+
+def order_response(params: dict, response: dict) -> None:
+    """Record the exchange's answer to an order."""
+    fields = _order_fields(params)
+    _write(
+        "order.response",
+        symbol=response.get("symbol") or fields["symbol"],
+        orderId=response.get("orderId") or response.get("algoId"),
+        clientOrderId=response.get("clientOrderId") or response.get("clientAlgoId") or fields["clientOrderId"],
+        status=response.get("status") or response.get("algoStatus"),
+        response=response,
+    )
+
+
+def order_error(params: dict, error) -> None:
+    """Record an order that failed or was rejected."""
+    _write(
+        "order.error",
+        **_order_fields(params),
+        error=str(error),
+        errorType=type(error).__name__ if isinstance(error, BaseException) else None,
+    )
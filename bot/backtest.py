@@ -0,0 +1,745 @@
+# trading_bot/bot/backtest.py
+"""
+Offline replay and backtesting on recorded market data.
+
+Two ways to run a strategy:
+
+- Vectorized: a strategy maps a whole KlineData to an array of target
+  positions and PnL, fees and drawdown are computed with NumPy in one pass.
+  This is the fast path for long histories and many symbols.
+- Event-driven: a strategy receives on_bar callbacks and trades through
+  SimulatedExchange, which has the same interface as BinanceFuturesClient
+  and a matching engine for MARKET, LIMIT, STOP and STOP_MARKET orders.
+
+Input files are Binance public-data CSVs (klines or trades), plain or
+compressed (.csv.gz / .zip), or .npz files written by ``save_klines``.
+"""
+
+import gzip
+import heapq
+import io
+import itertools
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from .exceptions import BinanceClientError
+from .logging_config import setup_logger
+from .models import OrderResponse
+
+
+logger = setup_logger()
+
+KLINE_FIELDS = ("open_time", "open", "high", "low", "close", "volume")
+
+MS_PER_YEAR = 365 * 24 * 3600 * 1000
+
+
+class BacktestError(Exception):
+    """Exception raised for invalid backtest data or configuration."""
+    pass
+
+
+@dataclass
+class KlineData:
+    """Column arrays of OHLCV bars for one symbol, sorted by open time."""
+    symbol: str
+    open_time: np.ndarray  # int64 milliseconds
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.open_time)
+
+    def slice(self, start_ms: Optional[int] = None, end_ms: Optional[int] = None) -> "KlineData":
+        """Return a view of bars with start_ms <= open_time < end_ms (no copy)."""
+        lo = 0 if start_ms is None else int(np.searchsorted(self.open_time, start_ms, "left"))
+        hi = len(self) if end_ms is None else int(np.searchsorted(self.open_time, end_ms, "left"))
+        return KlineData(self.symbol, *(getattr(self, f)[lo:hi] for f in KLINE_FIELDS))
+
+    @property
+    def bar_ms(self) -> int:
+        """Median spacing between bars in milliseconds."""
+        if len(self) < 2:
+            return 60_000
+        return int(np.median(np.diff(self.open_time[:1000])))
+
+
+def _open_text(path: Path) -> io.TextIOBase:
+    """Open a plain, gzip or zip compressed CSV as text."""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt")
+    if path.suffix == ".zip":
+        archive = zipfile.ZipFile(path)
+        return io.TextIOWrapper(archive.open(archive.namelist()[0]))
+    return open(path, "r")
+
+
+def _has_header(path: Path) -> bool:
+    with _open_text(path) as f:
+        first = f.readline().split(",")[0]
+    try:
+        float(first)
+        return False
+    except ValueError:
+        return True
+
+
+def _normalize_ms(times: np.ndarray) -> np.ndarray:
+    # Newer Binance public data files use microseconds
+    if len(times) and times[0] > 10**14:
+        return times // 1000
+    return times
+
+
+def load_klines(path, symbol: Optional[str] = None) -> KlineData:
+    """
+    Load recorded klines.
+
+    Args:
+        path: .csv, .csv.gz, .zip (Binance public data layout) or .npz
+        symbol: Symbol name (default: first part of the file name)
+
+    Returns:
+        KlineData sorted by open time
+
+    Raises:
+        BacktestError: If the file cannot be parsed
+    """
+    path = Path(path)
+    symbol = symbol or path.name.split("-")[0].split(".")[0].upper()
+
+    try:
+        if path.suffix == ".npz":
+            with np.load(path) as arrays:
+                columns = [arrays[f] for f in KLINE_FIELDS]
+        else:
+            with _open_text(path) as f:
+                raw = np.loadtxt(
+                    f,
+                    delimiter=",",
+                    usecols=range(6),
+                    skiprows=1 if _has_header(path) else 0,
+                    ndmin=2,
+                )
+            columns = [raw[:, 0].astype(np.int64)] + [raw[:, i] for i in range(1, 6)]
+    except (OSError, ValueError, KeyError) as e:
+        raise BacktestError(f"Cannot load klines from {path}: {e}") from e
+
+    columns[0] = _normalize_ms(columns[0])
+    if np.any(np.diff(columns[0]) < 0):
+        order = np.argsort(columns[0], kind="stable")
+        columns = [c[order] for c in columns]
+
+    logger.info(f"Loaded {len(columns[0])} bars for {symbol} from {path}")
+    return KlineData(symbol, *columns)
+
+
+def load_trades(path, symbol: Optional[str] = None) -> KlineData:
+    """
+    Load recorded trades as degenerate bars (open = high = low = close).
+
+    Expects the Binance public-data trades layout:
+    id, price, qty, quote_qty, time, is_buyer_maker.
+
+    Args:
+        path: .csv, .csv.gz or .zip
+        symbol: Symbol name (default: first part of the file name)
+
+    Returns:
+        KlineData with one bar per trade
+    """
+    path = Path(path)
+    symbol = symbol or path.name.split("-")[0].upper()
+
+    try:
+        with _open_text(path) as f:
+            raw = np.loadtxt(
+                f,
+                delimiter=",",
+                usecols=(1, 2, 4),
+                skiprows=1 if _has_header(path) else 0,
+                ndmin=2,
+            )
+    except (OSError, ValueError) as e:
+        raise BacktestError(f"Cannot load trades from {path}: {e}") from e
+
+    price, qty, times = raw[:, 0], raw[:, 1], _normalize_ms(raw[:, 2].astype(np.int64))
+    return KlineData(symbol, times, price, price, price, price, qty)
+
+
+def save_klines(data: KlineData, path) -> None:
+    """Save klines as a compressed .npz for fast reloads."""
+    np.savez_compressed(path, **{f: getattr(data, f) for f in KLINE_FIELDS})
+
+
+@dataclass
+class BacktestResult:
+    """Outcome of a backtest run."""
+    symbol: str
+    timestamps: np.ndarray
+    equity: np.ndarray
+    initial_balance: float
+    fees: float
+    trades: int
+
+    @property
+    def total_pnl(self) -> float:
+        """Net PnL after fees."""
+        return float(self.equity[-1] - self.initial_balance) if len(self.equity) else 0.0
+
+    @property
+    def max_drawdown(self) -> float:
+        """Largest peak-to-trough equity drop, as a fraction of the peak."""
+        if not len(self.equity):
+            return 0.0
+        peaks = np.maximum.accumulate(self.equity)
+        return float(np.max((peaks - self.equity) / peaks))
+
+    @property
+    def sharpe(self) -> float:
+        """Annualized Sharpe ratio of per-bar returns (zero risk-free rate)."""
+        if len(self.equity) < 3:
+            return 0.0
+        returns = np.diff(self.equity) / self.equity[:-1]
+        std = returns.std()
+        if std == 0:
+            return 0.0
+        bar_ms = max(int(np.median(np.diff(self.timestamps[:1000]))), 1)
+        return float(returns.mean() / std * np.sqrt(MS_PER_YEAR / bar_ms))
+
+    def __str__(self) -> str:
+        """Pretty print result summary."""
+        lines = [
+            f"Symbol:       {self.symbol}",
+            f"Bars:         {len(self.equity)}",
+            f"Trades:       {self.trades}",
+            f"Net PnL:      {self.total_pnl:.2f}",
+            f"Fees:         {self.fees:.2f}",
+            f"Max Drawdown: {self.max_drawdown:.2%}",
+            f"Sharpe:       {self.sharpe:.2f}",
+        ]
+        return "\n".join(lines)
+
+
+def run_vectorized(
+    data: KlineData,
+    positions: np.ndarray,
+    initial_balance: float = 10_000.0,
+    fee_rate: float = 0.0004,
+    slippage_bps: float = 0.0
+) -> BacktestResult:
+    """
+    Evaluate a target-position series in one vectorized pass.
+
+    positions[i] is the position decided at the close of bar i. It is
+    traded at the open of bar i + 1, so a strategy can never act on a
+    price it could not have seen.
+
+    Args:
+        data: Bars for one symbol
+        positions: Target position (in base units, signed) per bar
+        initial_balance: Starting equity in USDT
+        fee_rate: Taker fee per unit of notional
+        slippage_bps: Extra cost per trade in basis points of notional
+
+    Returns:
+        BacktestResult with the equity curve marked at each close
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    if positions.shape != data.close.shape:
+        raise BacktestError(
+            f"positions has {positions.shape[0]} entries, expected {len(data)}"
+        )
+
+    # Position held during bar j (traded at open[j])
+    held = np.empty_like(positions)
+    held[0] = 0.0
+    held[1:] = positions[:-1]
+    prev_held = np.empty_like(held)
+    prev_held[0] = 0.0
+    prev_held[1:] = held[:-1]
+
+    prev_close = np.empty_like(data.close)
+    prev_close[0] = data.open[0]
+    prev_close[1:] = data.close[:-1]
+
+    # Gap from previous close to this open on the old position, then
+    # open -> close on the new one
+    pnl = prev_held * (data.open - prev_close) + held * (data.close - data.open)
+
+    traded = np.abs(held - prev_held)
+    costs = traded * data.open * (fee_rate + slippage_bps / 10_000)
+
+    equity = initial_balance + np.cumsum(pnl - costs)
+
+    return BacktestResult(
+        symbol=data.symbol,
+        timestamps=data.open_time,
+        equity=equity,
+        initial_balance=initial_balance,
+        fees=float(costs.sum()),
+        trades=int(np.count_nonzero(traded)),
+    )
+
+
+def sma_cross_positions(data: KlineData, fast: int, slow: int, size: float) -> np.ndarray:
+    """
+    Example vectorized strategy: long when fast SMA > slow SMA, else short.
+
+    Args:
+        data: Bars for one symbol
+        fast: Fast moving average window
+        slow: Slow moving average window
+        size: Absolute position size in base units
+
+    Returns:
+        Target position per bar (flat until the slow SMA has warmed up)
+    """
+    if not 0 < fast < slow:
+        raise BacktestError("Require 0 < fast < slow")
+
+    csum = np.concatenate(([0.0], np.cumsum(data.close)))
+    positions = np.zeros(len(data))
+    if len(data) < slow:
+        return positions
+
+    fast_ma = (csum[slow:] - csum[slow - fast:-fast]) / fast
+    slow_ma = (csum[slow:] - csum[:-slow]) / slow
+    positions[slow - 1:] = np.where(fast_ma > slow_ma, size, -size)
+    return positions
+
+
+def run_portfolio(
+    datasets: dict,
+    strategy: Callable[[KlineData], np.ndarray],
+    initial_balance: float = 10_000.0,
+    fee_rate: float = 0.0004,
+    slippage_bps: float = 0.0
+) -> dict:
+    """
+    Run a vectorized strategy over many symbols.
+
+    Args:
+        datasets: Mapping of symbol -> KlineData
+        strategy: Function mapping KlineData to a target-position array
+        initial_balance: Starting equity per symbol
+        fee_rate: Taker fee rate
+        slippage_bps: Slippage in basis points
+
+    Returns:
+        Mapping of symbol -> BacktestResult
+    """
+    return {
+        symbol: run_vectorized(data, strategy(data), initial_balance, fee_rate, slippage_bps)
+        for symbol, data in datasets.items()
+    }
+
+
+def _first_index(mask_fn: Callable[[slice], np.ndarray], start: int, end: int) -> Optional[int]:
+    """
+    Find the first index in [start, end) where mask_fn is true.
+
+    Scans in growing chunks so orders that fill soon don't pay for a scan
+    of the whole remaining history.
+    """
+    chunk = 256
+    while start < end:
+        stop = min(start + chunk, end)
+        hits = mask_fn(slice(start, stop))
+        if hits.any():
+            return start + int(np.argmax(hits))
+        start = stop
+        chunk *= 4
+    return None
+
+
+@dataclass
+class _SimOrder:
+    order_id: int
+    symbol: str
+    side: str
+    order_type: str
+    quantity: float
+    price: Optional[float]
+    stop_price: Optional[float]
+    placed_index: int
+    status: str = "NEW"
+    executed_qty: float = 0.0
+    avg_price: Optional[float] = None
+    fill_index: Optional[int] = None
+    fill_price: Optional[float] = None
+    is_maker: bool = False
+
+    def to_response(self) -> OrderResponse:
+        return OrderResponse(
+            order_id=self.order_id,
+            symbol=self.symbol,
+            status=self.status,
+            side=self.side,
+            order_type=self.order_type,
+            quantity=str(self.quantity),
+            executed_qty=str(self.executed_qty),
+            avg_price=str(self.avg_price) if self.avg_price else None,
+            price=str(self.price) if self.price else None,
+        )
+
+
+@dataclass
+class SimPosition:
+    """Position and PnL state for one symbol."""
+    quantity: float = 0.0
+    entry_price: float = 0.0
+    realized_pnl: float = 0.0
+    fees: float = 0.0
+
+    def apply_fill(self, side: str, quantity: float, price: float, fee: float) -> None:
+        """Update position with a fill (signed, average-cost accounting)."""
+        signed = quantity if side == "BUY" else -quantity
+        self.fees += fee
+
+        if self.quantity == 0 or (self.quantity > 0) == (signed > 0):
+            total = self.quantity + signed
+            self.entry_price = (
+                (self.entry_price * abs(self.quantity) + price * abs(signed)) / abs(total)
+            )
+            self.quantity = total
+            return
+
+        closed = min(abs(signed), abs(self.quantity))
+        direction = 1 if self.quantity > 0 else -1
+        self.realized_pnl += closed * (price - self.entry_price) * direction
+        self.quantity += signed
+
+        if abs(self.quantity) < 1e-12:
+            self.quantity = 0.0
+            self.entry_price = 0.0
+        elif (self.quantity > 0) != (direction > 0):
+            # Flipped through zero: remainder opens at the fill price
+            self.entry_price = price
+
+
+class SimulatedExchange:
+    """
+    Simulated exchange with the BinanceFuturesClient interface.
+
+    Orders placed while bar i is current are matched from bar i + 1. When
+    an order is placed, its fill bar is found with one vectorized scan of
+    the future price arrays and queued; advancing the clock then only
+    pops queued fills, so resting orders cost nothing per bar.
+    """
+
+    def __init__(
+        self,
+        data: dict,
+        initial_balance: float = 10_000.0,
+        taker_fee: float = 0.0004,
+        maker_fee: float = 0.0002,
+        slippage_bps: float = 0.0
+    ):
+        """
+        Initialize simulated exchange.
+
+        Args:
+            data: Mapping of symbol -> KlineData
+            initial_balance: Starting wallet balance in USDT
+            taker_fee: Fee rate for MARKET/STOP_MARKET and marketable orders
+            maker_fee: Fee rate for resting LIMIT fills
+            slippage_bps: Adverse slippage applied to taker fills
+        """
+        self.data = data
+        self.initial_balance = initial_balance
+        self.taker_fee = taker_fee
+        self.maker_fee = maker_fee
+        self.slippage_bps = slippage_bps
+        self.base_url = "backtest://local"
+        self.time_offset_ms = 0
+
+        self.cursor = {symbol: -1 for symbol in data}
+        self.positions = {symbol: SimPosition() for symbol in data}
+        self.orders: dict[int, _SimOrder] = {}
+        self._pending = {symbol: [] for symbol in data}
+        self._ids = itertools.count(1)
+
+    # -- clock -------------------------------------------------------------
+
+    def advance(self, symbol: str, index: int) -> list:
+        """
+        Move a symbol's clock to bar ``index`` and apply fills up to it.
+
+        Returns:
+            Orders filled by this step
+        """
+        self.cursor[symbol] = index
+        pending = self._pending[symbol]
+        filled = []
+
+        while pending and pending[0][0] <= index:
+            _, _, order_id = heapq.heappop(pending)
+            order = self.orders[order_id]
+            if order.status != "NEW":
+                continue
+            self._fill(order)
+            filled.append(order)
+
+        return filled
+
+    def _fill(self, order: _SimOrder) -> None:
+        fee_rate = self.maker_fee if order.is_maker else self.taker_fee
+        fee = order.quantity * order.fill_price * fee_rate
+
+        self.positions[order.symbol].apply_fill(
+            order.side, order.quantity, order.fill_price, fee
+        )
+        order.status = "FILLED"
+        order.executed_qty = order.quantity
+        order.avg_price = order.fill_price
+
+    # -- matching ----------------------------------------------------------
+
+    def _schedule(self, order: _SimOrder) -> None:
+        """Find the bar where ``order`` fills and queue it."""
+        bars = self.data[order.symbol]
+        start, end = order.placed_index + 1, len(bars)
+        if start >= end:
+            return
+
+        buy = order.side == "BUY"
+        slip = self.slippage_bps / 10_000
+        taker_adj = (1 + slip) if buy else (1 - slip)
+
+        if order.order_type == "MARKET":
+            order.fill_index = start
+            order.fill_price = float(bars.open[start] * taker_adj)
+        else:
+            trigger_index = start
+            if order.order_type in ("STOP", "STOP_MARKET"):
+                stop = order.stop_price
+                trigger_index = _first_index(
+                    (lambda s: bars.high[s] >= stop) if buy else (lambda s: bars.low[s] <= stop),
+                    start, end,
+                )
+                if trigger_index is None:
+                    return
+
+            if order.order_type == "STOP_MARKET":
+                # Gapped through the stop -> fill at the open
+                gap_open = bars.open[trigger_index]
+                trigger_price = max(gap_open, order.stop_price) if buy else min(gap_open, order.stop_price)
+                order.fill_index = trigger_index
+                order.fill_price = float(trigger_price * taker_adj)
+            else:
+                limit = order.price
+                fill_index = _first_index(
+                    (lambda s: bars.low[s] <= limit) if buy else (lambda s: bars.high[s] >= limit),
+                    trigger_index, end,
+                )
+                if fill_index is None:
+                    return
+
+                reference = bars.open[fill_index]
+                if order.order_type == "STOP" and fill_index == trigger_index:
+                    # The open came before the trigger; the first price the
+                    # live order could see is the stop (or a gap past it)
+                    stop = order.stop_price
+                    reference = max(reference, stop) if buy else min(reference, stop)
+                marketable = reference <= limit if buy else reference >= limit
+                order.fill_index = fill_index
+                order.fill_price = float(reference if marketable else limit)
+                order.is_maker = not marketable
+
+        heapq.heappush(
+            self._pending[order.symbol], (order.fill_index, order.order_id, order.order_id)
+        )
+
+    # -- BinanceFuturesClient interface -------------------------------------
+
+    def test_connectivity(self) -> bool:
+        """Always succeeds; there is no network."""
+        return True
+
+    def sync_time(self) -> int:
+        """No clock to sync."""
+        return 0
+
+    def place_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: float,
+        price: Optional[float] = None,
+        time_in_force: Optional[str] = None,
+        stop_price: Optional[float] = None
+    ) -> OrderResponse:
+        """
+        Place a simulated order.
+
+        Args:
+            symbol: Trading pair symbol
+            side: BUY or SELL
+            order_type: MARKET, LIMIT, STOP or STOP_MARKET
+            quantity: Order quantity
+            price: Limit price (LIMIT and STOP)
+            time_in_force: Accepted for interface compatibility
+            stop_price: Trigger price (STOP and STOP_MARKET)
+
+        Returns:
+            OrderResponse with status NEW (fills happen as the clock advances)
+
+        Raises:
+            BinanceClientError: If the order is invalid
+        """
+        if symbol not in self.data:
+            raise BinanceClientError(f"API Error -1121: Invalid symbol {symbol}")
+        if order_type in ("LIMIT", "STOP") and price is None:
+            raise ValueError(f"Price is required for {order_type} orders")
+        if order_type in ("STOP", "STOP_MARKET") and stop_price is None:
+            raise ValueError(f"Stop price is required for {order_type} orders")
+        if order_type not in ("MARKET", "LIMIT", "STOP", "STOP_MARKET"):
+            raise BinanceClientError(f"API Error -1116: Invalid orderType {order_type}")
+
+        order = _SimOrder(
+            order_id=next(self._ids),
+            symbol=symbol,
+            side=side,
+            order_type=order_type,
+            quantity=float(quantity),
+            price=float(price) if price is not None else None,
+            stop_price=float(stop_price) if stop_price is not None else None,
+            placed_index=self.cursor[symbol],
+        )
+        self.orders[order.order_id] = order
+        self._schedule(order)
+        return order.to_response()
+
+    def get_order(self, symbol: str, order_id: int) -> OrderResponse:
+        """Query a simulated order."""
+        order = self.orders.get(order_id)
+        if order is None or order.symbol != symbol:
+            raise BinanceClientError("API Error -2013: Order does not exist.", -2013)
+        return order.to_response()
+
+    def cancel_order(self, symbol: str, order_id: int) -> OrderResponse:
+        """Cancel a simulated order if it has not filled yet."""
+        order = self.orders.get(order_id)
+        if order is None or order.symbol != symbol:
+            raise BinanceClientError("API Error -2011: Unknown order sent.")
+        if order.status != "NEW":
+            raise BinanceClientError("API Error -2011: Unknown order sent.")
+        order.status = "CANCELED"
+        return order.to_response()
+
+    def get_ticker_price(self, symbol: str) -> float:
+        """Close of the current bar."""
+        return float(self.data[symbol].close[max(self.cursor[symbol], 0)])
+
+    def get_exchange_info(self) -> dict:
+        """Minimal exchangeInfo listing the replayed symbols."""
+        return {"symbols": [{"symbol": s, "filters": []} for s in self.data]}
+
+    def get_symbol_filters(self, symbol: str) -> dict:
+        """No exchange filters are simulated."""
+        return {}
+
+    def equity(self) -> float:
+        """Wallet balance plus unrealized PnL at current closes."""
+        total = self.initial_balance
+        for symbol, position in self.positions.items():
+            total += position.realized_pnl - position.fees
+            if position.quantity:
+                mark = self.get_ticker_price(symbol)
+                total += position.quantity * (mark - position.entry_price)
+        return total
+
+    def close(self):
+        """Nothing to close."""
+        pass
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
+
+
+class Strategy:
+    """
+    Base class for event-driven strategies.
+
+    Override ``on_bar``; trade through ``exchange`` exactly as with a live
+    BinanceFuturesClient.
+    """
+
+    def on_start(self, exchange: SimulatedExchange) -> None:
+        """Called once before the first bar."""
+        pass
+
+    def on_bar(self, exchange: SimulatedExchange, symbol: str, index: int) -> None:
+        """Called after bar ``index`` of ``symbol`` has closed."""
+        raise NotImplementedError
+
+    def on_fill(self, exchange: SimulatedExchange, order: OrderResponse) -> None:
+        """Called when an order fills."""
+        pass
+
+
+def run_event_driven(
+    exchange: SimulatedExchange,
+    strategy: Strategy,
+    record_every: int = 1
+) -> BacktestResult:
+    """
+    Replay all symbols in time order through an event-driven strategy.
+
+    Args:
+        exchange: SimulatedExchange holding the data to replay
+        strategy: Strategy instance
+        record_every: Record equity every N timestamps
+
+    Returns:
+        BacktestResult for the whole portfolio
+    """
+    timeline = np.unique(np.concatenate([d.open_time for d in exchange.data.values()]))
+    # Per-symbol bar index at every timeline step (-1 if not yet started)
+    index_at = {
+        symbol: np.searchsorted(d.open_time, timeline, "right") - 1
+        for symbol, d in exchange.data.items()
+    }
+
+    strategy.on_start(exchange)
+    stamps, equity = [], []
+
+    for step, ts in enumerate(timeline):
+        for symbol, data in exchange.data.items():
+            index = int(index_at[symbol][step])
+            if index < 0 or data.open_time[index] != ts:
+                continue
+            for order in exchange.advance(symbol, index):
+                strategy.on_fill(exchange, order.to_response())
+            strategy.on_bar(exchange, symbol, index)
+
+        if step % record_every == 0:
+            stamps.append(ts)
+            equity.append(exchange.equity())
+
+    fees = sum(p.fees for p in exchange.positions.values())
+    trades = sum(1 for o in exchange.orders.values() if o.status == "FILLED")
+    name = ",".join(exchange.data) if len(exchange.data) <= 3 else f"{len(exchange.data)} symbols"
+
+    return BacktestResult(
+        symbol=name,
+        timestamps=np.asarray(stamps, dtype=np.int64),
+        equity=np.asarray(equity),
+        initial_balance=exchange.initial_balance,
+        fees=fees,
+        trades=trades,
+    )
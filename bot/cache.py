@@ -0,0 +1,132 @@
+# trading_bot/bot/cache.py
+"""
+Small in-process TTL cache for slow-changing exchange data.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Thread-safe key/value cache whose entries expire after a TTL.
+
+    Concurrent ``get_or_load`` calls for a cold key share one in-flight
+    load, so they trigger one upstream call, not one each. Loads of
+    different keys run independently: a slow exchangeInfo fetch does not
+    hold up prices.
+    """
+
+    def __init__(self, default_ttl: float = 60.0):
+        """
+        Initialize cache.
+
+        Args:
+            default_ttl: Seconds an entry stays fresh unless set() overrides it
+        """
+        self.default_ttl = default_ttl
+        self._entries: dict = {}
+        self._lock = threading.RLock()
+        self._inflight: dict = {}   # key -> asyncio task (get_or_load_async)
+        self._loading: dict = {}    # key -> Future (get_or_load)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or ``default`` if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            return default
+        return entry[0]
+
+    def get_stale(self, key: Hashable, default: Any = None) -> Any:
+        """Return the last stored value even if expired (fallback during outages)."""
+        entry = self._entries.get(key)
+        return default if entry is None else entry[0]
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value for ``ttl`` seconds (default: default_ttl)."""
+        expires = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires)
+
+    def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Return the cached value, calling ``loader`` once if missing or expired.
+
+        Callers arriving during a load wait for its result (or exception);
+        the cache lock is held only to register the load, not while it runs.
+        Exceptions from the loader propagate and nothing is cached.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        with self._lock:
+            value = self.get(key, missing)
+            if value is not missing:
+                return value
+            future = self._loading.get(key)
+            loading = future is None
+            if loading:
+                future = self._loading[key] = Future()
+        if not loading:
+            return future.result()
+
+        try:
+            value = loader()
+            self.set(key, value, ttl)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    async def get_or_load_async(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Async variant of get_or_load for use on one event loop.
+
+        Concurrent callers for a cold key await the same in-flight load.
+        """
+        import asyncio  # not imported by blocking callers (startup budget)
+
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            async def load() -> Any:
+                try:
+                    result = await loader()
+                    self.set(key, result, ttl)
+                    return result
+                finally:
+                    self._inflight.pop(key, None)
+
+            task = asyncio.ensure_future(load())
+            self._inflight[key] = task
+        return await asyncio.shield(task)
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or everything if ``key`` is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
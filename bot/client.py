@@ -11,18 +11,16 @@ from urllib.parse import urlencode
 
 import httpx
 
+from . import audit
+from .exceptions import (
+    ORDER_NOT_FOUND, BinanceClientError, BinanceNetworkError, OrderStatusUnknownError,
+    RateLimitError, WebSocketUnavailableError
+)
 from .logging_config import setup_logger, sanitize_params
 from .models import APIError, OrderResponse
-
-
-class BinanceClientError(Exception):
-    """Exception raised for Binance API errors."""
-    pass
-
-
-class BinanceNetworkError(Exception):
-    """Exception raised for network-related errors."""
-    pass
+from .profiling import timed
+from .resilience import build_transport
+from .tracing import decode_json, span
 
 
 class BinanceFuturesClient:
@@ -37,7 +35,8 @@ class BinanceFuturesClient:
         api_key: str,
         api_secret: str,
         base_url: str = "https://testnet.binancefuture.com",
-        timeout: float = 10.0
+        timeout: float = 10.0,
+        ws_api_url: Optional[str] = None
     ):
         """
         Initialize Binance Futures client.
@@ -47,17 +46,24 @@ class BinanceFuturesClient:
             api_secret: Binance API secret
             base_url: Base URL for API (default: testnet)
             timeout: Request timeout in seconds
+            ws_api_url: WebSocket API URL; if set, orders are placed,
+                queried and canceled over it, falling back to REST
         """
         self.api_key = api_key
         self.api_secret = api_secret
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.time_offset_ms = 0
+        self.ws_api_url = ws_api_url
+        self._ws_session = None
         self.logger = setup_logger()
         
+        # Retries, per-endpoint circuit breakers and hedged idempotent GETs
         self.client = httpx.Client(
             base_url=self.base_url,
             timeout=self.timeout,
-            headers={"X-MBX-APIKEY": self.api_key}
+            headers={"X-MBX-APIKEY": self.api_key},
+            transport=build_transport()
         )
     
     def _generate_signature(self, query_string: str) -> str:
@@ -88,7 +94,7 @@ class BinanceFuturesClient:
         """
         # Add timestamp and recvWindow
         signed_params = params.copy()
-        signed_params["timestamp"] = int(time.time() * 1000)
+        signed_params["timestamp"] = int(time.time() * 1000) + self.time_offset_ms
         signed_params["recvWindow"] = 5000
         
         # Create query string and generate signature
@@ -143,6 +149,102 @@ class BinanceFuturesClient:
             self.logger.error(f"Unexpected error during connectivity test: {e}")
             raise BinanceNetworkError(f"Connectivity test failed: {e}") from e
     
+    @timed
+    def sync_time(self) -> int:
+        """
+        Measure the offset between local and server clock.
+        
+        The offset is applied to every signed request timestamp, so a
+        long-running process does not drift outside recvWindow.
+        
+        Returns:
+            Offset in milliseconds (server - local)
+        """
+        sent = time.time() * 1000
+        data = self._request("GET", "/fapi/v1/time")
+        received = time.time() * 1000
+        
+        # Assume the server stamped the response halfway through the round-trip
+        self.time_offset_ms = int(data["serverTime"] - (sent + received) / 2)
+        self.logger.info(f"Clock synced: offset={self.time_offset_ms}ms")
+        return self.time_offset_ms
+    
+    @timed
+    def _request(
+        self,
+        method: str,
+        endpoint: str,
+        params: Optional[dict] = None,
+        signed: bool = False
+    ):
+        """
+        Send a request and return the decoded JSON body.
+        
+        Args:
+            method: HTTP method (GET, POST, DELETE)
+            endpoint: API path, e.g. /fapi/v1/order
+            params: Query parameters
+            signed: Whether to add timestamp and signature
+        
+        Returns:
+            Decoded JSON response
+        
+        Raises:
+            BinanceClientError: If API returns an error
+            BinanceNetworkError: If network error occurs
+        """
+        with span(f"binance {method} {endpoint}", attributes={"http.method": method, "url.path": endpoint}):
+            return self._send(method, endpoint, params or {}, signed)
+    
+    def _send(self, method: str, endpoint: str, params: dict, signed: bool):
+        """_request without the span: sign, send, decode."""
+        if signed:
+            with span("sign"):
+                params = self._sign_request(params)
+            self.logger.debug(f"Request params: {sanitize_params(params)}")
+        
+        try:
+            response = self.client.request(method, endpoint, params=params)
+            
+            self.logger.info(
+                f"{method} {endpoint} response: status={response.status_code} "
+                f"elapsed={response.elapsed.total_seconds() * 1000:.1f}ms"
+            )
+            
+            response_data = decode_json(response)
+            
+            if response.status_code != 200:
+                error = APIError.from_api_response(response_data)
+                self.logger.error(f"API error: {error}")
+                raise BinanceClientError(str(error), error.code)
+            
+            return response_data
+        
+        except httpx.TimeoutException as e:
+            self.logger.error(f"Timeout during {method} {endpoint}: {e}")
+            if method == "POST":
+                raise BinanceNetworkError(
+                    "Request timeout. The order may or may not have been placed."
+                ) from e
+            raise BinanceNetworkError("Request timeout.") from e
+        
+        except httpx.NetworkError as e:
+            self.logger.error(f"Network error during {method} {endpoint}: {e}")
+            raise BinanceNetworkError(
+                "Network error. Please check your connection."
+            ) from e
+        
+        except (BinanceClientError, BinanceNetworkError):
+            # Includes CircuitOpenError: rejected without being sent
+            raise
+        
+        except Exception as e:
+            self.logger.error(
+                f"Unexpected error during {method} {endpoint}: {e}", exc_info=True
+            )
+            raise BinanceNetworkError(f"Unexpected error: {e}") from e
+    
+    @timed
     def place_order(
         self,
         symbol: str,
@@ -150,7 +252,8 @@ class BinanceFuturesClient:
         order_type: str,
         quantity: float,
         price: Optional[float] = None,
-        time_in_force: Optional[str] = None
+        time_in_force: Optional[str] = None,
+        client_order_id: Optional[str] = None
     ) -> OrderResponse:
         """
         Place an order on Binance Futures.
@@ -162,6 +265,7 @@ class BinanceFuturesClient:
             quantity: Order quantity
             price: Order price (required for LIMIT)
             time_in_force: Time in force (default GTC for LIMIT)
+            client_order_id: newClientOrderId (generated for WebSocket orders)
         
         Returns:
             OrderResponse object
@@ -186,56 +290,313 @@ class BinanceFuturesClient:
                 raise ValueError("Price is required for LIMIT orders")
             params["price"] = str(price)
             params["timeInForce"] = time_in_force or "GTC"
+        if client_order_id:
+            params["newClientOrderId"] = client_order_id
         
-        # Sign the request
-        signed_params = self._sign_request(params)
+        audit.order_submitted(params, via="ws" if self.ws_api_url else "rest")
+        try:
+            if self.ws_api_url:
+                response_data = self._place_order_ws(params)
+            else:
+                self.logger.info(f"Placing order: POST {endpoint}")
+                response_data = self._request("POST", endpoint, params, signed=True)
+        except Exception as e:
+            audit.order_error(params, e)
+            raise
+        audit.order_response(params, response_data)
+        self.logger.debug(f"Response body: {response_data}")
         
-        # Log request (sanitized)
-        self.logger.info(f"Placing order: POST {endpoint}")
-        self.logger.debug(f"Request params: {sanitize_params(signed_params)}")
+        # Parse successful response
+        order_response = OrderResponse.from_api_response(response_data)
+        self.logger.info(f"Order placed successfully: {order_response.order_id}")
         
-        try:
-            response = self.client.post(endpoint, params=signed_params)
-            
-            self.logger.info(f"Order response: status={response.status_code}")
-            
-            # Parse response
-            response_data = response.json()
-            self.logger.debug(f"Response body: {response_data}")
-            
-            # Check for errors
-            if response.status_code != 200:
-                error = APIError.from_api_response(response_data)
-                self.logger.error(f"API error: {error}")
-                raise BinanceClientError(str(error))
-            
-            # Parse successful response
-            order_response = OrderResponse.from_api_response(response_data)
-            self.logger.info(f"Order placed successfully: {order_response.order_id}")
-            
-            return order_response
+        return order_response
+    
+    @timed
+    def get_order(
+        self,
+        symbol: str,
+        order_id: Optional[int] = None,
+        client_order_id: Optional[str] = None
+    ) -> OrderResponse:
+        """
+        Query the current state of an order.
         
-        except httpx.TimeoutException as e:
-            self.logger.error(f"Timeout while placing order: {e}")
-            raise BinanceNetworkError(
-                "Request timeout. The order may or may not have been placed."
-            ) from e
+        Args:
+            symbol: Trading pair symbol
+            order_id: Exchange order ID
+            client_order_id: Client order ID (if order_id is not known)
         
-        except httpx.NetworkError as e:
-            self.logger.error(f"Network error while placing order: {e}")
-            raise BinanceNetworkError(
-                "Network error. Please check your connection."
-            ) from e
+        Returns:
+            OrderResponse object with the latest status and fills
+        """
+        params = {"symbol": symbol}
+        if order_id is not None:
+            params["orderId"] = order_id
+        else:
+            params["origClientOrderId"] = client_order_id
+        response_data = self._ws_or_rest("order.status", "GET", params)
+        return OrderResponse.from_api_response(response_data)
+    
+    @timed
+    def cancel_order(self, symbol: str, order_id: int) -> OrderResponse:
+        """
+        Cancel an open order.
+        
+        Args:
+            symbol: Trading pair symbol
+            order_id: Exchange order ID
+        
+        Returns:
+            OrderResponse object for the canceled order
+        """
+        self.logger.info(f"Canceling order {order_id}")
+        response_data = self._ws_or_rest(
+            "order.cancel", "DELETE", {"symbol": symbol, "orderId": order_id}
+        )
+        return OrderResponse.from_api_response(response_data)
+    
+    def _ws(self):
+        """WebSocket API session, created on first use."""
+        if self._ws_session is None:
+            from .ws_trading import WebSocketTradingSession
+            self._ws_session = WebSocketTradingSession(
+                self.api_key,
+                self.api_secret,
+                self.ws_api_url,
+                self.timeout,
+                clock=lambda: int(time.time() * 1000) + self.time_offset_ms
+            )
+        return self._ws_session
+    
+    def _ws_or_rest(self, ws_method: str, http_method: str, params: dict):
+        """
+        Send an order query/cancel over the WebSocket API, else over REST.
+        
+        Both are safe to repeat, so REST is used whenever the WebSocket
+        request fails without an API answer.
+        """
+        if self.ws_api_url:
+            try:
+                return self._ws().call(ws_method, params)
+            except (BinanceClientError, RateLimitError):
+                raise
+            except BinanceNetworkError as e:
+                self.logger.warning(f"WebSocket {ws_method} failed ({e}); using REST")
+        return self._request(http_method, "/fapi/v1/order", params, signed=True)
+    
+    @timed
+    def _place_order_ws(self, params: dict) -> dict:
+        """
+        Place an order over the WebSocket API, falling back to REST.
+        
+        Unsent requests go straight to REST. If the request was sent but
+        the answer was lost, the order is looked up by its client order ID
+        first, so a fallback never places it twice. It is re-sent only if
+        the lookup says the order does not exist (-2013).
+        
+        Raises:
+            OrderStatusUnknownError: If the answer was lost and the lookup
+                failed for any other reason (the order may exist)
+        """
+        from .ws_trading import new_client_order_id
+        
+        params = dict(params)
+        params.setdefault("newClientOrderId", new_client_order_id())
         
-        except BinanceClientError:
+        try:
+            self.logger.info("Placing order: WebSocket order.place")
+            return self._ws().call("order.place", params)
+        except (BinanceClientError, RateLimitError):
             raise
+        except WebSocketUnavailableError as e:
+            self.logger.warning(f"{e}; placing order over REST")
+        except BinanceNetworkError as e:
+            self.logger.warning(f"{e}; checking order {params['newClientOrderId']} over REST")
+            try:
+                return self._request(
+                    "GET",
+                    "/fapi/v1/order",
+                    {"symbol": params["symbol"], "origClientOrderId": params["newClientOrderId"]},
+                    signed=True
+                )
+            except BinanceClientError as lookup_error:
+                if lookup_error.code != ORDER_NOT_FOUND:
+                    # -1021, -2015, ... say nothing about whether the order exists
+                    raise OrderStatusUnknownError(
+                        f"Order {params['newClientOrderId']} may have been placed: its answer "
+                        f"was lost and the lookup failed ({lookup_error})",
+                        params["newClientOrderId"]
+                    ) from lookup_error
+                # The request never reached the matching engine
+                self.logger.warning("Order not found; placing it over REST")
+            except BinanceNetworkError as lookup_error:
+                raise OrderStatusUnknownError(
+                    f"Order {params['newClientOrderId']} may have been placed: its answer "
+                    f"was lost and the lookup failed ({lookup_error})",
+                    params["newClientOrderId"]
+                ) from lookup_error
         
-        except Exception as e:
-            self.logger.error(f"Unexpected error while placing order: {e}", exc_info=True)
-            raise BinanceNetworkError(f"Unexpected error: {e}") from e
+        return self._request("POST", "/fapi/v1/order", params, signed=True)
     
+    @timed
+    def get_exchange_info(self) -> dict:
+        """
+        Get exchange trading rules and symbol information.
+        
+        Returns:
+            Raw exchangeInfo response
+        """
+        return self._request("GET", "/fapi/v1/exchangeInfo")
+    
+    @timed
+    def get_symbol_filters(self, symbol: str) -> dict:
+        """
+        Get trading filters for a symbol, keyed by filterType.
+        
+        Args:
+            symbol: Trading pair symbol
+        
+        Returns:
+            Dictionary of filterType -> filter (e.g. LOT_SIZE, PRICE_FILTER)
+        
+        Raises:
+            BinanceClientError: If the symbol is not listed
+        """
+        for symbol_data in self.get_exchange_info().get("symbols", []):
+            if symbol_data["symbol"] == symbol:
+                return {f["filterType"]: f for f in symbol_data.get("filters", [])}
+        
+        raise BinanceClientError(f"Symbol {symbol} not found in exchangeInfo")
+    
+    @timed
+    def get_ticker_price(self, symbol: str) -> float:
+        """
+        Get the latest traded price for a symbol.
+        
+        Args:
+            symbol: Trading pair symbol
+        
+        Returns:
+            Last price
+        """
+        data = self._request("GET", "/fapi/v1/ticker/price", {"symbol": symbol})
+        return float(data["price"])
+    
+    def get_ticker_24hr(self, symbol: str) -> dict:
+        """
+        Get rolling 24h statistics for a symbol (volume, quoteVolume, ...).
+        
+        Args:
+            symbol: Trading pair symbol
+        
+        Returns:
+            Raw 24hr ticker response
+        """
+        return self._request("GET", "/fapi/v1/ticker/24hr", {"symbol": symbol})
+    
+    @timed
+    def get_order_book(self, symbol: str, limit: int = 100) -> dict:
+        """
+        Get an order book snapshot.
+        
+        Args:
+            symbol: Trading pair symbol
+            limit: Levels per side (5, 10, 20, 50, 100, 500 or 1000)
+        
+        Returns:
+            Raw /fapi/v1/depth response (bids and asks as [price, qty] strings)
+        """
+        return self._request("GET", "/fapi/v1/depth", {"symbol": symbol, "limit": limit})
+    
+    @timed
+    def get_balance(self) -> list:
+        """
+        Get futures account balances per asset.
+        
+        Returns:
+            Raw /fapi/v2/balance rows
+        """
+        return self._request("GET", "/fapi/v2/balance", signed=True)
+    
+    @timed
+    def get_position_risk(self, symbol: Optional[str] = None) -> list:
+        """
+        Get positions with mark price, leverage and liquidation price.
+        
+        Args:
+            symbol: Trading pair symbol (default: all symbols)
+        
+        Returns:
+            Raw /fapi/v2/positionRisk rows
+        """
+        params = {"symbol": symbol} if symbol else {}
+        return self._request("GET", "/fapi/v2/positionRisk", params, signed=True)
+    
+    @timed
+    def get_klines(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: Optional[int] = None,
+        end_time: Optional[int] = None,
+        limit: int = 1500
+    ) -> list:
+        """
+        Get candlestick bars for a symbol.
+        
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval (1m, 5m, 1h, ...)
+            start_time: First open time in milliseconds (optional)
+            end_time: Last open time in milliseconds (optional)
+            limit: Maximum bars to return (max 1500)
+        
+        Returns:
+            List of raw kline rows
+        """
+        params = {"symbol": symbol, "interval": interval, "limit": limit}
+        if start_time is not None:
+            params["startTime"] = start_time
+        if end_time is not None:
+            params["endTime"] = end_time
+        return self._request("GET", "/fapi/v1/klines", params)
+    
+    def market_data(
+        self,
+        symbols: list,
+        workers: Optional[int] = None,
+        indicators: Optional[dict] = None,
+        stream_url: Optional[str] = None
+    ):
+        """
+        Live trades, top of book and indicators for many symbols, processed
+        in one worker process per shard.
+
+        Args:
+            symbols: Symbols to stream
+            workers: Worker processes (default: one per CPU)
+            indicators: Output name -> picklable Indicator factory
+                (default: bot.indicators.DEFAULT_INDICATORS)
+            stream_url: Market stream base URL (default: the testnet's)
+
+        Returns:
+            A ShardedMarketData runtime; use it as a context manager and
+            subscribe() to its record batches
+        """
+        from .sharded import BinanceStreamFeed, ShardedMarketData, TESTNET_STREAM_URL
+
+        return ShardedMarketData(
+            symbols,
+            workers=workers,
+            feed=BinanceStreamFeed(stream_url or TESTNET_STREAM_URL),
+            indicators=indicators
+        )
+
     def close(self):
-        """Close the HTTP client."""
+        """Close the HTTP client and the WebSocket session, if open."""
+        if self._ws_session is not None:
+            self._ws_session.close()
         self.client.close()
     
     def __enter__(self):
@@ -0,0 +1,253 @@
+# trading_bot/bot/daemon.py
+"""
+Long-running trading daemon serving CLI commands over a Unix socket.
+
+The daemon owns one warm BinanceFuturesClient (pooled keep-alive
+connection, synced clock), so each submitted command skips interpreter
+startup, imports, TLS handshake and the /fapi/v1/time round-trip.
+
+Protocol: one JSON object per line in each direction.
+    -> {"id": 1, "command": "order", "params": {...}}
+    <- {"id": 1, "ok": true, "result": {...}}
+"""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from dataclasses import asdict
+from typing import Optional
+
+from .client import BinanceFuturesClient
+from .logging_config import setup_logger
+from .orders import create_order_request, place_order
+from .risk import RiskGate
+from .symbols import SymbolIndex, load_symbol_index, DEFAULT_TTL
+
+
+logger = setup_logger()
+
+
+class _CommandHandler(socketserver.StreamRequestHandler):
+    """Handles one client connection; serves commands until it disconnects."""
+
+    def handle(self):
+        daemon: "TradingDaemon" = self.server.trading_daemon
+
+        for line in self.rfile:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                self._reply({"id": None, "ok": False, "errorType": "ProtocolError",
+                             "error": "Invalid JSON"})
+                continue
+            if not isinstance(message, dict):
+                self._reply({"id": None, "ok": False, "errorType": "ProtocolError",
+                             "error": "Expected a JSON object"})
+                continue
+
+            reply = daemon.dispatch(message.get("command"), message.get("params") or {})
+            reply["id"] = message.get("id")
+            self._reply(reply)
+
+    def _reply(self, reply: dict) -> None:
+        self.wfile.write(json.dumps(reply).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+class TradingDaemon:
+    """
+    Serves ping/test/order/shutdown commands with a warm client.
+    """
+
+    def __init__(
+        self,
+        client: BinanceFuturesClient,
+        socket_path: str,
+        resync_interval: float = 300.0,
+        risk_gate: Optional[RiskGate] = None,
+        risk_refresh_interval: float = 10.0
+    ):
+        """
+        Initialize daemon.
+
+        Args:
+            client: BinanceFuturesClient to keep warm
+            socket_path: Path of the Unix socket to listen on
+            resync_interval: Seconds between clock re-syncs (also keeps the
+                connection alive)
+            risk_gate: Pre-trade risk gate applied to every order (optional)
+            risk_refresh_interval: Seconds between mark/position refreshes
+                for the risk gate
+        """
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise OSError("Daemon mode requires Unix domain sockets (not available on Windows)")
+
+        self.client = client
+        self.socket_path = socket_path
+        self.resync_interval = resync_interval
+        self.risk_gate = risk_gate if risk_gate and risk_gate.enabled else None
+        self.risk_refresh_interval = risk_refresh_interval
+        self.symbol_index: Optional[SymbolIndex] = None
+        self.started_at = time.time()
+        self._stop = threading.Event()
+        self._server = None
+
+        self._commands = {
+            "ping": self._cmd_ping,
+            "test": self._cmd_test,
+            "order": self._cmd_order,
+            "shutdown": self._cmd_shutdown,
+        }
+
+    def dispatch(self, command: str, params: dict) -> dict:
+        """
+        Run a command and build its reply.
+
+        Args:
+            command: Command name
+            params: Command parameters
+
+        Returns:
+            Reply dictionary with ok/result or ok/error
+        """
+        handler = self._commands.get(command)
+        if handler is None:
+            return {"ok": False, "errorType": "ProtocolError",
+                    "error": f"Unknown command '{command}'"}
+
+        try:
+            return {"ok": True, "result": handler(params)}
+        except Exception as e:
+            logger.error(f"Daemon command {command} failed: {e}")
+            return {"ok": False, "errorType": type(e).__name__, "error": str(e)}
+
+    def _cmd_ping(self, params: dict) -> dict:
+        return {
+            "uptime": time.time() - self.started_at,
+            "timeOffsetMs": self.client.time_offset_ms,
+            "baseUrl": self.client.base_url,
+        }
+
+    def _cmd_test(self, params: dict) -> dict:
+        self.client.test_connectivity()
+        return {"connected": True, "baseUrl": self.client.base_url}
+
+    def _cmd_order(self, params: dict) -> dict:
+        order_request = create_order_request(
+            symbol=params.get("symbol", ""),
+            side=params.get("side", ""),
+            order_type=params.get("type", ""),
+            quantity=params.get("quantity", ""),
+            price=params.get("price"),
+            symbol_index=self._get_symbol_index()
+        )
+        response = place_order(self.client, order_request, self.risk_gate)
+        return asdict(response)
+
+    def _get_symbol_index(self) -> Optional[SymbolIndex]:
+        # Refreshed hourly; a failed refresh keeps serving the old snapshot
+        index = self.symbol_index
+        if index is None or time.time() - index.fetched_at > DEFAULT_TTL:
+            try:
+                self.symbol_index = index = load_symbol_index(self.client.get_exchange_info)
+            except Exception as e:
+                logger.warning(f"Daemon exchangeInfo refresh failed: {e}")
+        return index
+
+    def _cmd_shutdown(self, params: dict) -> dict:
+        # shutdown() blocks until serve_forever returns, so run it elsewhere
+        threading.Thread(target=self.stop, daemon=True).start()
+        return {"stopping": True}
+
+    def _resync_loop(self) -> None:
+        while not self._stop.wait(self.resync_interval):
+            try:
+                self.client.sync_time()
+            except Exception as e:
+                logger.warning(f"Daemon clock resync failed: {e}")
+
+    def _refresh_risk_state(self) -> None:
+        try:
+            self.risk_gate.load_position_risk(self.client.get_position_risk())
+        except Exception as e:
+            logger.warning(f"Daemon risk state refresh failed: {e}")
+
+    def _risk_refresh_loop(self) -> None:
+        # Orders are checked against this cached state, never a live request
+        while not self._stop.wait(self.risk_refresh_interval):
+            self._refresh_risk_state()
+
+    def serve_forever(self) -> None:
+        """Warm up the client, bind the socket and serve until stopped."""
+        self.client.sync_time()
+        self._get_symbol_index()
+        if self.risk_gate and self.risk_gate.needs_state:
+            self._refresh_risk_state()
+            threading.Thread(target=self._risk_refresh_loop, name="risk-refresh", daemon=True).start()
+
+        self._remove_stale_socket()
+
+        # Owner-only from the moment it exists, not just after the chmod
+        umask = os.umask(0o077)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(
+                self.socket_path, _CommandHandler
+            )
+        finally:
+            os.umask(umask)
+        self._server.daemon_threads = True
+        self._server.trading_daemon = self
+        os.chmod(self.socket_path, 0o600)
+        socket_inode = os.stat(self.socket_path).st_ino
+
+        threading.Thread(target=self._resync_loop, name="clock-resync", daemon=True).start()
+        logger.info(f"Daemon listening on {self.socket_path}")
+
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            # Only our own socket: another daemon may have replaced it since
+            try:
+                if os.stat(self.socket_path).st_ino == socket_inode:
+                    os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+            logger.info("Daemon stopped")
+
+    def _remove_stale_socket(self) -> None:
+        """
+        Remove a socket left behind by a daemon that is no longer running.
+
+        Raises:
+            OSError: If the path is not a socket, or a daemon still answers on it
+        """
+        try:
+            mode = os.lstat(self.socket_path).st_mode
+        except FileNotFoundError:
+            return
+        if not stat.S_ISSOCK(mode):
+            raise OSError(f"{self.socket_path} exists and is not a socket; not removing it")
+
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            pass  # Nobody listening: a leftover from a daemon that died
+        else:
+            raise OSError(f"A daemon is already listening on {self.socket_path}")
+        finally:
+            probe.close()
+
+        logger.info(f"Removing stale socket {self.socket_path}")
+        os.unlink(self.socket_path)
+
+    def stop(self) -> None:
+        """Stop serving."""
+        self._stop.set()
+        if self._server:
+            self._server.shutdown()
@@ -0,0 +1,153 @@
+# trading_bot/bot/daemon_client.py
+"""
+Thin client for the trading daemon's Unix socket.
+
+Deliberately stdlib-only: scripts that talk to a running daemon never pay
+for importing httpx, loading .env or opening a TLS connection.
+"""
+
+import json
+import os
+import socket
+import tempfile
+from typing import Optional
+
+
+DEFAULT_SOCKET_PATH = os.getenv(
+    "TRADING_BOT_SOCKET",
+    os.path.join(tempfile.gettempdir(), "trading_bot.sock")
+)
+
+
+class DaemonError(Exception):
+    """Exception raised when the daemon is unreachable or misbehaves."""
+    pass
+
+
+class DaemonCommandError(Exception):
+    """Exception raised when the daemon reports a failed command."""
+
+    def __init__(self, error_type: str, message: str):
+        super().__init__(message)
+        self.error_type = error_type
+
+
+class DaemonClient:
+    """
+    Client for a running ``cli.py daemon``.
+
+    One connection is reused for every command, so a scripted loop pays
+    only a local socket round-trip per order.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 30.0):
+        """
+        Initialize daemon client.
+
+        Args:
+            socket_path: Path of the daemon's Unix socket
+            timeout: Seconds to wait for a reply
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._reader = None
+        self._next_id = 0
+
+    def connect(self) -> None:
+        """Open the socket connection."""
+        if not hasattr(socket, "AF_UNIX"):
+            raise DaemonError("Daemon mode requires Unix domain sockets (not available on Windows)")
+
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+        except OSError as e:
+            raise DaemonError(
+                f"Cannot connect to daemon at {self.socket_path}: {e}. "
+                "Start it with: python cli.py daemon"
+            ) from e
+
+        self._sock = sock
+        self._reader = sock.makefile("rb")
+
+    def call(self, command: str, **params) -> dict:
+        """
+        Send one command and wait for its result.
+
+        Args:
+            command: Command name (ping, test, order, shutdown)
+            **params: Command parameters
+
+        Returns:
+            Result dictionary
+
+        Raises:
+            DaemonError: If the daemon cannot be reached
+            DaemonCommandError: If the command failed in the daemon
+        """
+        if self._sock is None:
+            self.connect()
+
+        self._next_id += 1
+        message = {"id": self._next_id, "command": command, "params": params}
+
+        try:
+            self._sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+            line = self._reader.readline()
+        except OSError as e:
+            self.close()
+            raise DaemonError(f"Daemon connection failed: {e}") from e
+
+        if not line:
+            self.close()
+            raise DaemonError("Daemon closed the connection")
+
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise DaemonCommandError(reply.get("errorType", "Error"), reply.get("error", ""))
+        return reply.get("result", {})
+
+    def ping(self) -> dict:
+        """Check the daemon is alive; returns uptime and clock offset."""
+        return self.call("ping")
+
+    def test_connection(self) -> dict:
+        """Ask the daemon to check connectivity to Binance."""
+        return self.call("test")
+
+    def place_order(
+        self,
+        symbol: str,
+        side: str,
+        order_type: str,
+        quantity: str,
+        price: Optional[str] = None
+    ) -> dict:
+        """Validate and place an order through the daemon's warm client."""
+        return self.call(
+            "order",
+            symbol=symbol,
+            side=side,
+            type=order_type,
+            quantity=str(quantity),
+            price=str(price) if price is not None else None,
+        )
+
+    def close(self) -> None:
+        """Close the socket connection."""
+        if self._reader:
+            self._reader.close()
+            self._reader = None
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit."""
+        self.close()
@@ -0,0 +1,59 @@
+# trading_bot/bot/exceptions.py
+"""
+Client exception types.
+
+Kept separate from client.py so callers can catch these errors without
+importing httpx (e.g. the CLI's --help and dry-run paths).
+"""
+
+from typing import Optional
+
+
+# Binance error code for "Order does not exist": the only lookup answer that
+# proves an order whose response was lost never reached the matching engine
+ORDER_NOT_FOUND = -2013
+
+
+class BinanceClientError(Exception):
+    """Exception raised for Binance API errors."""
+
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        self.code = code  # Binance error code (e.g. -2013), if the API returned one
+
+
+class BinanceNetworkError(Exception):
+    """Exception raised for network-related errors."""
+    pass
+
+
+class CircuitOpenError(BinanceNetworkError):
+    """Exception raised when a circuit breaker rejects a call without sending it."""
+    pass
+
+
+class RateLimitError(BinanceNetworkError):
+    """Exception raised while Binance's Retry-After (HTTP 429/418) is in force."""
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class WebSocketUnavailableError(BinanceNetworkError):
+    """Exception raised when a request could not be sent over the WebSocket API (safe to resend)."""
+    pass
+
+
+class OrderStatusUnknownError(BinanceNetworkError):
+    """
+    Exception raised when an order may or may not have been placed.
+
+    The order request was sent but its answer was lost, and looking it up
+    by client order ID failed too. Check the order (``client_order_id``)
+    before sending it again.
+    """
+
+    def __init__(self, message: str, client_order_id: str):
+        super().__init__(message)
+        self.client_order_id = client_order_id
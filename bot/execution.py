@@ -0,0 +1,755 @@
+# trading_bot/bot/execution.py
+"""
+Execution algorithms that slice a large parent order into child orders.
+
+- TWAP: spreads the quantity evenly over a time window
+- ICEBERG: shows one small visible clip at a time, next clip after a fill
+- POV: follows a fixed share of the volume traded in the market
+
+Children are scheduled on an asyncio loop. The REST client is blocking, so
+submissions and fill polling run in worker threads and can overlap.
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_DOWN
+from typing import Callable, Optional, TYPE_CHECKING
+
+from .exceptions import ORDER_NOT_FOUND, BinanceClientError, BinanceNetworkError
+from .logging_config import setup_logger
+from .models import OrderRequest
+from .orders import place_order, OrderError
+from .ratelimit import RateLimiter
+from .risk import RiskCheckError
+
+if TYPE_CHECKING:
+    from .client import BinanceFuturesClient
+    from .risk import RiskGate
+
+
+logger = setup_logger()
+
+TERMINAL_STATUSES = {"FILLED", "CANCELED", "EXPIRED", "REJECTED", "ERROR"}
+
+# Child sent but its answer lost: may exist on the exchange, so its whole
+# quantity stays committed until a lookup by client order ID settles it
+UNKNOWN = "UNKNOWN"
+
+# Children that never reached the book
+NOT_SENT_STATUSES = {"REJECTED", "ERROR"}
+
+
+class ExecutionError(Exception):
+    """Exception raised when an execution cannot be started."""
+    pass
+
+
+def round_to_step(quantity: float, step_size: float) -> float:
+    """
+    Round a quantity down to a multiple of the exchange step size.
+
+    Args:
+        quantity: Raw quantity
+        step_size: LOT_SIZE stepSize (0 disables rounding)
+
+    Returns:
+        Rounded quantity
+    """
+    if step_size <= 0:
+        return quantity
+
+    step = Decimal(str(step_size))
+    steps = (Decimal(str(quantity)) / step).to_integral_value(rounding=ROUND_DOWN)
+    return float(steps * step)
+
+
+@dataclass
+class ChildOrder:
+    """A single child order sent on behalf of a parent execution."""
+    index: int
+    quantity: float
+    submitted_at: float
+    client_order_id: Optional[str] = None
+    order_id: Optional[int] = None
+    status: str = "PENDING"
+    executed_qty: float = 0.0
+    avg_price: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the child can still receive fills."""
+        return self.status not in TERMINAL_STATUSES
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        return {
+            "index": self.index,
+            "orderId": self.order_id,
+            "clientOrderId": self.client_order_id,
+            "quantity": self.quantity,
+            "executedQty": self.executed_qty,
+            "avgPrice": self.avg_price,
+            "status": self.status,
+            "submittedAt": self.submitted_at,
+            "error": self.error,
+        }
+
+
+@dataclass
+class ExecutionProgress:
+    """Live progress of a parent order execution."""
+    execution_id: str
+    algo: str
+    symbol: str
+    side: str
+    order_type: str
+    target_qty: float
+    children: list = field(default_factory=list)
+    status: str = "PENDING"
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    cancel_requested: bool = False
+
+    @classmethod
+    def for_parent(cls, parent: OrderRequest, algo_name: str) -> "ExecutionProgress":
+        """Create an empty progress record for a parent order."""
+        return cls(
+            execution_id=uuid.uuid4().hex[:12],
+            algo=algo_name,
+            symbol=parent.symbol,
+            side=parent.side,
+            order_type=parent.order_type,
+            target_qty=parent.quantity,
+        )
+
+    @property
+    def filled_qty(self) -> float:
+        """Total quantity filled across all children."""
+        return sum(c.executed_qty for c in self.children)
+
+    @property
+    def committed_qty(self) -> float:
+        """Quantity filled or still working on the book."""
+        return sum(c.quantity if c.is_open else c.executed_qty for c in self.children)
+
+    @property
+    def remaining_qty(self) -> float:
+        """Quantity not yet sent to the exchange."""
+        return max(self.target_qty - self.committed_qty, 0.0)
+
+    @property
+    def open_children(self) -> list:
+        """Children that are still working."""
+        return [c for c in self.children if c.is_open]
+
+    @property
+    def avg_price(self) -> Optional[float]:
+        """Volume-weighted average fill price."""
+        notional = sum(c.executed_qty * c.avg_price for c in self.children if c.avg_price)
+        filled = sum(c.executed_qty for c in self.children if c.avg_price)
+        return notional / filled if filled else None
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dictionary."""
+        children = list(self.children)
+        return {
+            "executionId": self.execution_id,
+            "algo": self.algo,
+            "symbol": self.symbol,
+            "side": self.side,
+            "type": self.order_type,
+            "status": self.status,
+            "targetQty": self.target_qty,
+            "filledQty": self.filled_qty,
+            "remainingQty": self.remaining_qty,
+            "percentFilled": round(100 * self.filled_qty / self.target_qty, 2),
+            "avgPrice": self.avg_price,
+            "startedAt": self.started_at,
+            "finishedAt": self.finished_at,
+            "error": self.error,
+            "children": [c.to_dict() for c in children],
+        }
+
+    def __str__(self) -> str:
+        """One-line progress summary."""
+        return (
+            f"[{self.algo}] {self.symbol} {self.side} "
+            f"{self.filled_qty:g}/{self.target_qty:g} filled "
+            f"({len(self.children)} children, {self.status})"
+        )
+
+
+class ExecutionAlgorithm:
+    """
+    Base class for slicing algorithms.
+
+    The scheduler calls ``next_quantity`` every ``interval`` seconds and
+    sends a child for the returned size (rounded to the step size).
+    """
+    name = "BASE"
+    wait_for_fills = False
+
+    def __init__(self, interval: float):
+        if interval <= 0:
+            raise ValueError("interval must be greater than 0")
+        self.interval = interval
+
+    async def next_quantity(self, progress: ExecutionProgress) -> float:
+        """Return the size of the next child order (0 to skip this tick)."""
+        raise NotImplementedError
+
+    def plan(self, quantity: float) -> Optional[list]:
+        """Return the static child schedule, or None if it depends on the market."""
+        return None
+
+
+class TWAP(ExecutionAlgorithm):
+    """Time-weighted average price: equal slices over a fixed duration."""
+    name = "TWAP"
+
+    def __init__(self, duration: float, slices: int):
+        """
+        Args:
+            duration: Total execution time in seconds
+            slices: Number of child orders
+        """
+        if slices < 1:
+            raise ValueError("slices must be at least 1")
+        super().__init__(interval=duration / slices)
+        self.slices = slices
+
+    async def next_quantity(self, progress: ExecutionProgress) -> float:
+        sent = sum(1 for c in progress.children if c.status not in NOT_SENT_STATUSES)
+        # Later slices absorb step-size rounding dust from earlier ones
+        return progress.remaining_qty / max(self.slices - sent, 1)
+
+    def plan(self, quantity: float) -> Optional[list]:
+        return [quantity / self.slices] * self.slices
+
+
+class Iceberg(ExecutionAlgorithm):
+    """Iceberg: a small visible clip, replenished only after it fills."""
+    name = "ICEBERG"
+    wait_for_fills = True
+
+    def __init__(self, visible_qty: float, interval: float = 1.0):
+        """
+        Args:
+            visible_qty: Size of each visible clip
+            interval: Delay between clips in seconds
+        """
+        if visible_qty <= 0:
+            raise ValueError("visible_qty must be greater than 0")
+        super().__init__(interval=interval)
+        self.visible_qty = visible_qty
+
+    async def next_quantity(self, progress: ExecutionProgress) -> float:
+        return min(self.visible_qty, progress.remaining_qty)
+
+    def plan(self, quantity: float) -> Optional[list]:
+        full, rest = divmod(quantity, self.visible_qty)
+        return [self.visible_qty] * int(full) + ([rest] if rest > 1e-12 else [])
+
+
+class POV(ExecutionAlgorithm):
+    """Percentage of volume: trade a fixed share of observed market volume."""
+    name = "POV"
+
+    def __init__(
+        self,
+        participation: float,
+        volume_source: Callable[[], float],
+        interval: float = 5.0
+    ):
+        """
+        Args:
+            participation: Target share of market volume (0 < p <= 1)
+            volume_source: Blocking callable returning cumulative market volume
+            interval: Seconds between volume samples
+        """
+        if not 0 < participation <= 1:
+            raise ValueError("participation must be in (0, 1]")
+        super().__init__(interval=interval)
+        self.participation = participation
+        self.volume_source = volume_source
+        self._baseline: Optional[float] = None
+
+    async def next_quantity(self, progress: ExecutionProgress) -> float:
+        volume = await asyncio.to_thread(self.volume_source)
+        if self._baseline is None:
+            self._baseline = volume
+            return 0.0
+
+        allowed = self.participation * max(volume - self._baseline, 0.0)
+        return max(allowed - progress.committed_qty, 0.0)
+
+
+class KlineVolume:
+    """
+    Market volume traded in a symbol since this source was created.
+
+    Sums the volume of 1m klines from the minute it was created, so the
+    count only grows (a rolling 24h figure can fall as old trades drop out
+    of the window). Closed bars are summed once and not fetched again.
+    """
+
+    def __init__(self, client: "BinanceFuturesClient", symbol: str):
+        """
+        Args:
+            client: Client used to fetch klines
+            symbol: Trading pair symbol
+        """
+        self.client = client
+        self.symbol = symbol
+        self._next_open = int(time.time() * 1000) // 60_000 * 60_000
+        self._closed_volume = 0.0
+
+    def __call__(self) -> float:
+        rows = self.client.get_klines(self.symbol, "1m", start_time=self._next_open)
+        if not rows:
+            return self._closed_volume
+        # Every row but the last is a closed bar; the last may still be filling
+        self._closed_volume += sum(float(row[5]) for row in rows[:-1])
+        self._next_open = int(rows[-1][0])
+        return self._closed_volume + float(rows[-1][5])
+
+
+def build_algorithm(
+    name: str,
+    client: Optional["BinanceFuturesClient"] = None,
+    symbol: Optional[str] = None,
+    duration: float = 60.0,
+    slices: int = 10,
+    visible_qty: Optional[float] = None,
+    participation: float = 0.1,
+    interval: Optional[float] = None
+) -> ExecutionAlgorithm:
+    """
+    Build an execution algorithm from CLI/dashboard parameters.
+
+    Args:
+        name: twap, iceberg or pov (case-insensitive)
+        client: Client used by POV to sample market volume
+        symbol: Symbol used by POV to sample market volume
+        duration: TWAP duration in seconds
+        slices: TWAP number of slices
+        visible_qty: ICEBERG clip size
+        participation: POV participation rate
+        interval: Override the delay between children
+
+    Returns:
+        Configured ExecutionAlgorithm
+
+    Raises:
+        ExecutionError: If the name or parameters are invalid
+    """
+    name = name.upper()
+    try:
+        if name == "TWAP":
+            return TWAP(duration=duration, slices=slices)
+
+        if name == "ICEBERG":
+            if visible_qty is None:
+                raise ExecutionError("ICEBERG requires a visible quantity")
+            return Iceberg(visible_qty=visible_qty, interval=interval or 1.0)
+
+        if name == "POV":
+            if client is None or symbol is None:
+                raise ExecutionError("POV requires a client and symbol")
+            return POV(
+                participation=participation,
+                volume_source=KlineVolume(client, symbol),
+                interval=interval or 5.0,
+            )
+    except ValueError as e:
+        raise ExecutionError(str(e)) from e
+
+    raise ExecutionError(f"Unknown algorithm '{name}'. Use TWAP, ICEBERG or POV.")
+
+
+class ExecutionScheduler:
+    """
+    Drives an ExecutionAlgorithm for a parent order.
+
+    Child sizes are rounded to the symbol's LOT_SIZE step and capped at
+    maxQty; submissions go through a rate limiter so a fast schedule cannot
+    exceed exchange order limits. With a risk gate, the parent is checked
+    before the first child (RiskGate.check_parent) and every child goes
+    through the gate like a single order; a rejected child counts as a
+    child error.
+
+    Every child carries a newClientOrderId. A child whose answer is lost
+    (timeout, dropped connection) stays UNKNOWN with its full quantity
+    committed until a lookup by that ID finds it or answers -2013, so a
+    lost answer never leads to the quantity being sent twice.
+    """
+
+    def __init__(
+        self,
+        client: "BinanceFuturesClient",
+        rate_limiter: Optional[RateLimiter] = None,
+        poll_interval: float = 1.0,
+        max_child_errors: int = 3,
+        on_progress: Optional[Callable[[ExecutionProgress], None]] = None,
+        risk_gate: Optional["RiskGate"] = None,
+        risk_state_ttl: float = 10.0
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            client: BinanceFuturesClient instance
+            rate_limiter: Limiter for child submissions (default 5 orders/s)
+            poll_interval: Seconds between fill status polls
+            max_child_errors: Consecutive child failures before aborting
+            on_progress: Callback invoked after every progress change
+            risk_gate: Pre-trade risk gate for the parent and each child
+                (None or a gate without limits: no checks)
+            risk_state_ttl: Seconds the gate's marks/positions are used
+                before positionRisk is fetched again
+        """
+        self.client = client
+        self.rate_limiter = rate_limiter or RateLimiter(rate=5, capacity=5)
+        self.poll_interval = poll_interval
+        self.max_child_errors = max_child_errors
+        self.on_progress = on_progress
+        self.risk_gate = risk_gate if risk_gate is not None and risk_gate.enabled else None
+        self.risk_state_ttl = risk_state_ttl
+
+    def _refresh_risk_state(self, symbol: str) -> None:
+        """Reload marks and positions into the gate if they are stale (blocking)."""
+        gate = self.risk_gate
+        if gate is None or not gate.needs_state or not gate.is_stale(self.risk_state_ttl):
+            return
+        try:
+            gate.load_position_risk(self.client.get_position_risk(symbol))
+        except Exception as e:
+            # The gate fails closed on a missing mark, so carrying on is safe
+            logger.warning(f"Risk state refresh failed for {symbol}: {e}")
+
+    def precheck(self, parent: OrderRequest) -> None:
+        """
+        Check the whole parent order against the risk gate (blocking).
+
+        Raises:
+            RiskCheckError: If the gate rejects the parent
+        """
+        if self.risk_gate is None:
+            return
+        self._refresh_risk_state(parent.symbol)
+        self.risk_gate.check_parent(parent.symbol, parent.side, parent.quantity, parent.price)
+
+    def _place_child(self, request: OrderRequest):
+        """Refresh gate state if stale, then check and place one child (blocking)."""
+        self._refresh_risk_state(request.symbol)
+        return place_order(self.client, request, self.risk_gate)
+
+    def _notify(self, progress: ExecutionProgress) -> None:
+        if self.on_progress:
+            self.on_progress(progress)
+
+    async def _load_lot_size(self, parent: OrderRequest) -> tuple[float, float, float]:
+        """Return (stepSize, minQty, maxQty) for the parent symbol and type."""
+        filters = await asyncio.to_thread(self.client.get_symbol_filters, parent.symbol)
+
+        key = "LOT_SIZE"
+        if parent.order_type == "MARKET" and "MARKET_LOT_SIZE" in filters:
+            key = "MARKET_LOT_SIZE"
+        lot = filters.get(key, {})
+
+        return (
+            float(lot.get("stepSize", 0)),
+            float(lot.get("minQty", 0)),
+            float(lot.get("maxQty", 0)),
+        )
+
+    async def _submit(
+        self,
+        parent: OrderRequest,
+        quantity: float,
+        progress: ExecutionProgress
+    ) -> bool:
+        """Send one child order. Returns False if the exchange rejected it."""
+        await self.rate_limiter.acquire_async()
+
+        index = len(progress.children)
+        child = ChildOrder(
+            index=index,
+            quantity=quantity,
+            submitted_at=time.time(),
+            client_order_id=f"tb-{progress.execution_id}-{index}"
+        )
+        progress.children.append(child)
+
+        request = OrderRequest(
+            symbol=parent.symbol,
+            side=parent.side,
+            order_type=parent.order_type,
+            quantity=quantity,
+            price=parent.price,
+            time_in_force=parent.time_in_force,
+            client_order_id=child.client_order_id,
+        )
+
+        try:
+            response = await asyncio.to_thread(self._place_child, request)
+        except RiskCheckError as e:
+            child.status = "REJECTED"
+            child.error = f"Risk check failed: {e}"
+            logger.warning(f"Execution {progress.execution_id} child {child.index} rejected: {e}")
+            self._notify(progress)
+            return False
+        except OrderError as e:
+            child.error = str(e)
+            if isinstance(e.__cause__, BinanceNetworkError):
+                # Timeout or lost answer: the order may be live, never resend it blind
+                child.status = UNKNOWN
+                logger.error(
+                    f"Execution {progress.execution_id} child {child.index} "
+                    f"({child.client_order_id}) outcome unknown: {e}"
+                )
+            else:
+                child.status = "ERROR"
+                logger.error(f"Execution {progress.execution_id} child {child.index} failed: {e}")
+            self._notify(progress)
+            return False
+
+        self._apply_fill(child, response)
+        logger.info(
+            f"Execution {progress.execution_id} child {child.index}: "
+            f"{quantity} -> order {child.order_id} ({child.status})"
+        )
+        self._notify(progress)
+        return True
+
+    @staticmethod
+    def _apply_fill(child: ChildOrder, response) -> None:
+        child.order_id = response.order_id
+        child.status = response.status or child.status
+        child.executed_qty = float(response.executed_qty or 0)
+        if response.avg_price and float(response.avg_price) > 0:
+            child.avg_price = float(response.avg_price)
+
+    async def _reconcile(self, progress: ExecutionProgress, child: ChildOrder) -> None:
+        """
+        Settle an UNKNOWN child by looking it up by client order ID.
+
+        Only "order does not exist" (-2013) frees its quantity; any other
+        lookup error leaves it UNKNOWN for the next poll.
+        """
+        try:
+            response = await asyncio.to_thread(
+                self.client.get_order, progress.symbol, client_order_id=child.client_order_id
+            )
+        except BinanceClientError as e:
+            if e.code != ORDER_NOT_FOUND:
+                logger.warning(f"Lookup failed for order {child.client_order_id}: {e}")
+                return
+            child.status = "ERROR"
+            child.error = f"{child.error} (order was not placed)"
+            logger.info(f"Execution {progress.execution_id} child {child.index} was not placed")
+            self._notify(progress)
+            return
+        except Exception as e:
+            logger.warning(f"Lookup failed for order {child.client_order_id}: {e}")
+            return
+
+        self._apply_fill(child, response)
+        logger.info(
+            f"Execution {progress.execution_id} child {child.index} was placed: "
+            f"order {child.order_id} ({child.status})"
+        )
+        self._notify(progress)
+
+    async def _poll_fills(self, progress: ExecutionProgress) -> None:
+        """Refresh open children until the execution finishes."""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+
+            for child in progress.open_children:
+                if child.status == UNKNOWN:
+                    await self._reconcile(progress, child)
+                    continue
+                if child.order_id is None:
+                    continue
+                try:
+                    response = await asyncio.to_thread(
+                        self.client.get_order, progress.symbol, child.order_id
+                    )
+                except Exception as e:
+                    logger.warning(f"Fill poll failed for order {child.order_id}: {e}")
+                    continue
+
+                before = (child.status, child.executed_qty)
+                self._apply_fill(child, response)
+                if (child.status, child.executed_qty) != before:
+                    self._notify(progress)
+
+    async def _cancel_open(self, progress: ExecutionProgress) -> None:
+        # An UNKNOWN child may be working on the book: find it before cancelling
+        for child in progress.open_children:
+            if child.status == UNKNOWN:
+                await self._reconcile(progress, child)
+        for child in progress.open_children:
+            if child.order_id is None:
+                continue
+            try:
+                response = await asyncio.to_thread(
+                    self.client.cancel_order, progress.symbol, child.order_id
+                )
+                self._apply_fill(child, response)
+            except Exception as e:
+                logger.warning(f"Cancel failed for order {child.order_id}: {e}")
+
+    async def run(
+        self,
+        parent: OrderRequest,
+        algo: ExecutionAlgorithm,
+        progress: Optional[ExecutionProgress] = None,
+        timeout: Optional[float] = None
+    ) -> ExecutionProgress:
+        """
+        Execute a parent order.
+
+        Args:
+            parent: Validated parent OrderRequest
+            algo: Slicing algorithm
+            progress: Existing progress record to fill in (optional)
+            timeout: Give up and cancel working children after this many seconds
+
+        Returns:
+            Final ExecutionProgress
+        """
+        progress = progress or ExecutionProgress.for_parent(parent, algo.name)
+        progress.status = "RUNNING"
+        progress.started_at = time.time()
+        deadline = progress.started_at + timeout if timeout else None
+
+        logger.info(
+            f"Starting execution {progress.execution_id}: {algo.name} "
+            f"{parent.symbol} {parent.side} {parent.quantity}"
+        )
+
+        poller = None
+        try:
+            await asyncio.to_thread(self.precheck, parent)
+            step, min_qty, max_qty = await self._load_lot_size(parent)
+            min_tradable = max(min_qty, step, 1e-12)
+            poller = asyncio.create_task(self._poll_fills(progress))
+            self._notify(progress)
+            errors = 0
+
+            while True:
+                if progress.cancel_requested or (deadline and time.time() >= deadline):
+                    await self._cancel_open(progress)
+                    progress.status = "CANCELED"
+                    break
+
+                remaining = round_to_step(progress.remaining_qty, step)
+                if remaining < min_tradable:
+                    if not progress.open_children:
+                        progress.status = "COMPLETED"
+                        break
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                if algo.wait_for_fills and progress.open_children:
+                    await asyncio.sleep(self.poll_interval)
+                    continue
+
+                quantity = min(await algo.next_quantity(progress), remaining)
+                if max_qty:
+                    quantity = min(quantity, max_qty)
+                quantity = round_to_step(quantity, step)
+
+                if quantity >= min_tradable:
+                    if await self._submit(parent, quantity, progress):
+                        errors = 0
+                    else:
+                        errors += 1
+                        if errors >= self.max_child_errors:
+                            progress.status = "FAILED"
+                            progress.error = progress.children[-1].error
+                            for child in progress.open_children:
+                                if child.status == UNKNOWN:
+                                    await self._reconcile(progress, child)
+                            break
+
+                await asyncio.sleep(algo.interval)
+
+        except Exception as e:
+            logger.error(f"Execution {progress.execution_id} aborted: {e}", exc_info=True)
+            progress.status = "FAILED"
+            progress.error = str(e)
+
+        finally:
+            if poller:
+                poller.cancel()
+            progress.finished_at = time.time()
+            self._notify(progress)
+
+        logger.info(f"Execution {progress.execution_id} finished: {progress}")
+        return progress
+
+
+class ExecutionManager:
+    """
+    Runs executions on a background event loop and keeps their progress.
+
+    Used by the dashboard, whose request handlers are synchronous: they start
+    an execution and return immediately, and later read its progress by ID.
+    """
+
+    def __init__(self, scheduler: ExecutionScheduler):
+        self.scheduler = scheduler
+        self._executions: dict[str, ExecutionProgress] = {}
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="execution-loop", daemon=True
+        )
+        self._thread.start()
+
+    def start(
+        self,
+        parent: OrderRequest,
+        algo: ExecutionAlgorithm,
+        timeout: Optional[float] = None
+    ) -> ExecutionProgress:
+        """
+        Start an execution in the background and return its progress record.
+
+        Raises:
+            RiskCheckError: If the risk gate rejects the parent order
+        """
+        self.scheduler.precheck(parent)
+        progress = ExecutionProgress.for_parent(parent, algo.name)
+        self._executions[progress.execution_id] = progress
+        asyncio.run_coroutine_threadsafe(
+            self.scheduler.run(parent, algo, progress, timeout), self._loop
+        )
+        return progress
+
+    def get(self, execution_id: str) -> Optional[ExecutionProgress]:
+        """Look up an execution by ID."""
+        return self._executions.get(execution_id)
+
+    def cancel(self, execution_id: str) -> bool:
+        """Request cancellation of a running execution."""
+        progress = self._executions.get(execution_id)
+        if progress is None:
+            return False
+        progress.cancel_requested = True
+        return True
+
+    def list_executions(self) -> list:
+        """All executions started by this manager, newest first."""
+        return sorted(
+            self._executions.values(),
+            key=lambda p: p.started_at or 0,
+            reverse=True
+        )
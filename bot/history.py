@@ -0,0 +1,478 @@
+# trading_bot/bot/history.py
+"""
+Local trade and income history in SQLite.
+
+HistorySync pulls account fills (/fapi/v1/userTrades) and income records
+(/fapi/v1/income: realized PnL, commissions, funding) into a HistoryStore.
+Each run resumes where the last one stopped: fills from the highest stored
+trade ID per symbol, income from the newest stored record.
+
+The store keeps a per-day rollup of fills next to the raw rows. A query
+reads whole days from the rollup and only scans raw rows for the partial
+days at the edges of its range, so PnL and fee totals over hundreds of
+thousands of fills take milliseconds.
+"""
+
+import asyncio
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+
+from .logging_config import setup_logger
+from .ratelimit import RateLimiter
+
+if TYPE_CHECKING:
+    from .async_client import AsyncBinanceFuturesClient
+
+
+logger = setup_logger()
+
+DAY_MS = 86_400_000
+
+# Binance rejects userTrades/income windows longer than 7 days
+WINDOW_MS = 7 * DAY_MS
+
+# Maximum rows per request and request weights
+PAGE_LIMIT = 1000
+TRADES_WEIGHT = 5
+INCOME_WEIGHT = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    symbol TEXT NOT NULL,
+    id INTEGER NOT NULL,
+    order_id INTEGER,
+    side TEXT,
+    position_side TEXT,
+    price REAL,
+    qty REAL,
+    quote_qty REAL,
+    realized_pnl REAL,
+    commission REAL,
+    commission_asset TEXT,
+    maker INTEGER,
+    time INTEGER NOT NULL,
+    PRIMARY KEY (symbol, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS trades_time ON trades (time);
+CREATE INDEX IF NOT EXISTS trades_symbol_time ON trades (symbol, time);
+
+CREATE TABLE IF NOT EXISTS trade_daily (
+    symbol TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    commission_asset TEXT NOT NULL,
+    fills INTEGER,
+    quote_qty REAL,
+    realized_pnl REAL,
+    commission REAL,
+    PRIMARY KEY (symbol, day, commission_asset)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS trade_daily_day ON trade_daily (day);
+
+CREATE TABLE IF NOT EXISTS income (
+    tran_id INTEGER NOT NULL,
+    income_type TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    asset TEXT NOT NULL,
+    amount REAL,
+    time INTEGER NOT NULL,
+    trade_id TEXT,
+    info TEXT,
+    PRIMARY KEY (tran_id, income_type, symbol, asset)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS income_type_time ON income (income_type, time, symbol, amount);
+CREATE INDEX IF NOT EXISTS income_symbol_time ON income (symbol, time, income_type, amount);
+"""
+
+# GROUP BY expressions for PnLSummary keys
+GROUPINGS = {
+    "symbol": ("symbol", "symbol"),
+    "day": ("time / 86400000", "day"),
+    "total": ("'ALL'", "'ALL'"),
+}
+
+
+class HistoryError(Exception):
+    """Exception raised for history sync or query errors."""
+    pass
+
+
+@dataclass
+class PnLSummary:
+    """Fill totals for one symbol, day or the whole range."""
+    key: str
+    fills: int = 0
+    volume: float = 0.0              # quote asset notional
+    realized_pnl: float = 0.0
+    fees: dict = field(default_factory=dict)   # commission asset -> amount
+    funding: float = 0.0
+
+    @property
+    def net(self) -> float:
+        """Realized PnL after USDT fees and funding."""
+        return self.realized_pnl - self.fees.get("USDT", 0.0) + self.funding
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-serializable dict."""
+        return {
+            "key": self.key,
+            "fills": self.fills,
+            "volume": self.volume,
+            "realizedPnl": self.realized_pnl,
+            "fees": self.fees,
+            "funding": self.funding,
+            "net": self.net,
+        }
+
+
+def _split_range(start_ms: Optional[int], end_ms: Optional[int]) -> tuple:
+    """
+    Split [start_ms, end_ms) into raw edges and whole days.
+
+    Returns:
+        (list of (start, end) raw ranges, (first_day, last_day) or None);
+        None bounds are open
+    """
+    first_day = -(-start_ms // DAY_MS) if start_ms is not None else None
+    last_day = end_ms // DAY_MS if end_ms is not None else None
+    if first_day is not None and last_day is not None and first_day >= last_day:
+        return [(start_ms, end_ms)], None
+
+    edges = []
+    if start_ms is not None and start_ms < first_day * DAY_MS:
+        edges.append((start_ms, first_day * DAY_MS))
+    if end_ms is not None and last_day * DAY_MS < end_ms:
+        edges.append((last_day * DAY_MS, end_ms))
+    return edges, (first_day, last_day)
+
+
+def _where(column: str, low, high, symbol: Optional[str]) -> tuple:
+    """WHERE clause and params for low <= column < high (None = open)."""
+    clauses, params = [], []
+    if symbol:
+        clauses.append("symbol = ?")
+        params.append(symbol)
+    if low is not None:
+        clauses.append(f"{column} >= ?")
+        params.append(low)
+    if high is not None:
+        clauses.append(f"{column} < ?")
+        params.append(high)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+class HistoryStore:
+    """SQLite store for fills and income records."""
+
+    def __init__(self, path: str = "data/history.db"):
+        """
+        Open (and create if needed) the history database.
+
+        Args:
+            path: Database file
+        """
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        """Close the database."""
+        self.db.close()
+
+    # --- writes ---------------------------------------------------------------
+
+    def add_trades(self, trades: list) -> int:
+        """
+        Insert raw /fapi/v1/userTrades rows (duplicates are ignored).
+
+        Returns:
+            Number of new fills stored
+        """
+        if not trades:
+            return 0
+        rows = [(
+            t["symbol"], int(t["id"]), t.get("orderId"), t.get("side"), t.get("positionSide"),
+            float(t["price"]), float(t["qty"]), float(t.get("quoteQty", 0)),
+            float(t.get("realizedPnl", 0)), float(t.get("commission", 0)),
+            t.get("commissionAsset", ""), int(bool(t.get("maker"))), int(t["time"]),
+        ) for t in trades]
+
+        with self._transaction():
+            before = self.db.total_changes
+            self.db.executemany(
+                "INSERT OR IGNORE INTO trades VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            added = self.db.total_changes - before
+            # Recompute the rollup for every day these fills touched
+            touched = {}
+            for row in rows:
+                day = row[12] // DAY_MS
+                touched[row[0]] = min(touched.get(row[0], day), day)
+            for symbol, first_day in touched.items():
+                self.db.execute(
+                    "INSERT OR REPLACE INTO trade_daily "
+                    "SELECT symbol, time / 86400000, commission_asset, COUNT(*), "
+                    "SUM(quote_qty), SUM(realized_pnl), SUM(commission) "
+                    "FROM trades WHERE symbol = ? AND time >= ? "
+                    "GROUP BY time / 86400000, commission_asset",
+                    (symbol, first_day * DAY_MS),
+                )
+        return added
+
+    def add_income(self, records: list) -> int:
+        """
+        Insert raw /fapi/v1/income rows (duplicates are ignored).
+
+        Returns:
+            Number of new records stored
+        """
+        if not records:
+            return 0
+        rows = [(
+            int(r["tranId"]), r["incomeType"], r.get("symbol") or "", r.get("asset", ""),
+            float(r["income"]), int(r["time"]), r.get("tradeId") or None, r.get("info") or None,
+        ) for r in records]
+        with self._transaction():
+            before = self.db.total_changes
+            self.db.executemany("INSERT OR IGNORE INTO income VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            return self.db.total_changes - before
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN ... COMMIT around a batch (ROLLBACK on error)."""
+        self.db.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    # --- sync cursors ---------------------------------------------------------
+
+    def last_trade_id(self, symbol: str) -> Optional[int]:
+        """Highest stored trade ID for a symbol, or None."""
+        return self.db.execute("SELECT MAX(id) FROM trades WHERE symbol = ?", (symbol,)).fetchone()[0]
+
+    def last_income_time(self) -> Optional[int]:
+        """Time of the newest stored income record, or None."""
+        return self.db.execute("SELECT MAX(time) FROM income").fetchone()[0]
+
+    def symbols(self) -> list:
+        """Symbols with stored fills or income."""
+        rows = self.db.execute(
+            "SELECT DISTINCT symbol FROM trade_daily UNION "
+            "SELECT DISTINCT symbol FROM income WHERE symbol != ''"
+        ).fetchall()
+        return sorted(r[0] for r in rows)
+
+    # --- queries --------------------------------------------------------------
+
+    def summary(
+        self,
+        by: str = "symbol",
+        symbol: Optional[str] = None,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
+    ) -> list:
+        """
+        Fills, volume, realized PnL, fees and funding over [start_ms, end_ms).
+
+        Args:
+            by: Group rows by ``symbol``, ``day`` (UTC) or ``total``
+            symbol: Only this symbol
+            start_ms: Range start (default: everything)
+            end_ms: Range end, exclusive (default: now)
+
+        Returns:
+            List of PnLSummary, sorted by key
+
+        Raises:
+            HistoryError: If ``by`` is not a known grouping
+        """
+        if by not in GROUPINGS:
+            raise HistoryError(f"Unknown grouping '{by}' (use {', '.join(GROUPINGS)})")
+        raw_key, daily_key = GROUPINGS[by]
+        results: dict = {}
+
+        def get(key) -> PnLSummary:
+            key = time.strftime("%Y-%m-%d", time.gmtime(key * 86400)) if by == "day" else key
+            if key not in results:
+                results[key] = PnLSummary(key)
+            return results[key]
+
+        def add(rows) -> None:
+            for key, asset, fills, volume, pnl, fee in rows:
+                summary = get(key)
+                summary.fills += fills
+                summary.volume += volume or 0.0
+                summary.realized_pnl += pnl or 0.0
+                if fee:
+                    summary.fees[asset] = summary.fees.get(asset, 0.0) + fee
+
+        edges, days = _split_range(start_ms, end_ms)
+        for low, high in edges:
+            where, params = _where("time", low, high, symbol)
+            add(self.db.execute(
+                f"SELECT {raw_key}, commission_asset, COUNT(*), SUM(quote_qty), "
+                f"SUM(realized_pnl), SUM(commission) FROM trades{where} "
+                f"GROUP BY 1, 2", params
+            ))
+        if days is not None:
+            where, params = _where("day", days[0], days[1], symbol)
+            add(self.db.execute(
+                f"SELECT {daily_key}, commission_asset, SUM(fills), SUM(quote_qty), "
+                f"SUM(realized_pnl), SUM(commission) FROM trade_daily{where} "
+                f"GROUP BY 1, 2", params
+            ))
+
+        where, params = _where("time", start_ms, end_ms, symbol)
+        where += (" AND " if where else " WHERE ") + "income_type = 'FUNDING_FEE'"
+        for key, amount in self.db.execute(
+            f"SELECT {raw_key}, SUM(amount) FROM income{where} GROUP BY 1", params
+        ):
+            get(key).funding += amount or 0.0
+
+        return [results[k] for k in sorted(results)]
+
+    def income_totals(
+        self,
+        symbol: Optional[str] = None,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
+    ) -> dict:
+        """Sum of income records per type over [start_ms, end_ms)."""
+        where, params = _where("time", start_ms, end_ms, symbol)
+        return dict(self.db.execute(
+            f"SELECT income_type, SUM(amount) FROM income{where} GROUP BY income_type", params
+        ).fetchall())
+
+
+class HistorySync:
+    """
+    Incremental download of fills and income into a HistoryStore.
+
+    Income is one chain of 7-day windows. Fills are paged per symbol by
+    trade ID, with symbols fetched concurrently under a request-weight
+    limiter. Each page is committed as one batch, so an interrupted sync
+    resumes from the last committed page.
+    """
+
+    def __init__(
+        self,
+        client: "AsyncBinanceFuturesClient",
+        store: HistoryStore,
+        concurrency: int = 5,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        """
+        Initialize sync.
+
+        Args:
+            client: AsyncBinanceFuturesClient instance
+            store: Destination HistoryStore
+            concurrency: Maximum symbols fetched at once
+            rate_limiter: Request-weight limiter (default: 2400 weight/min)
+        """
+        self.client = client
+        self.store = store
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter or RateLimiter.per_window(2400, 60)
+
+    async def sync_income(self, since_ms: int) -> int:
+        """
+        Store income records from the newest stored one (or ``since_ms``) to now.
+
+        Returns:
+            Number of new records
+        """
+        now = int(time.time() * 1000)
+        cursor = max(since_ms, self.store.last_income_time() or since_ms)
+        stored = 0
+        while cursor < now:
+            window_end = min(cursor + WINDOW_MS, now)
+            await self.rate_limiter.acquire_async(INCOME_WEIGHT)
+            page = await self.client.get_income(cursor, window_end - 1, limit=PAGE_LIMIT)
+            stored += self.store.add_income(page)
+            if len(page) < PAGE_LIMIT:
+                cursor = window_end
+            else:
+                # Full page: continue from its newest record (duplicates are ignored)
+                last = int(page[-1]["time"])
+                cursor = last if last > cursor else cursor + 1
+        logger.info(f"Stored {stored} new income record(s)")
+        return stored
+
+    async def sync_trades(self, symbol: str, since_ms: int) -> int:
+        """
+        Store fills for one symbol after the highest stored trade ID.
+
+        Without stored fills, 7-day windows from ``since_ms`` are searched
+        for the first one; later pages follow by trade ID.
+
+        Returns:
+            Number of new fills
+        """
+        symbol = symbol.upper()
+        now = int(time.time() * 1000)
+        last_id = self.store.last_trade_id(symbol)
+        stored = 0
+
+        cursor = since_ms
+        while last_id is None and cursor < now:
+            window_end = min(cursor + WINDOW_MS, now)
+            await self.rate_limiter.acquire_async(TRADES_WEIGHT)
+            page = await self.client.get_user_trades(
+                symbol, start_time=cursor, end_time=window_end - 1, limit=PAGE_LIMIT
+            )
+            stored += self.store.add_trades(page)
+            if page:
+                last_id = max(int(t["id"]) for t in page)
+            cursor = window_end
+
+        while last_id is not None:
+            await self.rate_limiter.acquire_async(TRADES_WEIGHT)
+            page = await self.client.get_user_trades(symbol, from_id=last_id + 1, limit=PAGE_LIMIT)
+            stored += self.store.add_trades(page)
+            if len(page) < PAGE_LIMIT:
+                break
+            last_id = max(int(t["id"]) for t in page)
+
+        logger.info(f"Stored {stored} new fill(s) for {symbol}")
+        return stored
+
+    async def sync(self, symbols: Optional[list] = None, since_ms: Optional[int] = None) -> dict:
+        """
+        Sync income, then fills for ``symbols``.
+
+        Args:
+            symbols: Symbols to fetch fills for (default: every symbol seen
+                in stored fills or income)
+            since_ms: Earliest time for a first sync (default: 30 days ago)
+
+        Returns:
+            Mapping of "income" and each symbol -> new rows (or the exception raised)
+        """
+        since_ms = since_ms or int(time.time() * 1000) - 30 * DAY_MS
+        results: dict = {}
+        try:
+            results["income"] = await self.sync_income(since_ms)
+        except Exception as e:
+            results["income"] = e
+
+        symbols = [s.upper() for s in symbols] if symbols else self.store.symbols()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(symbol: str) -> int:
+            async with semaphore:
+                return await self.sync_trades(symbol, since_ms)
+
+        fills = await asyncio.gather(*(fetch(s) for s in symbols), return_exceptions=True)
+        results.update(zip(symbols, fills))
+        return results
@@ -0,0 +1,150 @@
+# trading_bot/bot/http_cache.py
+"""
+HTTP caching and compression helpers for the dashboard server.
+
+- Content-hashed static asset names, so assets can be cached for a year
+  and a deploy changes the URL instead of waiting for expiry
+- Weak ETags for conditional GETs (304 Not Modified)
+- Cache-Control policies per route
+- gzip, or brotli when the optional ``brotli`` package is installed
+"""
+
+import gzip
+import hashlib
+import os
+from typing import Optional
+
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "text/html",
+    "text/css",
+    "text/javascript",
+    "application/javascript",
+    "text/plain",
+)
+
+# One year: safe because hashed asset URLs change with their content
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+NO_STORE = "private, no-store"
+
+_hash_cache: dict = {}
+_compressed_cache: dict = {}
+
+
+def content_hash(path: str, length: int = 10) -> str:
+    """
+    Short SHA-256 of a file's contents (recomputed only when mtime changes).
+
+    Args:
+        path: File path
+        length: Hex digits to keep
+
+    Returns:
+        Hex digest prefix
+    """
+    mtime = os.stat(path).st_mtime_ns
+    cached = _hash_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()[:length]
+    _hash_cache[path] = (mtime, digest)
+    return digest
+
+
+def hashed_name(directory: str, filename: str) -> str:
+    """``app.js`` -> ``app.<hash>.js`` for a file in ``directory``."""
+    stem, ext = os.path.splitext(filename)
+    return f"{stem}.{content_hash(os.path.join(directory, filename))}{ext}"
+
+
+def etag_for(body: bytes) -> str:
+    """
+    Weak ETag for a response body.
+
+    Weak, because the same representation is served gzip, brotli or plain.
+    """
+    return 'W/"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header matches ``etag`` (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in tags
+
+
+def market_data_policy(max_age: int, s_maxage: int, stale: int, shared: bool = True) -> str:
+    """
+    Cache-Control for market data.
+
+    Args:
+        max_age: Seconds browsers may reuse the response
+        s_maxage: Seconds a CDN may reuse it
+        stale: Seconds a CDN may serve it stale while refetching in the background
+        shared: False keeps it out of shared caches (browser only)
+    """
+    if not shared:
+        return f"private, max-age={max_age}"
+    return f"public, max-age={max_age}, s-maxage={s_maxage}, stale-while-revalidate={stale}"
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick ``br`` (if brotli is installed) or ``gzip`` from Accept-Encoding."""
+    accepted = {
+        part.split(";")[0].strip().lower()
+        for part in (accept_encoding or "").split(",")
+        if not part.strip().endswith(";q=0")
+    }
+    if "br" in accepted:
+        try:
+            import brotli  # noqa: F401
+            return "br"
+        except ImportError:
+            pass
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, cache_key: Optional[str] = None) -> bytes:
+    """
+    Compress a body with gzip or brotli.
+
+    Args:
+        body: Uncompressed bytes
+        encoding: "gzip" or "br"
+        cache_key: Keep the result in memory under this key (e.g. the ETag
+            of a static asset), so repeated requests skip compression
+
+    Returns:
+        Compressed bytes
+    """
+    if cache_key is not None:
+        cached = _compressed_cache.get((cache_key, encoding))
+        if cached is not None:
+            return cached
+
+    if encoding == "br":
+        import brotli
+        compressed = brotli.compress(body, quality=5)
+    else:
+        compressed = gzip.compress(body, compresslevel=6)
+
+    if cache_key is not None:
+        _compressed_cache[(cache_key, encoding)] = compressed
+    return compressed
+
+
+def is_compressible(mimetype: Optional[str]) -> bool:
+    """True for text-like content types."""
+    return bool(mimetype) and mimetype.split(";")[0].strip() in COMPRESSIBLE_TYPES
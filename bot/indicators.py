@@ -0,0 +1,615 @@
+# trading_bot/bot/indicators.py
+"""
+Streaming technical indicators with a matching NumPy batch mode.
+
+Each indicator has two modes:
+
+- Streaming: ``update()`` takes one tick or bar and costs amortized O(1),
+  whatever the window. Rolling state lives in ring buffers allocated up
+  front. SMA, Bollinger and VWAP rewrite their ring once every ``period``
+  values (see _CumulativeWindow), so that one update costs O(period),
+  e.g. 200 steps for a 200-bar SMA.
+- Batch: ``batch()`` computes the whole series from history arrays, shaped
+  (T,) for one symbol or (T, N) for N symbols. ``warm()`` runs a batch and
+  loads its final state, so streaming continues from the history.
+
+The two modes give bitwise identical results. Both do the same IEEE-754
+operations in the same order, once on Python floats and once on float64
+arrays. Windowed means use cumulative sums taken relative to a reference
+price that restart every ``period`` values: streaming keeps the running
+sums and a ring of the last ``period`` of them, and batch uses ``np.cumsum``
+per block of ``period`` values, which adds in the same sequence.
+Recursive indicators (EMA, RSI, ATR) step through time in batch mode,
+vectorized across symbols.
+
+Every output is NaN until ``period`` values have been seen.
+"""
+
+import math
+from functools import partial
+from typing import Optional
+
+import numpy as np
+
+
+NAN = math.nan
+
+
+class IndicatorError(Exception):
+    """Exception raised for invalid indicator parameters or input."""
+    pass
+
+
+def _prepend_zero(c: np.ndarray) -> np.ndarray:
+    """C_0 = 0 followed by C_1..C_T along the time axis."""
+    return np.concatenate((np.zeros((1,) + c.shape[1:]), c))
+
+
+def _warmup_nan(series: np.ndarray, count: int) -> np.ndarray:
+    """Series with the first ``count`` rows set to NaN (not enough data yet)."""
+    series[:count] = NAN
+    return series
+
+
+class Indicator:
+    """
+    Base class. Subclasses implement update() and _batch().
+
+    Attributes:
+        period: Window length
+        value: Latest output (NaN until ready)
+        count: Values seen so far
+    """
+
+    def __init__(self, period: int):
+        if period < 1:
+            raise IndicatorError("period must be at least 1")
+        self.period = period
+        self.value = NAN
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        """True once the window is full."""
+        return self.count >= self.period
+
+    def update(
+        self,
+        close: float,
+        high: Optional[float] = None,
+        low: Optional[float] = None,
+        volume: float = 0.0
+    ) -> float:
+        """Add one tick/bar and return the new value."""
+        raise NotImplementedError
+
+    def _batch(self, close, high, low, volume) -> tuple:
+        """Return (series, final streaming state as attribute dict)."""
+        raise NotImplementedError
+
+    def batch(
+        self,
+        close: np.ndarray,
+        high: Optional[np.ndarray] = None,
+        low: Optional[np.ndarray] = None,
+        volume: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Compute the indicator over history without touching streaming state.
+
+        Args:
+            close: Prices, shape (T,) or (T, N)
+            high: Bar highs (default: close)
+            low: Bar lows (default: close)
+            volume: Volumes (default: zeros)
+
+        Returns:
+            Output series with the same shape as ``close``
+        """
+        close = np.asarray(close, dtype=np.float64)
+        if close.shape[0] == 0:
+            raise IndicatorError("batch() needs at least one value")
+        high = close if high is None else np.asarray(high, dtype=np.float64)
+        low = close if low is None else np.asarray(low, dtype=np.float64)
+        volume = np.zeros_like(close) if volume is None else np.asarray(volume, dtype=np.float64)
+        return self._batch(close, high, low, volume)[0]
+
+    def warm(
+        self,
+        close: np.ndarray,
+        high: Optional[np.ndarray] = None,
+        low: Optional[np.ndarray] = None,
+        volume: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Initialize from one symbol's history (shape (T,)) in batch mode.
+
+        Replaces any streaming state. The next update() continues exactly
+        as if every historical value had been streamed.
+
+        Returns:
+            The historical output series
+        """
+        close = np.asarray(close, dtype=np.float64)
+        if close.ndim != 1:
+            raise IndicatorError("warm() takes one symbol's history, shape (T,)")
+        high = close if high is None else np.asarray(high, dtype=np.float64)
+        low = close if low is None else np.asarray(low, dtype=np.float64)
+        volume = np.zeros_like(close) if volume is None else np.asarray(volume, dtype=np.float64)
+        series, state = self._batch(close, high, low, volume)
+        for attr, value in state.items():
+            setattr(self, attr, value)
+        return series
+
+
+class _CumulativeWindow(Indicator):
+    """
+    Shared ring-of-cumulative-sums machinery for SMA, Bollinger and VWAP.
+
+    Sums are taken relative to a reference price and restart every
+    ``period`` values. At each wrap the ring holds exactly the last window;
+    it is rewritten relative to the latest close (``_shift``) and the
+    running sums reset to zero. So the sums stay window-sized however long
+    the stream runs, and a price that drifts far from the first one cannot
+    cancel out a small variance.
+    """
+
+    # Cumulative sums this indicator keeps, one ring each
+    SUMS: tuple = ()
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.ref: Optional[float] = None
+        self.sums = [0.0] * len(self.SUMS)
+        self.rings = [[0.0] * period for _ in self.SUMS]
+
+    def _terms(self, close, volume, ref) -> tuple:
+        """One term per sum for a value, relative to ``ref`` (floats or arrays)."""
+        raise NotImplementedError
+
+    def _shift(self, sums: tuple, n, delta) -> tuple:
+        """Sums over ``n`` values re-expressed relative to a ref ``delta`` higher."""
+        raise NotImplementedError
+
+    def _push(self, close: float, volume: float) -> list:
+        """Add one value's terms; return each window total (current - period ago)."""
+        if self.ref is None:
+            self.ref = close
+        terms = self._terms(close, volume, self.ref)
+        pos = self.count % self.period
+        self.count += 1
+        totals = []
+        for i, term in enumerate(terms):
+            ring = self.rings[i]
+            old = ring[pos]
+            self.sums[i] = self.sums[i] + term
+            ring[pos] = self.sums[i]
+            totals.append(self.sums[i] - old)
+        return totals
+
+    def _rebase(self, close: float) -> None:
+        """After every ``period`` values, restart the sums relative to ``close``."""
+        if self.count % self.period:
+            return
+        delta = close - self.ref
+        for pos in range(self.period):
+            # Sums over the values after slot pos, which the next window still holds
+            rest = tuple(total - ring[pos] for total, ring in zip(self.sums, self.rings))
+            for ring, value in zip(self.rings, self._shift(rest, self.period - 1 - pos, delta)):
+                ring[pos] = -value
+        self.sums = [0.0] * len(self.SUMS)
+        self.ref = close
+
+    def _window_totals(self, close: np.ndarray, volume: np.ndarray) -> tuple:
+        """
+        Batch counterpart of _push and _rebase.
+
+        Returns:
+            (window totals per sum, ref used for each value, final state)
+        """
+        n = self.period
+        count = close.shape[0]
+        tail = close.shape[1:]
+        blocks = -(-count // n)
+        full = count // n
+
+        # Block k is taken relative to the close that ended block k - 1
+        block_refs = np.concatenate((close[:1], close[n - 1:(blocks - 1) * n:n]))
+        ref = np.repeat(block_refs, n, axis=0)[:count]
+        pad = np.zeros((blocks * n - count,) + tail)
+        local = [
+            np.cumsum(np.concatenate((term, pad)).reshape((blocks, n) + tail), axis=1)
+            for term in self._terms(close, volume, ref)
+        ]
+
+        # Rings as _rebase leaves them after each full block
+        delta = (close[n - 1::n][:full] - block_refs[:full])[:, np.newaxis]
+        rest = tuple(c[:full, -1:] - c[:full] for c in local)
+        left = (n - 1 - np.arange(n)).reshape((1, n) + (1,) * len(tail))
+        rebased = [-value for value in self._shift(rest, left, delta)]
+
+        totals = []
+        for c, rings in zip(local, rebased):
+            lagged = np.concatenate((np.zeros((1, n) + tail), rings))[:blocks]
+            totals.append((c - lagged).reshape((blocks * n,) + tail)[:count])
+
+        state: dict = {"count": count}
+        if close.ndim == 1:
+            last, filled = blocks - 1, count % n
+            if filled == 0:
+                sums = [0.0] * len(local)
+                rings = [[float(v) for v in r[-1]] for r in rebased]
+                final_ref = float(close[-1])
+            else:
+                sums = [float(c[last, filled - 1]) for c in local]
+                rings = [
+                    [float(v) for v in np.concatenate(
+                        (c[last, :filled], (r[last - 1] if last else np.zeros(n))[filled:])
+                    )]
+                    for c, r in zip(local, rebased)
+                ]
+                final_ref = float(block_refs[last])
+            state.update(sums=sums, rings=rings, ref=final_ref)
+        return totals, ref, state
+
+
+class SMA(_CumulativeWindow):
+    """Simple moving average of close."""
+
+    SUMS = ("price",)
+
+    def _terms(self, close, volume, ref) -> tuple:
+        return (close - ref,)
+
+    def _shift(self, sums: tuple, n, delta) -> tuple:
+        return (sums[0] - n * delta,)
+
+    def update(self, close, high=None, low=None, volume=0.0) -> float:
+        (total,) = self._push(close, volume)
+        self.value = total / self.period + self.ref if self.count >= self.period else NAN
+        self._rebase(close)
+        return self.value
+
+    def _batch(self, close, high, low, volume) -> tuple:
+        (total,), ref, state = self._window_totals(close, volume)
+        series = _warmup_nan(total / self.period + ref, self.period - 1)
+        if close.ndim == 1:
+            state.update(value=float(series[-1]))
+        return series, state
+
+
+class Bollinger(_CumulativeWindow):
+    """
+    Bollinger Bands: SMA of close +/- ``width`` population standard deviations.
+
+    ``value`` is the middle band; ``upper`` and ``lower`` hold the bands.
+    batch() returns shape (..., 3): middle, upper, lower.
+    """
+
+    SUMS = ("price", "square")
+
+    def __init__(self, period: int = 20, width: float = 2.0):
+        super().__init__(period)
+        self.width = width
+        self.upper = NAN
+        self.lower = NAN
+
+    def _terms(self, close, volume, ref) -> tuple:
+        d = close - ref
+        return d, d * d
+
+    def _shift(self, sums: tuple, n, delta) -> tuple:
+        total, total_sq = sums
+        return total - n * delta, total_sq - 2.0 * delta * total + n * delta * delta
+
+    def update(self, close, high=None, low=None, volume=0.0) -> float:
+        total, total_sq = self._push(close, volume)
+        if self.count >= self.period:
+            mean = total / self.period
+            var = total_sq / self.period - mean * mean
+            band = self.width * math.sqrt(var if var > 0.0 else 0.0)
+            self.value = mean + self.ref
+            self.upper = self.value + band
+            self.lower = self.value - band
+        self._rebase(close)
+        return self.value
+
+    def _batch(self, close, high, low, volume) -> tuple:
+        (total, total_sq), ref, state = self._window_totals(close, volume)
+        mean = total / self.period
+        var = total_sq / self.period - mean * mean
+        band = self.width * np.sqrt(np.where(var > 0.0, var, 0.0))
+        middle = mean + ref
+        series = np.stack((middle, middle + band, middle - band), axis=-1)
+        series = _warmup_nan(series, self.period - 1)
+        if close.ndim == 1:
+            state.update(value=float(series[-1, 0]),
+                         upper=float(series[-1, 1]), lower=float(series[-1, 2]))
+        return series, state
+
+
+class VWAP(_CumulativeWindow):
+    """
+    Volume-weighted average price over the last ``period`` ticks/bars.
+
+    NaN while the window holds no volume.
+    """
+
+    SUMS = ("volume", "weighted")
+
+    def _terms(self, close, volume, ref) -> tuple:
+        return volume, (close - ref) * volume
+
+    def _shift(self, sums: tuple, n, delta) -> tuple:
+        vol, weighted = sums
+        return vol, weighted - delta * vol
+
+    def update(self, close, high=None, low=None, volume=0.0) -> float:
+        vol, weighted = self._push(close, volume)
+        ready = self.count >= self.period and vol != 0.0
+        self.value = weighted / vol + self.ref if ready else NAN
+        self._rebase(close)
+        return self.value
+
+    def _batch(self, close, high, low, volume) -> tuple:
+        (vol, weighted), ref, state = self._window_totals(close, volume)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            series = np.where(vol != 0.0, weighted / vol + ref, NAN)
+        series = _warmup_nan(series, self.period - 1)
+        if close.ndim == 1:
+            state.update(value=float(series[-1]))
+        return series, state
+
+
+class EMA(Indicator):
+    """Exponential moving average (alpha = 2 / (period + 1)), seeded with the first price."""
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self.alpha = 2.0 / (period + 1)
+        self.ema = NAN
+
+    def update(self, close, high=None, low=None, volume=0.0) -> float:
+        self.ema = close if self.count == 0 else self.ema + self.alpha * (close - self.ema)
+        self.count += 1
+        self.value = self.ema if self.count >= self.period else NAN
+        return self.value
+
+    def _batch(self, close, high, low, volume) -> tuple:
+        out = np.empty_like(close)
+        prices = _steps(close)
+        ema = prices[0]
+        out[0] = ema
+        for t in range(1, len(close)):
+            ema = ema + self.alpha * (prices[t] - ema)
+            out[t] = ema
+        series = _warmup_nan(out, self.period - 1)
+        state = {}
+        if close.ndim == 1:
+            state = {"count": len(close), "ema": float(ema), "value": float(series[-1])}
+        return series, state
+
+
+def _steps(values: np.ndarray):
+    """
+    Per-step inputs for a recursive batch loop.
+
+    One symbol steps through Python floats (much faster than NumPy scalars,
+    same IEEE-754 arithmetic); several symbols step through row vectors.
+    """
+    return values.tolist() if values.ndim == 1 else values
+
+
+def _wilder(avg, x, period: int):
+    """One step of Wilder smoothing (works on floats and arrays alike)."""
+    return (avg * (period - 1) + x) / period
+
+
+class RSI(Indicator):
+    """Relative Strength Index with Wilder smoothing."""
+
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self.prev = NAN
+        self.changes = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    @property
+    def ready(self) -> bool:
+        return self.changes >= self.period
+
+    @staticmethod
+    def _rsi(avg_gain: float, avg_loss: float) -> float:
+        if avg_loss == 0.0:
+            return 50.0 if avg_gain == 0.0 else 100.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    def update(self, close, high=None, low=None, volume=0.0) -> float:
+        self.count += 1
+        if self.count == 1:
+            self.prev = close
+            return self.value
+        change = close - self.prev
+        self.prev = close
+        gain = (abs(change) + change) * 0.5
+        loss = (abs(change) - change) * 0.5
+        self.changes += 1
+        n = self.period
+        if self.changes <= n:
+            # Seed: plain sums, divided once the first window is full
+            self.avg_gain = self.avg_gain + gain
+            self.avg_loss = self.avg_loss + loss
+            if self.changes < n:
+                return self.value
+            self.avg_gain = self.avg_gain / n
+            self.avg_loss = self.avg_loss / n
+        else:
+            self.avg_gain = _wilder(self.avg_gain, gain, n)
+            self.avg_loss = _wilder(self.avg_loss, loss, n)
+        self.value = self._rsi(self.avg_gain, self.avg_loss)
+        return self.value
+
+    def _batch(self, close, high, low, volume) -> tuple:
+        n = self.period
+        out = np.full_like(close, NAN)
+        change = close[1:] - close[:-1]
+        gain = (np.abs(change) + change) * 0.5
+        loss = (np.abs(change) - change) * 0.5
+        changes = len(change)
+
+        avg_gain = _steps(np.cumsum(gain[:n], axis=0))[-1] if changes else np.zeros(close.shape[1:])
+        avg_loss = _steps(np.cumsum(loss[:n], axis=0))[-1] if changes else np.zeros(close.shape[1:])
+        if changes >= n:
+            avg_gain = avg_gain / n
+            avg_loss = avg_loss / n
+            gains, losses = [avg_gain], [avg_loss]
+            gain_steps, loss_steps = _steps(gain), _steps(loss)
+            for t in range(n, changes):
+                avg_gain = _wilder(avg_gain, gain_steps[t], n)
+                avg_loss = _wilder(avg_loss, loss_steps[t], n)
+                gains.append(avg_gain)
+                losses.append(avg_loss)
+            g, lo = np.array(gains), np.array(losses)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rsi = np.where(lo == 0.0, np.where(g == 0.0, 50.0, 100.0), 100.0 - 100.0 / (1.0 + g / lo))
+            out[n:] = rsi
+
+        state = {}
+        if close.ndim == 1:
+            state = {
+                "count": len(close), "changes": changes, "prev": float(close[-1]),
+                "avg_gain": float(avg_gain), "avg_loss": float(avg_loss), "value": float(out[-1]),
+            }
+        return out, state
+
+
+class ATR(Indicator):
+    """
+    Average True Range with Wilder smoothing.
+
+    On ticks (no high/low) the true range is the absolute price change.
+    """
+
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self.prev_close = NAN
+        self.atr = 0.0
+
+    def update(self, close, high=None, low=None, volume=0.0) -> float:
+        high = close if high is None else high
+        low = close if low is None else low
+        if self.count == 0:
+            tr = high - low
+        else:
+            tr = max(high - low, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+        self.count += 1
+        n = self.period
+        if self.count <= n:
+            self.atr = self.atr + tr
+            if self.count < n:
+                return self.value
+            self.atr = self.atr / n
+        else:
+            self.atr = _wilder(self.atr, tr, n)
+        self.value = self.atr
+        return self.value
+
+    def _batch(self, close, high, low, volume) -> tuple:
+        n = self.period
+        tr = high - low
+        if len(close) > 1:
+            prev = close[:-1]
+            tr[1:] = np.maximum(np.maximum(tr[1:], np.abs(high[1:] - prev)), np.abs(low[1:] - prev))
+
+        out = np.full_like(close, NAN)
+        atr = _steps(np.cumsum(tr[:n], axis=0))[-1]
+        if len(close) >= n:
+            atr = atr / n
+            out[n - 1] = atr
+            tr_steps = _steps(tr)
+            for t in range(n, len(close)):
+                atr = _wilder(atr, tr_steps[t], n)
+                out[t] = atr
+
+        state = {}
+        if close.ndim == 1:
+            state = {"count": len(close), "prev_close": float(close[-1]),
+                     "atr": float(atr), "value": float(out[-1])}
+        return out, state
+
+
+class IndicatorEngine:
+    """
+    One set of indicators per symbol, fed from a tick or bar stream.
+
+    Usage:
+        engine = IndicatorEngine({"ema12": lambda: EMA(12), "rsi14": lambda: RSI(14)})
+        engine.warm("BTCUSDT", klines)          # optional, from history
+        engine.on_tick("BTCUSDT", 65000.0)
+        engine.values("BTCUSDT")                # {"ema12": ..., "rsi14": ...}
+    """
+
+    def __init__(self, factories: dict):
+        """
+        Initialize engine.
+
+        Args:
+            factories: Output name -> zero-argument callable building an Indicator
+        """
+        self.factories: dict = factories
+        self.names = list(factories)
+        self._indicators: dict = {}
+
+    def indicators(self, symbol: str) -> list:
+        """This symbol's indicators (created on first use), in factory order."""
+        indicators = self._indicators.get(symbol)
+        if indicators is None:
+            indicators = [factory() for factory in self.factories.values()]
+            self._indicators[symbol] = indicators
+        return indicators
+
+    def on_tick(
+        self,
+        symbol: str,
+        price: float,
+        volume: float = 0.0,
+        high: Optional[float] = None,
+        low: Optional[float] = None
+    ) -> None:
+        """Update every indicator of ``symbol`` with one tick or bar."""
+        indicators = self._indicators.get(symbol) or self.indicators(symbol)
+        for indicator in indicators:
+            indicator.update(price, high, low, volume)
+
+    def warm(self, symbol: str, data) -> None:
+        """Initialize a symbol's indicators from bars (a KlineData) in batch mode."""
+        for indicator in self.indicators(symbol):
+            indicator.warm(data.close, data.high, data.low, data.volume)
+
+    def values(self, symbol: str) -> dict:
+        """Latest value per output name (Bollinger: (middle, upper, lower))."""
+        result = {}
+        for name, indicator in zip(self.names, self.indicators(symbol)):
+            if isinstance(indicator, Bollinger):
+                result[name] = (indicator.value, indicator.upper, indicator.lower)
+            else:
+                result[name] = indicator.value
+        return result
+
+
+# Indicator set used by the benchmark and as a reasonable default. Partials
+# rather than lambdas, so the set can be pickled into worker processes.
+DEFAULT_INDICATORS: dict = {
+    "sma20": partial(SMA, 20),
+    "sma50": partial(SMA, 50),
+    "sma200": partial(SMA, 200),
+    "ema12": partial(EMA, 12),
+    "ema26": partial(EMA, 26),
+    "ema200": partial(EMA, 200),
+    "rsi14": partial(RSI, 14),
+    "atr14": partial(ATR, 14),
+    "vwap100": partial(VWAP, 100),
+    "bb20": partial(Bollinger, 20, 2.0),
+}
@@ -8,6 +8,17 @@ import os
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
+from .tracing import current_request_id
+
+
+class CorrelationFilter(logging.Filter):
+    """Adds the current request ID to records as ``correlation`` (" [id]" or "")."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_id = current_request_id()
+        record.correlation = f" [{request_id}]" if request_id else ""
+        return True
+
 
 def setup_logger(name: str = "trading_bot", log_dir: str = "logs") -> logging.Logger:
     """
@@ -45,13 +56,16 @@ def setup_logger(name: str = "trading_bot", log_dir: str = "logs") -> logging.Lo
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.ERROR)
     
-    # Create formatter
+    # Create formatter; lines written while handling a request carry its ID
     formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        '%(asctime)s - %(name)s - %(levelname)s -%(correlation)s %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     file_handler.setFormatter(formatter)
     console_handler.setFormatter(formatter)
+    correlation = CorrelationFilter()
+    file_handler.addFilter(correlation)
+    console_handler.addFilter(correlation)
     
     # Add handlers
     logger.addHandler(file_handler)
@@ -0,0 +1,402 @@
+# trading_bot/bot/marketdata.py
+"""
+Historical kline downloader and columnar on-disk cache.
+
+Layout: one NumPy ``.npy`` file per column under
+``<root>/<SYMBOL>/<interval>/<column>.npy``. Files are appended in place
+(new rows written after the last valid row, then the header's shape is
+updated), so incremental updates never rewrite history, and reads are
+memory-mapped so range queries return views without copying.
+"""
+
+import asyncio
+import io
+import time
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+
+import numpy as np
+
+from .backtest import KlineData
+from .logging_config import setup_logger
+from .ratelimit import RateLimiter
+
+if TYPE_CHECKING:
+    from .async_client import AsyncBinanceFuturesClient
+
+
+logger = setup_logger()
+
+# Column name -> (dtype, index in the raw /fapi/v1/klines row)
+KLINE_COLUMNS = {
+    "open_time": (np.int64, 0),
+    "open": (np.float64, 1),
+    "high": (np.float64, 2),
+    "low": (np.float64, 3),
+    "close": (np.float64, 4),
+    "volume": (np.float64, 5),
+    "quote_volume": (np.float64, 7),
+    "trades": (np.int64, 8),
+    "taker_buy_volume": (np.float64, 9),
+    "taker_buy_quote_volume": (np.float64, 10),
+}
+
+INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 3 * 60_000,
+    "5m": 5 * 60_000,
+    "15m": 15 * 60_000,
+    "30m": 30 * 60_000,
+    "1h": 3_600_000,
+    "2h": 2 * 3_600_000,
+    "4h": 4 * 3_600_000,
+    "6h": 6 * 3_600_000,
+    "8h": 8 * 3_600_000,
+    "12h": 12 * 3_600_000,
+    "1d": 86_400_000,
+    "3d": 3 * 86_400_000,
+    "1w": 7 * 86_400_000,
+}
+
+# Maximum bars per /fapi/v1/klines request and its request weight
+PAGE_LIMIT = 1500
+PAGE_WEIGHT = 10
+
+
+class MarketDataError(Exception):
+    """Exception raised for kline download or storage errors."""
+    pass
+
+
+def interval_to_ms(interval: str) -> int:
+    """
+    Convert a kline interval string to milliseconds.
+
+    Raises:
+        MarketDataError: If the interval is not supported
+    """
+    try:
+        return INTERVAL_MS[interval]
+    except KeyError:
+        raise MarketDataError(
+            f"Unsupported interval '{interval}'. Use one of: {', '.join(INTERVAL_MS)}"
+        ) from None
+
+
+def parse_klines(rows: list) -> dict:
+    """
+    Convert raw /fapi/v1/klines rows to column arrays.
+
+    Args:
+        rows: Raw kline rows
+
+    Returns:
+        Mapping of column name -> array
+    """
+    if not rows:
+        return {name: np.empty(0, dtype=dtype) for name, (dtype, _) in KLINE_COLUMNS.items()}
+
+    # Rows mix ints and numeric strings; go through float64 once
+    raw = np.asarray([row[:11] for row in rows], dtype=np.float64)
+    return {name: raw[:, index].astype(dtype) for name, (dtype, index) in KLINE_COLUMNS.items()}
+
+
+def _npy_length(path: Path) -> tuple[int, int]:
+    """Return (row count, header length) of a 1-D .npy file."""
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, _, _ = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, _, _ = np.lib.format.read_array_header_2_0(f)
+        return shape[0], f.tell()
+
+
+def _append_npy(path: Path, values: np.ndarray, valid_rows: int) -> None:
+    """
+    Append rows to a 1-D .npy file in place.
+
+    New rows are written after ``valid_rows`` (overwriting anything a crashed
+    writer left behind) and the header shape is updated last.
+    """
+    if not path.exists() or valid_rows == 0:
+        np.save(path, values)
+        return
+
+    _, header_len = _npy_length(path)
+    total = valid_rows + len(values)
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(header, {
+        "descr": np.lib.format.dtype_to_descr(values.dtype),
+        "fortran_order": False,
+        "shape": (total,),
+    })
+
+    if header.tell() != header_len:
+        # Older NumPy writes headers without growth padding; rewrite once
+        existing = np.load(path)[:valid_rows]
+        np.save(path, np.concatenate([existing, values]))
+        return
+
+    with open(path, "r+b") as f:
+        f.seek(header_len + valid_rows * values.dtype.itemsize)
+        f.write(values.tobytes())
+        f.truncate()
+
+        f.seek(0)
+        f.write(header.getvalue())
+
+
+class KlineStore:
+    """
+    Columnar on-disk kline cache, one directory per symbol and interval.
+    """
+
+    def __init__(self, root: str = "data/klines"):
+        """
+        Initialize store.
+
+        Args:
+            root: Root directory for cached data
+        """
+        self.root = Path(root)
+
+    def _dir(self, symbol: str, interval: str) -> Path:
+        return self.root / symbol.upper() / interval
+
+    def row_count(self, symbol: str, interval: str) -> int:
+        """
+        Number of complete rows stored.
+
+        If a previous append crashed midway, columns can differ in length;
+        the shortest column is the committed length.
+        """
+        directory = self._dir(symbol, interval)
+        lengths = []
+        for name in KLINE_COLUMNS:
+            path = directory / f"{name}.npy"
+            if not path.exists():
+                return 0
+            lengths.append(_npy_length(path)[0])
+        return min(lengths)
+
+    def last_open_time(self, symbol: str, interval: str) -> Optional[int]:
+        """Open time of the newest stored bar, or None if empty."""
+        count = self.row_count(symbol, interval)
+        if count == 0:
+            return None
+        path = self._dir(symbol, interval) / "open_time.npy"
+        return int(np.load(path, mmap_mode="r")[count - 1])
+
+    def append(self, symbol: str, interval: str, columns: dict) -> int:
+        """
+        Append bars newer than the last stored bar.
+
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval
+            columns: Column arrays as returned by parse_klines
+
+        Returns:
+            Number of rows appended
+        """
+        directory = self._dir(symbol, interval)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        count = self.row_count(symbol, interval)
+        last = self.last_open_time(symbol, interval)
+        keep = slice(None)
+        if last is not None:
+            keep = columns["open_time"] > last
+        rows = int(np.count_nonzero(keep)) if last is not None else len(columns["open_time"])
+        if rows == 0:
+            return 0
+
+        for name, (dtype, _) in KLINE_COLUMNS.items():
+            values = np.ascontiguousarray(columns[name][keep], dtype=dtype)
+            _append_npy(directory / f"{name}.npy", values, count)
+
+        return rows
+
+    def read(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None,
+        columns: Optional[list] = None
+    ) -> dict:
+        """
+        Read a time range as memory-mapped views (zero-copy).
+
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval
+            start_ms: First open time to include (optional)
+            end_ms: Open time to stop before (optional)
+            columns: Column names to return (default: all)
+
+        Returns:
+            Mapping of column name -> read-only array view
+
+        Raises:
+            MarketDataError: If nothing is stored for symbol/interval
+        """
+        count = self.row_count(symbol, interval)
+        if count == 0:
+            raise MarketDataError(f"No cached klines for {symbol.upper()} {interval}")
+
+        directory = self._dir(symbol, interval)
+        open_time = np.load(directory / "open_time.npy", mmap_mode="r")[:count]
+        lo = 0 if start_ms is None else int(np.searchsorted(open_time, start_ms, "left"))
+        hi = count if end_ms is None else int(np.searchsorted(open_time, end_ms, "left"))
+
+        return {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r")[lo:hi]
+            for name in (columns or KLINE_COLUMNS)
+        }
+
+    def load(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
+    ) -> KlineData:
+        """Read a time range as KlineData for the backtest engine (zero-copy)."""
+        data = self.read(symbol, interval, start_ms, end_ms,
+                         ["open_time", "open", "high", "low", "close", "volume"])
+        return KlineData(symbol.upper(), **data)
+
+
+class KlineDownloader:
+    """
+    Downloads /fapi/v1/klines history into a KlineStore.
+
+    The missing range is split into pages that are fetched concurrently
+    under a request-weight limiter. Completed pages are written in order
+    as soon as every earlier page is done, so an interrupted download
+    resumes from the last committed bar.
+    """
+
+    def __init__(
+        self,
+        client: "AsyncBinanceFuturesClient",
+        store: KlineStore,
+        concurrency: int = 5,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        """
+        Initialize downloader.
+
+        Args:
+            client: AsyncBinanceFuturesClient instance
+            store: Destination KlineStore
+            concurrency: Maximum pages in flight
+            rate_limiter: Request-weight limiter (default: 2400 weight/min)
+        """
+        self.client = client
+        self.store = store
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter or RateLimiter.per_window(2400, 60)
+
+    async def _fetch_page(self, symbol: str, interval: str, start: int, end: int) -> list:
+        await self.rate_limiter.acquire_async(PAGE_WEIGHT)
+        return await self.client.get_klines(
+            symbol, interval, start_time=start, end_time=end, limit=PAGE_LIMIT
+        )
+
+    async def download(
+        self,
+        symbol: str,
+        interval: str,
+        start_ms: int,
+        end_ms: Optional[int] = None
+    ) -> int:
+        """
+        Download and store all closed bars in [start_ms, end_ms).
+
+        Already-stored bars are skipped: the download resumes after the
+        newest cached bar.
+
+        Args:
+            symbol: Trading pair symbol
+            interval: Kline interval
+            start_ms: Earliest open time wanted
+            end_ms: Stop before this open time (default: now)
+
+        Returns:
+            Number of new bars stored
+        """
+        symbol = symbol.upper()
+        step = interval_to_ms(interval)
+        now = int(time.time() * 1000)
+        end_ms = min(end_ms or now, now)
+
+        last = self.store.last_open_time(symbol, interval)
+        if last is not None:
+            start_ms = max(start_ms, last + step)
+        start_ms -= start_ms % step
+
+        if start_ms >= end_ms:
+            logger.info(f"{symbol} {interval} already up to date")
+            return 0
+
+        page_span = PAGE_LIMIT * step
+        pages = [
+            (page_start, min(page_start + page_span, end_ms) - 1)
+            for page_start in range(start_ms, end_ms, page_span)
+        ]
+        logger.info(f"Downloading {symbol} {interval}: {len(pages)} page(s) from {start_ms}")
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(index: int):
+            async with semaphore:
+                rows = await self._fetch_page(symbol, interval, *pages[index])
+            # The current bar is still forming: keep only bars closed by now.
+            # Judged by close time, since bars are not aligned to the epoch
+            # (1w bars open on Monday)
+            return index, [row for row in rows if int(row[6]) < now]
+
+        tasks = [asyncio.create_task(fetch(i)) for i in range(len(pages))]
+        done_pages: dict[int, list] = {}
+        next_to_write = 0
+        stored = 0
+
+        try:
+            for finished in asyncio.as_completed(tasks):
+                index, rows = await finished
+                done_pages[index] = rows
+
+                # Commit the contiguous prefix so a crash loses nothing written
+                while next_to_write in done_pages:
+                    stored += self.store.append(
+                        symbol, interval, parse_klines(done_pages.pop(next_to_write))
+                    )
+                    next_to_write += 1
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        logger.info(f"Stored {stored} new bar(s) for {symbol} {interval}")
+        return stored
+
+    async def download_many(
+        self,
+        symbols: list,
+        interval: str,
+        start_ms: int,
+        end_ms: Optional[int] = None
+    ) -> dict:
+        """
+        Download several symbols concurrently (sharing the rate limiter).
+
+        Returns:
+            Mapping of symbol -> new bars stored (or the exception raised)
+        """
+        results = await asyncio.gather(
+            *(self.download(s, interval, start_ms, end_ms) for s in symbols),
+            return_exceptions=True,
+        )
+        return dict(zip((s.upper() for s in symbols), results))
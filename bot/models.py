@@ -16,6 +16,7 @@ class OrderRequest:
     quantity: float
     price: Optional[float] = None
     time_in_force: Optional[str] = None  # Required for LIMIT orders
+    client_order_id: Optional[str] = None  # newClientOrderId, to look the order up if its answer is lost
     
     def to_params(self) -> dict:
         """Convert to API parameters dictionary."""
@@ -31,6 +32,8 @@ class OrderRequest:
                 raise ValueError("Price is required for LIMIT orders")
             params["price"] = str(self.price)
             params["timeInForce"] = self.time_in_force or "GTC"
+        if self.client_order_id:
+            params["newClientOrderId"] = self.client_order_id
         
         return params
 
@@ -3,13 +3,18 @@
 Order placement business logic layer.
 """
 
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 
-from .client import BinanceFuturesClient
 from .logging_config import setup_logger
 from .models import OrderRequest, OrderResponse
+from .profiling import timed
 from .validators import validate_order_params, ValidationError
 
+if TYPE_CHECKING:
+    from .client import BinanceFuturesClient
+    from .risk import RiskGate
+    from .symbols import SymbolIndex
+
 
 logger = setup_logger()
 
@@ -19,12 +24,14 @@ class OrderError(Exception):
     pass
 
 
+@timed
 def create_order_request(
     symbol: str,
     side: str,
     order_type: str,
     quantity: str,
-    price: Optional[str] = None
+    price: Optional[str] = None,
+    symbol_index: Optional["SymbolIndex"] = None
 ) -> OrderRequest:
     """
     Create and validate an order request.
@@ -35,6 +42,7 @@ def create_order_request(
         order_type: Order type (MARKET/LIMIT)
         quantity: Order quantity
         price: Order price (required for LIMIT)
+        symbol_index: Cached exchangeInfo index for the tradable check (optional)
     
     Returns:
         Validated OrderRequest object
@@ -45,7 +53,7 @@ def create_order_request(
     logger.info(f"Creating order request: {symbol} {side} {order_type} {quantity}")
     
     # Validate all parameters
-    validated = validate_order_params(symbol, side, order_type, quantity, price)
+    validated = validate_order_params(symbol, side, order_type, quantity, price, symbol_index)
     symbol_v, side_v, type_v, quantity_v, price_v = validated
     
     # Create order request
@@ -62,9 +70,11 @@ def create_order_request(
     return order_request
 
 
+@timed
 def place_order(
-    client: BinanceFuturesClient,
-    order_request: OrderRequest
+    client: "BinanceFuturesClient",
+    order_request: OrderRequest,
+    risk_gate: Optional["RiskGate"] = None
 ) -> OrderResponse:
     """
     Place an order using the Binance client.
@@ -72,26 +82,44 @@ def place_order(
     Args:
         client: BinanceFuturesClient instance
         order_request: Validated OrderRequest
+        risk_gate: Pre-trade risk gate to check first (optional)
     
     Returns:
         OrderResponse from the API
     
     Raises:
+        RiskCheckError: If the risk gate rejects the order
         OrderError: If order placement fails
     """
+    if risk_gate is not None:
+        risk_gate.check(
+            order_request.symbol,
+            order_request.side,
+            order_request.quantity,
+            order_request.price
+        )
+    
     try:
         logger.info(f"Placing order: {order_request.symbol} {order_request.side} {order_request.order_type}")
         
+        extra = {}
+        if order_request.client_order_id:
+            extra["client_order_id"] = order_request.client_order_id
         response = client.place_order(
             symbol=order_request.symbol,
             side=order_request.side,
             order_type=order_request.order_type,
             quantity=order_request.quantity,
             price=order_request.price,
-            time_in_force=order_request.time_in_force
+            time_in_force=order_request.time_in_force,
+            **extra
         )
         
         logger.info(f"Order placed successfully: Order ID {response.order_id}")
+        
+        if risk_gate is not None and float(response.executed_qty or 0) > 0:
+            risk_gate.record_fill(order_request.symbol, order_request.side, float(response.executed_qty))
+        
         return response
     
     except Exception as e:
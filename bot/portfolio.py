@@ -0,0 +1,298 @@
+# trading_bot/bot/portfolio.py
+"""
+Vectorized position PnL and risk engine.
+
+Positions live in NumPy arrays indexed by symbol, so a mark-price update
+recomputes unrealized PnL, notional, margin ratio and liquidation distance
+for every symbol in one pass (tens of microseconds for hundreds of symbols).
+"""
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+
+# Tier-1 maintenance margin rate for most USDT-M perpetuals; override per
+# symbol from /fapi/v1/leverageBracket when the exact bracket matters
+DEFAULT_MAINT_MARGIN_RATE = 0.004
+
+
+def _finite(value: float) -> Optional[float]:
+    """Convert NaN/inf to None so results stay valid JSON."""
+    value = float(value)
+    return value if np.isfinite(value) else None
+
+
+def _ratio(maint_margin: float, margin_balance: float) -> Optional[float]:
+    """Account margin ratio; None once the margin balance is exhausted."""
+    if margin_balance > 0:
+        return maint_margin / margin_balance
+    return 0.0 if maint_margin == 0 else None
+
+
+@dataclass
+class Exposure:
+    """Aggregate account exposure."""
+
+    wallet_balance: float
+    margin_balance: float
+    unrealized_pnl: float
+    gross_notional: float
+    net_notional: float
+    long_notional: float
+    short_notional: float
+    initial_margin: float
+    maint_margin: float
+    margin_ratio: Optional[float]
+    closest_symbol: Optional[str] = None
+    closest_liq_distance: Optional[float] = None
+    positions: list = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert to the camelCase JSON shape used by the dashboard."""
+        return {
+            "walletBalance": self.wallet_balance,
+            "marginBalance": self.margin_balance,
+            "unrealizedPnl": self.unrealized_pnl,
+            "grossNotional": self.gross_notional,
+            "netNotional": self.net_notional,
+            "longNotional": self.long_notional,
+            "shortNotional": self.short_notional,
+            "initialMargin": self.initial_margin,
+            "maintMargin": self.maint_margin,
+            "marginRatio": self.margin_ratio,
+            "closestSymbol": self.closest_symbol,
+            "closestLiqDistance": self.closest_liq_distance,
+            "positions": self.positions,
+        }
+
+
+class RiskEngine:
+    """
+    Holds open positions as arrays and recomputes risk on every mark update.
+
+    Per position (isolated-margin model, cross accounts use the wallet for
+    the account-level ratio):
+        notional       = qty * mark
+        unrealized PnL = qty * (mark - entry)
+        margin         = |qty| * entry / leverage  (or the isolated wallet)
+        maint margin   = |notional| * maint_margin_rate
+        liq price      = (qty * entry - margin) / (qty - |qty| * maint_margin_rate)
+        liq distance   = fraction the mark can move against the position
+                         before it reaches the liquidation price
+    """
+
+    def __init__(self, wallet_balance: float = 0.0, capacity: int = 64):
+        """
+        Initialize engine.
+
+        Args:
+            wallet_balance: Account wallet balance in quote currency
+            capacity: Initial number of symbol slots (grows as needed)
+        """
+        self.wallet_balance = wallet_balance
+        self.symbols: list = []
+        self.index: dict = {}
+
+        self.qty = np.zeros(capacity)
+        self.entry = np.zeros(capacity)
+        self.mark = np.zeros(capacity)
+        self.leverage = np.ones(capacity)
+        self.maint_rate = np.full(capacity, DEFAULT_MAINT_MARGIN_RATE)
+        self.isolated_margin = np.full(capacity, np.nan)
+
+        self.notional = np.zeros(capacity)
+        self.unrealized_pnl = np.zeros(capacity)
+        self.margin = np.zeros(capacity)
+        self.maint_margin = np.zeros(capacity)
+        self.margin_ratio = np.zeros(capacity)
+        self.liq_price = np.full(capacity, np.nan)
+        self.liq_distance = np.full(capacity, np.nan)
+
+    @property
+    def size(self) -> int:
+        """Number of symbols tracked."""
+        return len(self.symbols)
+
+    def _grow(self) -> None:
+        capacity = max(2 * len(self.qty), 1)
+        fills = {
+            "qty": 0.0, "entry": 0.0, "mark": 0.0, "leverage": 1.0,
+            "maint_rate": DEFAULT_MAINT_MARGIN_RATE, "isolated_margin": np.nan,
+            "notional": 0.0, "unrealized_pnl": 0.0, "margin": 0.0,
+            "maint_margin": 0.0, "margin_ratio": 0.0,
+            "liq_price": np.nan, "liq_distance": np.nan,
+        }
+        for name, fill in fills.items():
+            old = getattr(self, name)
+            new = np.full(capacity, fill)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def _slot(self, symbol: str) -> int:
+        i = self.index.get(symbol)
+        if i is None:
+            if self.size == len(self.qty):
+                self._grow()
+            i = self.size
+            self.symbols.append(symbol)
+            self.index[symbol] = i
+        return i
+
+    def set_position(
+        self,
+        symbol: str,
+        qty: float,
+        entry_price: float,
+        mark_price: Optional[float] = None,
+        leverage: float = 1.0,
+        maint_margin_rate: Optional[float] = None,
+        isolated_margin: Optional[float] = None
+    ) -> None:
+        """
+        Add or replace a position (qty > 0 long, qty < 0 short, 0 flat).
+
+        Call recompute() afterwards, or use load_position_risk for a batch.
+        """
+        i = self._slot(symbol)
+        self.qty[i] = qty
+        self.entry[i] = entry_price
+        self.mark[i] = entry_price if mark_price is None else mark_price
+        self.leverage[i] = max(leverage, 1.0)
+        if maint_margin_rate is not None:
+            self.maint_rate[i] = maint_margin_rate
+        self.isolated_margin[i] = np.nan if not isolated_margin else isolated_margin
+
+    def load_position_risk(self, positions: list, wallet_balance: Optional[float] = None) -> None:
+        """
+        Replace all positions from a /fapi/v2/positionRisk response.
+
+        Args:
+            positions: Raw positionRisk rows
+            wallet_balance: Account wallet balance (optional)
+        """
+        if wallet_balance is not None:
+            self.wallet_balance = wallet_balance
+
+        self.qty[:] = 0.0
+        for p in positions:
+            qty = float(p.get("positionAmt", 0))
+            if qty == 0 and p["symbol"] not in self.index:
+                continue
+            isolated = p.get("marginType") == "isolated"
+            self.set_position(
+                p["symbol"],
+                qty,
+                float(p.get("entryPrice", 0)),
+                float(p.get("markPrice", 0)),
+                float(p.get("leverage", 1)),
+                isolated_margin=float(p.get("isolatedWallet", 0)) if isolated else None,
+            )
+        self.recompute()
+
+    def update_mark(self, symbol: str, price: float) -> None:
+        """Apply one mark-price tick and recompute."""
+        i = self.index.get(symbol)
+        if i is not None:
+            self.mark[i] = price
+            self.recompute()
+
+    def update_marks(self, prices: dict) -> None:
+        """Apply a batch of mark prices (symbol -> price) with one recompute."""
+        for symbol, price in prices.items():
+            i = self.index.get(symbol)
+            if i is not None:
+                self.mark[i] = price
+        self.recompute()
+
+    def recompute(self) -> None:
+        """Recompute all per-position risk figures in one vectorized pass."""
+        n = self.size
+        qty = self.qty[:n]
+        entry = self.entry[:n]
+        mark = self.mark[:n]
+        abs_qty = np.abs(qty)
+        rate = self.maint_rate[:n]
+
+        np.multiply(qty, mark, out=self.notional[:n])
+        np.multiply(qty, mark - entry, out=self.unrealized_pnl[:n])
+        np.multiply(np.abs(self.notional[:n]), rate, out=self.maint_margin[:n])
+
+        margin = abs_qty * entry / self.leverage[:n]
+        isolated = self.isolated_margin[:n]
+        np.copyto(margin, isolated, where=~np.isnan(isolated))
+        self.margin[:n] = margin
+
+        open_ = qty != 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            equity = margin + self.unrealized_pnl[:n]
+            self.margin_ratio[:n] = np.where(open_, self.maint_margin[:n] / equity, 0.0)
+
+            liq = (qty * entry - margin) / (qty - abs_qty * rate)
+            liq = np.where(open_ & (liq > 0), liq, np.where(open_, 0.0, np.nan))
+            self.liq_price[:n] = liq
+            # Positive while the mark is on the safe side of liquidation
+            self.liq_distance[:n] = np.where(open_, np.sign(qty) * (mark - liq) / mark, np.nan)
+
+    def exposure(self, include_positions: bool = True) -> Exposure:
+        """
+        Aggregate exposure across all open positions.
+
+        Args:
+            include_positions: Also return per-symbol rows
+
+        Returns:
+            Exposure summary
+        """
+        n = self.size
+        notional = self.notional[:n]
+        upnl = float(self.unrealized_pnl[:n].sum())
+        maint = float(self.maint_margin[:n].sum())
+        margin_balance = self.wallet_balance + upnl
+
+        long_notional = float(notional[notional > 0].sum())
+        short_notional = float(np.abs(notional[notional < 0]).sum())
+
+        closest_symbol = None
+        closest_distance = None
+        distance = self.liq_distance[:n]
+        if n and not np.all(np.isnan(distance)):
+            i = int(np.nanargmin(distance))
+            closest_symbol = self.symbols[i]
+            closest_distance = float(distance[i])
+
+        return Exposure(
+            wallet_balance=self.wallet_balance,
+            margin_balance=margin_balance,
+            unrealized_pnl=upnl,
+            gross_notional=long_notional + short_notional,
+            net_notional=long_notional - short_notional,
+            long_notional=long_notional,
+            short_notional=short_notional,
+            initial_margin=float(self.margin[:n].sum()),
+            maint_margin=maint,
+            margin_ratio=_ratio(maint, margin_balance),
+            closest_symbol=closest_symbol,
+            closest_liq_distance=closest_distance,
+            positions=self.positions() if include_positions else [],
+        )
+
+    def positions(self) -> list:
+        """Per-symbol risk rows for open positions."""
+        rows = []
+        for i in np.flatnonzero(self.qty[:self.size]):
+            rows.append({
+                "symbol": self.symbols[i],
+                "positionAmt": float(self.qty[i]),
+                "entryPrice": float(self.entry[i]),
+                "markPrice": float(self.mark[i]),
+                "notional": float(self.notional[i]),
+                "unrealizedPnl": float(self.unrealized_pnl[i]),
+                "margin": float(self.margin[i]),
+                "maintMargin": float(self.maint_margin[i]),
+                "marginRatio": _finite(self.margin_ratio[i]),
+                "liquidationPrice": _finite(self.liq_price[i]),
+                "liquidationDistance": _finite(self.liq_distance[i]),
+            })
+        return rows
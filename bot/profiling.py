@@ -0,0 +1,266 @@
+# trading_bot/bot/profiling.py
+"""
+Profiling hooks: function timers, cProfile, and a sampling profiler.
+
+- ``@timed`` wraps hot functions (client requests, order placement). While
+  timings are disabled, the wrapper costs one flag check per call. Enable
+  timings with ``enable_timings()`` or ``PROFILE_TIMINGS=1``. After that,
+  each call adds its duration to a per-function count/total/max.
+- ``Profiler`` profiles one block of code. It writes either a cProfile
+  ``.prof`` file (open with ``python -m pstats`` or snakeviz) or
+  collapsed stacks (``.folded``). Collapsed stacks come from a sampling
+  thread that reads the profiled thread's stack every millisecond. They
+  are the input format of flamegraph.pl, speedscope and inferno.
+
+cProfile traces every call, so it is exact but slows Python-heavy code
+down. Sampling adds almost nothing, but it only sees code that runs for
+several milliseconds or longer.
+"""
+
+import functools
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Optional
+
+
+PROFILE_MODES = ("cprofile", "sample")
+
+DEFAULT_PROFILE_DIR = "profiles"
+
+# Keeps output names unique within one process and second
+_output_numbers = itertools.count(1)
+
+
+class _TimerState:
+    """Module-wide switch and per-function [count, total, max] in seconds."""
+
+    def __init__(self):
+        self.enabled = os.getenv("PROFILE_TIMINGS", "").lower() in ("1", "true", "yes")
+        self.stats: dict = {}
+        self.lock = threading.Lock()
+
+
+_timers = _TimerState()
+
+
+def enable_timings() -> None:
+    """Start recording @timed calls."""
+    _timers.enabled = True
+
+
+def disable_timings() -> None:
+    """Stop recording @timed calls (recorded numbers are kept)."""
+    _timers.enabled = False
+
+
+def timings_enabled() -> bool:
+    """Whether @timed calls are being recorded."""
+    return _timers.enabled
+
+
+def reset_timings() -> None:
+    """Forget all recorded timings."""
+    with _timers.lock:
+        _timers.stats.clear()
+
+
+def timing_snapshot() -> dict:
+    """{name: {"calls", "total_ms", "mean_ms", "max_ms"}}, slowest total first."""
+    with _timers.lock:
+        items = [(name, list(stat)) for name, stat in _timers.stats.items()]
+    items.sort(key=lambda item: item[1][1], reverse=True)
+    return {
+        name: {
+            "calls": count,
+            "total_ms": round(total * 1000, 3),
+            "mean_ms": round(total / count * 1000, 3),
+            "max_ms": round(longest * 1000, 3),
+        }
+        for name, (count, total, longest) in items
+    }
+
+
+def format_timings() -> str:
+    """timing_snapshot() as a text table."""
+    snapshot = timing_snapshot()
+    if not snapshot:
+        return "No timed calls recorded."
+    width = max(len(name) for name in snapshot)
+    lines = [f"{'function':<{width}}  {'calls':>7}  {'total ms':>10}  {'mean ms':>9}  {'max ms':>9}"]
+    for name, s in snapshot.items():
+        lines.append(
+            f"{name:<{width}}  {s['calls']:>7}  {s['total_ms']:>10.2f}  "
+            f"{s['mean_ms']:>9.3f}  {s['max_ms']:>9.3f}"
+        )
+    return "\n".join(lines)
+
+
+def _record(name: str, elapsed: float) -> None:
+    with _timers.lock:
+        stat = _timers.stats.get(name)
+        if stat is None:
+            _timers.stats[name] = [1, elapsed, elapsed]
+        else:
+            stat[0] += 1
+            stat[1] += elapsed
+            if elapsed > stat[2]:
+                stat[2] = elapsed
+
+
+def timed(func: Optional[Callable] = None, *, name: Optional[str] = None) -> Callable:
+    """
+    Decorator recording call count and duration while timings are enabled.
+
+    Usable bare (``@timed``) or with a name (``@timed(name="client.request")``);
+    the default name is ``module.Qualname`` without the package prefix.
+    Exceptions are timed too and re-raised unchanged.
+    """
+    def decorate(fn: Callable) -> Callable:
+        label = name or f"{fn.__module__.rpartition('.')[2]}.{fn.__qualname__}"
+        clock = time.perf_counter
+        state = _timers
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not state.enabled:
+                return fn(*args, **kwargs)
+            started = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                _record(label, clock() - started)
+
+        return wrapper
+
+    return decorate(func) if func is not None else decorate
+
+
+class _Sampler:
+    """Collects the stack of one thread every ``interval`` seconds."""
+
+    def __init__(self, thread_id: int, interval: float = 0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def write(self, path: Path) -> None:
+        """Collapsed-stack lines: ``outer;...;inner count``."""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class Profiler:
+    """
+    Profile the code run inside a ``with`` block on the current thread.
+
+    Usage:
+        with Profiler("profiles/order.prof") as profiler:
+            place_order(...)
+        print(profiler.summary())
+    """
+
+    def __init__(self, output: str, mode: str = "cprofile", interval: float = 0.001):
+        """
+        Initialize profiler.
+
+        Args:
+            output: File to write (.prof for cprofile, .folded for sample)
+            mode: "cprofile" (deterministic) or "sample" (collapsed stacks)
+            interval: Seconds between samples in sample mode
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Profile mode must be one of {', '.join(PROFILE_MODES)}, got {mode!r}")
+        self.output = Path(output)
+        self.mode = mode
+        self.interval = interval
+        self.elapsed = 0.0
+        self._profile = None
+        self._sampler: Optional[_Sampler] = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        """Begin profiling the calling thread."""
+        if self.mode == "cprofile":
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = _Sampler(threading.get_ident(), self.interval)
+            self._sampler.start()
+        self._started = time.perf_counter()
+
+    def stop(self) -> Path:
+        """Stop profiling and write the output file. Returns its path."""
+        self.elapsed = time.perf_counter() - self._started
+        if self._profile is not None:
+            self._profile.disable()
+        else:
+            self._sampler.stop()
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        if self._profile is not None:
+            self._profile.dump_stats(str(self.output))
+        else:
+            self._sampler.write(self.output)
+        return self.output
+
+    def summary(self, limit: int = 20) -> str:
+        """Top functions by cumulative time (cprofile) or hottest stacks (sample)."""
+        if self._profile is not None:
+            import io
+            import pstats
+
+            out = io.StringIO()
+            pstats.Stats(self._profile, stream=out).sort_stats("cumulative").print_stats(limit)
+            return out.getvalue()
+
+        lines = [f"{self._sampler.samples} samples over {self.elapsed * 1000:.0f} ms"]
+        for stack, count in self._sampler.stacks.most_common(limit):
+            leaf = stack.rpartition(";")[2]
+            lines.append(f"{count:>6}  {leaf}")
+        return "\n".join(lines)
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def default_output(label: str, mode: str, directory: str = DEFAULT_PROFILE_DIR) -> str:
+    """profiles/<label>-<timestamp>-<pid>-<n>.prof (or .folded for sampling)."""
+    suffix = ".prof" if mode == "cprofile" else ".folded"
+    safe = "".join(c if c.isalnum() or c in "-_" else "_" for c in label).strip("_") or "profile"
+    return str(Path(directory) / f"{safe}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{next(_output_numbers)}{suffix}")
@@ -0,0 +1,84 @@
+# trading_bot/bot/ratelimit.py
+"""
+Token bucket rate limiter shared by threaded and asyncio callers.
+"""
+
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Token bucket limiter.
+
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Binance limits are expressed per window (e.g. 300 orders / 10s), so
+    ``RateLimiter.per_window(300, 10)`` is the usual way to build one.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize rate limiter.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum burst size
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("rate and capacity must be greater than 0")
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_window(cls, limit: int, window_seconds: float) -> "RateLimiter":
+        """Build a limiter allowing ``limit`` requests per ``window_seconds``."""
+        return cls(rate=limit / window_seconds, capacity=limit)
+
+    def _reserve(self, tokens: float) -> float:
+        """
+        Take tokens from the bucket.
+
+        Returns:
+            Seconds the caller must wait before the reservation is valid
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= tokens
+
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Take ``tokens`` if available right now; never waits or borrows."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def acquire(self, tokens: float = 1) -> None:
+        """Block the current thread until ``tokens`` are available."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1) -> None:
+        """Suspend the current task until ``tokens`` are available."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
@@ -0,0 +1,639 @@
+# trading_bot/bot/resilience.py
+"""
+Circuit breakers and hedged requests for upstream Binance calls.
+
+Both live in an httpx transport wrapper, so BinanceFuturesClient, the
+async client and the dashboard's pooled client get them by passing
+``transport=build_transport()`` (which also adds retries, see retry.py).
+
+Circuit breaker (one per endpoint path):
+- closed: calls go through; outcomes fill a rolling window
+- open: once the window has enough calls and the error rate or slow-call
+  rate passes its threshold, calls fail at once with CircuitOpenError
+  instead of waiting out the timeout
+- half-open: after ``open_seconds`` a few probe calls are let through; a
+  success closes the breaker, a failure opens it again
+
+Hedging: for idempotent GETs (time, ticker/price, exchangeInfo) a second
+identical request is sent if the first has not answered within the
+endpoint's recent p95 latency, and the first response wins. A hedge
+budget caps the extra load.
+
+Tracing: the innermost layer records one client span per attempt sent
+(retries and hedges each get their own), see tracing.py.
+"""
+
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from .exceptions import CircuitOpenError
+from .logging_config import setup_logger
+from .tracing import SPAN_KIND_CLIENT, span, tracing_enabled
+
+
+logger = setup_logger()
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Read-only and safe to send twice
+HEDGED_ENDPOINTS = frozenset({
+    "/fapi/v1/time",
+    "/fapi/v1/ticker/price",
+    "/fapi/v1/exchangeInfo",
+})
+
+# Upstream statuses that count as failures (rate limits and server errors);
+# other 4xx are the caller's fault and say nothing about upstream health
+FAILURE_STATUSES = frozenset({418, 429})
+
+
+@dataclass
+class BreakerConfig:
+    """Thresholds shared by every breaker in a registry."""
+
+    window: int = 20                  # calls in the rolling window
+    min_calls: int = 5                # calls needed before the breaker may open
+    failure_rate: float = 0.5         # error fraction that opens it
+    slow_call_seconds: float = 5.0    # a call slower than this counts as slow
+    slow_call_rate: float = 0.8       # slow fraction that opens it
+    open_seconds: float = 15.0        # time open before probing (half-open)
+    half_open_calls: int = 1          # probes allowed while half-open
+
+    @classmethod
+    def from_env(cls) -> "BreakerConfig":
+        """Read BREAKER_* environment variables over the defaults."""
+        config = cls()
+        for name, cast in (
+            ("window", int), ("min_calls", int), ("failure_rate", float),
+            ("slow_call_seconds", float), ("slow_call_rate", float),
+            ("open_seconds", float), ("half_open_calls", int),
+        ):
+            value = os.getenv(f"BREAKER_{name.upper()}")
+            if value:
+                setattr(config, name, cast(value))
+        return config
+
+
+class CircuitBreaker:
+    """Error-rate and latency breaker for one endpoint (thread-safe)."""
+
+    def __init__(self, name: str, config: Optional[BreakerConfig] = None):
+        """
+        Initialize breaker.
+
+        Args:
+            name: Endpoint path, for logs and metrics
+            config: Thresholds (default: BreakerConfig())
+        """
+        self.name = name
+        self.config = config or BreakerConfig()
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self._calls: deque = deque(maxlen=self.config.window)  # (failed, slow)
+        self._probes = 0
+        self._lock = threading.Lock()
+        self.total_calls = 0
+        self.total_failures = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def before_call(self) -> None:
+        """
+        Admit a call or reject it.
+
+        Raises:
+            CircuitOpenError: If the breaker is open (or half-open with all
+                probes in flight)
+        """
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.config.open_seconds:
+                    self.rejected += 1
+                    raise CircuitOpenError(
+                        f"Circuit open for {self.name}: upstream failing, retry in "
+                        f"{self.config.open_seconds - (time.monotonic() - self.opened_at):.0f}s"
+                    )
+                self.state = HALF_OPEN
+                self._probes = 0
+                logger.info(f"Circuit half-open for {self.name}")
+
+            if self.state == HALF_OPEN:
+                if self._probes >= self.config.half_open_calls:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"Circuit half-open for {self.name}: probe in flight")
+                self._probes += 1
+
+    def release(self) -> None:
+        """
+        Give back a call admitted by before_call that never finished.
+
+        Used when a call is cancelled (task cancellation, KeyboardInterrupt):
+        no outcome is recorded, but a half-open probe slot must not stay
+        taken or the breaker rejects every call from then on.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record(self, failed: bool, seconds: float) -> None:
+        """Record a finished call's outcome and latency."""
+        slow = seconds >= self.config.slow_call_seconds
+        with self._lock:
+            self.total_calls += 1
+            self.total_failures += failed
+
+            if self.state == HALF_OPEN:
+                if failed or slow:
+                    self._open()
+                else:
+                    self.state = CLOSED
+                    self._calls.clear()
+                    logger.info(f"Circuit closed for {self.name}")
+                return
+
+            self._calls.append((failed, slow))
+            n = len(self._calls)
+            if self.state == CLOSED and n >= self.config.min_calls:
+                failures = sum(f for f, _ in self._calls)
+                slows = sum(s for _, s in self._calls)
+                if failures / n >= self.config.failure_rate or slows / n >= self.config.slow_call_rate:
+                    self._open()
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+        self._calls.clear()
+        logger.warning(f"Circuit opened for {self.name} for {self.config.open_seconds}s")
+
+    def snapshot(self) -> dict:
+        """Current state and counters for metrics."""
+        with self._lock:
+            n = len(self._calls)
+            return {
+                "endpoint": self.name,
+                "state": self.state,
+                "windowCalls": n,
+                "windowErrorRate": sum(f for f, _ in self._calls) / n if n else 0.0,
+                "totalCalls": self.total_calls,
+                "totalFailures": self.total_failures,
+                "rejected": self.rejected,
+                "timesOpened": self.times_opened,
+            }
+
+
+class LatencyTracker:
+    """Recent latencies of one endpoint, for the hedge delay."""
+
+    def __init__(self, size: int = 200, min_samples: int = 20):
+        self.samples: deque = deque(maxlen=size)
+        self.min_samples = min_samples
+        self._p95: Optional[float] = None
+        self._since_sort = 0
+
+    def add(self, seconds: float) -> None:
+        """Record one latency."""
+        self.samples.append(seconds)
+        self._since_sort += 1
+
+    def p95(self) -> Optional[float]:
+        """95th percentile, or None until min_samples are recorded."""
+        if len(self.samples) < self.min_samples:
+            return None
+        # Re-sort only every 20 samples; hedging needs a rough figure
+        if self._p95 is None or self._since_sort >= 20:
+            ordered = sorted(self.samples)
+            self._p95 = ordered[int(0.95 * (len(ordered) - 1))]
+            self._since_sort = 0
+        return self._p95
+
+
+class ResilienceRegistry:
+    """
+    Breakers, latency trackers and hedge counters per endpoint.
+
+    One registry per process (``DEFAULT_REGISTRY``) gives a single view of
+    upstream health for metrics, whichever client made the call.
+    """
+
+    def __init__(
+        self,
+        config: Optional[BreakerConfig] = None,
+        hedge_budget: float = 0.1,
+        min_hedge_delay: float = 0.02
+    ):
+        """
+        Initialize registry.
+
+        Args:
+            config: Breaker thresholds (default: BREAKER_* env vars)
+            hedge_budget: Max hedges as a fraction of hedgeable requests
+            min_hedge_delay: Never hedge sooner than this (seconds)
+        """
+        self.config = config or BreakerConfig.from_env()
+        self.hedge_budget = hedge_budget
+        self.min_hedge_delay = min_hedge_delay
+        self.breakers: dict = {}
+        self.latency: dict = {}
+        self.hedge_requests = 0
+        self.hedges_sent = 0
+        self.hedges_won = 0
+        self._lock = threading.Lock()
+
+    def breaker(self, endpoint: str) -> CircuitBreaker:
+        """The breaker for an endpoint (created on first use)."""
+        breaker = self.breakers.get(endpoint)
+        if breaker is None:
+            with self._lock:
+                breaker = self.breakers.setdefault(endpoint, CircuitBreaker(endpoint, self.config))
+        return breaker
+
+    def tracker(self, endpoint: str) -> LatencyTracker:
+        """The latency tracker for an endpoint (created on first use)."""
+        tracker = self.latency.get(endpoint)
+        if tracker is None:
+            with self._lock:
+                tracker = self.latency.setdefault(endpoint, LatencyTracker())
+        return tracker
+
+    def hedge_delay(self, method: str, endpoint: str) -> Optional[float]:
+        """Seconds to wait before hedging this request, or None to not hedge."""
+        if method != "GET" or endpoint not in HEDGED_ENDPOINTS:
+            return None
+        self.hedge_requests += 1
+        p95 = self.tracker(endpoint).p95()
+        if p95 is None:
+            return None
+        return max(p95, self.min_hedge_delay)
+
+    def take_hedge(self) -> bool:
+        """Consume hedge budget; False if hedging now would exceed it."""
+        with self._lock:
+            if self.hedges_sent + 1 > self.hedge_budget * self.hedge_requests:
+                return False
+            self.hedges_sent += 1
+            return True
+
+    def snapshot(self) -> dict:
+        """Breaker states and hedge counters for metrics."""
+        return {
+            "breakers": [b.snapshot() for b in list(self.breakers.values())],
+            "hedging": {
+                "hedgeableRequests": self.hedge_requests,
+                "hedgesSent": self.hedges_sent,
+                "hedgesWon": self.hedges_won,
+                "p95Ms": {
+                    endpoint: round(p95 * 1000, 1)
+                    for endpoint, tracker in list(self.latency.items())
+                    if (p95 := tracker.p95()) is not None
+                },
+            },
+        }
+
+
+DEFAULT_REGISTRY = ResilienceRegistry()
+
+
+def _failed(response) -> bool:
+    return response.status_code >= 500 or response.status_code in FAILURE_STATUSES
+
+
+def _endpoint(request) -> str:
+    """Path relative to the API root (base URLs may carry a prefix)."""
+    path = request.url.path
+    index = path.find("/fapi/")
+    return path[index:] if index >= 0 else path
+
+
+_hedge_pool = None
+_hedge_pool_lock = threading.Lock()
+
+
+def _get_hedge_pool():
+    global _hedge_pool
+    if _hedge_pool is None:
+        with _hedge_pool_lock:
+            if _hedge_pool is None:
+                from concurrent.futures import ThreadPoolExecutor
+                _hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+    return _hedge_pool
+
+
+class ResilientTransport(httpx.BaseTransport):
+    """
+    httpx transport wrapper adding circuit breakers and hedged GETs.
+
+    Usage:
+        httpx.Client(transport=ResilientTransport(httpx.HTTPTransport()))
+    """
+
+    def __init__(self, transport, registry: Optional[ResilienceRegistry] = None):
+        """
+        Initialize transport.
+
+        Args:
+            transport: Wrapped httpx.HTTPTransport (carries pool limits)
+            registry: Breakers and latency stats (default: DEFAULT_REGISTRY)
+        """
+        self.transport = transport
+        self.registry = registry or DEFAULT_REGISTRY
+
+    def handle_request(self, request):
+        endpoint = _endpoint(request)
+        breaker = self.registry.breaker(endpoint)
+        breaker.before_call()
+
+        start = time.perf_counter()
+        try:
+            delay = self.registry.hedge_delay(request.method, endpoint)
+            if delay is None:
+                response = self.transport.handle_request(request)
+            else:
+                response = self._hedged(request, delay)
+        except Exception:
+            breaker.record(True, time.perf_counter() - start)
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+
+        elapsed = time.perf_counter() - start
+        breaker.record(_failed(response), elapsed)
+        self.registry.tracker(endpoint).add(elapsed)
+        return response
+
+    def _hedged(self, request, delay: float):
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        pool = _get_hedge_pool()
+        # Copy the context so both attempts' spans join the caller's trace
+        primary = pool.submit(contextvars.copy_context().run, self.transport.handle_request, request)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self.registry.take_hedge():
+            return primary.result()
+
+        hedge = pool.submit(contextvars.copy_context().run, self.transport.handle_request, request)
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winners = [f for f in done if f.exception() is None]
+            if not winners:
+                error = next(iter(done)).exception()
+                continue
+            # Can't interrupt a blocking send: close the loser when it lands
+            for loser in pending | set(winners[1:]):
+                loser.add_done_callback(_close_result)
+            if winners[0] is hedge:
+                self.registry.hedges_won += 1
+            return winners[0].result()
+        raise error
+
+    def close(self) -> None:
+        self.transport.close()
+
+    def __enter__(self):
+        self.transport.__enter__()
+        return self
+
+    def __exit__(self, *args):
+        self.transport.__exit__(*args)
+
+
+def _close_result(future) -> None:
+    if future.exception() is None:
+        future.result().close()
+
+
+class AsyncResilientTransport(httpx.AsyncBaseTransport):
+    """
+    Async counterpart of ResilientTransport.
+
+    Usage:
+        httpx.AsyncClient(transport=AsyncResilientTransport(httpx.AsyncHTTPTransport()))
+    """
+
+    def __init__(self, transport, registry: Optional[ResilienceRegistry] = None):
+        """
+        Initialize transport.
+
+        Args:
+            transport: Wrapped httpx.AsyncHTTPTransport (carries pool limits)
+            registry: Breakers and latency stats (default: DEFAULT_REGISTRY)
+        """
+        self.transport = transport
+        self.registry = registry or DEFAULT_REGISTRY
+
+    async def handle_async_request(self, request):
+        endpoint = _endpoint(request)
+        breaker = self.registry.breaker(endpoint)
+        breaker.before_call()
+
+        start = time.perf_counter()
+        try:
+            delay = self.registry.hedge_delay(request.method, endpoint)
+            if delay is None:
+                response = await self.transport.handle_async_request(request)
+            else:
+                response = await self._hedged(request, delay)
+        except Exception:
+            breaker.record(True, time.perf_counter() - start)
+            raise
+        except BaseException:
+            # Cancelled (CancelledError is a BaseException): free the probe slot
+            breaker.release()
+            raise
+
+        elapsed = time.perf_counter() - start
+        breaker.record(_failed(response), elapsed)
+        self.registry.tracker(endpoint).add(elapsed)
+        return response
+
+    async def _hedged(self, request, delay: float):
+        import asyncio
+
+        primary = asyncio.ensure_future(self.transport.handle_async_request(request))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+        except asyncio.CancelledError:
+            primary.cancel()
+            raise
+        if done or not self.registry.take_hedge():
+            return await primary
+
+        hedge = asyncio.ensure_future(self.transport.handle_async_request(request))
+        pending = {primary, hedge}
+        error = None
+        while pending:
+            try:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            except asyncio.CancelledError:
+                for attempt in pending:
+                    attempt.cancel()
+                raise
+            winners = [t for t in done if t.exception() is None]
+            if not winners:
+                error = next(iter(done)).exception()
+                continue
+            for loser in pending:
+                loser.cancel()
+            for extra in winners[1:]:
+                await extra.result().aclose()
+            if winners[0] is hedge:
+                self.registry.hedges_won += 1
+            return winners[0].result()
+        raise error
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    async def __aenter__(self):
+        await self.transport.__aenter__()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.transport.__aexit__(*args)
+
+
+def _start_attempt(request):
+    return span(
+        f"HTTP {request.method} {request.url.path}",
+        SPAN_KIND_CLIENT,
+        {"http.method": request.method, "server.address": request.url.host, "url.path": request.url.path},
+    ).start()
+
+
+def _record_status(attempt, response) -> None:
+    attempt.set_attribute("http.status_code", response.status_code)
+    if response.status_code >= 500:
+        attempt.set_error(f"HTTP {response.status_code}")
+
+
+class _TracedStream(httpx.SyncByteStream):
+    """Response body that ends the attempt's span when it is closed."""
+
+    def __init__(self, stream, attempt):
+        self.stream = stream
+        self.attempt = attempt
+
+    def __iter__(self):
+        yield from self.stream
+
+    def close(self) -> None:
+        try:
+            self.stream.close()
+        finally:
+            self.attempt.end()
+
+
+class _AsyncTracedStream(httpx.AsyncByteStream):
+    """Async counterpart of _TracedStream."""
+
+    def __init__(self, stream, attempt):
+        self.stream = stream
+        self.attempt = attempt
+
+    async def __aiter__(self):
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self.stream.aclose()
+        finally:
+            self.attempt.end()
+
+
+class TracingTransport(httpx.BaseTransport):
+    """
+    httpx transport wrapper recording one client span per request sent.
+
+    The span ends when the response body is closed, so it covers the
+    whole exchange including the download. It is never made the current
+    span: hedged attempts finish on a different thread than they start.
+    """
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    def handle_request(self, request):
+        if not tracing_enabled():
+            return self.transport.handle_request(request)
+        attempt = _start_attempt(request)
+        try:
+            response = self.transport.handle_request(request)
+        except Exception as e:
+            attempt.set_error(f"{type(e).__name__}: {e}")
+            attempt.end()
+            raise
+        _record_status(attempt, response)
+        response.stream = _TracedStream(response.stream, attempt)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+    def __enter__(self):
+        self.transport.__enter__()
+        return self
+
+    def __exit__(self, *args):
+        self.transport.__exit__(*args)
+
+
+class AsyncTracingTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of TracingTransport."""
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    async def handle_async_request(self, request):
+        if not tracing_enabled():
+            return await self.transport.handle_async_request(request)
+        attempt = _start_attempt(request)
+        try:
+            response = await self.transport.handle_async_request(request)
+        except Exception as e:
+            attempt.set_error(f"{type(e).__name__}: {e}")
+            attempt.end()
+            raise
+        _record_status(attempt, response)
+        response.stream = _AsyncTracedStream(response.stream, attempt)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    async def __aenter__(self):
+        await self.transport.__aenter__()
+        return self
+
+    async def __aexit__(self, *args):
+        await self.transport.__aexit__(*args)
+
+
+def build_transport(**transport_kwargs) -> httpx.BaseTransport:
+    """
+    The standard upstream stack: retries around breakers/hedging around
+    per-attempt tracing around an httpx.HTTPTransport built with
+    ``transport_kwargs`` (e.g. limits).
+    """
+    from .retry import RetryTransport
+    return RetryTransport(ResilientTransport(TracingTransport(httpx.HTTPTransport(**transport_kwargs))))
+
+
+def build_async_transport(**transport_kwargs) -> httpx.AsyncBaseTransport:
+    """Async counterpart of build_transport."""
+    from .retry import AsyncRetryTransport
+    return AsyncRetryTransport(
+        AsyncResilientTransport(AsyncTracingTransport(httpx.AsyncHTTPTransport(**transport_kwargs)))
+    )
@@ -0,0 +1,304 @@
+# trading_bot/bot/retry.py
+"""
+Retry policy for upstream Binance calls.
+
+Like the circuit breakers in resilience.py, retries live in an httpx
+transport wrapper (RetryTransport / AsyncRetryTransport), placed outside
+the breaker so every attempt is counted and an open circuit stops retrying.
+
+What is retried:
+- Connection failures (connect error/timeout), any method: the request
+  never reached Binance, so even an order POST is safe to resend
+- HTTP 429, any method: Binance rejected the request unprocessed
+- Read timeouts, other network errors and 5xx: idempotent methods
+  (GET) only. For a POST the order may or may not exist, so the error is
+  surfaced instead
+
+HTTP 418 means the IP is banned for continuing after 429s. It is never
+retried. Its Retry-After (like a 429's) blocks every request through the
+policy until it passes, so callers fail fast instead of extending the ban.
+
+Delays use decorrelated jitter (sleep = min(cap, uniform(base, prev * 3)))
+and never undercut Retry-After. A retry budget (a token bucket refilled
+by a fraction of each first attempt) stops retries from multiplying load
+during an outage.
+"""
+
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from .exceptions import BinanceNetworkError, RateLimitError
+from .logging_config import setup_logger
+
+
+logger = setup_logger()
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+RETRY_AFTER_STATUSES = frozenset({418, 429})
+
+# Errors raised before the request could have been sent
+CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+@dataclass
+class RetryConfig:
+    """Retry limits and backoff parameters."""
+
+    max_attempts: int = 3         # first try included
+    base_delay: float = 0.1       # seconds
+    max_delay: float = 5.0        # cap per sleep; a longer Retry-After is not waited for
+    budget_ratio: float = 0.1     # retries earned per first attempt
+    budget_cap: float = 10.0      # retries that can be banked
+
+    @classmethod
+    def from_env(cls) -> "RetryConfig":
+        """Read RETRY_* environment variables over the defaults."""
+        config = cls()
+        for name, cast in (
+            ("max_attempts", int), ("base_delay", float), ("max_delay", float),
+            ("budget_ratio", float), ("budget_cap", float),
+        ):
+            value = os.getenv(f"RETRY_{name.upper()}")
+            if value:
+                setattr(config, name, cast(value))
+        return config
+
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """Retry-After in seconds (Binance sends delta-seconds), or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+class RetryPolicy:
+    """
+    Decides whether and when to retry; shared by all clients in a process.
+    """
+
+    def __init__(self, config: Optional[RetryConfig] = None):
+        """
+        Initialize policy.
+
+        Args:
+            config: Limits (default: RETRY_* env vars)
+        """
+        self.config = config or RetryConfig.from_env()
+        self._tokens = self.config.budget_cap
+        self._lock = threading.Lock()
+        self.blocked_until = 0.0
+        self.attempts = 0
+        self.retries = 0
+        self.budget_exhausted = 0
+
+    def check_blocked(self) -> None:
+        """
+        Fail fast while a 429/418 Retry-After is in force.
+
+        Raises:
+            RateLimitError: If requests are blocked
+        """
+        remaining = self.blocked_until - time.monotonic()
+        if remaining > 0:
+            raise RateLimitError(
+                f"Rate limited by Binance; requests blocked for {remaining:.1f}s more",
+                retry_after=remaining,
+            )
+
+    def block(self, seconds: float) -> None:
+        """Block all requests for ``seconds`` (from a Retry-After header)."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        logger.warning(f"Binance asked to back off for {seconds:.0f}s")
+
+    def on_first_attempt(self) -> None:
+        """Count a new request and earn retry budget for it."""
+        with self._lock:
+            self.attempts += 1
+            self._tokens = min(self.config.budget_cap, self._tokens + self.config.budget_ratio)
+
+    def take_retry(self) -> bool:
+        """Spend one retry from the budget; False if it is empty."""
+        with self._lock:
+            if self._tokens < 1:
+                self.budget_exhausted += 1
+                return False
+            self._tokens -= 1
+            self.retries += 1
+            return True
+
+    def next_delay(self, previous: float, retry_after: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds to sleep before the next attempt, or None to give up.
+
+        Args:
+            previous: Previous sleep (0 before the first retry)
+            retry_after: Server-requested delay, if any
+        """
+        base = self.config.base_delay
+        delay = min(self.config.max_delay, random.uniform(base, max(base, previous * 3)))
+        if retry_after is not None:
+            if retry_after > self.config.max_delay:
+                return None
+            delay = max(delay, retry_after)
+        return delay
+
+    def should_retry_response(self, method: str, response: httpx.Response) -> bool:
+        """True if this response status is worth another attempt."""
+        if response.status_code == 429:
+            return True
+        return response.status_code >= 500 and method in IDEMPOTENT_METHODS
+
+    def should_retry_error(self, method: str, error: Exception) -> bool:
+        """True if this transport error is worth another attempt."""
+        if isinstance(error, BinanceNetworkError):
+            # Circuit open or blocked: retrying would not reach upstream
+            return False
+        if isinstance(error, CONNECT_ERRORS):
+            return True
+        return isinstance(error, httpx.TransportError) and method in IDEMPOTENT_METHODS
+
+    def snapshot(self) -> dict:
+        """Counters for metrics."""
+        return {
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "budgetExhausted": self.budget_exhausted,
+            "budgetTokens": round(self._tokens, 2),
+            "blockedFor": round(max(0.0, self.blocked_until - time.monotonic()), 1),
+        }
+
+
+DEFAULT_POLICY = RetryPolicy()
+
+
+class RetryTransport(httpx.BaseTransport):
+    """
+    httpx transport wrapper that retries per a RetryPolicy.
+
+    Usage:
+        httpx.Client(transport=RetryTransport(ResilientTransport(httpx.HTTPTransport())))
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, policy: Optional[RetryPolicy] = None):
+        """
+        Initialize transport.
+
+        Args:
+            transport: Wrapped transport
+            policy: Retry policy (default: DEFAULT_POLICY)
+        """
+        self.transport = transport
+        self.policy = policy or DEFAULT_POLICY
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        policy = self.policy
+        policy.check_blocked()
+        policy.on_first_attempt()
+
+        delay = 0.0
+        for attempt in range(1, policy.config.max_attempts + 1):
+            last = attempt == policy.config.max_attempts
+            try:
+                response = self.transport.handle_request(request)
+            except Exception as e:
+                if last or not policy.should_retry_error(request.method, e):
+                    raise
+                delay = policy.next_delay(delay)
+                if not policy.take_retry():
+                    raise
+                logger.warning(f"Retrying {request.method} {request.url.path} in {delay:.2f}s: {e!r}")
+                time.sleep(delay)
+                continue
+
+            retry_after = None
+            if response.status_code in RETRY_AFTER_STATUSES:
+                retry_after = parse_retry_after(response)
+                if retry_after:
+                    policy.block(retry_after)
+            if last or not policy.should_retry_response(request.method, response):
+                return response
+
+            delay = policy.next_delay(delay, retry_after)
+            if delay is None or not policy.take_retry():
+                return response
+            response.close()
+            logger.warning(
+                f"Retrying {request.method} {request.url.path} in {delay:.2f}s: "
+                f"HTTP {response.status_code}"
+            )
+            time.sleep(delay)
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """Async counterpart of RetryTransport."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, policy: Optional[RetryPolicy] = None):
+        """
+        Initialize transport.
+
+        Args:
+            transport: Wrapped async transport
+            policy: Retry policy (default: DEFAULT_POLICY)
+        """
+        self.transport = transport
+        self.policy = policy or DEFAULT_POLICY
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        import asyncio
+
+        policy = self.policy
+        policy.check_blocked()
+        policy.on_first_attempt()
+
+        delay = 0.0
+        for attempt in range(1, policy.config.max_attempts + 1):
+            last = attempt == policy.config.max_attempts
+            try:
+                response = await self.transport.handle_async_request(request)
+            except Exception as e:
+                if last or not policy.should_retry_error(request.method, e):
+                    raise
+                delay = policy.next_delay(delay)
+                if not policy.take_retry():
+                    raise
+                logger.warning(f"Retrying {request.method} {request.url.path} in {delay:.2f}s: {e!r}")
+                await asyncio.sleep(delay)
+                continue
+
+            retry_after = None
+            if response.status_code in RETRY_AFTER_STATUSES:
+                retry_after = parse_retry_after(response)
+                if retry_after:
+                    policy.block(retry_after)
+            if last or not policy.should_retry_response(request.method, response):
+                return response
+
+            delay = policy.next_delay(delay, retry_after)
+            if delay is None or not policy.take_retry():
+                return response
+            await response.aclose()
+            logger.warning(
+                f"Retrying {request.method} {request.url.path} in {delay:.2f}s: "
+                f"HTTP {response.status_code}"
+            )
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
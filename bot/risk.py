@@ -0,0 +1,344 @@
+# trading_bot/bot/risk.py
+"""
+Pre-trade risk gate.
+
+Every order is checked against in-memory state (cached mark prices,
+positions and order-rate buckets) before it leaves the process, so the
+check costs microseconds and never adds a network round-trip.
+
+Limits are configured globally and optionally per symbol, from environment
+variables or a JSON file (see RiskGate.from_env).
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, fields, replace
+from typing import Optional
+
+from .logging_config import setup_logger
+from .ratelimit import RateLimiter
+
+
+logger = setup_logger()
+
+
+class RiskCheckError(Exception):
+    """Exception raised when an order is rejected by a pre-trade risk check."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+@dataclass
+class RiskLimits:
+    """
+    Pre-trade limits. ``None`` disables a check.
+
+    Attributes:
+        max_order_qty: Largest order quantity in base units
+        max_order_notional: Largest order value in quote currency
+        max_position_notional: Largest absolute position value after the fill
+        price_band_pct: Max distance of a LIMIT price from the mark, in percent
+        max_orders_per_second: Order rate limit
+    """
+
+    max_order_qty: Optional[float] = None
+    max_order_notional: Optional[float] = None
+    max_position_notional: Optional[float] = None
+    price_band_pct: Optional[float] = None
+    max_orders_per_second: Optional[float] = None
+
+    @property
+    def enabled(self) -> bool:
+        """True if any limit is set."""
+        return any(getattr(self, f.name) is not None for f in fields(self))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RiskLimits":
+        """Build from a dict, ignoring unknown keys."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: float(v) for k, v in data.items() if k in names and v is not None})
+
+
+# Environment variable -> RiskLimits field
+ENV_LIMITS = {
+    "RISK_MAX_ORDER_QTY": "max_order_qty",
+    "RISK_MAX_ORDER_NOTIONAL": "max_order_notional",
+    "RISK_MAX_POSITION_NOTIONAL": "max_position_notional",
+    "RISK_PRICE_BAND_PCT": "price_band_pct",
+    "RISK_MAX_ORDERS_PER_SECOND": "max_orders_per_second",
+}
+
+
+class RiskGate:
+    """
+    Checks orders against global and per-symbol limits.
+
+    Per-symbol limits override the global ones field by field. The
+    orders-per-second limit applies both per symbol and across all symbols.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[RiskLimits] = None,
+        symbol_limits: Optional[dict] = None
+    ):
+        """
+        Initialize risk gate.
+
+        Args:
+            limits: Global limits
+            symbol_limits: Mapping of symbol -> RiskLimits overrides
+        """
+        self.limits = limits or RiskLimits()
+        self.symbol_limits: dict = {}
+        for symbol, overrides in (symbol_limits or {}).items():
+            merged = replace(self.limits, **{
+                f.name: getattr(overrides, f.name)
+                for f in fields(overrides) if getattr(overrides, f.name) is not None
+            })
+            self.symbol_limits[symbol.upper()] = merged
+
+        self.marks: dict = {}
+        self.positions: dict = {}
+        self.updated_at = 0.0
+        self._rate_limiters: dict = {}
+
+        if self.limits.max_orders_per_second:
+            self._global_rate = self._make_limiter(self.limits.max_orders_per_second)
+        else:
+            self._global_rate = None
+
+    @classmethod
+    def from_env(cls) -> "RiskGate":
+        """
+        Build a gate from environment variables.
+
+        Global limits come from RISK_MAX_ORDER_QTY, RISK_MAX_ORDER_NOTIONAL,
+        RISK_MAX_POSITION_NOTIONAL, RISK_PRICE_BAND_PCT and
+        RISK_MAX_ORDERS_PER_SECOND. RISK_LIMITS_FILE may point to a JSON file
+        of the form ``{"default": {...}, "symbols": {"BTCUSDT": {...}}}``;
+        environment variables take precedence over its defaults.
+        """
+        config: dict = {}
+        path = os.getenv("RISK_LIMITS_FILE")
+        if path:
+            with open(path, encoding="utf-8") as f:
+                config = json.load(f)
+
+        defaults = dict(config.get("default", {}))
+        for env_name, field_name in ENV_LIMITS.items():
+            value = os.getenv(env_name)
+            if value:
+                defaults[field_name] = value
+
+        return cls(
+            RiskLimits.from_dict(defaults),
+            {symbol: RiskLimits.from_dict(limits)
+             for symbol, limits in config.get("symbols", {}).items()},
+        )
+
+    @property
+    def enabled(self) -> bool:
+        """True if any global or per-symbol limit is set."""
+        return self.limits.enabled or any(l.enabled for l in self.symbol_limits.values())
+
+    @property
+    def needs_state(self) -> bool:
+        """True if checks need cached mark prices or positions."""
+        return any(
+            l.max_order_notional is not None
+            or l.max_position_notional is not None
+            or l.price_band_pct is not None
+            for l in (self.limits, *self.symbol_limits.values())
+        )
+
+    @property
+    def has_rate_limits(self) -> bool:
+        """True if any order-rate limit is set (enforced per process)."""
+        return any(
+            l.max_orders_per_second is not None
+            for l in (self.limits, *self.symbol_limits.values())
+        )
+
+    def limits_for(self, symbol: str) -> RiskLimits:
+        """Effective limits for a symbol."""
+        return self.symbol_limits.get(symbol, self.limits)
+
+    @staticmethod
+    def _make_limiter(per_second: float) -> RateLimiter:
+        # A one-second burst allowance: N orders may go back to back, then N/s
+        return RateLimiter(rate=per_second, capacity=max(per_second, 1.0))
+
+    def update_mark(self, symbol: str, price: float) -> None:
+        """Cache the latest mark price for a symbol."""
+        self.marks[symbol] = price
+
+    def set_position(self, symbol: str, qty: float) -> None:
+        """Set the signed position for a symbol (qty > 0 long)."""
+        self.positions[symbol] = qty
+
+    def record_fill(self, symbol: str, side: str, qty: float) -> None:
+        """Apply an executed quantity to the cached position."""
+        signed = qty if side == "BUY" else -qty
+        self.positions[symbol] = self.positions.get(symbol, 0.0) + signed
+
+    def load_position_risk(self, positions: list) -> None:
+        """
+        Refresh cached marks and positions from a /fapi/v2/positionRisk response.
+
+        Args:
+            positions: Raw positionRisk rows
+        """
+        for p in positions:
+            symbol = p["symbol"]
+            self.positions[symbol] = float(p.get("positionAmt", 0))
+            mark = float(p.get("markPrice", 0))
+            if mark > 0:
+                self.marks[symbol] = mark
+        self.updated_at = time.monotonic()
+
+    def is_stale(self, max_age: float) -> bool:
+        """True if positionRisk state is older than ``max_age`` seconds."""
+        return time.monotonic() - self.updated_at > max_age
+
+    def _reject(self, symbol: str, side: str, quantity: float, reason: str) -> None:
+        logger.warning(f"Risk check rejected {symbol} {side} {quantity}: {reason}")
+        raise RiskCheckError(reason)
+
+    def check(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: Optional[float] = None
+    ) -> None:
+        """
+        Check an order against the limits.
+
+        Args:
+            symbol: Trading pair symbol
+            side: BUY or SELL
+            quantity: Order quantity
+            price: Limit price (None for MARKET)
+
+        Raises:
+            RiskCheckError: If any check fails (the reason is logged)
+        """
+        limits = self.limits_for(symbol)
+        quantity = float(quantity)
+
+        if limits.max_order_qty is not None and quantity > limits.max_order_qty:
+            self._reject(symbol, side, quantity,
+                         f"quantity {quantity} exceeds max order qty {limits.max_order_qty}")
+
+        mark = self._require_mark(symbol, side, quantity, price, limits.max_order_notional is not None)
+        self._check_band(symbol, side, quantity, price, mark)
+
+        reference = float(price) if price is not None else mark
+        if limits.max_order_notional is not None:
+            notional = quantity * reference
+            if notional > limits.max_order_notional:
+                self._reject(
+                    symbol, side, quantity,
+                    f"notional {notional:.2f} exceeds max order notional {limits.max_order_notional}"
+                )
+
+        self._check_position(symbol, side, quantity, mark)
+
+        if limits.max_orders_per_second is not None:
+            limiter = self._rate_limiters.get(symbol)
+            if limiter is None:
+                limiter = self._make_limiter(limits.max_orders_per_second)
+                self._rate_limiters[symbol] = limiter
+            if not limiter.try_acquire():
+                self._reject(symbol, side, quantity,
+                             f"more than {limits.max_orders_per_second} orders/s for {symbol}")
+
+        if self._global_rate is not None and not self._global_rate.try_acquire():
+            self._reject(symbol, side, quantity,
+                         f"more than {self.limits.max_orders_per_second} orders/s overall")
+
+    def check_parent(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: Optional[float] = None
+    ) -> None:
+        """
+        Check a whole parent order before an execution slices it into children.
+
+        Runs the price band and the position notional limit on the full
+        parent quantity. A parent that can only end above the position
+        limit is rejected before any child is sent. The per-order
+        quantity/notional and rate limits apply to each child (check()),
+        not to the parent, and no rate-limit tokens are used here.
+
+        Args:
+            symbol: Trading pair symbol
+            side: BUY or SELL
+            quantity: Total parent quantity
+            price: Limit price (None for MARKET)
+
+        Raises:
+            RiskCheckError: If a check fails (the reason is logged)
+        """
+        quantity = float(quantity)
+        mark = self._require_mark(symbol, side, quantity, price, False)
+        self._check_band(symbol, side, quantity, price, mark)
+        self._check_position(symbol, side, quantity, mark)
+
+    def _require_mark(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: Optional[float],
+        for_notional: bool
+    ) -> Optional[float]:
+        """Cached mark, rejecting the order if a configured check needs one."""
+        limits = self.limits_for(symbol)
+        mark = self.marks.get(symbol)
+        needs_mark = (for_notional
+                      or limits.max_position_notional is not None
+                      or (limits.price_band_pct is not None and price is not None))
+        if needs_mark and not mark:
+            # Fail closed: without a reference price the limits cannot be evaluated
+            self._reject(symbol, side, quantity, f"no cached mark price for {symbol}")
+        return mark
+
+    def _check_band(
+        self,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: Optional[float],
+        mark: Optional[float]
+    ) -> None:
+        """Fat-finger check: a limit price too far from the mark."""
+        band = self.limits_for(symbol).price_band_pct
+        if price is not None and band is not None:
+            deviation = abs(float(price) - mark) / mark * 100
+            if deviation > band:
+                self._reject(
+                    symbol, side, quantity,
+                    f"price {price} is {deviation:.2f}% from mark {mark} (band {band}%)"
+                )
+
+    def _check_position(self, symbol: str, side: str, quantity: float, mark: Optional[float]) -> None:
+        """Position notional after the fill must stay within the limit."""
+        limit = self.limits_for(symbol).max_position_notional
+        if limit is None:
+            return
+        current = self.positions.get(symbol, 0.0)
+        projected = current + (quantity if side == "BUY" else -quantity)
+        # Orders that only reduce the position are always allowed
+        if abs(projected) > abs(current) and abs(projected) * mark > limit:
+            self._reject(
+                symbol, side, quantity,
+                f"position notional {abs(projected) * mark:.2f} would exceed "
+                f"max position notional {limit}"
+            )
@@ -0,0 +1,492 @@
+# trading_bot/bot/sharded.py
+"""
+Market-data processing sharded across worker processes.
+
+One Python process runs feed parsing and indicator updates on one core.
+ShardedMarketData splits the symbols into shards, one worker process per
+shard. Each worker owns everything for its symbols: the WebSocket feed
+(``<symbol>@aggTrade`` and ``<symbol>@bookTicker``), JSON parsing, top of
+book and an IndicatorEngine. Shards share nothing, so throughput grows
+with the number of cores until the parent's reader saturates.
+
+Workers do not send pickled objects through a multiprocessing.Queue. Each
+one writes fixed-size binary records into its own shared-memory ring:
+
+    header (128 bytes): write index, done flag | read index (own cache line)
+    slots:              record[0] ... record[slots - 1]
+
+A record is the symbol's full state after one message: symbol number,
+kind (trade or book), event time, last price and quantity, best bid/ask
+with quantities, then one float64 per indicator output. The parent's
+reader thread copies whatever is new out of every ring as one NumPy
+structured array and hands that batch to subscribers. The parent handles
+each batch once, not each message. A worker whose ring is full waits, so
+a slow consumer slows the feed down instead of growing memory.
+
+Each ring has exactly one writer and one reader. The writer stores the
+record, then advances the write index. The reader copies records up to
+the write index, then advances the read index. Both indexes are only
+read and written while holding the ring's multiprocessing lock. Taking
+and releasing it is a full memory barrier, so a reader never sees an
+index before the records it covers, and a writer never reuses a slot
+before the reader has finished copying it. This holds on weakly ordered
+CPUs (ARM64, Graviton) as well as x86-64. The lock is held for a single
+index load or store, never during a copy.
+"""
+
+import json
+import multiprocessing
+import os
+import queue
+import struct
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Callable, Iterable, Iterator, Optional
+
+import numpy as np
+
+from .indicators import Bollinger, DEFAULT_INDICATORS, IndicatorEngine
+from .logging_config import setup_logger
+
+
+logger = setup_logger()
+
+TESTNET_STREAM_URL = "wss://stream.binancefuture.com"
+
+KIND_TRADE = 0
+KIND_BOOK = 1
+
+# Fields before the indicator columns: (name, struct code, dtype)
+_BASE_FIELDS = (
+    ("symbol", "I", np.uint32),
+    ("kind", "I", np.uint32),
+    ("event_time", "q", np.int64),
+    ("price", "d", np.float64),
+    ("quantity", "d", np.float64),
+    ("bid", "d", np.float64),
+    ("bid_qty", "d", np.float64),
+    ("ask", "d", np.float64),
+    ("ask_qty", "d", np.float64),
+)
+
+_HEADER_SIZE = 128
+_WRITE, _DONE, _READ = 0, 1, 8  # int64 slots in the header
+
+# Binance allows 200 streams per connection; two per symbol
+SYMBOLS_PER_CONNECTION = 100
+
+
+class ShardError(Exception):
+    """Exception raised when the sharded runtime cannot start or a worker fails."""
+    pass
+
+
+def indicator_columns(factories: dict) -> list:
+    """Record column names for an indicator set (Bollinger adds _upper/_lower)."""
+    columns = []
+    for name, factory in factories.items():
+        columns.append(name)
+        if isinstance(factory(), Bollinger):
+            columns += [f"{name}_upper", f"{name}_lower"]
+    return columns
+
+
+def record_dtype(columns: list) -> np.dtype:
+    """Structured dtype of one ring record (packed, matches record_struct)."""
+    return np.dtype(
+        [(name, dtype) for name, _, dtype in _BASE_FIELDS]
+        + [(column, np.float64) for column in columns]
+    )
+
+
+def record_struct(columns: list) -> struct.Struct:
+    """struct layout of one ring record, used by the writer."""
+    return struct.Struct("<" + "".join(code for _, code, _ in _BASE_FIELDS) + "d" * len(columns))
+
+
+def partition(symbols: Iterable[str], shards: int) -> list:
+    """
+    Split symbols into ``shards`` groups of near-equal size.
+
+    Assignment is round-robin over the sorted list, so it does not depend
+    on the order symbols were given in.
+    """
+    ordered = sorted({s.upper() for s in symbols})
+    return [ordered[i::shards] for i in range(shards) if ordered[i::shards]]
+
+
+class ShmRing:
+    """
+    Single-producer, single-consumer ring of fixed-size records in shared memory.
+
+    The parent creates it; the worker attaches by name. Both sides must use
+    the same ``lock``, which orders index updates against record copies.
+    """
+
+    def __init__(self, dtype: np.dtype, slots: int, name: Optional[str] = None, lock=None):
+        """
+        Create (name=None) or attach to a ring.
+
+        Args:
+            dtype: Record dtype (see record_dtype)
+            slots: Records the ring holds
+            name: Shared-memory name of an existing ring
+            lock: multiprocessing lock shared by writer and reader
+                (default: a new one, for a ring created here)
+        """
+        self.dtype = dtype
+        self.slots = slots
+        self.lock = lock if lock is not None else multiprocessing.Lock()
+        size = _HEADER_SIZE + slots * dtype.itemsize
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size)
+        self.name = self.shm.name
+        self.header = np.ndarray((_HEADER_SIZE // 8,), np.int64, buffer=self.shm.buf)
+        self.records = np.ndarray((slots,), dtype, buffer=self.shm.buf, offset=_HEADER_SIZE)
+        if self.owner:
+            self.header[:] = 0
+
+    @property
+    def done(self) -> bool:
+        """True once the writer has finished (feed ended or stopped)."""
+        return bool(self.header[_DONE])
+
+    def read(self) -> Optional[np.ndarray]:
+        """Copy out and consume every unread record (None if there are none)."""
+        with self.lock:  # acquire: records up to this index are visible
+            write = int(self.header[_WRITE])
+            read = int(self.header[_READ])
+        if write == read:
+            return None
+        start, end = read % self.slots, write % self.slots
+        if start < end:
+            batch = self.records[start:end].copy()
+        else:
+            batch = np.concatenate((self.records[start:], self.records[:end]))
+        with self.lock:  # release: the copy is done before the slots are reused
+            self.header[_READ] = write
+        return batch
+
+    def close(self) -> None:
+        """Detach, and free the segment if this side created it."""
+        # Views into the buffer must go before the segment can close
+        del self.header, self.records
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class RingWriter:
+    """Worker side of a ShmRing: packs records straight into the shared buffer."""
+
+    def __init__(self, ring: ShmRing, layout: struct.Struct, stop):
+        self.ring = ring
+        self.lock = ring.lock
+        self.buf = ring.shm.buf
+        self.pack_into = layout.pack_into
+        self.size = layout.size
+        self.stop = stop
+        self.written = 0
+        self._limit = ring.slots  # write index that would overwrite unread records
+
+    def write(self, *values) -> None:
+        """Append one record, waiting while the ring is full."""
+        header = self.ring.header
+        if self.written >= self._limit:
+            while True:
+                with self.lock:
+                    self._limit = int(header[_READ]) + self.ring.slots
+                if self.written < self._limit or self.stop.is_set():
+                    break
+                time.sleep(0.0005)
+        slot = self.written % self.ring.slots
+        self.pack_into(self.buf, _HEADER_SIZE + slot * self.size, *values)
+        self.written += 1
+        with self.lock:  # release: the record is visible before the index
+            header[_WRITE] = self.written
+
+    def finish(self) -> None:
+        """Mark the ring done and release the buffer."""
+        with self.lock:
+            self.ring.header[_DONE] = 1
+        del self.buf
+        self.ring.close()
+
+
+class BinanceStreamFeed:
+    """
+    Raw messages from Binance combined market streams.
+
+    Picklable, so it can be handed to a worker process. Called with the
+    worker's symbols, it returns an iterator of raw JSON messages. Every
+    connection has a reader thread that reconnects after errors, and the
+    iterator yields None about once a second when nothing arrives, so the
+    worker can check for shutdown.
+    """
+
+    def __init__(self, url: str = TESTNET_STREAM_URL, streams: tuple = ("aggTrade", "bookTicker")):
+        """
+        Initialize feed.
+
+        Args:
+            url: Market stream base URL
+            streams: Stream types to subscribe per symbol
+        """
+        self.url = url.rstrip("/")
+        self.streams = streams
+
+    def __call__(self, symbols: list) -> Iterator[Optional[str]]:
+        messages: queue.SimpleQueue = queue.SimpleQueue()
+        for i in range(0, len(symbols), SYMBOLS_PER_CONNECTION):
+            names = "/".join(
+                f"{symbol.lower()}@{stream}"
+                for symbol in symbols[i:i + SYMBOLS_PER_CONNECTION]
+                for stream in self.streams
+            )
+            threading.Thread(
+                target=self._read, args=(f"{self.url}/stream?streams={names}", messages),
+                name="market-stream", daemon=True
+            ).start()
+        while True:
+            try:
+                yield messages.get(timeout=1.0)
+            except queue.Empty:
+                yield None
+
+    @staticmethod
+    def _read(url: str, messages: queue.SimpleQueue) -> None:
+        from websockets.sync.client import connect
+
+        delay = 1.0
+        while True:
+            try:
+                with connect(url, open_timeout=10, compression=None, max_size=2 ** 22) as ws:
+                    delay = 1.0
+                    for message in ws:
+                        messages.put(message)
+            except Exception as e:
+                logger.warning(f"Market stream error, reconnecting in {delay:.0f}s: {e}")
+            time.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+def _run_shard(
+    symbols: list,
+    symbol_ids: dict,
+    ring_name: str,
+    ring_lock,
+    slots: int,
+    feed: Callable[[list], Iterable],
+    factories: dict,
+    stop
+) -> None:
+    """Worker process: parse the shard's feed, update state, write records."""
+    columns = indicator_columns(factories)
+    ring = ShmRing(record_dtype(columns), slots, ring_name, ring_lock)
+    writer = RingWriter(ring, record_struct(columns), stop)
+    engine = IndicatorEngine(factories)
+    bands = [isinstance(i, Bollinger) for i in engine.indicators(symbols[0])]
+
+    nan = float("nan")
+    # symbol -> [last price, last qty, bid, bid qty, ask, ask qty, indicator values]
+    state = {s: [nan, nan, nan, nan, nan, nan, [nan] * len(columns)] for s in symbols}
+    loads = json.loads
+    write = writer.write
+    try:
+        for count, raw in enumerate(feed(symbols)):
+            if raw is None:
+                # Heartbeat from a quiet feed: the only chance to notice stop
+                if stop.is_set():
+                    break
+                continue
+            if count & 255 == 0 and stop.is_set():
+                break
+            message = loads(raw)
+            data = message.get("data", message)
+            symbol = data.get("s")
+            book = state.get(symbol)
+            if book is None:
+                continue
+
+            if data.get("e") == "aggTrade":
+                kind = KIND_TRADE
+                price, qty = float(data["p"]), float(data["q"])
+                book[0], book[1] = price, qty
+                values = []
+                for indicator, band in zip(engine.indicators(symbol), bands):
+                    indicator.update(price, None, None, qty)
+                    values.append(indicator.value)
+                    if band:
+                        values += (indicator.upper, indicator.lower)
+                book[6] = values
+                event_time = data.get("T", 0)
+            else:  # bookTicker
+                kind = KIND_BOOK
+                book[2], book[3] = float(data["b"]), float(data["B"])
+                book[4], book[5] = float(data["a"]), float(data["A"])
+                event_time = data.get("T") or data.get("E", 0)
+
+            write(symbol_ids[symbol], kind, event_time, *book[:6], *book[6])
+    finally:
+        writer.finish()
+
+
+class ShardedMarketData:
+    """
+    Process-per-shard market-data runtime with a shared-memory fan-in.
+
+    Usage:
+        with ShardedMarketData(["BTCUSDT", "ETHUSDT", ...], workers=4) as md:
+            md.subscribe(lambda batch: print(md.symbols[batch["symbol"]], batch["price"]))
+            md.latest("BTCUSDT")      # {"price": ..., "bid": ..., "rsi14": ...}
+
+    Subscribers receive NumPy structured arrays (see record_dtype): every
+    record since the previous batch, from one shard, in that shard's order.
+    """
+
+    def __init__(
+        self,
+        symbols: Iterable[str],
+        workers: Optional[int] = None,
+        feed: Optional[Callable[[list], Iterable]] = None,
+        indicators: Optional[dict] = None,
+        ring_slots: int = 65536
+    ):
+        """
+        Initialize runtime (no processes start until start()).
+
+        Args:
+            symbols: Symbols to process
+            workers: Worker processes (default: one per CPU, at most one per symbol)
+            feed: Picklable callable taking a shard's symbols and returning
+                an iterable of raw stream messages (default: BinanceStreamFeed())
+            indicators: Output name -> picklable factory (default: DEFAULT_INDICATORS)
+            ring_slots: Records each shard's ring holds
+        """
+        workers = workers or os.cpu_count() or 1
+        self.shards = partition(symbols, workers)
+        if not self.shards:
+            raise ShardError("No symbols to process")
+        self.symbols = [s for shard in self.shards for s in shard]
+        self._ids = {s: i for i, s in enumerate(self.symbols)}
+        self.feed = feed or BinanceStreamFeed()
+        self.factories = indicators if indicators is not None else DEFAULT_INDICATORS
+        self.ring_slots = ring_slots
+        self.columns = indicator_columns(self.factories)
+        self.dtype = record_dtype(self.columns)
+
+        self.received = 0
+        self._latest = np.zeros(len(self.symbols), self.dtype)
+        self._latest[:] = tuple([0, 0, 0] + [np.nan] * (len(self.dtype.names) - 3))
+        self._seen = np.zeros(len(self.symbols), bool)
+        self._subscribers: list = []
+        self._rings: list = []
+        self._processes: list = []
+        self._reader: Optional[threading.Thread] = None
+        self._stop = None
+        self._finished = threading.Event()
+
+    def subscribe(self, callback: Callable[[np.ndarray], None]) -> Callable[[], None]:
+        """
+        Call ``callback`` with every batch of records from the reader thread.
+
+        Returns:
+            A function that removes the subscription
+        """
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def latest(self, symbol: str) -> Optional[dict]:
+        """Most recent state of one symbol, or None before its first message."""
+        i = self._ids.get(symbol.upper())
+        if i is None or not self._seen[i]:
+            return None
+        record = self._latest[i]
+        result = {name: record[name].item() for name in self.dtype.names[2:]}
+        result["symbol"] = self.symbols[i]
+        return result
+
+    def start(self) -> "ShardedMarketData":
+        """Create the rings and start one worker per shard plus the reader thread."""
+        context = multiprocessing.get_context("spawn")  # no fork of a threaded parent
+        self._stop = context.Event()
+        for shard in self.shards:
+            ring = ShmRing(self.dtype, self.ring_slots, lock=context.Lock())
+            self._rings.append(ring)
+            process = context.Process(
+                target=_run_shard,
+                args=(shard, self._ids, ring.name, ring.lock, self.ring_slots, self.feed,
+                      self.factories, self._stop),
+                name=f"md-shard-{len(self._processes)}",
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+        logger.info(
+            f"Sharded market data: {len(self.symbols)} symbols on {len(self.shards)} workers"
+        )
+
+        self._reader = threading.Thread(target=self._read_loop, name="md-reader", daemon=True)
+        self._reader.start()
+        return self
+
+    def _read_loop(self) -> None:
+        idle = 0
+        while True:
+            got = False
+            for ring in self._rings:
+                batch = ring.read()
+                if batch is None:
+                    continue
+                got = True
+                self.received += len(batch)
+                # Last record per symbol wins
+                self._latest[batch["symbol"]] = batch
+                self._seen[batch["symbol"]] = True
+                for callback in list(self._subscribers):
+                    try:
+                        callback(batch)
+                    except Exception as e:
+                        logger.error(f"Market data subscriber failed: {e}", exc_info=True)
+            if got:
+                idle = 0
+                continue
+            if all(ring.done for ring in self._rings) and all(ring.read() is None for ring in self._rings):
+                break
+            for ring, process in zip(self._rings, self._processes):
+                if not ring.done and not process.is_alive():
+                    logger.error(f"Market data worker {process.name} died (exit {process.exitcode})")
+                    ring.header[_DONE] = 1
+            # Back off gradually, so an idle feed does not spin a core
+            idle = min(idle + 1, 20)
+            time.sleep(0.00005 * idle)
+        self._finished.set()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every worker's feed has ended and its ring is drained."""
+        return self._finished.wait(timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop the workers, drain the rings and free shared memory."""
+        if self._stop is not None:
+            self._stop.set()
+        for ring, process in zip(self._rings, self._processes):
+            process.join(timeout)
+            if process.is_alive():
+                logger.warning(f"{process.name} did not stop, terminating")
+                process.terminate()
+                process.join(1)
+            ring.header[_DONE] = 1  # a killed worker never set it
+        if self._reader is not None:
+            self._reader.join(timeout)
+        for ring in self._rings:
+            ring.close()
+        self._rings.clear()
+        self._processes.clear()
+
+    def __enter__(self) -> "ShardedMarketData":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
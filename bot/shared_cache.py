@@ -0,0 +1,483 @@
+# trading_bot/bot/shared_cache.py
+"""
+Cache shared by every worker process of the dashboard.
+
+With several server workers, a per-process TTLCache means each worker
+fetches exchangeInfo and tickers on its own. SharedCache keeps the same
+interface as TTLCache but stores entries in a cross-process store:
+
+- ``sqlite://<path>``: a SQLite file. The multi-worker default is
+  ``trading_bot_cache.db`` in a private per-user directory on a RAM-backed
+  filesystem ($XDG_RUNTIME_DIR, else /dev/shm/trading_bot-<uid>).
+- ``redis://localhost:6379/0``: Redis or any Redis-compatible server
+  (Valkey, KeyDB, ...), via the optional ``redis`` package
+
+A short-lived lease makes sure one worker loads a cold key while the
+others wait for its result. Each worker also keeps a local copy of an
+entry until the shared one expires, so hot reads don't hit the store.
+
+Values are stored as JSON, never pickled, so whoever can write the store
+cannot run code in the dashboard. The SQLite file must belong to the user
+running the dashboard; a file or directory owned by anyone else is refused.
+"""
+
+import json
+import os
+import sqlite3
+import stat
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Optional
+
+from .cache import TTLCache
+from .logging_config import setup_logger
+from .symbols import SymbolIndex
+
+
+logger = setup_logger()
+
+DEFAULT_NAMESPACE = "trading_bot:"
+
+# How often a waiting worker checks whether the lease holder has finished
+LEASE_POLL_INTERVAL = 0.05
+
+# Marks a JSON-encoded object that is not plain data (see encode_value)
+TYPE_TAG = "__cache_type__"
+
+
+def encode_value(value: Any) -> bytes:
+    """
+    Serialize a cache value as JSON.
+
+    Plain JSON data (dicts, lists, strings, numbers) is stored as is;
+    tuples come back as lists. A SymbolIndex is stored as the exchangeInfo
+    subset it was built from.
+
+    Raises:
+        TypeError: If the value is not JSON-serializable
+    """
+    if isinstance(value, SymbolIndex):
+        value = {TYPE_TAG: "SymbolIndex", "data": value.to_exchange_info(), "fetchedAt": value.fetched_at}
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def decode_value(raw: bytes) -> Any:
+    """Inverse of encode_value."""
+    value = json.loads(raw)
+    if isinstance(value, dict) and value.get(TYPE_TAG) == "SymbolIndex":
+        return SymbolIndex.from_exchange_info(value["data"], value["fetchedAt"])
+    return value
+
+
+def _check_owned(path: str, directory: bool = False) -> None:
+    """
+    Refuse a path that another user owns or could have replaced.
+
+    Raises:
+        PermissionError: If ``path`` is a symlink, the wrong file type, owned
+            by another uid, or (for a directory) accessible by others
+    """
+    if not hasattr(os, "getuid"):
+        return  # Windows: the temp directory is already per-user
+    st = os.lstat(path)
+    kind_ok = stat.S_ISDIR(st.st_mode) if directory else stat.S_ISREG(st.st_mode)
+    if not kind_ok or st.st_uid != os.getuid() or (directory and st.st_mode & 0o077):
+        raise PermissionError(
+            f"Refusing shared cache path {path}: it must be a "
+            f"{'private (0700) directory' if directory else 'regular file'} owned by this user"
+        )
+
+
+def private_cache_dir() -> str:
+    """
+    Per-user directory for the SQLite cache, on a RAM-backed filesystem if possible.
+
+    Uses $XDG_RUNTIME_DIR (per-user, mode 0700 by spec), else creates
+    ``trading_bot-<uid>`` with mode 0700 in /dev/shm or the temp directory.
+
+    Raises:
+        PermissionError: If the directory exists but is not private to this user
+    """
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        _check_owned(runtime_dir, directory=True)
+        return runtime_dir
+
+    parent = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    if not hasattr(os, "getuid"):
+        return parent
+    path = os.path.join(parent, f"trading_bot-{os.getuid()}")
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    _check_owned(path, directory=True)
+    return path
+
+
+def default_cache_url() -> str:
+    """SQLite file in this user's private cache directory."""
+    return "sqlite://" + os.path.join(private_cache_dir(), "trading_bot_cache.db")
+
+
+class SQLiteStore:
+    """Cross-process store in one SQLite file (one connection per thread)."""
+
+    def __init__(self, path: str, namespace: str = DEFAULT_NAMESPACE):
+        """
+        Initialize store.
+
+        Args:
+            path: Database file; put it on tmpfs (/dev/shm) to keep it in RAM
+            namespace: Key prefix, so several apps can share one file
+
+        Raises:
+            PermissionError: If the file (or its WAL files) is not a regular
+                file owned by this user
+        """
+        self.path = path
+        self.namespace = namespace
+        self._local = threading.local()
+        try:
+            # Create it 0600; never follow a symlink someone else planted
+            os.close(os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+        except FileExistsError:
+            pass
+        for name in (path, path + "-wal", path + "-shm"):
+            if os.path.lexists(name):
+                _check_owned(name)
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT PRIMARY KEY, value BLOB, expires REAL)"
+            )
+            db.execute("CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, expires REAL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=OFF")  # RAM-backed; durability is not needed
+            self._local.db = db
+        return db
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Return (value bytes, expires unix time) or None if missing/expired."""
+        row = self._connect().execute(
+            "SELECT value, expires FROM cache WHERE key = ?", (self.namespace + key,)
+        ).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row
+
+    def set(self, key: str, value: bytes, expires: float) -> None:
+        """Store a value until ``expires`` (unix time)."""
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+            (self.namespace + key, value, expires),
+        )
+
+    def acquire_lease(self, key: str, timeout: float) -> bool:
+        """Try to become the loader for ``key``; True if this caller won."""
+        db = self._connect()
+        now = time.time()
+        db.execute("DELETE FROM leases WHERE key = ? AND expires < ?", (self.namespace + key, now))
+        cursor = db.execute(
+            "INSERT OR IGNORE INTO leases (key, expires) VALUES (?, ?)",
+            (self.namespace + key, now + timeout),
+        )
+        return cursor.rowcount == 1
+
+    def release_lease(self, key: str) -> None:
+        """Give up the loader role for ``key``."""
+        self._connect().execute("DELETE FROM leases WHERE key = ?", (self.namespace + key,))
+
+    def delete(self, key: Optional[str] = None) -> None:
+        """Drop one key, or every key in the namespace if ``key`` is None."""
+        if key is None:
+            self._connect().execute(
+                "DELETE FROM cache WHERE substr(key, 1, ?) = ?",
+                (len(self.namespace), self.namespace),
+            )
+        else:
+            self._connect().execute("DELETE FROM cache WHERE key = ?", (self.namespace + key,))
+
+
+class RedisStore:
+    """Cross-process store on Redis or a Redis-compatible server."""
+
+    def __init__(self, url: str, namespace: str = DEFAULT_NAMESPACE):
+        """
+        Initialize store.
+
+        Args:
+            url: redis:// or rediss:// URL
+            namespace: Key prefix
+
+        Raises:
+            ImportError: If the ``redis`` package is not installed
+        """
+        import redis
+
+        self.namespace = namespace
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Return (value bytes, expires unix time) or None if missing/expired."""
+        pipe = self.client.pipeline()
+        pipe.get(self.namespace + key)
+        pipe.pttl(self.namespace + key)
+        value, ttl_ms = pipe.execute()
+        if value is None or ttl_ms < 0:
+            return None
+        return value, time.time() + ttl_ms / 1000
+
+    def set(self, key: str, value: bytes, expires: float) -> None:
+        """Store a value until ``expires`` (unix time)."""
+        ttl_ms = int((expires - time.time()) * 1000)
+        if ttl_ms > 0:
+            self.client.set(self.namespace + key, value, px=ttl_ms)
+
+    def acquire_lease(self, key: str, timeout: float) -> bool:
+        """Try to become the loader for ``key``; True if this caller won."""
+        return bool(self.client.set(
+            f"{self.namespace}lease:{key}", b"1", nx=True, px=int(timeout * 1000)
+        ))
+
+    def release_lease(self, key: str) -> None:
+        """Give up the loader role for ``key``."""
+        self.client.delete(f"{self.namespace}lease:{key}")
+
+    def delete(self, key: Optional[str] = None) -> None:
+        """Drop one key, or every key in the namespace if ``key`` is None."""
+        if key is not None:
+            self.client.delete(self.namespace + key)
+            return
+        for name in self.client.scan_iter(match=self.namespace + "*"):
+            self.client.delete(name)
+
+
+class SharedCache:
+    """
+    TTLCache-compatible cache backed by a cross-process store.
+
+    Keys must be strings and values JSON-serializable (see encode_value).
+    Entries with ttl <= 0 are never stored; concurrent loads are still
+    shared within the process.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        default_ttl: float = 60.0,
+        lease_timeout: float = 10.0
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            store: SQLiteStore or RedisStore
+            default_ttl: Seconds an entry stays fresh unless set() overrides it
+            lease_timeout: Longest a worker waits for another worker's load
+                before loading itself
+        """
+        self.store = store
+        self.default_ttl = default_ttl
+        self.lease_timeout = lease_timeout
+        self._local = TTLCache(default_ttl)
+        self._lock = threading.Lock()
+        self._inflight: dict = {}   # key -> asyncio task (get_or_load_async)
+        self._loading: dict = {}    # key -> Future (get_or_load)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value, or ``default`` if missing or expired."""
+        missing = object()
+        value = self._local.get(key, missing)
+        if value is not missing:
+            return value
+
+        try:
+            row = self.store.get(key)
+        except Exception as e:
+            logger.warning(f"Shared cache read failed for {key}: {e}")
+            return default
+        if row is None:
+            return default
+
+        try:
+            value = decode_value(row[0])
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring undecodable shared cache entry {key}: {e}")
+            return default
+        self._local.set(key, value, max(0.0, row[1] - time.time()))
+        return value
+
+    def get_stale(self, key: str, default: Any = None) -> Any:
+        """Return this worker's last copy even if expired (fallback during outages)."""
+        return self._local.get_stale(key, default)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value for ``ttl`` seconds (default: default_ttl)."""
+        ttl = self.default_ttl if ttl is None else ttl
+        self._local.set(key, value, ttl)
+        if ttl <= 0:
+            return
+        try:
+            self.store.set(key, encode_value(value), time.time() + ttl)
+        except Exception as e:
+            logger.warning(f"Shared cache write failed for {key}: {e}")
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Return the cached value, loading it once across all workers if missing.
+
+        Within a worker, one thread per key waits for the lease and loads;
+        other threads asking for that key wait on its Future. Keys don't
+        wait for each other. Exceptions from the loader propagate and
+        nothing is cached.
+        """
+        if ttl is not None and ttl <= 0:
+            return self._local.get_or_load(key, loader, ttl)
+
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        with self._lock:
+            future = self._loading.get(key)
+            loading = future is None
+            if loading:
+                future = self._loading[key] = Future()
+        if not loading:
+            return future.result()
+
+        try:
+            value = self._load(key, loader, ttl)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+
+    def _load(self, key: str, loader: Callable[[], Any], ttl: Optional[float]) -> Any:
+        """Wait for another worker's load (the lease), else load and store."""
+        missing = object()
+        deadline = time.monotonic() + self.lease_timeout
+        while True:
+            value = self.get(key, missing)
+            if value is not missing:
+                return value
+            if self._acquire(key) or time.monotonic() >= deadline:
+                break
+            time.sleep(LEASE_POLL_INTERVAL)
+
+        try:
+            value = loader()
+            self.set(key, value, ttl)
+            return value
+        finally:
+            self._release(key)
+
+    async def get_or_load_async(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """Async variant of get_or_load; waiting for another worker yields the loop."""
+        import asyncio
+
+        if ttl is not None and ttl <= 0:
+            return await self._local.get_or_load_async(key, loader, ttl)
+
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        async def load() -> Any:
+            deadline = time.monotonic() + self.lease_timeout
+            while True:
+                value = self.get(key, missing)
+                if value is not missing:
+                    return value
+                if self._acquire(key) or time.monotonic() >= deadline:
+                    break
+                await asyncio.sleep(LEASE_POLL_INTERVAL)
+
+            try:
+                value = await loader()
+                self.set(key, value, ttl)
+                return value
+            finally:
+                self._release(key)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(load())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def _acquire(self, key: str) -> bool:
+        try:
+            return self.store.acquire_lease(key, self.lease_timeout)
+        except Exception as e:
+            # Store unavailable: load without coordination rather than fail
+            logger.warning(f"Shared cache lease failed for {key}: {e}")
+            return True
+
+    def _release(self, key: str) -> None:
+        try:
+            self.store.release_lease(key)
+        except Exception as e:
+            logger.warning(f"Shared cache lease release failed for {key}: {e}")
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop one key, or everything if ``key`` is None, in every worker's view."""
+        self._local.invalidate(key)
+        try:
+            self.store.delete(key)
+        except Exception as e:
+            logger.warning(f"Shared cache invalidate failed: {e}")
+
+
+def make_cache(url: Optional[str] = None, default_ttl: float = 60.0) -> Any:
+    """
+    Build a cache from a URL.
+
+    Args:
+        url: ``memory://`` (per-process TTLCache), ``sqlite://<path>``
+            (e.g. ``sqlite:///dev/shm/cache.db``) or ``redis://host:port/db``. Empty uses the CACHE_URL env var,
+            defaulting to memory.
+        default_ttl: Default entry lifetime in seconds
+
+    Returns:
+        TTLCache or SharedCache
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+    url = url or os.getenv("CACHE_URL", "") or "memory://"
+    scheme = url.split("://", 1)[0].lower()
+
+    if scheme == "memory":
+        return TTLCache(default_ttl)
+    if scheme == "sqlite":
+        path = url.split("://", 1)[1]
+        return SharedCache(SQLiteStore(path), default_ttl)
+    if scheme in ("redis", "rediss", "unix"):
+        return SharedCache(RedisStore(url), default_ttl)
+    raise ValueError(f"Unsupported CACHE_URL scheme: {scheme}")
@@ -0,0 +1,428 @@
+# trading_bot/bot/simulator.py
+"""
+Dry-run fill simulation from cached market and account state.
+
+simulate_order() estimates what an order would do without sending it:
+
+- fill price and slippage: the order walks a cached /fapi/v1/depth
+  snapshot level by level. A LIMIT order only takes levels up to its
+  price and the rest rests on the book.
+- fees: taker rate on the part that fills at once, maker rate on the
+  resting part if it fills later
+- margin impact: quantity that opens or adds to a position needs
+  ``notional / leverage``, using the cached leverage and available
+  balance. Quantity that reduces an opposite position needs none.
+- STOP / STOP_MARKET: whether the stop price is already crossed. Binance
+  rejects those orders (-2021, "would immediately trigger").
+
+Everything runs on plain dicts and lists. It takes well under a
+millisecond and makes no requests. The CLI keeps its snapshots on disk
+(SnapshotStore); the dashboard keeps them in its exchange-data cache.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from .logging_config import setup_logger
+
+
+logger = setup_logger()
+
+DEFAULT_SNAPSHOT_DIR = os.path.join("data", "snapshots")
+
+# Levels fetched per side; /fapi/v1/depth costs weight 5 at this limit
+DEFAULT_DEPTH_LIMIT = 100
+
+# Rates of the lowest VIP tier (same defaults as the backtester)
+DEFAULT_TAKER_FEE = 0.0004
+DEFAULT_MAKER_FEE = 0.0002
+
+# Binance's initial leverage for a symbol that was never changed
+DEFAULT_LEVERAGE = 20
+
+# Older snapshots are still used, with a warning
+STALE_BOOK_SECONDS = 60.0
+STALE_ACCOUNT_SECONDS = 600.0
+
+STOP_TYPES = ("STOP", "STOP_MARKET")
+
+
+@dataclass
+class OrderBook:
+    """A depth snapshot: bids best (highest) first, asks best (lowest) first."""
+
+    symbol: str
+    bids: list
+    asks: list
+    fetched_at: float = 0.0
+
+    @classmethod
+    def from_api_response(cls, symbol: str, data: dict, fetched_at: Optional[float] = None) -> "OrderBook":
+        """Create from a /fapi/v1/depth response."""
+        return cls(
+            symbol=symbol,
+            bids=[(float(p), float(q)) for p, q in data.get("bids", [])],
+            asks=[(float(p), float(q)) for p, q in data.get("asks", [])],
+            fetched_at=fetched_at if fetched_at is not None else time.time(),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "OrderBook":
+        return cls(
+            symbol=data["symbol"],
+            bids=[tuple(level) for level in data["bids"]],
+            asks=[tuple(level) for level in data["asks"]],
+            fetched_at=data.get("fetchedAt", 0.0),
+        )
+
+    def to_dict(self) -> dict:
+        return {"symbol": self.symbol, "bids": self.bids, "asks": self.asks, "fetchedAt": self.fetched_at}
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken."""
+        return max(time.time() - self.fetched_at, 0.0)
+
+    @property
+    def mid(self) -> Optional[float]:
+        """Midpoint of the best bid and ask (or whichever side exists)."""
+        if self.bids and self.asks:
+            return (self.bids[0][0] + self.asks[0][0]) / 2
+        if self.bids or self.asks:
+            return (self.bids or self.asks)[0][0]
+        return None
+
+
+@dataclass
+class AccountSnapshot:
+    """Balance, leverage and positions as last fetched."""
+
+    available_balance: float
+    wallet_balance: float
+    leverage: dict = field(default_factory=dict)    # symbol -> leverage
+    positions: dict = field(default_factory=dict)   # symbol -> signed quantity
+    fetched_at: float = 0.0
+
+    @classmethod
+    def from_api_responses(
+        cls,
+        balances: list,
+        positions: list,
+        asset: str = "USDT",
+        fetched_at: Optional[float] = None
+    ) -> "AccountSnapshot":
+        """
+        Create from /fapi/v2/balance and /fapi/v2/positionRisk responses.
+
+        positionRisk lists every symbol, flat ones included, so the
+        leverage of symbols without a position is known too.
+        """
+        row = next((b for b in balances if b.get("asset") == asset), {})
+        return cls(
+            available_balance=float(row.get("availableBalance", 0) or 0),
+            wallet_balance=float(row.get("balance", 0) or 0),
+            leverage={p["symbol"]: int(float(p.get("leverage", DEFAULT_LEVERAGE))) for p in positions},
+            positions={
+                p["symbol"]: float(p.get("positionAmt", 0))
+                for p in positions if float(p.get("positionAmt", 0))
+            },
+            fetched_at=fetched_at if fetched_at is not None else time.time(),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AccountSnapshot":
+        return cls(
+            available_balance=data["availableBalance"],
+            wallet_balance=data["walletBalance"],
+            leverage=data.get("leverage", {}),
+            positions=data.get("positions", {}),
+            fetched_at=data.get("fetchedAt", 0.0),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "availableBalance": self.available_balance,
+            "walletBalance": self.wallet_balance,
+            "leverage": self.leverage,
+            "positions": self.positions,
+            "fetchedAt": self.fetched_at,
+        }
+
+    @property
+    def age(self) -> float:
+        """Seconds since the snapshot was taken."""
+        return max(time.time() - self.fetched_at, 0.0)
+
+
+@dataclass
+class SimulatedOrder:
+    """Outcome of a simulated order. Prices in quote currency, fees in USDT."""
+
+    symbol: str
+    side: str
+    order_type: str
+    quantity: float
+    status: str                               # FILLED, PARTIALLY_FILLED, NEW, REJECTED
+    filled_qty: float = 0.0
+    avg_price: Optional[float] = None
+    resting_qty: float = 0.0
+    reference_price: Optional[float] = None   # book mid
+    slippage_bps: Optional[float] = None      # adverse move of avg_price from mid
+    levels: int = 0                           # book levels the fill consumed
+    fee: float = 0.0                          # taker fee on the immediate fill
+    resting_fee: float = 0.0                  # maker fee if the resting part fills
+    notional: float = 0.0
+    leverage: Optional[int] = None
+    margin_required: float = 0.0
+    available_after: Optional[float] = None
+    position_after: Optional[float] = None
+    stop_triggered: Optional[bool] = None
+    warnings: list = field(default_factory=list)
+    book_age: Optional[float] = None
+    account_age: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        """Convert to the camelCase JSON shape used by the dashboard."""
+        return {
+            "symbol": self.symbol,
+            "side": self.side,
+            "type": self.order_type,
+            "quantity": self.quantity,
+            "status": self.status,
+            "filledQty": self.filled_qty,
+            "avgPrice": self.avg_price,
+            "restingQty": self.resting_qty,
+            "referencePrice": self.reference_price,
+            "slippageBps": self.slippage_bps,
+            "levels": self.levels,
+            "fee": self.fee,
+            "restingFee": self.resting_fee,
+            "notional": self.notional,
+            "leverage": self.leverage,
+            "marginRequired": self.margin_required,
+            "availableAfter": self.available_after,
+            "positionAfter": self.position_after,
+            "stopTriggered": self.stop_triggered,
+            "warnings": self.warnings,
+            "bookAge": self.book_age,
+            "accountAge": self.account_age,
+        }
+
+    def format(self) -> str:
+        """Multi-line summary for the terminal."""
+        lines = [f"Simulated:    {self.status}"]
+        if self.filled_qty:
+            lines.append(
+                f"Fill:         {self.filled_qty:g} @ {self.avg_price:,.6g} "
+                f"({self.levels} level{'s' if self.levels != 1 else ''})"
+            )
+        if self.slippage_bps is not None:
+            lines.append(f"Slippage:     {self.slippage_bps:.2f} bps vs mid {self.reference_price:,.6g}")
+        if self.resting_qty:
+            lines.append(f"Resting:      {self.resting_qty:g} (maker fee if filled: {self.resting_fee:.4f})")
+        if self.stop_triggered is not None:
+            lines.append(f"Stop:         {'already crossed' if self.stop_triggered else 'not yet crossed'}")
+        if self.stop_triggered is False and self.avg_price:
+            lines.append(f"If triggered: ~{self.avg_price:,.6g}")
+        lines.append(f"Notional:     {self.notional:,.2f}")
+        lines.append(f"Fee:          {self.fee:.4f}")
+        if self.leverage:
+            lines.append(f"Margin:       {self.margin_required:,.2f} at {self.leverage}x")
+        if self.available_after is not None:
+            lines.append(f"Available:    {self.available_after:,.2f} after the order")
+        if self.position_after is not None:
+            lines.append(f"Position:     {self.position_after:g} after the fill")
+        for warning in self.warnings:
+            lines.append(f"⚠ {warning}")
+        return "\n".join(lines)
+
+
+def _walk(levels: list, quantity: float, limit: Optional[float], buy: bool) -> tuple:
+    """(filled qty, quote spent, levels used) taking ``levels`` up to ``limit``."""
+    remaining, quote, used = quantity, 0.0, 0
+    for price, size in levels:
+        if remaining <= 0:
+            break
+        if limit is not None and (price > limit if buy else price < limit):
+            break
+        take = min(size, remaining)
+        quote += take * price
+        remaining -= take
+        used += 1
+    return quantity - remaining, quote, used
+
+
+def simulate_order(
+    symbol: str,
+    side: str,
+    order_type: str,
+    quantity: float,
+    price: Optional[float] = None,
+    stop_price: Optional[float] = None,
+    book: Optional[OrderBook] = None,
+    account: Optional[AccountSnapshot] = None,
+    last_price: Optional[float] = None,
+    taker_fee: float = DEFAULT_TAKER_FEE,
+    maker_fee: float = DEFAULT_MAKER_FEE
+) -> SimulatedOrder:
+    """
+    Simulate an order against cached state.
+
+    Args:
+        symbol: Trading pair symbol
+        side: BUY or SELL
+        order_type: MARKET, LIMIT, STOP or STOP_MARKET
+        quantity: Order quantity
+        price: Limit price (LIMIT, STOP)
+        stop_price: Trigger price (STOP, STOP_MARKET)
+        book: Depth snapshot (None: no fill estimate)
+        account: Balance/leverage snapshot (None: no margin check)
+        last_price: Last trade price for the stop check (default: book mid)
+        taker_fee: Taker fee rate
+        maker_fee: Maker fee rate
+
+    Returns:
+        SimulatedOrder
+    """
+    buy = side == "BUY"
+    result = SimulatedOrder(symbol, side, order_type, quantity, status="NEW")
+    mid = book.mid if book else None
+    result.reference_price = mid
+
+    if book is None or mid is None:
+        result.warnings.append(f"No order book snapshot for {symbol}: fill price not estimated")
+    else:
+        result.book_age = round(book.age, 1)
+        if book.age > STALE_BOOK_SECONDS:
+            result.warnings.append(f"Order book snapshot is {book.age:.0f}s old")
+
+    # Stops: rejected if already crossed, otherwise they wait for the trigger
+    executable = order_type in ("MARKET", "LIMIT")
+    if order_type in STOP_TYPES:
+        reference = last_price or mid
+        if stop_price and reference:
+            crossed = reference >= stop_price if buy else reference <= stop_price
+            result.stop_triggered = crossed
+            if crossed:
+                result.status = "REJECTED"
+                result.warnings.append(
+                    f"Stop {stop_price:g} is already crossed (price {reference:g}): "
+                    "Binance rejects it with -2021 (order would immediately trigger)"
+                )
+
+    levels = (book.asks if buy else book.bids) if book else []
+    limit = price if order_type in ("LIMIT", "STOP") else None
+    if executable and levels:
+        filled, quote, used = _walk(levels, quantity, limit, buy)
+        if order_type == "MARKET" and filled < quantity:
+            # A real MARKET order keeps going past the snapshot's depth
+            worst = levels[-1][0]
+            quote += (quantity - filled) * worst
+            filled = quantity
+            result.warnings.append(
+                f"Order is larger than the {len(levels)}-level snapshot: "
+                f"remainder priced at the last level ({worst:g})"
+            )
+        result.filled_qty = filled
+        result.levels = used
+        if filled:
+            result.avg_price = quote / filled
+            result.fee = quote * taker_fee
+        result.resting_qty = quantity - filled
+        result.status = "FILLED" if not result.resting_qty else "PARTIALLY_FILLED" if filled else "NEW"
+    elif executable and order_type == "LIMIT":
+        result.resting_qty = quantity
+    elif order_type in STOP_TYPES and levels and result.status != "REJECTED":
+        # Fill once triggered: the current book's shape, shifted to the stop
+        filled, quote, used = _walk(levels, quantity, None, buy)
+        if filled and stop_price:
+            impact = (quote / filled - levels[0][0]) / levels[0][0]
+            trigger_fill = stop_price * (1 + impact)
+            if limit is not None and (trigger_fill > limit if buy else trigger_fill < limit):
+                trigger_fill = limit
+            result.avg_price = trigger_fill
+            result.levels = used
+            result.fee = quantity * trigger_fill * taker_fee
+
+    if result.avg_price and mid and order_type in ("MARKET", "LIMIT"):
+        move = (result.avg_price - mid) / mid
+        result.slippage_bps = round((move if buy else -move) * 10_000, 2)
+    if limit:
+        result.resting_fee = result.resting_qty * limit * maker_fee
+
+    # Margin: only the part that opens or adds to a position needs any
+    order_price = result.avg_price or limit or stop_price or mid
+    result.notional = quantity * order_price if order_price else 0.0
+    if account is None:
+        result.warnings.append("No account snapshot: margin impact not checked")
+        return result
+
+    result.account_age = round(account.age, 1)
+    if account.age > STALE_ACCOUNT_SECONDS:
+        result.warnings.append(f"Account snapshot is {account.age / 60:.0f} min old")
+    leverage = account.leverage.get(symbol)
+    if leverage is None:
+        leverage = DEFAULT_LEVERAGE
+        result.warnings.append(f"Leverage for {symbol} unknown: assuming {DEFAULT_LEVERAGE}x")
+    result.leverage = leverage
+
+    position = account.positions.get(symbol, 0.0)
+    signed = quantity if buy else -quantity
+    reducing = min(abs(position), quantity) if position and (position > 0) != buy else 0.0
+    if order_price:
+        result.margin_required = (quantity - reducing) * order_price / leverage
+    if result.stop_triggered is not True:
+        result.position_after = position + signed
+    result.available_after = account.available_balance - result.margin_required - result.fee
+    if result.available_after < 0 and result.status != "REJECTED":
+        result.status = "REJECTED"
+        result.warnings.append(
+            f"Needs {result.margin_required + result.fee:,.2f} but only "
+            f"{account.available_balance:,.2f} is available: Binance rejects it with -2019 "
+            "(margin is insufficient)"
+        )
+    return result
+
+
+class SnapshotStore:
+    """Order book and account snapshots on disk, for the CLI's dry runs."""
+
+    def __init__(self, directory: str = DEFAULT_SNAPSHOT_DIR):
+        self.directory = Path(directory)
+
+    def _write(self, name: str, data: dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / name
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def _read(self, name: str) -> Optional[dict]:
+        path = self.directory / name
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable snapshot {path}: {e}")
+            return None
+
+    def save_book(self, book: OrderBook) -> None:
+        self._write(f"book-{book.symbol}.json", book.to_dict())
+
+    def load_book(self, symbol: str) -> Optional[OrderBook]:
+        data = self._read(f"book-{symbol}.json")
+        return OrderBook.from_dict(data) if data else None
+
+    def save_account(self, account: AccountSnapshot) -> None:
+        self._write("account.json", account.to_dict())
+
+    def load_account(self) -> Optional[AccountSnapshot]:
+        data = self._read("account.json")
+        return AccountSnapshot.from_dict(data) if data else None
@@ -0,0 +1,260 @@
+# trading_bot/bot/stream.py
+"""
+Server-Sent Events fan-out of dashboard state.
+
+One background thread refreshes each state source on its own interval and
+publishes changes to every connected client, so upstream call volume does
+not depend on how many dashboards are open.
+
+Blocking servers (Flask threads) consume a Subscription with ``events()``;
+asyncio servers use ``subscribe_async()`` / ``aevents()`` so every viewer
+waits on the event loop instead of holding a thread.
+
+Clients get an ``event: snapshot`` with the full state when they connect,
+then ``event: delta`` messages holding only what changed. Dict sections
+(e.g. prices) are diffed one level deep; removed keys are sent as null.
+"""
+
+import asyncio
+import json
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Iterator, Optional
+
+from .logging_config import setup_logger
+
+
+logger = setup_logger()
+
+
+@dataclass
+class StateSource:
+    """A refresh function and how often to call it."""
+
+    name: str
+    interval: float
+    fetch: Callable[[], dict]  # returns {section: value}
+    next_due: float = 0.0
+
+
+class Subscription:
+    """One connected client: a bounded queue of pending SSE messages."""
+
+    def __init__(self, maxsize: int):
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self.closed = False
+
+    def deliver(self, message: str) -> bool:
+        """Queue a message; False if the client is too far behind."""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except queue.Full:
+            return False
+
+
+class AsyncSubscription(Subscription):
+    """
+    A client served from an asyncio event loop.
+
+    The refresher thread hands messages to the loop with
+    call_soon_threadsafe, so the loop's queue is only touched by the loop.
+    """
+
+    def __init__(self, maxsize: int, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.closed = False
+
+    def deliver(self, message: str) -> bool:
+        """Queue a message; False if the client is too far behind."""
+        if self.queue.full():
+            return False
+        if self.loop.is_closed():
+            return False
+        self.loop.call_soon_threadsafe(self._put, message)
+        return True
+
+    def _put(self, message: str) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.closed = True
+
+
+def _diff(old: dict, new: dict) -> dict:
+    """Sections/keys in ``new`` that differ from ``old`` (one level deep)."""
+    delta = {}
+    for section, value in new.items():
+        previous = old.get(section)
+        if value == previous:
+            continue
+        if isinstance(value, dict) and isinstance(previous, dict):
+            changed = {k: v for k, v in value.items() if previous.get(k) != v}
+            changed.update({k: None for k in previous.keys() - value.keys()})
+            delta[section] = changed
+        else:
+            delta[section] = value
+    return delta
+
+
+def format_sse(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    """Encode one Server-Sent Events message."""
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'))}")
+    return "\n".join(lines) + "\n\n"
+
+
+class StateStream:
+    """
+    Shared refresher plus subscriber fan-out.
+
+    The refresher thread runs only while at least one client is connected.
+    A client that falls ``queue_size`` messages behind is dropped; its
+    EventSource reconnects and starts again from a fresh snapshot.
+    """
+
+    def __init__(self, heartbeat: float = 15.0, queue_size: int = 100):
+        """
+        Initialize stream.
+
+        Args:
+            heartbeat: Seconds between keep-alive comments on idle streams
+            queue_size: Pending messages allowed per client
+        """
+        self.heartbeat = heartbeat
+        self.queue_size = queue_size
+        self.sources: list = []
+        self.state: dict = {}
+        self.sequence = 0
+        self._subscribers: set = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+
+    def add_source(self, name: str, interval: float, fetch: Callable[[], dict]) -> None:
+        """
+        Register a state source.
+
+        Args:
+            name: Source name (for logging)
+            interval: Seconds between refreshes
+            fetch: Returns a dict of section -> value to merge into the state
+        """
+        self.sources.append(StateSource(name, interval, fetch))
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of connected clients."""
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscription:
+        """Register a client, queue its snapshot and start the refresher if idle."""
+        return self._register(Subscription(self.queue_size))
+
+    def subscribe_async(self) -> AsyncSubscription:
+        """Like subscribe(), for a client consumed with aevents() on the running loop."""
+        return self._register(AsyncSubscription(self.queue_size, asyncio.get_running_loop()))
+
+    def _register(self, subscription: Subscription) -> Subscription:
+        with self._lock:
+            subscription.queue.put_nowait(format_sse("snapshot", self.state, self.sequence))
+            self._subscribers.add(subscription)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="state-stream", daemon=True
+                )
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a client."""
+        with self._lock:
+            subscription.closed = True
+            self._subscribers.discard(subscription)
+
+    def events(self, subscription: Subscription) -> Iterator[str]:
+        """
+        Yield SSE messages for one client until it disconnects or is dropped.
+
+        Meant to be returned from a streaming HTTP response.
+        """
+        try:
+            while not subscription.closed:
+                try:
+                    yield subscription.queue.get(timeout=self.heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+    async def aevents(self, subscription: AsyncSubscription) -> AsyncIterator[str]:
+        """Async counterpart of events() for an AsyncSubscription."""
+        try:
+            while not subscription.closed:
+                try:
+                    yield await asyncio.wait_for(subscription.queue.get(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+    def _publish(self, update: dict, delta: dict) -> None:
+        with self._lock:
+            self.state = {**self.state, **update}
+            self.sequence += 1
+            message = format_sse("delta", delta, self.sequence)
+            for subscription in list(self._subscribers):
+                if not subscription.deliver(message):
+                    logger.warning("Dropping slow stream client")
+                    subscription.closed = True
+                    self._subscribers.discard(subscription)
+
+    def refresh(self, source: StateSource) -> None:
+        """Fetch one source now and publish whatever changed."""
+        try:
+            update = source.fetch()
+        except Exception as e:
+            logger.warning(f"Stream source {source.name} failed: {e}")
+            return
+
+        delta = _diff(self.state, update)
+        if delta:
+            self._publish(update, delta)
+
+    def _run(self) -> None:
+        logger.info("State stream refresher started")
+        for source in self.sources:
+            source.next_due = 0.0
+
+        while True:
+            with self._lock:
+                if not self._subscribers:
+                    # subscribe() starts a new thread once this is cleared
+                    self._thread = None
+                    break
+
+            now = time.monotonic()
+            for source in self.sources:
+                if now >= source.next_due:
+                    self.refresh(source)
+                    source.next_due = time.monotonic() + source.interval
+
+            next_due = min((s.next_due for s in self.sources), default=now + 1.0)
+            self._wake.wait(max(0.0, next_due - time.monotonic()))
+            self._wake.clear()
+
+        logger.info("State stream refresher stopped (no clients)")
+
+    def stop(self) -> None:
+        """Disconnect all clients and stop the refresher."""
+        with self._lock:
+            for subscription in self._subscribers:
+                subscription.closed = True
+            self._subscribers.clear()
+        self._wake.set()
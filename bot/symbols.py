@@ -0,0 +1,205 @@
+# trading_bot/bot/symbols.py
+"""
+Symbol discovery from a cached exchangeInfo snapshot.
+
+One /fapi/v1/exchangeInfo response describes the whole symbol universe, so
+every lookup here (tradable check, filters, autocomplete) is served from
+memory without per-symbol requests.
+"""
+
+import json
+import os
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional
+
+from .logging_config import setup_logger
+
+
+logger = setup_logger()
+
+DEFAULT_CACHE_PATH = os.path.join("data", "exchange_info.json")
+
+# exchangeInfo changes only on listings/delistings and filter updates
+DEFAULT_TTL = 3600.0
+
+
+@dataclass
+class SymbolInfo:
+    """Trading rules for one symbol."""
+
+    symbol: str
+    base_asset: str
+    quote_asset: str
+    status: str
+    contract_type: str = ""
+    price_precision: Optional[int] = None
+    quantity_precision: Optional[int] = None
+    filters: dict = field(default_factory=dict)
+
+    @property
+    def tradable(self) -> bool:
+        """True if the symbol currently accepts orders."""
+        return self.status == "TRADING"
+
+    @classmethod
+    def from_api_response(cls, data: dict) -> "SymbolInfo":
+        """Create SymbolInfo from one exchangeInfo ``symbols`` entry."""
+        return cls(
+            symbol=data["symbol"],
+            base_asset=data.get("baseAsset", ""),
+            quote_asset=data.get("quoteAsset", ""),
+            status=data.get("status", ""),
+            contract_type=data.get("contractType", ""),
+            price_precision=data.get("pricePrecision"),
+            quantity_precision=data.get("quantityPrecision"),
+            filters={f["filterType"]: f for f in data.get("filters", [])},
+        )
+
+    def to_api_response(self) -> dict:
+        """Convert back to an exchangeInfo ``symbols`` entry (inverse of from_api_response)."""
+        return {
+            "symbol": self.symbol,
+            "baseAsset": self.base_asset,
+            "quoteAsset": self.quote_asset,
+            "status": self.status,
+            "contractType": self.contract_type,
+            "pricePrecision": self.price_precision,
+            "quantityPrecision": self.quantity_precision,
+            "filters": list(self.filters.values()),
+        }
+
+    def to_dict(self) -> dict:
+        """Convert to the shape served by the dashboard's /api/exchange-info."""
+        return {
+            "quantityPrecision": self.quantity_precision,
+            "pricePrecision": self.price_precision,
+            "filters": self.filters,
+        }
+
+
+class SymbolIndex:
+    """
+    In-memory index over the exchangeInfo symbol list.
+
+    - ``is_tradable`` / ``get``: O(1) dict lookups
+    - ``search``: prefix search by bisecting a sorted name list, so
+      autocomplete costs O(log n + k) per keystroke
+    """
+
+    def __init__(self, symbols: list, fetched_at: Optional[float] = None):
+        """
+        Initialize index.
+
+        Args:
+            symbols: SymbolInfo entries
+            fetched_at: Unix time of the exchangeInfo snapshot
+        """
+        self._by_symbol = {s.symbol: s for s in symbols}
+        self._names = sorted(self._by_symbol)
+        self._tradable = frozenset(s.symbol for s in symbols if s.tradable)
+        self.fetched_at = fetched_at or time.time()
+
+    @classmethod
+    def from_exchange_info(cls, data: dict, fetched_at: Optional[float] = None) -> "SymbolIndex":
+        """Build an index from a raw /fapi/v1/exchangeInfo response."""
+        return cls(
+            [SymbolInfo.from_api_response(s) for s in data.get("symbols", [])],
+            fetched_at,
+        )
+
+    def to_exchange_info(self) -> dict:
+        """The exchangeInfo subset this index holds; from_exchange_info() rebuilds it."""
+        return {"symbols": [s.to_api_response() for s in self._by_symbol.values()]}
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._by_symbol
+
+    @property
+    def symbols(self) -> list:
+        """All symbol names, sorted."""
+        return list(self._names)
+
+    def get(self, symbol: str) -> Optional[SymbolInfo]:
+        """Trading rules for a symbol, or None if not listed."""
+        return self._by_symbol.get(symbol)
+
+    def is_tradable(self, symbol: str) -> bool:
+        """True if the symbol is listed and in TRADING status."""
+        return symbol in self._tradable
+
+    def search(self, prefix: str, limit: int = 10, tradable_only: bool = True) -> list:
+        """
+        Symbols starting with ``prefix`` (case-insensitive), in sorted order.
+
+        Args:
+            prefix: Typed prefix, e.g. "BT"
+            limit: Maximum matches to return
+            tradable_only: Skip symbols not in TRADING status
+
+        Returns:
+            Matching symbol names
+        """
+        prefix = prefix.upper().strip()
+        matches = []
+        for i in range(bisect_left(self._names, prefix), len(self._names)):
+            name = self._names[i]
+            if not name.startswith(prefix):
+                break
+            if tradable_only and name not in self._tradable:
+                continue
+            matches.append(name)
+            if len(matches) >= limit:
+                break
+        return matches
+
+
+def load_symbol_index(
+    fetch: Optional[Callable[[], dict]] = None,
+    cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+    ttl: float = DEFAULT_TTL
+) -> Optional[SymbolIndex]:
+    """
+    Load the symbol index from the on-disk snapshot, refreshing it if stale.
+
+    Args:
+        fetch: Callable returning a raw exchangeInfo response (e.g.
+            client.get_exchange_info). Without it only the disk cache is used.
+        cache_path: Snapshot file (None disables the disk cache)
+        ttl: Seconds a snapshot stays fresh
+
+    Returns:
+        SymbolIndex, or None if there is no fresh snapshot and no fetch
+    """
+    path = Path(cache_path) if cache_path else None
+
+    if path and path.exists() and time.time() - path.stat().st_mtime < ttl:
+        try:
+            with open(path, encoding="utf-8") as f:
+                return SymbolIndex.from_exchange_info(json.load(f), path.stat().st_mtime)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable exchangeInfo cache {path}: {e}")
+
+    if fetch is None:
+        return None
+
+    data = fetch()
+    if path:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"symbols": data.get("symbols", [])}, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            # Read-only filesystems (serverless) still get the in-memory index
+            logger.warning(f"Could not write exchangeInfo cache {path}: {e}")
+
+    index = SymbolIndex.from_exchange_info(data)
+    logger.info(f"Loaded exchangeInfo: {len(index)} symbols")
+    return index
@@ -0,0 +1,457 @@
+# trading_bot/bot/tracing.py
+"""
+Request IDs and span tracing, exported in OpenTelemetry (OTLP/JSON) format.
+
+A request ID ties together every log line written while one dashboard
+request or CLI command runs. It is kept in a context variable, so it
+follows the request across threads started with a copied context and
+across asyncio tasks. setup_logger() adds it to each log line.
+
+Spans nest the same way:
+
+    GET /api/place-order                  (server, one per route)
+    └── binance POST /fapi/v1/order       (client call: sign, send, decode)
+        ├── sign
+        ├── HTTP POST /fapi/v1/order      (one per attempt, incl. retries/hedges)
+        └── decode
+
+Tracing is off unless an exporter is configured:
+
+- ``OTEL_TRACES_FILE=traces.jsonl``: one ExportTraceServiceRequest JSON
+  object per line. The OpenTelemetry Collector's ``otlpjsonfile`` receiver
+  and most trace viewers can read this file.
+- ``OTEL_EXPORTER_OTLP_ENDPOINT=http://localhost:4318``: POST batches to a
+  collector's OTLP/HTTP JSON endpoint (``/v1/traces``).
+
+Spans are batched and written by a background thread. While tracing is
+off, ``span()`` returns a shared no-op object.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+# version-trace_id-parent_id-flags; a future version may append more fields
+_TRACEPARENT = re.compile(
+    r"(?P<version>[0-9a-f]{2})-(?P<trace_id>[0-9a-f]{32})-(?P<span_id>[0-9a-f]{16})"
+    r"-(?P<flags>[0-9a-f]{2})(?P<rest>-.*)?"
+)
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+def new_id(nbytes: int = 8) -> str:
+    """Random lowercase hex ID (8 bytes for span/request IDs, 16 for trace IDs)."""
+    return os.urandom(nbytes).hex()
+
+
+def current_request_id() -> Optional[str]:
+    """Request ID of the request or command being handled, if any."""
+    return _request_id.get()
+
+
+def set_request_id(request_id: Optional[str]):
+    """Set the request ID for the current context. Returns a token for reset_request_id."""
+    return _request_id.set(request_id)
+
+
+def reset_request_id(token) -> None:
+    """Restore the request ID that was current before set_request_id."""
+    _request_id.reset(token)
+
+
+def current_span() -> Optional["Span"]:
+    """Innermost open span in this context."""
+    return _current_span.get()
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[tuple]:
+    """
+    (trace_id, parent_span_id) from a W3C ``traceparent`` header, or None.
+
+    Invalid headers are ignored, per the spec: IDs must be lowercase hex and
+    not all zeros, version ``ff`` is invalid, and version 00 has exactly
+    four fields.
+    """
+    if not header:
+        return None
+    match = _TRACEPARENT.fullmatch(header.strip())
+    if match is None:
+        return None
+    version, trace_id, span_id = match.group("version", "trace_id", "span_id")
+    if version == "ff" or (version == "00" and match.group("rest") is not None):
+        return None
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return trace_id, span_id
+
+
+def _attribute(key: str, value) -> dict:
+    """One OTLP/JSON attribute (int64 values are strings in OTLP/JSON)."""
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Span:
+    """
+    A timed operation. Use as a context manager; it becomes the parent of
+    spans started inside the block, and is exported when the block exits.
+    """
+
+    __slots__ = (
+        "name", "kind", "trace_id", "span_id", "parent_id", "attributes",
+        "start_ns", "end_ns", "status", "status_message", "_token",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[dict] = None,
+        parent: Optional[tuple] = None
+    ):
+        """
+        Initialize span (the clock starts on __enter__).
+
+        Args:
+            name: Operation name
+            kind: SPAN_KIND_INTERNAL, SPAN_KIND_SERVER or SPAN_KIND_CLIENT
+            attributes: Initial attributes
+            parent: (trace_id, span_id) of a remote parent; default is the
+                current span, or a new trace
+        """
+        if parent is None:
+            enclosing = _current_span.get()
+            parent = (enclosing.trace_id, enclosing.span_id) if enclosing else None
+        self.trace_id = parent[0] if parent else new_id(16)
+        self.parent_id = parent[1] if parent else None
+        self.span_id = new_id()
+        self.name = name
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.start_ns = 0
+        self.end_ns = 0
+        self.status = 0
+        self.status_message = ""
+        self._token = None
+
+    def set_attribute(self, key: str, value) -> None:
+        """Add or replace an attribute."""
+        self.attributes[key] = value
+
+    def set_error(self, message: str) -> None:
+        """Mark the span failed."""
+        self.status = STATUS_ERROR
+        self.status_message = message
+
+    @property
+    def duration_ms(self) -> float:
+        """Elapsed milliseconds (so far, if still open)."""
+        end = self.end_ns or time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def start(self) -> "Span":
+        """Start the clock without making this the current span (see end)."""
+        self.start_ns = time.time_ns()
+        return self
+
+    def end(self) -> None:
+        """Stop the clock and export; later calls do nothing. For spans
+        that finish somewhere else, e.g. when a response body is closed."""
+        if self.end_ns:
+            return
+        self.end_ns = time.time_ns()
+        _tracer.export(self)
+
+    def __enter__(self) -> "Span":
+        self.start_ns = time.time_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_val is not None and self.status != STATUS_ERROR:
+            self.set_error(f"{exc_type.__name__}: {exc_val}")
+        _current_span.reset(self._token)
+        self.end()
+
+    def to_otlp(self) -> dict:
+        """The span in OTLP/JSON encoding."""
+        data = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_attribute(k, v) for k, v in self.attributes.items()],
+        }
+        if self.parent_id:
+            data["parentSpanId"] = self.parent_id
+        if self.status:
+            data["status"] = {"code": self.status, "message": self.status_message}
+        return data
+
+
+class _NoopSpan:
+    """Stand-in returned by span() while tracing is off."""
+
+    trace_id = span_id = parent_id = None
+    duration_ms = 0.0
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+    def set_error(self, message: str) -> None:
+        pass
+
+    def start(self) -> "_NoopSpan":
+        return self
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class FileExporter:
+    """Appends each batch as one OTLP/JSON line."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def export(self, payload: dict) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(payload, separators=(",", ":")) + "\n")
+
+    def close(self) -> None:
+        pass
+
+
+class OTLPHttpExporter:
+    """POSTs each batch to an OTLP/HTTP collector as JSON."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.timeout = timeout
+        self._client = None
+
+    def export(self, payload: dict) -> None:
+        if self._client is None:
+            import httpx
+            # Plain transport: the exporter's own requests are not traced
+            self._client = httpx.Client(timeout=self.timeout)
+        self._client.post(self.url, json=payload).raise_for_status()
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+
+
+class Tracer:
+    """
+    Collects finished spans and exports them in batches from a daemon thread.
+
+    A full queue drops spans (counted in ``dropped``) rather than slowing
+    requests down.
+    """
+
+    def __init__(
+        self,
+        exporter=None,
+        service_name: str = "trading-bot",
+        batch_size: int = 512,
+        interval: float = 1.0,
+        queue_size: int = 10000
+    ):
+        """
+        Initialize tracer.
+
+        Args:
+            exporter: FileExporter, OTLPHttpExporter or None (tracing off)
+            service_name: ``service.name`` resource attribute
+            batch_size: Spans per export call
+            interval: Seconds between exports of a partial batch
+            queue_size: Finished spans allowed to wait for export
+        """
+        self.exporter = exporter
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.interval = interval
+        self.exported = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are recorded."""
+        return self.exporter is not None
+
+    def export(self, span: Span) -> None:
+        """Queue a finished span."""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                    self._thread.start()
+                    atexit.register(self.flush)
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _payload(self, spans: list) -> dict:
+        return {"resourceSpans": [{
+            "resource": {"attributes": [
+                _attribute("service.name", self.service_name),
+                _attribute("process.pid", os.getpid()),
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "trading_bot"},
+                "spans": [span.to_otlp() for span in spans],
+            }],
+        }]}
+
+    def flush(self) -> None:
+        """Export every queued span now."""
+        with self._flush_lock:
+            while True:
+                spans = []
+                try:
+                    while len(spans) < self.batch_size:
+                        spans.append(self._queue.get_nowait())
+                except queue.Empty:
+                    pass
+                if not spans:
+                    return
+                self._send(spans)
+
+    def _send(self, spans: list) -> None:
+        try:
+            self.exporter.export(self._payload(spans))
+            self.exported += len(spans)
+        except Exception as e:
+            self.dropped += len(spans)
+            logging.getLogger("trading_bot").warning(f"Span export failed ({len(spans)} spans): {e}")
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            self.flush()
+
+
+def tracer_from_env() -> Tracer:
+    """Tracer configured from OTEL_TRACES_FILE / OTEL_EXPORTER_OTLP_ENDPOINT."""
+    exporter = None
+    if os.getenv("OTEL_TRACES_FILE"):
+        exporter = FileExporter(os.environ["OTEL_TRACES_FILE"])
+    elif os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        exporter = OTLPHttpExporter(os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"])
+    return Tracer(exporter, service_name=os.getenv("OTEL_SERVICE_NAME", "trading-bot"))
+
+
+_tracer = tracer_from_env()
+
+
+def get_tracer() -> Tracer:
+    """The process-wide tracer."""
+    return _tracer
+
+
+def configure_tracing(exporter=None, service_name: str = "trading-bot") -> Tracer:
+    """Replace the process-wide tracer (exporter=None turns tracing off)."""
+    global _tracer
+    if _tracer.enabled:
+        _tracer.flush()
+    _tracer = Tracer(exporter, service_name=service_name)
+    return _tracer
+
+
+def configure_from_env() -> Tracer:
+    """Reconfigure from the environment (call after loading a .env file)."""
+    global _tracer
+    if _tracer.enabled:
+        _tracer.flush()
+    _tracer = tracer_from_env()
+    return _tracer
+
+
+def tracing_enabled() -> bool:
+    """Whether spans are being recorded."""
+    return _tracer.exporter is not None
+
+
+def span(
+    name: str,
+    kind: int = SPAN_KIND_INTERNAL,
+    attributes: Optional[dict] = None,
+    parent: Optional[tuple] = None
+):
+    """
+    Start a span as a context manager (a no-op while tracing is off).
+
+    The current request ID, if any, is recorded as ``request.id`` on the
+    outermost span of the request.
+    """
+    if _tracer.exporter is None:
+        return NOOP_SPAN
+    outermost = _current_span.get() is None
+    new = Span(name, kind, attributes, parent)
+    request_id = _request_id.get()
+    if request_id and outermost:
+        new.attributes.setdefault("request.id", request_id)
+    return new
+
+
+def decode_json(response):
+    """``response.json()`` inside a "decode" span."""
+    if _tracer.exporter is None:
+        return response.json()
+    with Span("decode", attributes={"http.response.body.size": len(response.content)}):
+        return response.json()
+
+
+def clean_request_id(value: Optional[str]) -> Optional[str]:
+    """
+    A caller-supplied request ID if it is safe to log, else None.
+
+    Allows up to 128 letters, digits and ``.-_:`` (Vercel IDs look like
+    ``fra1::iad1::abcde-1700000000000-0123456789ab``).
+    """
+    if not value or len(value) > 128:
+        return None
+    if not all(c.isascii() and (c.isalnum() or c in ".-_:") for c in value):
+        return None
+    return value
@@ -3,7 +3,10 @@
 Input validation utilities for CLI arguments.
 """
 
-from typing import Literal, Optional
+from typing import Literal, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .symbols import SymbolIndex
 
 
 class ValidationError(Exception):
@@ -11,12 +14,14 @@ class ValidationError(Exception):
     pass
 
 
-def validate_symbol(symbol: str) -> str:
+def validate_symbol(symbol: str, symbol_index: Optional["SymbolIndex"] = None) -> str:
     """
     Validate trading symbol.
     
     Args:
         symbol: Trading pair symbol
+        symbol_index: Cached exchangeInfo index; if given, the symbol must
+            be listed and in TRADING status (O(1) lookup)
     
     Returns:
         Validated and normalized symbol
@@ -36,6 +41,19 @@ def validate_symbol(symbol: str) -> str:
             "Symbol must end with 'USDT' for USDT-M futures."
         )
     
+    if symbol_index is not None and not symbol_index.is_tradable(symbol):
+        if symbol in symbol_index:
+            raise ValidationError(
+                f"Symbol '{symbol}' is not trading (status: {symbol_index.get(symbol).status})."
+            )
+        suggestions = []
+        for length in (4, 3, 2):
+            suggestions = symbol_index.search(symbol[:length], limit=5)
+            if suggestions:
+                break
+        hint = f" Did you mean: {', '.join(suggestions)}?" if suggestions else ""
+        raise ValidationError(f"Symbol '{symbol}' is not listed on this exchange.{hint}")
+    
     return symbol
 
 
@@ -165,7 +183,8 @@ def validate_order_params(
     side: str,
     order_type: str,
     quantity: str,
-    price: Optional[str] = None
+    price: Optional[str] = None,
+    symbol_index: Optional["SymbolIndex"] = None
 ) -> tuple[str, str, str, float, Optional[float]]:
     """
     Validate all order parameters.
@@ -176,6 +195,7 @@ def validate_order_params(
         order_type: Order type
         quantity: Order quantity
         price: Order price (optional)
+        symbol_index: Cached exchangeInfo index for the tradable check (optional)
     
     Returns:
         Tuple of validated (symbol, side, type, quantity, price)
@@ -183,7 +203,7 @@ def validate_order_params(
     Raises:
         ValidationError: If any validation fails
     """
-    validated_symbol = validate_symbol(symbol)
+    validated_symbol = validate_symbol(symbol, symbol_index)
     validated_side = validate_side(side)
     validated_type = validate_order_type(order_type)
     validated_quantity = validate_quantity(quantity)
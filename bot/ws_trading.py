@@ -0,0 +1,253 @@
+# trading_bot/bot/ws_trading.py
+"""
+Order entry over the Binance Futures WebSocket API.
+
+A REST order pays for HTTP framing on every call, and for a new TCP/TLS
+handshake whenever the pooled connection has gone idle. The WebSocket API
+(``wss://testnet.binancefuture.com/ws-fapi/v1``) accepts the same signed
+requests as JSON messages on one long-lived connection:
+
+    {"id": "7", "method": "order.place", "params": {..., "signature": "..."}}
+
+Responses carry the request's ``id``, so several requests can be in flight
+at once: a reader thread matches each response to its waiting caller.
+
+HMAC keys cannot log a session in (``session.logon`` takes Ed25519 keys
+only), so every request is signed, like a REST call.
+
+Errors follow the REST client's types. WebSocketUnavailableError means the
+request was never sent, and the caller may resend it over REST. Any other
+BinanceNetworkError means it was sent but no answer came back, so an order
+may or may not exist.
+"""
+
+import hashlib
+import hmac
+import itertools
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Optional
+from urllib.parse import urlencode
+
+from .exceptions import (
+    BinanceClientError, BinanceNetworkError, RateLimitError, WebSocketUnavailableError
+)
+from .logging_config import setup_logger
+from .models import APIError
+from .tracing import SPAN_KIND_CLIENT, span
+
+
+logger = setup_logger()
+
+DEFAULT_WS_API_URL = "wss://testnet.binancefuture.com/ws-fapi/v1"
+
+# After a failed connect, go straight to the fallback for this long
+RECONNECT_COOLDOWN = 5.0
+
+# Binance closes WebSocket API connections after 24h; reconnect a bit earlier
+MAX_CONNECTION_AGE = 23 * 3600
+
+
+def new_client_order_id() -> str:
+    """Unique newClientOrderId, so a lost response can be checked over REST."""
+    return "tb-" + uuid.uuid4().hex[:24]
+
+
+class _ConnectionLost(Exception):
+    """The connection closed while a request was waiting for its response."""
+
+
+class WebSocketTradingSession:
+    """
+    Persistent, thread-safe WebSocket API session.
+
+    Connects on first use and reconnects after the connection drops.
+    Callers on any thread share the connection; ``submit`` returns a
+    Future, so one thread can pipeline several requests.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        api_secret: str,
+        url: str = DEFAULT_WS_API_URL,
+        timeout: float = 10.0,
+        clock: Optional[Callable[[], int]] = None
+    ):
+        """
+        Initialize session (no connection is opened yet).
+
+        Args:
+            api_key: Binance API key
+            api_secret: Binance API secret
+            url: WebSocket API endpoint
+            timeout: Seconds to wait for a connection or a response
+            clock: Returns the request timestamp in ms (default: local clock);
+                pass a server-offset clock to stay inside recvWindow
+        """
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.url = url
+        self.timeout = timeout
+        self.clock = clock or (lambda: int(time.time() * 1000))
+
+        self._ws = None
+        self._connected_at = 0.0
+        self._reconnect_at = 0.0
+        self._pending: dict = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _sign(self, params: dict) -> dict:
+        """Add apiKey, timestamp and signature (params sorted, as the WS API requires)."""
+        signed = dict(params, apiKey=self.api_key, timestamp=self.clock(), recvWindow=5000)
+        query_string = urlencode(sorted(signed.items()))
+        signed["signature"] = hmac.new(
+            self.api_secret.encode("utf-8"), query_string.encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+        return signed
+
+    def _connection(self):
+        """Return the open connection, connecting if needed. Caller holds _lock."""
+        if self._ws is not None and time.monotonic() - self._connected_at > MAX_CONNECTION_AGE:
+            self._ws.close()
+            self._ws = None
+        if self._ws is not None:
+            return self._ws
+        if time.monotonic() < self._reconnect_at:
+            raise WebSocketUnavailableError("WebSocket API unavailable (reconnect cooling down)")
+
+        from websockets.sync.client import connect
+
+        try:
+            ws = connect(self.url, open_timeout=self.timeout, compression=None, max_size=2 ** 22)
+        except Exception as e:
+            self._reconnect_at = time.monotonic() + RECONNECT_COOLDOWN
+            logger.warning(f"WebSocket API connect to {self.url} failed: {e}")
+            raise WebSocketUnavailableError(f"WebSocket API connect failed: {e}") from e
+
+        logger.info(f"WebSocket API connected: {self.url}")
+        self._ws = ws
+        self._connected_at = time.monotonic()
+        threading.Thread(
+            target=self._read_loop, args=(ws,), name="ws-trading-reader", daemon=True
+        ).start()
+        return ws
+
+    def _read_loop(self, ws) -> None:
+        """Deliver each response to the Future waiting on its id."""
+        error: Exception = _ConnectionLost("WebSocket API connection closed")
+        try:
+            for message in ws:
+                data = json.loads(message)
+                future = self._pending.pop(str(data.get("id")), None)
+                if future is not None:
+                    future.set_result(data)
+        except Exception as e:
+            error = _ConnectionLost(f"WebSocket API connection lost: {e}")
+        finally:
+            with self._lock:
+                if self._ws is ws:
+                    self._ws = None
+                # Futures registered for this connection only
+                orphaned = [f for f in self._pending.values() if f.connection is ws]
+                self._pending = {k: f for k, f in self._pending.items() if f.connection is not ws}
+            for future in orphaned:
+                future.set_exception(error)
+
+    def submit(self, method: str, params: Optional[dict] = None, signed: bool = True) -> Future:
+        """
+        Send a request without waiting for its response.
+
+        Args:
+            method: WebSocket API method, e.g. ``order.place``
+            params: Request parameters (unsigned)
+            signed: Whether to add apiKey, timestamp and signature
+
+        Returns:
+            Future resolving to the raw response message
+
+        Raises:
+            WebSocketUnavailableError: If the request could not be sent
+        """
+        from .retry import DEFAULT_POLICY
+
+        # Shares the REST client's Retry-After block: one IP, one ban
+        DEFAULT_POLICY.check_blocked()
+
+        request_id = str(next(self._ids))
+        params = params or {}
+        message = json.dumps({
+            "id": request_id,
+            "method": method,
+            "params": self._sign(params) if signed else params,
+        })
+
+        future: Future = Future()
+        future.request_id = request_id
+        with self._lock:
+            ws = self._connection()
+            future.connection = ws
+            self._pending[request_id] = future
+        try:
+            ws.send(message)
+        except Exception as e:
+            self._pending.pop(request_id, None)
+            raise WebSocketUnavailableError(f"WebSocket API send failed: {e}") from e
+        return future
+
+    def result(self, future: Future, method: str = "") -> Any:
+        """
+        Wait for a submitted request and return its ``result``.
+
+        Raises:
+            BinanceClientError: If the API rejected the request
+            RateLimitError: On HTTP 429/418 equivalents
+            BinanceNetworkError: If the connection dropped or no response
+                arrived within the timeout (outcome unknown)
+        """
+        try:
+            data = future.result(self.timeout)
+        except FutureTimeoutError as e:
+            self._pending.pop(future.request_id, None)
+            raise BinanceNetworkError(
+                f"No WebSocket API response to {method or 'request'} within {self.timeout:.0f}s"
+            ) from e
+        except _ConnectionLost as e:
+            raise BinanceNetworkError(str(e)) from e
+        return self._unwrap(data)
+
+    def call(self, method: str, params: Optional[dict] = None, signed: bool = True) -> Any:
+        """Send a request and wait for its result (see submit and result)."""
+        with span(f"ws {method}", SPAN_KIND_CLIENT, {"rpc.system": "binance-ws", "rpc.method": method}):
+            return self.result(self.submit(method, params, signed), method)
+
+    def _unwrap(self, data: dict) -> Any:
+        status = data.get("status", 200)
+        if status == 200:
+            return data.get("result")
+
+        error = data.get("error") or {}
+        if status in (418, 429):
+            from .retry import DEFAULT_POLICY
+
+            detail = error.get("data") or {}
+            retry_after = 1.0
+            if detail.get("retryAfter") and detail.get("serverTime"):
+                retry_after = max(1.0, (detail["retryAfter"] - detail["serverTime"]) / 1000)
+            DEFAULT_POLICY.block(retry_after)
+            raise RateLimitError(f"Rate limited by Binance (HTTP {status})", retry_after=retry_after)
+
+        api_error = APIError.from_api_response(error)
+        logger.error(f"WebSocket API error: {api_error}")
+        raise BinanceClientError(str(api_error), api_error.code)
+
+    def close(self) -> None:
+        """Close the connection; pending requests fail with BinanceNetworkError."""
+        with self._lock:
+            ws, self._ws = self._ws, None
+        if ws is not None:
+            ws.close()
@@ -8,9 +8,8 @@ import os
 import sys
 from pathlib import Path
 
-from dotenv import load_dotenv
-
-from bot.client import BinanceFuturesClient, BinanceClientError, BinanceNetworkError
+from bot.daemon_client import DaemonClient, DaemonError, DaemonCommandError, DEFAULT_SOCKET_PATH
+from bot.exceptions import BinanceClientError, BinanceNetworkError
 from bot.logging_config import setup_logger
 from bot.orders import (
     create_order_request,
@@ -19,15 +18,42 @@ from bot.orders import (
     print_order_response,
     OrderError
 )
-from bot.validators import ValidationError
-
+from bot.models import OrderResponse
+from bot.validators import ValidationError, validate_symbol
 
-# Load environment variables from .env file if it exists
-load_dotenv()
 
 logger = setup_logger()
 
 
+def load_environment() -> None:
+    """
+    Load environment variables from .env file if it exists.
+    
+    Deferred until a command actually runs, so --help stays fast.
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+def create_client():
+    """
+    Create a BinanceFuturesClient from environment configuration.
+    
+    httpx is imported here rather than at module level, so --help and
+    dry-run never pay for it.
+    
+    Returns:
+        BinanceFuturesClient instance
+    """
+    from bot.client import BinanceFuturesClient
+    
+    api_key, api_secret = get_api_credentials()
+    # BINANCE_WS_API_URL switches order entry to the WebSocket API
+    return BinanceFuturesClient(
+        api_key, api_secret, get_base_url(), ws_api_url=os.getenv("BINANCE_WS_API_URL") or None
+    )
+
+
 def get_api_credentials() -> tuple[str, str]:
     """
     Get API credentials from environment variables.
@@ -78,13 +104,13 @@ def cmd_test_connection(args: argparse.Namespace) -> int:
     """
     print("Testing connection to Binance Futures Testnet...")
     
+    if args.daemon:
+        return _daemon_command(args, "test")
+    
     try:
-        api_key, api_secret = get_api_credentials()
-        base_url = get_base_url()
-        
-        print(f"Base URL: {base_url}")
+        print(f"Base URL: {get_base_url()}")
         
-        with BinanceFuturesClient(api_key, api_secret, base_url) as client:
+        with create_client() as client:
             client.test_connectivity()
         
         print("✓ Connection successful!")
@@ -110,14 +136,20 @@ def cmd_place_order(args: argparse.Namespace) -> int:
     Returns:
         Exit code (0 for success, 1 for failure)
     """
+    from bot.symbols import load_symbol_index
+    
     try:
+        # Tradable-symbol check from the exchangeInfo snapshot (no network)
+        symbol_index = load_symbol_index()
+        
         # Create order request (validates inputs)
         order_request = create_order_request(
             symbol=args.symbol,
             side=args.side,
             order_type=args.type,
             quantity=args.quantity,
-            price=args.price
+            price=args.price,
+            symbol_index=symbol_index
         )
         
         # Print order summary
@@ -125,17 +157,36 @@ def cmd_place_order(args: argparse.Namespace) -> int:
         
         # Dry run mode - don't actually place order
         if args.dry_run:
+            _simulate_dry_run(order_request, refresh=args.refresh)
             print("DRY RUN MODE: Order not sent to exchange.")
             print("Remove --dry-run flag to place the order.")
             return 0
         
-        # Get credentials and create client
-        api_key, api_secret = get_api_credentials()
-        base_url = get_base_url()
+        # Hand off to a running daemon (warm connection, synced clock)
+        if args.daemon:
+            return _daemon_command(args, "order", order_request=order_request)
+        
+        # Fan out to several sub-accounts
+        if args.accounts or args.all_accounts:
+            return _broadcast_order(args, order_request)
+        
+        # Place the order (through the pre-trade risk gate if limits are set)
+        from bot.risk import RiskCheckError, RiskGate
         
-        # Place the order
-        with BinanceFuturesClient(api_key, api_secret, base_url) as client:
-            response = place_order(client, order_request)
+        risk_gate = RiskGate.from_env()
+        with create_client() as client:
+            if symbol_index is None:
+                # No fresh snapshot yet: fetch exchangeInfo once and cache it
+                validate_symbol(order_request.symbol, load_symbol_index(client.get_exchange_info))
+            try:
+                if risk_gate.needs_state:
+                    risk_gate.load_position_risk(client.get_position_risk(order_request.symbol))
+                response = place_order(
+                    client, order_request, risk_gate if risk_gate.enabled else None
+                )
+            except RiskCheckError as e:
+                print(f"✗ Risk Check Failed: {e}")
+                return 1
         
         # Print response
         print_order_response(response)
@@ -165,6 +216,595 @@ def cmd_place_order(args: argparse.Namespace) -> int:
         return 1
 
 
+def _simulate_dry_run(order_request, refresh: bool = False) -> None:
+    """
+    Print the simulated fill, fees and margin impact of a dry-run order.
+    
+    Works from the order book and account snapshots in data/snapshots/,
+    so a dry run stays offline. With refresh, both snapshots are fetched
+    first (one public depth call, two signed account calls).
+    
+    Args:
+        order_request: Validated order request
+        refresh: Fetch fresh snapshots before simulating
+    """
+    from bot.simulator import AccountSnapshot, OrderBook, SnapshotStore, simulate_order
+    
+    store = SnapshotStore()
+    if refresh:
+        with create_client() as client:
+            store.save_book(OrderBook.from_api_response(
+                order_request.symbol, client.get_order_book(order_request.symbol)
+            ))
+            store.save_account(AccountSnapshot.from_api_responses(
+                client.get_balance(), client.get_position_risk()
+            ))
+    
+    book = store.load_book(order_request.symbol)
+    account = store.load_account()
+    if book is None and account is None:
+        print("No snapshots to simulate against: add --refresh to fetch them.")
+        print()
+        return
+    
+    result = simulate_order(
+        order_request.symbol,
+        order_request.side,
+        order_request.order_type,
+        order_request.quantity,
+        price=order_request.price,
+        book=book,
+        account=account
+    )
+    print(result.format())
+    print()
+
+
+def _broadcast_order(args: argparse.Namespace, order_request) -> int:
+    """
+    Place the same order on several accounts concurrently.
+    
+    Args:
+        args: Command-line arguments
+        order_request: Validated OrderRequest
+    
+    Returns:
+        Exit code (0 if every account succeeded, 1 otherwise)
+    """
+    from bot.accounts import AccountError, AccountRegistry
+    from bot.risk import RiskGate
+    
+    try:
+        registry = AccountRegistry.from_env(get_base_url())
+        names = None if args.all_accounts else args.accounts
+        
+        with registry:
+            gates = {name: RiskGate.from_env() for name in (names or registry.names)}
+            if any(g.needs_state for g in gates.values()):
+                registry.broadcast(
+                    lambda a: gates[a.name].load_position_risk(
+                        a.client.get_position_risk(order_request.symbol)
+                    ),
+                    names, weight=5
+                )
+            gates = {name: g for name, g in gates.items() if g.enabled}
+            result = registry.place_order_all(order_request, names, gates)
+    
+    except AccountError as e:
+        print(f"✗ Account Error: {e}")
+        return 1
+    
+    for name, r in result.results.items():
+        if r.ok:
+            print(f"✓ {name}: order {r.result.order_id} {r.result.status} "
+                  f"(executed {r.result.executed_qty})")
+        else:
+            print(f"✗ {name}: {r.error_type}: {r.error}")
+    
+    aggregate = result.aggregate
+    print(f"\n{len(result.succeeded)}/{len(result.results)} account(s) succeeded, "
+          f"executed {aggregate['executedQty']} of {aggregate['requestedQty']} {aggregate['symbol']}")
+    return 0 if not result.failed else 1
+
+
+def cmd_balances(args: argparse.Namespace) -> int:
+    """
+    Show balances for several accounts and their total.
+    
+    Args:
+        args: Command-line arguments
+    
+    Returns:
+        Exit code (0 for success, 1 if any account failed)
+    """
+    from bot.accounts import AccountError, AccountRegistry
+    
+    try:
+        with AccountRegistry.from_env(get_base_url()) as registry:
+            result = registry.get_balances(args.accounts, args.asset)
+    except AccountError as e:
+        print(f"✗ Account Error: {e}")
+        return 1
+    
+    print(f"\n{'Account':<16}{'Balance':>16}{'Available':>16}{'Unrealized PnL':>18}")
+    print("-" * 66)
+    for name, r in result.results.items():
+        if not r.ok:
+            print(f"{name:<16}  ✗ {r.error_type}: {r.error}")
+        elif r.result is None:
+            print(f"{name:<16}  (no {args.asset} balance)")
+        else:
+            print(f"{name:<16}{float(r.result['balance']):>16.2f}"
+                  f"{float(r.result['availableBalance']):>16.2f}"
+                  f"{float(r.result.get('crossUnPnl', 0)):>18.2f}")
+    
+    totals = result.aggregate
+    print("-" * 66)
+    print(f"{'TOTAL':<16}{totals['balance']:>16.2f}{totals['availableBalance']:>16.2f}"
+          f"{totals['crossUnPnl']:>18.2f}  {totals['asset']}")
+    return 0 if not result.failed else 1
+
+
+def _daemon_command(args: argparse.Namespace, command: str, order_request=None) -> int:
+    """
+    Run a command through a running daemon instead of a fresh client.
+    
+    Args:
+        args: Command-line arguments
+        command: Daemon command (test or order)
+        order_request: Validated OrderRequest for the order command
+    
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    try:
+        with DaemonClient(args.socket) as daemon:
+            if command == "test":
+                result = daemon.test_connection()
+                print(f"Base URL: {result['baseUrl']} (via daemon)")
+                print("✓ Connection successful!")
+                return 0
+            
+            result = daemon.place_order(
+                symbol=order_request.symbol,
+                side=order_request.side,
+                order_type=order_request.order_type,
+                quantity=order_request.quantity,
+                price=order_request.price
+            )
+        
+        print_order_response(OrderResponse(**result))
+        print("✓ Order placed successfully!")
+        return 0
+    
+    except DaemonError as e:
+        print(f"✗ Daemon Error: {e}")
+        return 1
+    
+    except DaemonCommandError as e:
+        print(f"✗ {e.error_type}: {e}")
+        return 1
+
+
+def cmd_daemon(args: argparse.Namespace) -> int:
+    """
+    Run the long-lived daemon that serves commands over a Unix socket.
+    
+    Args:
+        args: Command-line arguments
+    
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    from bot.daemon import TradingDaemon
+    from bot.risk import RiskGate
+    
+    try:
+        with create_client() as client:
+            daemon = TradingDaemon(
+                client, args.socket, args.resync_interval, risk_gate=RiskGate.from_env()
+            )
+            print(f"Daemon listening on {args.socket} (Ctrl+C to stop)")
+            try:
+                daemon.serve_forever()
+            except KeyboardInterrupt:
+                print("\nStopping daemon...")
+        
+        return 0
+    
+    except (BinanceClientError, BinanceNetworkError, OSError) as e:
+        print(f"✗ Daemon failed to start: {e}")
+        return 1
+
+
+def cmd_execute(args: argparse.Namespace) -> int:
+    """
+    Execute a large order as a series of child orders (TWAP/ICEBERG/POV).
+    
+    Args:
+        args: Command-line arguments
+    
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    import asyncio
+    from bot.execution import ExecutionScheduler, ExecutionError, build_algorithm
+    from bot.risk import RiskCheckError, RiskGate
+    
+    try:
+        # Create parent order request (validates inputs)
+        order_request = create_order_request(
+            symbol=args.symbol,
+            side=args.side,
+            order_type=args.type,
+            quantity=args.quantity,
+            price=args.price
+        )
+        
+        print_order_summary(order_request)
+        
+        algo_params = {
+            "duration": args.duration,
+            "slices": args.slices,
+            "visible_qty": args.visible_qty,
+            "participation": args.participation,
+            "interval": args.interval,
+        }
+        
+        # Dry run mode - show the slicing plan only
+        if args.dry_run:
+            if args.algo.upper() == "POV":
+                print("POV child sizes depend on live market volume.")
+            else:
+                plan = build_algorithm(args.algo, **algo_params).plan(order_request.quantity)
+                print(f"Planned children: {len(plan)} x ~{plan[0]:g}")
+            print("DRY RUN MODE: No child orders sent to exchange.")
+            return 0
+        
+        with create_client() as client:
+            algo = build_algorithm(
+                args.algo, client=client, symbol=order_request.symbol, **algo_params
+            )
+            print(f"Algorithm:    {algo.name} (child every {algo.interval:g}s)")
+            
+            # Same pre-trade gate as place-order: the parent, then every child
+            scheduler = ExecutionScheduler(
+                client,
+                poll_interval=args.poll_interval,
+                on_progress=lambda progress: print(f"  {progress}"),
+                risk_gate=RiskGate.from_env()
+            )
+            try:
+                scheduler.precheck(order_request)
+            except RiskCheckError as e:
+                print(f"✗ Risk Check Failed: {e}")
+                return 1
+            progress = asyncio.run(
+                scheduler.run(order_request, algo, timeout=args.timeout)
+            )
+        
+        print(f"\nFilled {progress.filled_qty:g} of {progress.target_qty:g}")
+        if progress.avg_price:
+            print(f"Average Price: {progress.avg_price}")
+        
+        if progress.status != "COMPLETED":
+            print(f"✗ Execution {progress.status.lower()}: {progress.error or 'not fully filled'}")
+            return 1
+        
+        print("✓ Execution completed!")
+        return 0
+    
+    except ValidationError as e:
+        print(f"✗ Validation Error: {e}")
+        return 1
+    
+    except ExecutionError as e:
+        print(f"✗ Execution Error: {e}")
+        return 1
+    
+    except (BinanceClientError, BinanceNetworkError) as e:
+        print(f"✗ API Error: {e}")
+        return 1
+    
+    except Exception as e:
+        print(f"✗ Unexpected error: {e}")
+        logger.error(f"Execute error: {e}", exc_info=True)
+        return 1
+
+
+def cmd_backtest(args: argparse.Namespace) -> int:
+    """
+    Backtest the example SMA-crossover strategy on recorded klines.
+    
+    Args:
+        args: Command-line arguments
+    
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    from bot.backtest import BacktestError, load_klines, run_portfolio, sma_cross_positions
+    from bot.marketdata import KlineStore, MarketDataError
+    
+    if not args.data and not args.symbols:
+        print("✗ Backtest Error: pass --data files or --symbols from the download cache")
+        return 1
+    
+    try:
+        datasets = {}
+        for path in args.data or []:
+            data = load_klines(path)
+            datasets[data.symbol] = data
+        
+        store = KlineStore(args.data_dir)
+        for symbol in args.symbols or []:
+            data = store.load(symbol, args.interval)
+            datasets[data.symbol] = data
+        
+        results = run_portfolio(
+            datasets,
+            lambda data: sma_cross_positions(data, args.fast, args.slow, args.size),
+            initial_balance=args.balance,
+            fee_rate=args.fee,
+            slippage_bps=args.slippage_bps
+        )
+        
+        for result in results.values():
+            print("\n" + "=" * 50)
+            print(result)
+        print("=" * 50)
+        
+        total = sum(r.total_pnl for r in results.values())
+        print(f"\nTotal Net PnL across {len(results)} symbol(s): {total:.2f}")
+        return 0
+    
+    except (BacktestError, MarketDataError) as e:
+        print(f"✗ Backtest Error: {e}")
+        return 1
+
+
+def _parse_date_ms(value: str) -> int:
+    """Parse YYYY-MM-DD (UTC) or epoch milliseconds."""
+    from datetime import datetime, timezone
+    
+    if value.isdigit():
+        return int(value)
+    try:
+        parsed = datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid date '{value}'. Use YYYY-MM-DD or epoch milliseconds."
+        ) from None
+    return int(parsed.timestamp() * 1000)
+
+
+def _parse_time_ms(value: str) -> int:
+    """Parse a relative age (30m, 2h, 7d), YYYY-MM-DD[THH:MM[:SS]] (UTC) or epoch ms."""
+    import time
+    from datetime import datetime, timezone
+    
+    units = {"s": 1000, "m": 60_000, "h": 3_600_000, "d": 86_400_000}
+    if len(value) > 1 and value[-1] in units and value[:-1].isdigit():
+        return int(time.time() * 1000) - int(value[:-1]) * units[value[-1]]
+    for fmt in ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%dT%H:%M"):
+        try:
+            parsed = datetime.strptime(value, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+        return int(parsed.timestamp() * 1000)
+    try:
+        return _parse_date_ms(value)
+    except argparse.ArgumentTypeError:
+        raise argparse.ArgumentTypeError(
+            f"Invalid time '{value}'. Use 30m/2h/7d, YYYY-MM-DD[THH:MM], or epoch milliseconds."
+        ) from None
+
+
+def _format_audit_record(record: dict) -> str:
+    """One audit record as a log-style line."""
+    from datetime import datetime, timezone
+    
+    when = datetime.fromtimestamp(record["ts"] / 1000, timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    details = []
+    if record.get("orderId"):
+        details.append(f"order={record['orderId']}")
+    if record.get("clientOrderId"):
+        details.append(f"client={record['clientOrderId']}")
+    event = record.get("event", "")
+    if event == "order.submitted":
+        params = record.get("params", {})
+        details.append(" ".join(str(params[k]) for k in ("side", "type", "quantity", "price") if params.get(k)))
+        if record.get("via"):
+            details.append(f"via={record['via']}")
+    elif event == "order.response":
+        response = record.get("response", {})
+        details.append(f"status={record.get('status')}")
+        if response.get("executedQty"):
+            details.append(f"filled={response['executedQty']}@{response.get('avgPrice', '?')}")
+    elif event == "order.error":
+        details.append(f"error={record.get('error')}")
+    request_id = f"  [{record['requestId']}]" if record.get("requestId") else ""
+    return f"{when}  {event:<16} {record.get('symbol', '-'):<12} {' '.join(details)}{request_id}"
+
+
+def cmd_logs(args: argparse.Namespace) -> int:
+    """
+    Query the order audit log (see bot/audit.py).
+    
+    Args:
+        args: Command-line arguments
+    
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    import json
+    import time
+    
+    from bot.audit import DEFAULT_AUDIT_DIR, AuditError, QueryStats, query
+    
+    directory = args.dir or os.getenv("AUDIT_LOG_DIR") or DEFAULT_AUDIT_DIR
+    stats = QueryStats()
+    started = time.perf_counter()
+    try:
+        records = query(
+            directory, args.since, args.until, args.symbol, args.order_id,
+            args.client_order_id, args.request_id, args.event, args.limit or None, stats
+        )
+    except AuditError as e:
+        print(f"✗ Audit Error: {e}")
+        return 1
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    
+    for record in records:
+        print(json.dumps(record) if args.json else _format_audit_record(record))
+    
+    shown = f"newest {len(records)}" if args.limit and len(records) == args.limit else str(len(records))
+    print(
+        f"\n({shown} record(s) in {elapsed_ms:.1f}ms; read {stats.blocks_read} of "
+        f"{stats.blocks_total} compressed block(s) and {stats.open_segments} open segment(s))",
+        file=sys.stderr if args.json else sys.stdout
+    )
+    return 0
+
+
+def cmd_download(args: argparse.Namespace) -> int:
+    """
+    Download historical klines into the local columnar cache.
+    
+    Args:
+        args: Command-line arguments
+    
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    import asyncio
+    
+    from bot.async_client import AsyncBinanceFuturesClient
+    from bot.marketdata import KlineDownloader, KlineStore, MarketDataError, interval_to_ms
+    
+    try:
+        interval_to_ms(args.interval)
+    except MarketDataError as e:
+        print(f"✗ Download Error: {e}")
+        return 1
+    
+    async def run() -> dict:
+        # /fapi/v1/klines is a public endpoint; credentials are optional
+        async with AsyncBinanceFuturesClient(
+            os.getenv("BINANCE_API_KEY", ""),
+            os.getenv("BINANCE_API_SECRET", ""),
+            get_base_url()
+        ) as client:
+            downloader = KlineDownloader(
+                client, KlineStore(args.data_dir), concurrency=args.concurrency
+            )
+            return await downloader.download_many(
+                args.symbols, args.interval, args.start, args.end
+            )
+    
+    try:
+        results = asyncio.run(run())
+    except KeyboardInterrupt:
+        print("\nInterrupted. Completed pages are kept; re-run to resume.")
+        return 1
+    
+    failed = False
+    for symbol, stored in results.items():
+        if isinstance(stored, Exception):
+            failed = True
+            print(f"✗ {symbol}: {stored}")
+            logger.error(f"Download {symbol} failed: {stored}")
+        else:
+            print(f"✓ {symbol} {args.interval}: {stored} new bar(s)")
+    
+    print(f"\nCache: {args.data_dir}")
+    return 1 if failed else 0
+
+
+def cmd_history(args: argparse.Namespace) -> int:
+    """
+    Sync fills and income into the local history database, or query it.
+    
+    Args:
+        args: Command-line arguments
+    
+    Returns:
+        Exit code (0 for success, 1 for failure)
+    """
+    import time
+    
+    from bot.history import HistoryError, HistoryStore, HistorySync
+    
+    store = HistoryStore(args.db)
+    try:
+        if args.history_command == "sync":
+            import asyncio
+            
+            from bot.async_client import AsyncBinanceFuturesClient
+            
+            api_key, api_secret = get_api_credentials()
+            
+            async def run() -> dict:
+                async with AsyncBinanceFuturesClient(api_key, api_secret, get_base_url()) as client:
+                    return await HistorySync(client, store, concurrency=args.concurrency).sync(
+                        args.symbols, args.since
+                    )
+            
+            try:
+                results = asyncio.run(run())
+            except KeyboardInterrupt:
+                print("\nInterrupted. Committed pages are kept; re-run to resume.")
+                return 1
+            
+            failed = False
+            for name, stored in results.items():
+                if isinstance(stored, Exception):
+                    failed = True
+                    print(f"✗ {name}: {stored}")
+                    logger.error(f"History sync {name} failed: {stored}")
+                else:
+                    print(f"✓ {name}: {stored} new record(s)")
+            print(f"\nHistory: {args.db}")
+            return 1 if failed else 0
+        
+        started = time.perf_counter()
+        rows = store.summary(args.by, args.symbol and args.symbol.upper(), args.start, args.end)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+    except HistoryError as e:
+        print(f"✗ History Error: {e}")
+        return 1
+    finally:
+        store.close()
+    
+    if not rows:
+        print("No fills in range. Run: python cli.py history sync")
+        return 0
+    
+    label = {"symbol": "Symbol", "day": "Day", "total": ""}[args.by]
+    if args.history_command == "fees":
+        assets = sorted({asset for r in rows for asset in r.fees})
+        print(f"\n{label:<14}{'Fills':>10}" + "".join(f"{a:>14}" for a in assets))
+        print("-" * (24 + 14 * len(assets)))
+        for r in rows:
+            print(f"{r.key:<14}{r.fills:>10}" + "".join(f"{r.fees.get(a, 0.0):>14.4f}" for a in assets))
+    else:
+        print(f"\n{label:<14}{'Fills':>10}{'Volume':>16}{'Realized':>14}{'Fees':>12}{'Funding':>12}{'Net':>14}")
+        print("-" * 92)
+        totals = [0, 0.0, 0.0, 0.0, 0.0, 0.0]
+        for r in rows:
+            fee = r.fees.get("USDT", 0.0)
+            print(f"{r.key:<14}{r.fills:>10}{r.volume:>16.2f}{r.realized_pnl:>14.4f}"
+                  f"{fee:>12.4f}{r.funding:>12.4f}{r.net:>14.4f}")
+            for i, value in enumerate((r.fills, r.volume, r.realized_pnl, fee, r.funding, r.net)):
+                totals[i] += value
+        if len(rows) > 1:
+            print("-" * 92)
+            print(f"{'TOTAL':<14}{totals[0]:>10}{totals[1]:>16.2f}{totals[2]:>14.4f}"
+                  f"{totals[3]:>12.4f}{totals[4]:>12.4f}{totals[5]:>14.4f}")
+    note = "" if args.history_command == "fees" else "; fees and net in USDT"
+    print(f"\n({len(rows)} row(s) in {elapsed_ms:.1f}ms{note})")
+    return 0
+
+
 def main():
     """Main entry point for the CLI."""
     parser = argparse.ArgumentParser(
@@ -181,11 +821,55 @@ Examples:
   Place LIMIT order:
     python cli.py place-order --symbol ETHUSDT --side SELL --type LIMIT --quantity 0.01 --price 3500
   
-  Dry run (don't send order):
+  Dry run (simulate the fill, don't send order; --refresh updates the snapshots):
+    python cli.py place-order --symbol BTCUSDT --side BUY --type MARKET --quantity 0.001 --dry-run --refresh
     python cli.py place-order --symbol BTCUSDT --side BUY --type MARKET --quantity 0.001 --dry-run
+  
+  Daemon mode (start once, then submit through it):
+    python cli.py daemon &
+    python cli.py place-order --symbol BTCUSDT --side BUY --type MARKET --quantity 0.001 --daemon
+  
+  Same order on every configured sub-account:
+    python cli.py place-order --symbol BTCUSDT --side BUY --type MARKET --quantity 0.001 --all-accounts
+    python cli.py balances
+  
+  TWAP execution (10 children over 5 minutes):
+    python cli.py execute --symbol BTCUSDT --side BUY --type MARKET --quantity 0.5 --algo twap --duration 300 --slices 10
+  
+  Download history, then backtest from the cache:
+    python cli.py download --symbols BTCUSDT ETHUSDT --interval 1m --start 2024-01-01
+    python cli.py backtest --symbols BTCUSDT ETHUSDT --interval 1m
+  
+  Sync fills and income, then report realized PnL:
+    python cli.py history sync
+    python cli.py history pnl --by day --start 2024-06-01
+  
+  Audit trail of one order, or of the last two hours:
+    python cli.py logs --order-id 4011234567
+    python cli.py logs --since 2h --symbol BTCUSDT --event order.error
+  
+  Profile a slow command (pstats file, or --profile-mode sample for a flamegraph):
+    python cli.py --profile place-order --symbol BTCUSDT --side BUY --type MARKET --quantity 0.001 --dry-run
         """
     )
     
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Profile the command and print where the time went"
+    )
+    parser.add_argument(
+        "--profile-output",
+        metavar="FILE",
+        help="Profile file (default: profiles/cli-<command>-<time>.prof, or .folded when sampling)"
+    )
+    parser.add_argument(
+        "--profile-mode",
+        choices=["cprofile", "sample"],
+        default="cprofile",
+        help="cprofile: exact pstats file; sample: collapsed stacks for a flamegraph (default: cprofile)"
+    )
+    
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
     
     # Test connection command
@@ -193,6 +877,16 @@ Examples:
         "test-connection",
         help="Test connection to Binance Futures API"
     )
+    parser_test.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Send the command to a running daemon"
+    )
+    parser_test.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET_PATH,
+        help=f"Daemon socket path (default: {DEFAULT_SOCKET_PATH})"
+    )
     
     # Place order command
     parser_order = subparsers.add_parser(
@@ -228,9 +922,203 @@ Examples:
     parser_order.add_argument(
         "--dry-run",
         action="store_true",
-        help="Print order summary but don't send to exchange"
+        help="Simulate the order from cached snapshots but don't send to exchange"
+    )
+    parser_order.add_argument(
+        "--refresh",
+        action="store_true",
+        help="With --dry-run: fetch fresh order book and account snapshots first"
+    )
+    parser_order.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Send the order to a running daemon"
+    )
+    parser_order.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET_PATH,
+        help=f"Daemon socket path (default: {DEFAULT_SOCKET_PATH})"
+    )
+    accounts_group = parser_order.add_mutually_exclusive_group()
+    accounts_group.add_argument(
+        "--accounts",
+        nargs="+",
+        help="Place the same order on these configured accounts"
+    )
+    accounts_group.add_argument(
+        "--all-accounts",
+        action="store_true",
+        help="Place the same order on every configured account"
     )
     
+    # Execute command (sliced parent order)
+    parser_execute = subparsers.add_parser(
+        "execute",
+        help="Execute a large order with TWAP, ICEBERG or POV slicing"
+    )
+    parser_execute.add_argument("--symbol", required=True, help="Trading pair symbol (e.g., BTCUSDT)")
+    parser_execute.add_argument(
+        "--side",
+        required=True,
+        choices=["BUY", "SELL", "buy", "sell"],
+        help="Order side: BUY or SELL"
+    )
+    parser_execute.add_argument(
+        "--type",
+        default="MARKET",
+        choices=["MARKET", "LIMIT", "market", "limit"],
+        help="Child order type (default: MARKET)"
+    )
+    parser_execute.add_argument("--quantity", required=True, help="Total parent quantity")
+    parser_execute.add_argument("--price", help="Limit price for LIMIT children")
+    parser_execute.add_argument(
+        "--algo",
+        required=True,
+        choices=["twap", "iceberg", "pov", "TWAP", "ICEBERG", "POV"],
+        help="Execution algorithm"
+    )
+    parser_execute.add_argument(
+        "--duration", type=float, default=60.0,
+        help="TWAP: total duration in seconds (default: 60)"
+    )
+    parser_execute.add_argument(
+        "--slices", type=int, default=10,
+        help="TWAP: number of child orders (default: 10)"
+    )
+    parser_execute.add_argument(
+        "--visible-qty", type=float,
+        help="ICEBERG: visible clip size"
+    )
+    parser_execute.add_argument(
+        "--participation", type=float, default=0.1,
+        help="POV: share of market volume, 0-1 (default: 0.1)"
+    )
+    parser_execute.add_argument(
+        "--interval", type=float,
+        help="ICEBERG/POV: seconds between children"
+    )
+    parser_execute.add_argument(
+        "--poll-interval", type=float, default=1.0,
+        help="Seconds between fill status checks (default: 1)"
+    )
+    parser_execute.add_argument(
+        "--timeout", type=float,
+        help="Cancel working children and stop after this many seconds"
+    )
+    parser_execute.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the execution plan but don't send orders"
+    )
+    
+    # Daemon command (warm client served over a Unix socket)
+    parser_daemon = subparsers.add_parser(
+        "daemon",
+        help="Run a long-lived daemon that keeps a warm connection"
+    )
+    parser_daemon.add_argument(
+        "--socket",
+        default=DEFAULT_SOCKET_PATH,
+        help=f"Unix socket path to listen on (default: {DEFAULT_SOCKET_PATH})"
+    )
+    parser_daemon.add_argument(
+        "--resync-interval",
+        type=float,
+        default=300.0,
+        help="Seconds between server clock re-syncs (default: 300)"
+    )
+    
+    # Backtest command (offline replay of recorded data)
+    parser_backtest = subparsers.add_parser(
+        "backtest",
+        help="Backtest the example SMA-crossover strategy on recorded klines"
+    )
+    parser_backtest.add_argument(
+        "--data",
+        nargs="+",
+        help="Kline files (.csv, .csv.gz, .zip or .npz), one per symbol"
+    )
+    parser_backtest.add_argument(
+        "--symbols",
+        nargs="+",
+        help="Symbols to read from the download cache instead of files"
+    )
+    parser_backtest.add_argument("--interval", default="1m", help="Cached kline interval (default: 1m)")
+    parser_backtest.add_argument("--data-dir", default="data/klines", help="Download cache directory (default: data/klines)")
+    parser_backtest.add_argument("--fast", type=int, default=20, help="Fast SMA window (default: 20)")
+    parser_backtest.add_argument("--slow", type=int, default=50, help="Slow SMA window (default: 50)")
+    parser_backtest.add_argument("--size", type=float, default=1.0, help="Position size in base units (default: 1)")
+    parser_backtest.add_argument("--balance", type=float, default=10_000.0, help="Starting balance per symbol (default: 10000)")
+    parser_backtest.add_argument("--fee", type=float, default=0.0004, help="Taker fee rate (default: 0.0004)")
+    parser_backtest.add_argument("--slippage-bps", type=float, default=0.0, help="Slippage in basis points (default: 0)")
+    
+    # Balances command (all configured accounts)
+    parser_balances = subparsers.add_parser(
+        "balances",
+        help="Show balances across configured accounts"
+    )
+    parser_balances.add_argument("--accounts", nargs="+", help="Accounts to include (default: all)")
+    parser_balances.add_argument("--asset", default="USDT", help="Asset to report (default: USDT)")
+    
+    # Download command (historical klines into the local cache)
+    parser_download = subparsers.add_parser(
+        "download",
+        help="Download historical klines into the local columnar cache"
+    )
+    parser_download.add_argument("--symbols", required=True, nargs="+", help="Trading pair symbols")
+    parser_download.add_argument("--interval", default="1m", help="Kline interval (default: 1m)")
+    parser_download.add_argument(
+        "--start",
+        required=True,
+        type=_parse_date_ms,
+        help="Start date (YYYY-MM-DD, UTC) or epoch ms; ignored where the cache is newer"
+    )
+    parser_download.add_argument(
+        "--end",
+        type=_parse_date_ms,
+        help="End date (YYYY-MM-DD, UTC) or epoch ms (default: now)"
+    )
+    parser_download.add_argument("--data-dir", default="data/klines", help="Cache directory (default: data/klines)")
+    parser_download.add_argument("--concurrency", type=int, default=5, help="Pages in flight (default: 5)")
+    
+    # Logs command (order audit log)
+    parser_logs = subparsers.add_parser(
+        "logs",
+        help="Search the order audit log (submissions, responses, errors)"
+    )
+    parser_logs.add_argument("--since", type=_parse_time_ms, help="From (30m/2h/7d ago, YYYY-MM-DD[THH:MM] UTC, or epoch ms)")
+    parser_logs.add_argument("--until", type=_parse_time_ms, help="Until, exclusive (same formats)")
+    parser_logs.add_argument("--symbol", help="Trading pair symbol")
+    parser_logs.add_argument("--order-id", help="Exchange order ID (or algo ID)")
+    parser_logs.add_argument("--client-order-id", help="Client order ID")
+    parser_logs.add_argument("--request-id", help="Dashboard/CLI request ID (X-Request-ID)")
+    parser_logs.add_argument("--event", help="order.submitted, order.response, order.error (or prefix: order.)")
+    parser_logs.add_argument("--limit", type=int, default=100, help="Show the most recent N matches (default: 100, 0 = all)")
+    parser_logs.add_argument("--json", action="store_true", help="Print records as JSON lines")
+    parser_logs.add_argument("--dir", help="Audit log directory (default: AUDIT_LOG_DIR or logs/audit)")
+    
+    # History command (local fill/income database)
+    parser_history = subparsers.add_parser(
+        "history",
+        help="Sync and query trade, fee and funding history"
+    )
+    history_commands = parser_history.add_subparsers(dest="history_command", required=True)
+    history_sync = history_commands.add_parser("sync", help="Fetch new fills and income records")
+    history_sync.add_argument("--symbols", nargs="+",
+                              help="Symbols to fetch fills for (default: symbols already seen)")
+    history_sync.add_argument("--since", type=_parse_date_ms,
+                              help="First sync start, YYYY-MM-DD or epoch ms (default: 30 days ago)")
+    history_sync.add_argument("--concurrency", type=int, default=5, help="Symbols in flight (default: 5)")
+    for name, help_text in (("pnl", "Realized PnL, fees and funding"), ("fees", "Commissions per asset")):
+        history_query = history_commands.add_parser(name, help=help_text)
+        history_query.add_argument("--by", choices=["symbol", "day", "total"], default="symbol",
+                                   help="Group rows by (default: symbol)")
+        history_query.add_argument("--symbol", help="Only this symbol")
+        history_query.add_argument("--start", type=_parse_date_ms, help="From (YYYY-MM-DD, UTC, or epoch ms)")
+        history_query.add_argument("--end", type=_parse_date_ms, help="Until, exclusive (YYYY-MM-DD or epoch ms)")
+    for sub in history_commands.choices.values():
+        sub.add_argument("--db", default="data/history.db", help="History database (default: data/history.db)")
+    
     # Parse arguments
     args = parser.parse_args()
     
@@ -239,15 +1127,65 @@ Examples:
         parser.print_help()
         return 0
     
-    # Route to appropriate command handler
+    load_environment()
+    
+    # One request ID per command: its log lines and spans share it
+    from bot.tracing import configure_from_env, new_id, set_request_id, span
+    configure_from_env()
+    set_request_id(new_id())
+    
+    with span(f"cli {args.command}", attributes={"cli.command": args.command}):
+        if args.profile:
+            return run_profiled(args, parser)
+        return dispatch(args, parser)
+
+
+def dispatch(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """Route parsed arguments to the command handler."""
     if args.command == "test-connection":
         return cmd_test_connection(args)
     elif args.command == "place-order":
         return cmd_place_order(args)
+    elif args.command == "execute":
+        return cmd_execute(args)
+    elif args.command == "daemon":
+        return cmd_daemon(args)
+    elif args.command == "backtest":
+        return cmd_backtest(args)
+    elif args.command == "download":
+        return cmd_download(args)
+    elif args.command == "balances":
+        return cmd_balances(args)
+    elif args.command == "history":
+        return cmd_history(args)
+    elif args.command == "logs":
+        return cmd_logs(args)
     else:
         parser.print_help()
         return 1
 
 
+def run_profiled(args: argparse.Namespace, parser: argparse.ArgumentParser) -> int:
+    """
+    Run a command under the profiler, with @timed call timings enabled.
+    
+    Writes the profile to --profile-output (default: profiles/cli-<command>-...),
+    then prints the top functions and the timing table to stderr.
+    """
+    from bot.profiling import Profiler, default_output, enable_timings, format_timings
+    
+    enable_timings()
+    output = args.profile_output or default_output(f"cli-{args.command}", args.profile_mode)
+    profiler = Profiler(output, args.profile_mode)
+    try:
+        with profiler:
+            return dispatch(args, parser)
+    finally:
+        print(f"\n{'=' * 60}\nPROFILE ({args.profile_mode}, {profiler.elapsed * 1000:.0f} ms): "
+              f"{profiler.output}\n{'=' * 60}", file=sys.stderr)
+        print(profiler.summary(), file=sys.stderr)
+        print(format_timings(), file=sys.stderr)
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -9,15 +9,38 @@ import os
 import hmac
 import hashlib
 import time
-from urllib import response
 from urllib.parse import urlencode
-from typing import Dict, Any, Optional
-from flask import Flask, request, jsonify, send_from_directory
+from typing import Any, Callable, Dict, Optional, TYPE_CHECKING
+from flask import Flask, Response, g, request, jsonify, send_from_directory, stream_with_context
 from dotenv import load_dotenv
-import httpx
 
-# Load environment variables
+from bot import audit
+from bot.cache import TTLCache
+from bot.http_cache import (
+    IMMUTABLE, MIN_COMPRESS_SIZE, NO_STORE, REVALIDATE, choose_encoding, compress,
+    content_hash, etag_for, etag_matches, hashed_name, is_compressible, market_data_policy
+)
+from bot.orders import create_order_request
+from bot.tracing import (
+    SPAN_KIND_SERVER, clean_request_id, configure_from_env, decode_json, get_tracer, new_id,
+    parse_traceparent, reset_request_id, set_request_id, span
+)
+from bot.validators import ValidationError
+
+if TYPE_CHECKING:
+    import httpx
+    from bot.execution import ExecutionManager
+    from bot.portfolio import RiskEngine
+    from bot.risk import RiskGate
+    from bot.accounts import AccountRegistry
+    from bot.alerts import AlertIndex, PriceWatcher
+    from bot.symbols import SymbolIndex
+    from bot.stream import StateStream
+    from bot.ws_trading import WebSocketTradingSession
+
+# Load environment variables (tracing reads OTEL_* from them)
 load_dotenv()
+configure_from_env()
 
 app = Flask(__name__, static_folder='web', static_url_path='')
 
@@ -27,37 +50,309 @@ API_SECRET = os.getenv('BINANCE_API_SECRET', '')
 BASE_URL = os.getenv('BINANCE_BASE_URL', 'https://testnet.binancefuture.com')
 DASHBOARD_TOKEN = os.getenv('DASHBOARD_TOKEN', '')
 
+# Optional WebSocket API endpoint for order entry, e.g.
+# wss://testnet.binancefuture.com/ws-fapi/v1 (unset: orders use REST)
+WS_API_URL = os.getenv('BINANCE_WS_API_URL', '')
+
+# Seconds the risk gate may use cached marks/positions before refreshing
+RISK_STATE_TTL = float(os.getenv('RISK_STATE_TTL', '10'))
+
+# Dry-run simulation: seconds a depth snapshot is reused, and seconds the
+# balance/leverage snapshot from the last account refresh is shared across
+# workers (a dry run never fetches it; it falls back to the worker's own copy)
+DRY_RUN_BOOK_TTL = float(os.getenv('DRY_RUN_BOOK_TTL', '2'))
+DRY_RUN_ACCOUNT_TTL = float(os.getenv('DRY_RUN_ACCOUNT_TTL', '300'))
+
+# /api/stream refresh intervals (seconds), shared by all connected viewers
+STREAM_PRICE_INTERVAL = float(os.getenv('STREAM_PRICE_INTERVAL', '2'))
+STREAM_ACCOUNT_INTERVAL = float(os.getenv('STREAM_ACCOUNT_INTERVAL', '10'))
+
+# Seconds between price polls while price alerts are pending
+ALERT_PRICE_INTERVAL = float(os.getenv('ALERT_PRICE_INTERVAL', '1'))
+
+# Serverless instances freeze between invocations, so export each
+# request's spans before responding instead of from the background thread
+TRACE_FLUSH_PER_REQUEST = bool(os.getenv('VERCEL'))
+
+# Per-request profiling, off unless set: comma-separated path prefixes to
+# profile (e.g. /api/place-order), or * for every request. Each profiled
+# request writes one file to PROFILE_DIR (use /tmp/... on serverless).
+PROFILE_REQUESTS = [p.strip() for p in os.getenv('PROFILE_REQUESTS', '').split(',') if p.strip()]
+PROFILE_MODE = os.getenv('PROFILE_MODE', 'cprofile')  # or 'sample' (flamegraph stacks)
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+
 # Enforce testnet
 if 'testnet' not in BASE_URL.lower():
     raise ValueError("ERROR: Only testnet URLs allowed. Set BINANCE_BASE_URL to testnet URL.")
+if WS_API_URL and 'testnet' not in WS_API_URL.lower():
+    raise ValueError("ERROR: Only testnet URLs allowed. Set BINANCE_WS_API_URL to testnet URL.")
+
+# Shared upstream connection pool, created on first API call. Reusing it
+# across requests (and across warm serverless invocations) avoids a new
+# TLS handshake per call; importing httpx lazily keeps cold start lean.
+_http_client: Optional['httpx.Client'] = None
+
+
+def get_http_client() -> 'httpx.Client':
+    """Return the shared pooled HTTP client for Binance requests."""
+    global _http_client
+    if _http_client is None:
+        import httpx
+        from bot.resilience import build_transport
+        # Retries for safe cases, circuit breakers that fail fast on a
+        # degraded upstream, hedging for market-data GETs
+        _http_client = httpx.Client(timeout=10.0, transport=build_transport())
+    return _http_client
+
+
+# Server clock minus local clock, measured by warmup(); keeps signed
+# requests inside recvWindow on hosts with a drifting clock
+TIME_OFFSET_MS = 0
+
+
+def timestamp_ms() -> int:
+    """Current Binance server time estimate in milliseconds."""
+    return int(time.time() * 1000) + TIME_OFFSET_MS
 
 
 def generate_signature(params: Dict[str, Any]) -> str:
     """Generate HMAC SHA256 signature for Binance API."""
-    query_string = urlencode(params)
-    return hmac.new(
-        API_SECRET.encode('utf-8'),
-        query_string.encode('utf-8'),
-        hashlib.sha256
-    ).hexdigest()
+    with span('sign'):
+        query_string = urlencode(params)
+        return hmac.new(
+            API_SECRET.encode('utf-8'),
+            query_string.encode('utf-8'),
+            hashlib.sha256
+        ).hexdigest()
+
+
+def upstream_error_status(e: Exception) -> tuple:
+    """
+    (status, headers) for a failed route: 503 with Retry-After when upstream
+    is unavailable or rate limiting us (the client should back off), else 500.
+    """
+    import httpx
+    from bot.exceptions import BinanceNetworkError, RateLimitError
+    
+    if isinstance(e, RateLimitError):
+        return 503, {'Retry-After': str(max(1, round(e.retry_after)))}
+    if isinstance(e, (BinanceNetworkError, httpx.TransportError)):
+        return 503, {'Retry-After': '5'}
+    return 500, {}
+
+
+def upstream_error(e: Exception) -> tuple:
+    """JSON error response for an exception (see upstream_error_status)."""
+    status, headers = upstream_error_status(e)
+    return jsonify({'error': str(e)}), status, headers
+
+
+# Cache-Control for public market-data routes: (browser max-age, CDN
+# s-maxage, stale-while-revalidate). Polling viewers are then absorbed by
+# the CDN instead of reaching this server and Binance.
+MARKET_DATA_CACHE = {
+    '/api/prices': (1, 2, 10),
+    '/api/time': (1, 1, 5),
+    '/api/exchange-info': (300, 3600, 86400),
+    '/api/symbols': (300, 3600, 86400),
+}
+
+STATIC_ASSETS = ('styles.css', 'app.js')
+WEB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'web')
+
+_index_cache: Dict[str, Any] = {}
+
+
+def render_index() -> bytes:
+    """index.html with asset URLs rewritten to their content-hashed names."""
+    assets = {name: hashed_name(WEB_DIR, name) for name in STATIC_ASSETS}
+    key = (os.stat(os.path.join(WEB_DIR, 'index.html')).st_mtime_ns, tuple(assets.values()))
+    if _index_cache.get('key') != key:
+        with open(os.path.join(WEB_DIR, 'index.html'), encoding='utf-8') as f:
+            html = f.read()
+        html = html.replace('href="styles.css"', f'href="{assets["styles.css"]}"')
+        html = html.replace('src="app.js"', f'src="{assets["app.js"]}"')
+        _index_cache.update(key=key, body=html.encode('utf-8'))
+    return _index_cache['body']
 
 
 @app.route('/')
 def index():
-    """Serve the main HTML page."""
-    return send_from_directory('web', 'index.html')
+    """Serve the main HTML page (always revalidated; assets are hashed)."""
+    response = Response(render_index(), mimetype='text/html')
+    response.headers['Cache-Control'] = REVALIDATE
+    return response
 
 
 @app.route('/styles.css')
 def styles():
     """Serve the CSS file."""
-    return send_from_directory('web', 'styles.css')
+    return send_from_directory('web', 'styles.css', max_age=300)
 
 
 @app.route('/app.js')
 def app_js():
     """Serve the JavaScript file."""
-    return send_from_directory('web', 'app.js')
+    return send_from_directory('web', 'app.js', max_age=300)
+
+
+@app.route('/<stem>.<digest>.<any(css, js):ext>')
+def hashed_asset(stem: str, digest: str, ext: str):
+    """Serve a content-hashed asset with a one-year immutable cache."""
+    filename = f'{stem}.{ext}'
+    if filename not in STATIC_ASSETS:
+        return jsonify({'error': 'Not found'}), 404
+    
+    response = send_from_directory('web', filename)
+    if digest == content_hash(os.path.join(WEB_DIR, filename)):
+        response.headers['Cache-Control'] = IMMUTABLE
+    else:
+        # Stale link from an old page: serve the current file, don't pin it
+        response.headers['Cache-Control'] = REVALIDATE
+    return response
+
+
+@app.before_request
+def start_request_trace() -> None:
+    """Bind a request ID (X-Request-ID, Vercel's ID, or a new one) and open the route's span."""
+    request_id = (clean_request_id(request.headers.get('X-Request-ID'))
+                  or clean_request_id(request.headers.get('x-vercel-id'))
+                  or new_id())
+    g.request_id = request_id
+    g.request_id_token = set_request_id(request_id)
+    
+    route = request.url_rule.rule if request.url_rule else request.path
+    trace_span = span(
+        f"{request.method} {route}", SPAN_KIND_SERVER,
+        {'http.method': request.method, 'http.route': route, 'url.path': request.path},
+        parent=parse_traceparent(request.headers.get('traceparent')),
+    )
+    trace_span.__enter__()
+    g.trace_span = trace_span
+
+
+# Registered first, so it runs last and sees the final status
+@app.after_request
+def attach_request_id(response: Response) -> Response:
+    """Echo the request ID so a client can quote it when reporting a problem."""
+    request_id = g.get('request_id')
+    if request_id:
+        response.headers['X-Request-ID'] = request_id
+    trace_span = g.get('trace_span')
+    if trace_span is not None:
+        trace_span.set_attribute('http.status_code', response.status_code)
+        if response.status_code >= 500:
+            trace_span.set_error(f"HTTP {response.status_code}")
+    return response
+
+
+@app.teardown_request
+def end_request_trace(exc: Optional[BaseException]) -> None:
+    """Close the route's span and unbind the request ID."""
+    trace_span = g.pop('trace_span', None)
+    if trace_span is not None:
+        trace_span.__exit__(type(exc) if exc else None, exc, None)
+        if TRACE_FLUSH_PER_REQUEST:
+            get_tracer().flush()
+    token = g.pop('request_id_token', None)
+    if token is not None:
+        reset_request_id(token)
+
+
+def should_profile(path: str) -> bool:
+    """Whether PROFILE_REQUESTS selects this request path."""
+    return any(prefix == '*' or path.startswith(prefix) for prefix in PROFILE_REQUESTS)
+
+
+@app.before_request
+def start_request_profile() -> None:
+    """Start the profiler for requests chosen by PROFILE_REQUESTS."""
+    if not PROFILE_REQUESTS or not should_profile(request.path):
+        return
+    from bot.profiling import Profiler, default_output
+    
+    label = f"{request.method}-{request.path}"
+    profiler = Profiler(default_output(label, PROFILE_MODE, PROFILE_DIR), PROFILE_MODE)
+    try:
+        profiler.start()
+    except ValueError as e:
+        # Python 3.12+ allows one cProfile at a time across threads
+        print(f"[WARN] Not profiling {request.path}: {e}")
+        return
+    g.profiler = profiler
+
+
+def finish_request_profile() -> Optional[str]:
+    """Stop this request's profiler, if any, and return the file it wrote."""
+    profiler = g.pop('profiler', None)
+    if profiler is None:
+        return None
+    path = profiler.stop()
+    print(f"[INFO] Profiled {request.method} {request.path} "
+          f"({profiler.elapsed * 1000:.1f} ms): {path}")
+    return str(path)
+
+
+# Registered before apply_http_caching, so it runs after it and the
+# profile includes caching and compression
+@app.after_request
+def attach_request_profile(response: Response) -> Response:
+    """Write the request's profile and name the file in X-Profile."""
+    path = finish_request_profile()
+    if path:
+        response.headers['X-Profile'] = os.path.basename(path)
+    return response
+
+
+@app.teardown_request
+def stop_request_profile(exc: Optional[BaseException]) -> None:
+    """Stop a profiler left running by a request that raised."""
+    finish_request_profile()
+
+
+@app.after_request
+def apply_http_caching(response: Response) -> Response:
+    """Add Cache-Control/ETag to GET responses and compress large bodies."""
+    # Never buffer the SSE stream (files are streamed too, but finite)
+    if response.mimetype == 'text/event-stream':
+        return response
+    
+    if request.method == 'GET' and response.status_code == 200:
+        policy = MARKET_DATA_CACHE.get(request.path)
+        if g.get('stale'):
+            # Last good data while upstream is down: don't let a CDN keep it
+            response.headers['Cache-Control'] = NO_STORE
+            response.headers['Warning'] = '110 - "Response is Stale"'
+        elif policy:
+            # With a dashboard token set, keep responses out of shared caches
+            response.headers['Cache-Control'] = market_data_policy(
+                *policy, shared=not DASHBOARD_TOKEN
+            )
+        elif request.path.startswith('/api/'):
+            response.headers['Cache-Control'] = NO_STORE
+        
+        response.direct_passthrough = False
+        body = response.get_data()
+        etag = etag_for(body)
+        response.headers['ETag'] = etag
+        if etag_matches(request.headers.get('If-None-Match'), etag):
+            response.status_code = 304
+            response.set_data(b'')
+            return response
+    else:
+        response.direct_passthrough = False
+        body = response.get_data()
+        etag = None
+    
+    encoding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+    if encoding and len(body) >= MIN_COMPRESS_SIZE and is_compressible(response.mimetype):
+        # Static assets are compressed once per version, API bodies per response
+        cache_key = etag if not request.path.startswith('/api/') else None
+        response.set_data(compress(body, encoding, cache_key))
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+    
+    return response
 
 
 @app.route('/api/time', methods=['GET'])
@@ -71,18 +366,18 @@ def api_time():
                 return jsonify({'error': 'Invalid dashboard token'}), 401
         
         # Make request to Binance
-        with httpx.Client() as client:
-            response = client.get(f'{BASE_URL}/fapi/v1/time')
-            response.raise_for_status()
-            data = response.json()
+        client = get_http_client()
+        response = client.get(f'{BASE_URL}/fapi/v1/time')
+        response.raise_for_status()
+        data = decode_json(response)
             
-            return jsonify({
-                'serverTime': data['serverTime'],
-                'baseUrl': BASE_URL,
-                'message': 'Connection successful!'
-            })
+        return jsonify({
+            'serverTime': data['serverTime'],
+            'baseUrl': BASE_URL,
+            'message': 'Connection successful!'
+        })
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return upstream_error(e)
 
 
 @app.route('/api/balance', methods=['GET'])
@@ -95,28 +390,28 @@ def api_balance():
                 return jsonify({'error': 'Invalid dashboard token'}), 401
         
         params = {
-            'timestamp': int(time.time() * 1000),
+            'timestamp': timestamp_ms(),
             'recvWindow': 5000
         }
         params['signature'] = generate_signature(params)
         
         headers = {'X-MBX-APIKEY': API_KEY}
         
-        with httpx.Client() as client:
-            response = client.get(
-                f'{BASE_URL}/fapi/v2/balance',
-                params=params,
-                headers=headers
-            )
-            if response.status_code == 200:
-                balances = response.json()
-                # Filter to show only USDT
-                usdt = [b for b in balances if b['asset'] == 'USDT']
-                return jsonify({'balance': usdt[0] if usdt else None})
-            else:
-                return jsonify({'error': response.text}), response.status_code
+        client = get_http_client()
+        response = client.get(
+            f'{BASE_URL}/fapi/v2/balance',
+            params=params,
+            headers=headers
+        )
+        if response.status_code == 200:
+            balances = decode_json(response)
+            # Filter to show only USDT
+            usdt = [b for b in balances if b['asset'] == 'USDT']
+            return jsonify({'balance': usdt[0] if usdt else None})
+        else:
+            return jsonify({'error': response.text}), response.status_code
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return upstream_error(e)
 
 
 @app.route('/api/positions', methods=['GET'])
@@ -129,7 +424,7 @@ def api_positions():
                 return jsonify({'error': 'Invalid dashboard token'}), 401
         
         params = {
-            'timestamp': int(time.time() * 1000),
+            'timestamp': timestamp_ms(),
             'recvWindow': 5000
         }
         params['signature'] = generate_signature(params)
@@ -137,57 +432,277 @@ def api_positions():
         headers = {'X-MBX-APIKEY': API_KEY}
         
         # Get open positions
-        with httpx.Client() as client:
-            response = client.get(
-                f'{BASE_URL}/fapi/v2/positionRisk',
-                params=params,
-                headers=headers
-            )
+        client = get_http_client()
+        response = client.get(
+            f'{BASE_URL}/fapi/v2/positionRisk',
+            params=params,
+            headers=headers
+        )
             
-            if response.status_code == 200:
-                positions = response.json()
-                # Filter only positions with non-zero position amount
-                active_positions = [p for p in positions if float(p.get('positionAmt', 0)) != 0]
-            else:
-                active_positions = []
+        if response.status_code == 200:
+            positions = decode_json(response)
+            # Filter only positions with non-zero position amount
+            active_positions = [p for p in positions if float(p.get('positionAmt', 0)) != 0]
+            engine = get_risk_engine()
+            engine.load_position_risk(positions)
+            get_risk_gate().load_position_risk(positions)
+            risk = engine.positions()
+        else:
+            active_positions = []
+            risk = []
         
         # Get algo orders (STOP orders)
         algo_params = {
-            'timestamp': int(time.time() * 1000),
+            'timestamp': timestamp_ms(),
             'recvWindow': 5000
         }
         algo_params['signature'] = generate_signature(algo_params)
         
-        with httpx.Client() as client:
-            algo_response = client.get(
-                f'{BASE_URL}/fapi/v1/algoOrders',
-                params=algo_params,
-                headers=headers
-            )
+        algo_response = client.get(
+            f'{BASE_URL}/fapi/v1/algoOrders',
+            params=algo_params,
+            headers=headers
+        )
             
-            print(f"[DEBUG] Algo orders response status: {algo_response.status_code}")
-            if algo_response.status_code == 200:
-                algo_orders = algo_response.json()
-                print(f"[DEBUG] Total algo orders: {len(algo_orders)}")
-                # Filter only active algo orders (NEW or WORKING status)
-                active_algos = [a for a in algo_orders if a.get('algoStatus') in ['NEW', 'WORKING']]
-                print(f"[DEBUG] Active algo orders: {len(active_algos)}")
-            else:
-                print(f"[DEBUG] Algo orders error: {algo_response.text}")
-                active_algos = []
+        print(f"[DEBUG] Algo orders response status: {algo_response.status_code}")
+        if algo_response.status_code == 200:
+            algo_orders = decode_json(algo_response)
+            print(f"[DEBUG] Total algo orders: {len(algo_orders)}")
+            # Filter only active algo orders (NEW or WORKING status)
+            active_algos = [a for a in algo_orders if a.get('algoStatus') in ['NEW', 'WORKING']]
+            print(f"[DEBUG] Active algo orders: {len(active_algos)}")
+        else:
+            print(f"[DEBUG] Algo orders error: {algo_response.text}")
+            active_algos = []
         
         return jsonify({
             'positions': active_positions,
+            'risk': risk,
             'algoOrders': active_algos
         }), 200
         
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return upstream_error(e)
+
+
+_risk_engine: Optional['RiskEngine'] = None
+
+
+def get_risk_engine() -> 'RiskEngine':
+    """Create the shared risk engine on first use (NumPy is imported lazily)."""
+    global _risk_engine
+    if _risk_engine is None:
+        from bot.portfolio import RiskEngine
+        _risk_engine = RiskEngine()
+    return _risk_engine
+
+
+_risk_gate: Optional['RiskGate'] = None
+
+
+def get_risk_gate() -> 'RiskGate':
+    """Create the shared pre-trade risk gate (limits from RISK_* env vars)."""
+    global _risk_gate
+    if _risk_gate is None:
+        from bot.risk import RiskGate
+        _risk_gate = RiskGate.from_env()
+    return _risk_gate
+
+
+def refresh_risk_gate(gate: 'RiskGate') -> None:
+    """Reload marks and positions into the gate if its cached state is stale."""
+    if not gate.needs_state or not gate.is_stale(RISK_STATE_TTL):
+        return
+    
+    params = {
+        'timestamp': timestamp_ms(),
+        'recvWindow': 5000
+    }
+    params['signature'] = generate_signature(params)
+    response = get_http_client().get(
+        f'{BASE_URL}/fapi/v2/positionRisk',
+        params=params,
+        headers={'X-MBX-APIKEY': API_KEY}
+    )
+    if response.status_code == 200:
+        gate.load_position_risk(decode_json(response))
+
+
+@app.route('/api/exposure', methods=['GET'])
+def api_exposure():
+    """Get aggregate exposure: notional, unrealized PnL, margin ratio, liquidation distance."""
+    try:
+        if DASHBOARD_TOKEN:
+            token = request.headers.get('X-Dashboard-Token', '')
+            if token != DASHBOARD_TOKEN:
+                return jsonify({'error': 'Invalid dashboard token'}), 401
+        
+        return jsonify(serve_stale_on_error('account_state', fetch_account_state)['exposure'])
+    except Exception as e:
+        return upstream_error(e)
+
+
+def fetch_account_state() -> dict:
+    """
+    Fetch positionRisk and balance, and recompute risk from them.
+    
+    Returns:
+        {'balance': USDT balance row, 'exposure': exposure dict}
+    
+    Raises:
+        RuntimeError: If an upstream call fails
+    """
+    headers = {'X-MBX-APIKEY': API_KEY}
+    client = get_http_client()
+    
+    results = {}
+    for name, endpoint in (('positions', '/fapi/v2/positionRisk'), ('balance', '/fapi/v2/balance')):
+        params = {
+            'timestamp': timestamp_ms(),
+            'recvWindow': 5000
+        }
+        params['signature'] = generate_signature(params)
+        response = client.get(f'{BASE_URL}{endpoint}', params=params, headers=headers)
+        if response.status_code != 200:
+            raise RuntimeError(f'{endpoint} failed: HTTP {response.status_code} {response.text}')
+        results[name] = decode_json(response)
+    
+    usdt = [b for b in results['balance'] if b['asset'] == 'USDT']
+    wallet_balance = float(usdt[0]['balance']) if usdt else 0.0
+    
+    engine = get_risk_engine()
+    engine.load_position_risk(results['positions'], wallet_balance)
+    get_risk_gate().load_position_risk(results['positions'])
+    state = {'balance': usdt[0] if usdt else None, 'exposure': engine.exposure().to_dict()}
+    # Kept only as the fallback for serve_stale_on_error
+    _cache.set('account_state', state, ttl=0)
+    store_account_snapshot(results['balance'], results['positions'])
+    return state
+
+
+def store_account_snapshot(balances: list, positions: list) -> None:
+    """Keep balance and per-symbol leverage for dry-run margin estimates."""
+    from bot.simulator import AccountSnapshot
+    snapshot = AccountSnapshot.from_api_responses(balances, positions)
+    _cache.set('account_snapshot', snapshot.to_dict(), ttl=DRY_RUN_ACCOUNT_TTL)
+
+
+def get_account_snapshot() -> Optional[dict]:
+    """
+    Balance/leverage snapshot for dry runs.
+    
+    Only ever reads what the last account refresh (/api/exposure, /api/stream)
+    stored: a dry run makes no signed calls. An old snapshot is still used
+    (the simulation reports its age and warns); None if there never was one.
+    """
+    snapshot = _cache.get('account_snapshot')
+    if snapshot is None:
+        snapshot = _cache.get_stale('account_snapshot')
+    return snapshot
+
+
+# Symbols shown when the dashboard does not ask for specific ones
+DEFAULT_SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT']
+
+# Exchange data shared by all requests. With CACHE_URL (set by
+# serve_dashboard.py for multi-worker runs) it is shared across workers too.
+CACHE_URL = os.getenv('CACHE_URL', '')
+if CACHE_URL and not CACHE_URL.startswith('memory://'):
+    from bot.shared_cache import make_cache
+    _cache = make_cache(CACHE_URL, default_ttl=60.0)
+else:
+    _cache = TTLCache(default_ttl=60.0)
+
+
+def get_symbol_index() -> 'SymbolIndex':
+    """Return the exchangeInfo index (one upstream call per hour)."""
+    from bot.symbols import DEFAULT_TTL, load_symbol_index
+    
+    def fetch() -> dict:
+        response = get_http_client().get(f'{BASE_URL}/fapi/v1/exchangeInfo')
+        response.raise_for_status()
+        return decode_json(response)
+    
+    return _cache.get_or_load(
+        'symbol_index', lambda: load_symbol_index(fetch), ttl=DEFAULT_TTL
+    )
+
+
+def fetch_all_prices() -> dict:
+    """Latest price for every symbol, shared for one second across requests."""
+    def fetch() -> dict:
+        response = get_http_client().get(f'{BASE_URL}/fapi/v1/ticker/price')
+        response.raise_for_status()
+        return {t['symbol']: float(t['price']) for t in decode_json(response)}
+    
+    # Ticker for every symbol costs weight 2, about the same as one symbol
+    return _cache.get_or_load('prices', fetch, ttl=1.0)
+
+
+def fetch_order_book(symbol: str) -> dict:
+    """Depth snapshot for dry-run fills, shared for DRY_RUN_BOOK_TTL seconds."""
+    from bot.simulator import DEFAULT_DEPTH_LIMIT, OrderBook
+    
+    def fetch() -> dict:
+        response = get_http_client().get(
+            f'{BASE_URL}/fapi/v1/depth',
+            params={'symbol': symbol, 'limit': DEFAULT_DEPTH_LIMIT}
+        )
+        response.raise_for_status()
+        return OrderBook.from_api_response(symbol, decode_json(response)).to_dict()
+    
+    return _cache.get_or_load(f'depth:{symbol}', fetch, ttl=DRY_RUN_BOOK_TTL)
+
+
+def serve_stale_on_error(key: str, load: Callable[[], Any]) -> Any:
+    """
+    Run ``load``; if upstream fails or its circuit is open, return the last
+    good value cached under ``key`` and mark the response stale.
+    
+    Raises:
+        Exception: The load error, if nothing was ever cached
+    """
+    try:
+        return load()
+    except Exception as e:
+        stale = _cache.get_stale(key)
+        if stale is None:
+            raise
+        print(f"[WARN] Serving stale {key}: {e}")
+        g.stale = True
+        return stale
+
+
+def warmup() -> None:
+    """
+    Prepare a freshly started worker before it takes traffic.
+
+    Opens the pooled upstream connection while measuring the server clock
+    offset, and loads the exchangeInfo index (from the shared cache when
+    another worker already fetched it).
+    """
+    global TIME_OFFSET_MS
+    client = get_http_client()
+    sent = time.time() * 1000
+    response = client.get(f'{BASE_URL}/fapi/v1/time')
+    received = time.time() * 1000
+    response.raise_for_status()
+    TIME_OFFSET_MS = int(decode_json(response)['serverTime'] - (sent + received) / 2)
+    
+    index = get_symbol_index()
+    print(f"[INFO] Worker {os.getpid()} warm: clock offset {TIME_OFFSET_MS}ms, "
+          f"{len(index)} symbols")
+
+
+def requested_symbols() -> list:
+    """Symbols from ?symbols=A,B (default: DEFAULT_SYMBOLS)."""
+    symbols = [s.strip().upper() for s in request.args.get('symbols', '').split(',') if s.strip()]
+    return symbols or DEFAULT_SYMBOLS
 
 
 @app.route('/api/prices', methods=['GET'])
 def api_prices():
-    """Get current market prices for symbols."""
+    """Get current market prices (?symbols=A,B, or ?symbols=ALL) in one upstream call."""
     try:
         # Optional token check
         if DASHBOARD_TOKEN:
@@ -195,24 +710,19 @@ def api_prices():
             if token != DASHBOARD_TOKEN:
                 return jsonify({'error': 'Invalid dashboard token'}), 401
         
-        symbols = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT']
-        prices = {}
-        
-        with httpx.Client() as client:
-            for symbol in symbols:
-                response = client.get(f'{BASE_URL}/fapi/v1/ticker/price', params={'symbol': symbol})
-                if response.status_code == 200:
-                    data = response.json()
-                    prices[symbol] = float(data['price'])
+        all_prices = serve_stale_on_error('prices', fetch_all_prices)
         
-        return jsonify({'prices': prices})
+        symbols = requested_symbols()
+        if symbols == ['ALL']:
+            return jsonify({'prices': all_prices})
+        return jsonify({'prices': {s: all_prices[s] for s in symbols if s in all_prices}})
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return upstream_error(e)
 
 
 @app.route('/api/exchange-info', methods=['GET'])
 def api_exchange_info():
-    """Get exchange information including filters for symbols."""
+    """Get exchange filters for ?symbols=A,B (default: DEFAULT_SYMBOLS)."""
     try:
         # Optional token check
         if DASHBOARD_TOKEN:
@@ -220,37 +730,42 @@ def api_exchange_info():
             if token != DASHBOARD_TOKEN:
                 return jsonify({'error': 'Invalid dashboard token'}), 401
         
-        with httpx.Client() as client:
-            response = client.get(f'{BASE_URL}/fapi/v1/exchangeInfo')
-            if response.status_code == 200:
-                data = response.json()
-                # Extract only the symbols we support
-                supported_symbols = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT']
-                symbol_info = {}
-                
-                for symbol_data in data.get('symbols', []):
-                    if symbol_data['symbol'] in supported_symbols:
-                        filters = {}
-                        for f in symbol_data.get('filters', []):
-                            filters[f['filterType']] = f
-                        
-                        symbol_info[symbol_data['symbol']] = {
-                            'quantityPrecision': symbol_data.get('quantityPrecision'),
-                            'pricePrecision': symbol_data.get('pricePrecision'),
-                            'filters': filters
-                        }
-                
-                return jsonify({'symbols': symbol_info})
-            else:
-                return jsonify({'error': 'Failed to fetch exchange info'}), response.status_code
+        index = serve_stale_on_error('symbol_index', get_symbol_index)
+        symbol_info = {}
+        for symbol in requested_symbols():
+            info = index.get(symbol)
+            if info is not None:
+                symbol_info[symbol] = info.to_dict()
+        
+        return jsonify({'symbols': symbol_info, 'totalSymbols': len(index)})
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        return upstream_error(e)
+
+
+@app.route('/api/symbols', methods=['GET'])
+def api_symbols():
+    """Autocomplete tradable symbols by prefix (?q=BT&limit=10)."""
+    try:
+        if DASHBOARD_TOKEN:
+            token = request.headers.get('X-Dashboard-Token', '')
+            if token != DASHBOARD_TOKEN:
+                return jsonify({'error': 'Invalid dashboard token'}), 401
+        
+        limit = min(int(request.args.get('limit', 10)), 100)
+        index = serve_stale_on_error('symbol_index', get_symbol_index)
+        matches = index.search(request.args.get('q', ''), limit=limit)
+        return jsonify({'symbols': matches})
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    except Exception as e:
+        return upstream_error(e)
 
 
 @app.route('/api/place-order', methods=['POST'])
 def api_place_order():
     """Place an order on Binance Futures."""
     print("[DEBUG] === PLACE ORDER ENDPOINT HIT ===")
+    submitted = None  # order params once sent, for the audit log
     try:
         # Optional token check
         if DASHBOARD_TOKEN:
@@ -278,6 +793,8 @@ def api_place_order():
         # Validate required fields
         if not symbol:
             return jsonify({'error': 'Symbol is required'}), 400
+        if not get_symbol_index().is_tradable(symbol):
+            return jsonify({'error': f'Symbol {symbol} is not tradable on this exchange'}), 400
         if side not in ['BUY', 'SELL']:
             return jsonify({'error': 'Side must be BUY or SELL'}), 400
         if order_type not in ['MARKET', 'LIMIT', 'STOP', 'STOP_MARKET']:
@@ -288,10 +805,10 @@ def api_place_order():
         # Get current market price for determining STOP order type
         current_price = None
         if order_type in ['LIMIT', 'STOP', 'STOP_MARKET']:
-            with httpx.Client() as client:
-                price_response = client.get(f'{BASE_URL}/fapi/v1/ticker/price', params={'symbol': symbol})
-                if price_response.status_code == 200:
-                    current_price = float(price_response.json()['price'])
+            client = get_http_client()
+            price_response = client.get(f'{BASE_URL}/fapi/v1/ticker/price', params={'symbol': symbol})
+            if price_response.status_code == 200:
+                current_price = float(decode_json(price_response)['price'])
         
         # Basic parameter validation - let Binance validate ranges
         if order_type == 'LIMIT':
@@ -304,7 +821,7 @@ def api_place_order():
             if order_type == 'STOP' and (not price or float(price) <= 0):
                 return jsonify({'error': 'Price is required for STOP limit orders'}), 400
         
-        # Dry run - just validate and return
+        # Dry run - simulate the fill from cached state and return
         if dry_run:
             order_params = {
                 'symbol': symbol,
@@ -317,15 +834,51 @@ def api_place_order():
             if stop_price:
                 order_params['stopPrice'] = str(stop_price)
             
+            from bot.simulator import AccountSnapshot, OrderBook, simulate_order
+            
+            try:
+                book = OrderBook.from_dict(fetch_order_book(symbol))
+            except Exception as e:
+                print(f"[WARN] Order book unavailable for dry run: {e}")
+                book = None
+            account = get_account_snapshot()
+            simulation = simulate_order(
+                symbol, side, order_type, float(quantity),
+                price=float(price) if price else None,
+                stop_price=float(stop_price) if stop_price else None,
+                book=book,
+                account=AccountSnapshot.from_dict(account) if account else None,
+                last_price=current_price
+            )
+            
             return jsonify({
                 'success': True,
                 'dryRun': True,
                 'message': 'Order validated successfully (dry run)',
-                'params': order_params
+                'params': order_params,
+                'simulation': simulation.to_dict()
             })
         
+        # Pre-trade risk gate (fat-finger, notional, position and rate limits).
+        # After the dry-run return: a dry run uses no order-rate tokens and
+        # makes no signed positionRisk call
+        from bot.risk import RiskCheckError
+        
+        risk_gate = get_risk_gate()
+        if risk_gate.enabled:
+            refresh_risk_gate(risk_gate)
+            if current_price:
+                risk_gate.update_mark(symbol, current_price)
+            try:
+                risk_gate.check(
+                    symbol, side, float(quantity),
+                    float(price) if order_type in ['LIMIT', 'STOP'] and price else None
+                )
+            except RiskCheckError as e:
+                return jsonify({'error': f'Risk check failed: {e}', 'riskRejected': True}), 422
+        
         # Build order parameters
-        timestamp = int(time.time() * 1000)
+        timestamp = timestamp_ms()
         params = {
             'symbol': symbol,
             'side': side,
@@ -362,22 +915,38 @@ def api_place_order():
             
             endpoint = f'{BASE_URL}/fapi/v1/order'
         
-        # Generate signature
-        signature = generate_signature(params)
-        params['signature'] = signature
+        # Regular orders go over the WebSocket API when it is configured;
+        # REST is used if the request could not be sent there
+        result = None
+        submitted = params
+        audit.order_submitted(params, via='ws' if WS_API_URL and not is_algo_order else 'rest')
+        if WS_API_URL and not is_algo_order:
+            from bot.exceptions import BinanceClientError
+            
+            order_params = {k: v for k, v in params.items() if k not in ('timestamp', 'recvWindow')}
+            try:
+                result = place_order_ws(order_params)
+            except BinanceClientError as e:
+                audit.order_error(params, e)
+                return jsonify({'error': str(e)}), 400
         
-        # Redact signature for logging
-        debug_params = params.copy()
-        debug_params['signature'] = '[REDACTED]'
-        print(f"[DEBUG] Sending params: {debug_params}")
-        print(f"[DEBUG] Using endpoint: {endpoint}")
+        if result is None:
+            # Generate signature
+            signature = generate_signature(params)
+            params['signature'] = signature
         
-        # Make request to Binance
-        headers = {
-            'X-MBX-APIKEY': API_KEY
-        }
+            # Redact signature for logging
+            debug_params = params.copy()
+            debug_params['signature'] = '[REDACTED]'
+            print(f"[DEBUG] Sending params: {debug_params}")
+            print(f"[DEBUG] Using endpoint: {endpoint}")
         
-        with httpx.Client() as client:
+            # Make request to Binance
+            headers = {
+                'X-MBX-APIKEY': API_KEY
+            }
+        
+            client = get_http_client()
             response = client.post(
                 endpoint,
                 headers=headers,
@@ -388,34 +957,461 @@ def api_place_order():
             print(f"[DEBUG] Response body: {response.text}")
             
             if response.status_code != 200:
-                error_data = response.json()
+                error_data = decode_json(response)
+                audit.order_error(params, f"HTTP {response.status_code}: {error_data.get('code')} {error_data.get('msg')}")
                 return jsonify({
                     'error': error_data.get('msg', 'Unknown error'),
                     'code': error_data.get('code')
                 }), response.status_code
             
-            result = response.json()
-            
-            # Handle different response formats (Algo vs Regular orders)
-            if 'algoId' in result:
-                # Algo order response - normalize to standard format
-                return jsonify({
-                    'success': True,
-                    'orderId': result.get('algoId'),
-                    'symbol': result.get('symbol'),
-                    'status': result.get('algoStatus', 'WORKING'),
-                    'type': order_type,
-                    'triggerPrice': result.get('triggerPrice'),
-                    'price': result.get('price'),
-                    'quantity': result.get('quantity'),
-                    'message': 'Algo order placed successfully'
-                }), 200
-            else:
-                # Regular order response
-                return jsonify({'success': True, **result}), 200
+            result = decode_json(response)
+        
+        audit.order_response(params, result)
+        
+        # Handle different response formats (Algo vs Regular orders)
+        if 'algoId' in result:
+            # Algo order response - normalize to standard format
+            return jsonify({
+                'success': True,
+                'orderId': result.get('algoId'),
+                'symbol': result.get('symbol'),
+                'status': result.get('algoStatus', 'WORKING'),
+                'type': order_type,
+                'triggerPrice': result.get('triggerPrice'),
+                'price': result.get('price'),
+                'quantity': result.get('quantity'),
+                'message': 'Algo order placed successfully'
+            }), 200
+        else:
+            # Regular order response
+            executed_qty = float(result.get('executedQty', 0) or 0)
+            if risk_gate.enabled and executed_qty > 0:
+                risk_gate.record_fill(symbol, side, executed_qty)
+            return jsonify({'success': True, **result}), 200
     
     except Exception as e:
         print(f"[ERROR] Exception during order placement: {str(e)}")
+        if submitted is not None:
+            audit.order_error(submitted, e)
+        return upstream_error(e)
+
+
+_ws_session: Optional['WebSocketTradingSession'] = None
+
+
+def get_ws_session() -> 'WebSocketTradingSession':
+    """Return the shared WebSocket API session (connects on first order)."""
+    global _ws_session
+    if _ws_session is None:
+        from bot.ws_trading import WebSocketTradingSession
+        _ws_session = WebSocketTradingSession(API_KEY, API_SECRET, WS_API_URL, clock=timestamp_ms)
+    return _ws_session
+
+
+def place_order_ws(params: Dict[str, Any]) -> Optional[dict]:
+    """
+    Place a regular order over the WebSocket API.
+    
+    Returns the order, or None if the request could not be sent (the
+    caller falls back to REST). A request that was sent but got no answer
+    raises BinanceNetworkError: resending it could place the order twice.
+    """
+    from bot.exceptions import WebSocketUnavailableError
+    
+    try:
+        return get_ws_session().call('order.place', params)
+    except WebSocketUnavailableError as e:
+        print(f"[WARN] {e}; placing order over REST")
+        return None
+
+
+_execution_manager: Optional['ExecutionManager'] = None
+
+
+def get_execution_manager() -> 'ExecutionManager':
+    """Create the shared execution manager on first use."""
+    global _execution_manager
+    if _execution_manager is None:
+        from bot.client import BinanceFuturesClient
+        from bot.execution import ExecutionManager, ExecutionScheduler
+        
+        client = BinanceFuturesClient(API_KEY, API_SECRET, BASE_URL)
+        # Children share the dashboard's risk gate (and its order-rate budget)
+        _execution_manager = ExecutionManager(ExecutionScheduler(
+            client, risk_gate=get_risk_gate(), risk_state_ttl=RISK_STATE_TTL
+        ))
+    return _execution_manager
+
+
+@app.route('/api/execute', methods=['POST'])
+def api_execute():
+    """Start a TWAP/ICEBERG/POV execution for a large order."""
+    from bot.execution import ExecutionError, build_algorithm
+    from bot.risk import RiskCheckError
+    
+    try:
+        if DASHBOARD_TOKEN:
+            token = request.headers.get('X-Dashboard-Token', '')
+            if token != DASHBOARD_TOKEN:
+                return jsonify({'error': 'Invalid dashboard token'}), 401
+        
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'Invalid request body'}), 400
+        
+        parent = create_order_request(
+            symbol=data.get('symbol', ''),
+            side=data.get('side', ''),
+            order_type=data.get('type', 'MARKET'),
+            quantity=str(data.get('quantity', '')),
+            price=str(data['price']) if data.get('price') else None,
+            symbol_index=get_symbol_index()
+        )
+        
+        timeout = data.get('timeout')
+        if timeout is not None:
+            try:
+                timeout = float(timeout)
+            except (TypeError, ValueError):
+                timeout = None
+            if timeout is None or not 0 < timeout < float('inf'):
+                return jsonify({'error': 'timeout must be a positive number of seconds'}), 400
+        
+        manager = get_execution_manager()
+        algo = build_algorithm(
+            data.get('algo', 'TWAP'),
+            client=manager.scheduler.client,
+            symbol=parent.symbol,
+            duration=float(data.get('duration', 60)),
+            slices=int(data.get('slices', 10)),
+            visible_qty=float(data['visibleQty']) if data.get('visibleQty') else None,
+            participation=float(data.get('participation', 0.1)),
+            interval=float(data['interval']) if data.get('interval') else None
+        )
+        
+        try:
+            progress = manager.start(parent, algo, timeout=timeout)
+        except RiskCheckError as e:
+            return jsonify({'error': f'Risk check failed: {e}', 'riskRejected': True}), 422
+        return jsonify(progress.to_dict()), 202
+    
+    except (ValidationError, ExecutionError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/executions', methods=['GET'])
+def api_executions():
+    """List executions started from this dashboard."""
+    if DASHBOARD_TOKEN:
+        token = request.headers.get('X-Dashboard-Token', '')
+        if token != DASHBOARD_TOKEN:
+            return jsonify({'error': 'Invalid dashboard token'}), 401
+    
+    executions = get_execution_manager().list_executions()
+    return jsonify({'executions': [p.to_dict() for p in executions]})
+
+
+@app.route('/api/executions/<execution_id>', methods=['GET'])
+def api_execution_progress(execution_id: str):
+    """Get live fill progress for one execution."""
+    if DASHBOARD_TOKEN:
+        token = request.headers.get('X-Dashboard-Token', '')
+        if token != DASHBOARD_TOKEN:
+            return jsonify({'error': 'Invalid dashboard token'}), 401
+    
+    progress = get_execution_manager().get(execution_id)
+    if progress is None:
+        return jsonify({'error': 'Execution not found'}), 404
+    return jsonify(progress.to_dict())
+
+
+@app.route('/api/executions/<execution_id>/cancel', methods=['POST'])
+def api_execution_cancel(execution_id: str):
+    """Stop an execution and cancel its working child orders."""
+    if DASHBOARD_TOKEN:
+        token = request.headers.get('X-Dashboard-Token', '')
+        if token != DASHBOARD_TOKEN:
+            return jsonify({'error': 'Invalid dashboard token'}), 401
+    
+    if not get_execution_manager().cancel(execution_id):
+        return jsonify({'error': 'Execution not found'}), 404
+    return jsonify({'success': True, 'executionId': execution_id})
+
+
+_state_stream: Optional['StateStream'] = None
+
+
+def get_state_stream() -> 'StateStream':
+    """Create the shared SSE fan-out with its price and account sources."""
+    global _state_stream
+    if _state_stream is None:
+        from bot.stream import StateStream
+        
+        _state_stream = StateStream()
+        _state_stream.add_source(
+            'prices', STREAM_PRICE_INTERVAL, lambda: {'prices': fetch_all_prices()}
+        )
+        if API_KEY and API_SECRET:
+            _state_stream.add_source('account', STREAM_ACCOUNT_INTERVAL, fetch_account_state)
+    return _state_stream
+
+
+@app.route('/api/stream', methods=['GET'])
+def api_stream():
+    """
+    Server-Sent Events: a snapshot of prices/balance/exposure, then deltas.
+    
+    EventSource cannot send headers, so the dashboard token may also be
+    passed as ?token=.
+    """
+    if DASHBOARD_TOKEN:
+        token = request.headers.get('X-Dashboard-Token', '') or request.args.get('token', '')
+        if token != DASHBOARD_TOKEN:
+            return jsonify({'error': 'Invalid dashboard token'}), 401
+    
+    stream = get_state_stream()
+    subscription = stream.subscribe()
+    return Response(
+        stream_with_context(stream.events(subscription)),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no',  # disable proxy buffering (nginx)
+        }
+    )
+
+
+_alert_index: Optional['AlertIndex'] = None
+_price_watcher: Optional['PriceWatcher'] = None
+
+
+def get_alert_index() -> 'AlertIndex':
+    """Create the shared price-alert index and its price watcher on first use."""
+    global _alert_index, _price_watcher
+    if _alert_index is None:
+        from bot.alerts import AlertIndex, PriceWatcher
+        
+        _alert_index = AlertIndex()
+        # Shares the one-second ticker cache with /api/prices and the stream
+        _price_watcher = PriceWatcher(_alert_index, fetch_all_prices, ALERT_PRICE_INTERVAL)
+    return _alert_index
+
+
+@app.route('/api/alerts', methods=['GET'])
+def api_alerts():
+    """List pending price alerts (?symbol= to filter)."""
+    if DASHBOARD_TOKEN:
+        token = request.headers.get('X-Dashboard-Token', '')
+        if token != DASHBOARD_TOKEN:
+            return jsonify({'error': 'Invalid dashboard token'}), 401
+    
+    index = get_alert_index()
+    alerts = index.list_alerts(request.args.get('symbol') or None)
+    return jsonify({
+        'alerts': [a.to_dict() for a in alerts],
+        'fired': index.fired_count,
+        'webhooks': index.dispatcher.snapshot(),
+    })
+
+
+@app.route('/api/alerts', methods=['POST'])
+def api_create_alert():
+    """
+    Register a one-shot price alert.
+    
+    Body: {"symbol", "price", "direction"?: "above"|"below", "webhook"?, "note"?}.
+    Without a direction the alert fires when the price moves from where it
+    is now to the level. The webhook must be on this machine (loopback).
+    """
+    from bot.alerts import AlertError
+    
+    try:
+        if DASHBOARD_TOKEN:
+            token = request.headers.get('X-Dashboard-Token', '')
+            if token != DASHBOARD_TOKEN:
+                return jsonify({'error': 'Invalid dashboard token'}), 401
+        
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'Invalid request body'}), 400
+        
+        symbol = str(data.get('symbol', '')).upper()
+        if symbol not in get_symbol_index():
+            return jsonify({'error': f'Unknown symbol: {symbol}'}), 400
+        
+        index = get_alert_index()
+        direction = data.get('direction') or None
+        if direction is None and symbol not in index.last_prices:
+            index.on_prices(serve_stale_on_error('prices', fetch_all_prices))
+        
+        alert = index.add(
+            symbol,
+            float(data.get('price', 0)),
+            direction=direction,
+            webhook=data.get('webhook') or None,
+            note=str(data.get('note', ''))
+        )
+        _price_watcher.ensure_running()
+        return jsonify(alert.to_dict()), 201
+    
+    except (AlertError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return upstream_error(e)
+
+
+@app.route('/api/alerts/<int:alert_id>', methods=['DELETE'])
+def api_delete_alert(alert_id: int):
+    """Remove a pending price alert."""
+    if DASHBOARD_TOKEN:
+        token = request.headers.get('X-Dashboard-Token', '')
+        if token != DASHBOARD_TOKEN:
+            return jsonify({'error': 'Invalid dashboard token'}), 401
+    
+    if not get_alert_index().remove(alert_id):
+        return jsonify({'error': 'Alert not found'}), 404
+    return jsonify({'success': True, 'alertId': alert_id})
+
+
+@app.route('/api/metrics', methods=['GET'])
+def api_metrics():
+    """Upstream health: circuit breaker states, hedging and retry counters, call timings."""
+    if DASHBOARD_TOKEN:
+        token = request.headers.get('X-Dashboard-Token', '')
+        if token != DASHBOARD_TOKEN:
+            return jsonify({'error': 'Invalid dashboard token'}), 401
+    
+    from bot.profiling import timing_snapshot, timings_enabled
+    from bot.resilience import DEFAULT_REGISTRY
+    from bot.retry import DEFAULT_POLICY
+    metrics = {
+        'pid': os.getpid(),
+        **DEFAULT_REGISTRY.snapshot(),
+        'retries': DEFAULT_POLICY.snapshot(),
+    }
+    if timings_enabled():
+        # Per-function call timings from @timed (PROFILE_TIMINGS=1)
+        metrics['timings'] = timing_snapshot()
+    return jsonify(metrics)
+
+
+_account_registry: Optional['AccountRegistry'] = None
+
+
+def get_account_registry() -> 'AccountRegistry':
+    """Create the shared multi-account registry on first use."""
+    global _account_registry
+    if _account_registry is None:
+        from bot.accounts import AccountRegistry
+        _account_registry = AccountRegistry.from_env(BASE_URL)
+    return _account_registry
+
+
+# One pre-trade risk gate per account: limits apply to each account's own
+# positions, and each account has its own order-rate budget
+_account_risk_gates: dict = {}
+
+
+def get_account_risk_gates(names: Optional[list] = None) -> dict:
+    """
+    Risk gates for the given accounts (default: all), with fresh state.
+    
+    Gates whose positionRisk is older than RISK_STATE_TTL are reloaded from
+    their own account concurrently, as `cli.py place-order --accounts` does.
+    
+    Returns:
+        Mapping of account name -> RiskGate, only for gates with limits set
+    """
+    from bot.risk import RiskGate
+    
+    registry = get_account_registry()
+    names = names or registry.names
+    gates = {}
+    for name in names:
+        registry.get(name)  # AccountError for an unknown name
+        if name not in _account_risk_gates:
+            _account_risk_gates[name] = RiskGate.from_env()
+        gates[name] = _account_risk_gates[name]
+    
+    stale = [n for n, g in gates.items() if g.needs_state and g.is_stale(RISK_STATE_TTL)]
+    if stale:
+        registry.broadcast(
+            lambda a: gates[a.name].load_position_risk(a.client.get_position_risk()),
+            stale, weight=5
+        )
+    return {name: g for name, g in gates.items() if g.enabled}
+
+
+@app.route('/api/accounts', methods=['GET'])
+def api_accounts():
+    """List configured account names."""
+    if DASHBOARD_TOKEN:
+        token = request.headers.get('X-Dashboard-Token', '')
+        if token != DASHBOARD_TOKEN:
+            return jsonify({'error': 'Invalid dashboard token'}), 401
+    
+    try:
+        return jsonify({'accounts': get_account_registry().names})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/accounts/balances', methods=['GET'])
+def api_accounts_balances():
+    """Fetch balances from all (or ?accounts=a,b) accounts concurrently, with totals."""
+    from bot.accounts import AccountError
+    
+    try:
+        if DASHBOARD_TOKEN:
+            token = request.headers.get('X-Dashboard-Token', '')
+            if token != DASHBOARD_TOKEN:
+                return jsonify({'error': 'Invalid dashboard token'}), 401
+        
+        names = [n for n in request.args.get('accounts', '').split(',') if n] or None
+        result = get_account_registry().get_balances(names, request.args.get('asset', 'USDT'))
+        return jsonify(result.to_dict())
+    except AccountError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/accounts/place-order', methods=['POST'])
+def api_accounts_place_order():
+    """Place the same MARKET/LIMIT order on several accounts concurrently."""
+    from bot.accounts import AccountError
+    
+    try:
+        if DASHBOARD_TOKEN:
+            token = request.headers.get('X-Dashboard-Token', '')
+            if token != DASHBOARD_TOKEN:
+                return jsonify({'error': 'Invalid dashboard token'}), 401
+        
+        data = request.get_json()
+        if not data:
+            return jsonify({'error': 'Invalid request body'}), 400
+        
+        order_request = create_order_request(
+            symbol=data.get('symbol', ''),
+            side=data.get('side', ''),
+            order_type=data.get('type', 'MARKET'),
+            quantity=str(data.get('quantity', '')),
+            price=str(data['price']) if data.get('price') else None,
+            symbol_index=get_symbol_index()
+        )
+        
+        # Each account is checked against its own gate; a rejection fails
+        # that account only (207), like any other per-account error
+        names = data.get('accounts') or None
+        gates = get_account_risk_gates(names)
+        result = get_account_registry().place_order_all(order_request, names, gates)
+        return jsonify(result.to_dict()), 200 if not result.failed else 207
+    
+    except (ValidationError, AccountError) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
@@ -433,4 +1429,5 @@ if __name__ == '__main__':
     print(f"\n🌐 Dashboard: http://localhost:5000")
     print("\nPress Ctrl+C to stop the server\n")
     
-    app.run(host='localhost', port=5000, debug=True)
+    # threaded: each /api/stream viewer holds a connection open
+    app.run(host='localhost', port=5000, debug=True, threaded=True)
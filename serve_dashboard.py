@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Production launcher for the web dashboard.
+
+run_local_dashboard.py's __main__ is a single-process debug server. This
+entry point runs the dashboard with several workers instead:
+
+- gunicorn (if installed, not on Windows): pre-fork workers, sync threads
+  for the Flask app or uvicorn workers for the ASGI app. ``kill -HUP``
+  reloads workers gracefully: new ones start and warm up, old ones
+  finish their in-flight requests.
+- uvicorn: multi-process ASGI supervisor; SIGHUP restarts workers one by
+  one.
+- werkzeug: threaded single process, for Flask where gunicorn is missing.
+
+Every worker warms up before serving: it opens its upstream connection
+pool, measures the server clock offset and loads exchangeInfo. With more
+than one worker, caches go to a SQLite file in a private per-user
+directory on /dev/shm or $XDG_RUNTIME_DIR (or CACHE_URL,
+e.g. redis://localhost:6379/0), so the workers share one upstream fetch.
+
+Only cached exchange data is shared. Executions (/api/execute*), price
+alerts (/api/alerts) and the risk gate's order-rate budget live in the
+worker that handled the request. With several workers, a request for an
+execution or alert can land on a worker that has never seen it (404), and
+every worker allows the full order rate. So the launcher runs one worker
+when order-rate limits are set (RISK_MAX_ORDERS_PER_SECOND or
+RISK_LIMITS_FILE), and refuses --workers > 1.
+
+Usage:
+    python serve_dashboard.py                              # ASGI, one worker per CPU
+    python serve_dashboard.py --mode flask --workers 4 --threads 8
+    python serve_dashboard.py --bind 0.0.0.0:8000 --pid dashboard.pid
+    kill -HUP $(cat dashboard.pid)                         # graceful reload
+"""
+
+import argparse
+import os
+import sys
+
+
+APP_URIS = {
+    "asgi": "asgi_dashboard:app",
+    "flask": "run_local_dashboard:app",
+}
+
+
+def default_workers(mode: str) -> int:
+    """WEB_CONCURRENCY, else one worker per CPU (ASGI) or per CPU plus one (Flask)."""
+    if os.getenv("WEB_CONCURRENCY"):
+        return int(os.environ["WEB_CONCURRENCY"])
+    cpus = os.cpu_count() or 1
+    return cpus if mode == "asgi" else cpus + 1
+
+
+def risk_rate_limited() -> bool:
+    """True if the risk gate has order-rate limits, which each worker enforces alone."""
+    from dotenv import load_dotenv
+    from bot.risk import RiskGate
+
+    load_dotenv()
+    return RiskGate.from_env().has_rate_limits
+
+
+def pick_server(mode: str, requested: str) -> str:
+    """Resolve --server auto to the best server available here."""
+    if requested != "auto":
+        return requested
+    if sys.platform != "win32":
+        try:
+            import gunicorn  # noqa: F401
+            return "gunicorn"
+        except ImportError:
+            pass
+    return "uvicorn" if mode == "asgi" else "werkzeug"
+
+
+def warm_flask_worker() -> None:
+    """Warm up a Flask worker; a failed warmup is logged, not fatal."""
+    import run_local_dashboard
+
+    try:
+        run_local_dashboard.warmup()
+    except Exception as e:
+        print(f"[WARN] Worker {os.getpid()} warmup failed: {e}")
+
+
+def run_gunicorn(args: argparse.Namespace) -> None:
+    """Serve with gunicorn (pre-fork, graceful HUP reload)."""
+    from gunicorn.app.base import BaseApplication
+
+    options = {
+        "bind": args.bind,
+        "workers": args.workers,
+        "timeout": args.timeout,
+        "graceful_timeout": args.graceful_timeout,
+        "keepalive": 5,
+        "pidfile": args.pid,
+        "accesslog": "-" if args.access_log else None,
+        # No preload: each worker builds its own connection pool after fork
+        "preload_app": False,
+    }
+    if args.mode == "asgi":
+        options["worker_class"] = "uvicorn.workers.UvicornWorker"
+    else:
+        options["worker_class"] = "gthread"
+        options["threads"] = args.threads
+        if args.warmup:
+            options["post_worker_init"] = lambda worker: warm_flask_worker()
+
+    class DashboardApplication(BaseApplication):
+        def load_config(self):
+            for key, value in options.items():
+                if value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            module, attr = APP_URIS[args.mode].split(":")
+            return getattr(__import__(module), attr)
+
+    DashboardApplication().run()
+
+
+def run_uvicorn(args: argparse.Namespace) -> None:
+    """Serve the ASGI app with uvicorn's multi-process supervisor."""
+    import uvicorn
+
+    host, port = args.bind.rsplit(":", 1)
+    if args.pid:
+        with open(args.pid, "w") as f:
+            f.write(str(os.getpid()))
+    try:
+        uvicorn.run(
+            APP_URIS["asgi"],
+            host=host,
+            port=int(port),
+            workers=args.workers,
+            timeout_graceful_shutdown=args.graceful_timeout,
+            access_log=args.access_log,
+            log_level="info",
+        )
+    finally:
+        if args.pid and os.path.exists(args.pid):
+            os.remove(args.pid)
+
+
+def run_werkzeug(args: argparse.Namespace) -> None:
+    """Serve the Flask app from one threaded process (no debug, no reloader)."""
+    from werkzeug.serving import run_simple
+
+    if args.workers > 1:
+        print("[WARN] werkzeug runs one process; use gunicorn for more workers")
+    if args.warmup:
+        warm_flask_worker()
+
+    import run_local_dashboard
+
+    host, port = args.bind.rsplit(":", 1)
+    run_simple(host, int(port), run_local_dashboard.app, threaded=True)
+
+
+def main() -> int:
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Run the dashboard with production settings")
+    parser.add_argument("--mode", choices=["asgi", "flask"], default="asgi",
+                        help="ASGI app (asgi_dashboard) or Flask app (default: asgi)")
+    parser.add_argument("--server", choices=["auto", "gunicorn", "uvicorn", "werkzeug"],
+                        default="auto", help="Server to run under (default: best available)")
+    parser.add_argument("--bind", default="127.0.0.1:5000", help="host:port (default: 127.0.0.1:5000)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: WEB_CONCURRENCY or per CPU)")
+    parser.add_argument("--threads", type=int, default=8, help="Threads per Flask worker (default: 8)")
+    parser.add_argument("--timeout", type=int, default=30, help="Seconds before a stuck worker is restarted")
+    parser.add_argument("--graceful-timeout", type=int, default=30,
+                        help="Seconds in-flight requests get on reload/shutdown")
+    parser.add_argument("--pid", help="Write the master PID here (for kill -HUP)")
+    parser.add_argument("--cache-url", help="Shared cache: sqlite://<path>, redis://..., memory://")
+    parser.add_argument("--no-warmup", dest="warmup", action="store_false",
+                        help="Skip per-worker clock sync and exchangeInfo prefetch")
+    parser.add_argument("--access-log", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    if risk_rate_limited():
+        if args.workers and args.workers > 1:
+            parser.error("risk order-rate limits are enforced per worker (N workers allow N times "
+                         "the rate); use --workers 1 or unset RISK_MAX_ORDERS_PER_SECOND")
+        args.workers = 1
+    args.workers = args.workers or default_workers(args.mode)
+    server = pick_server(args.mode, args.server)
+    if server == "uvicorn" and args.mode != "asgi":
+        parser.error("uvicorn serves --mode asgi only")
+    if server == "werkzeug" and args.mode != "flask":
+        parser.error("werkzeug serves --mode flask only")
+
+    # Workers read these at import time
+    if args.cache_url:
+        os.environ["CACHE_URL"] = args.cache_url
+    elif args.workers > 1 and not os.getenv("CACHE_URL") and server != "werkzeug":
+        from bot.shared_cache import default_cache_url
+        os.environ["CACHE_URL"] = default_cache_url()
+    if args.warmup:
+        os.environ["DASHBOARD_WARMUP"] = "1"
+
+    print(f"Dashboard ({args.mode}) on http://{args.bind} via {server}, "
+          f"{args.workers} worker(s), cache {os.getenv('CACHE_URL') or 'memory://'}")
+    if args.workers > 1 and server != "werkzeug":
+        print("[WARN] Executions and price alerts are kept per worker: their progress, "
+              "cancel and delete requests can land on another worker (404). "
+              "Use --workers 1 to manage them from the dashboard.")
+
+    {"gunicorn": run_gunicorn, "uvicorn": run_uvicorn, "werkzeug": run_werkzeug}[server](args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -26,17 +26,18 @@ let marketPrices = {};
 let exchangeInfo = {};
 let availableBalance = 0;
 
-// Fetch exchange info with filters
+// Fetch exchange info with filters (defaults plus the selected symbol)
 async function fetchExchangeInfo() {
     try {
-        const response = await fetch(`${API_BASE}/api/exchange-info`, {
+        const symbols = trackedSymbols().join(',');
+        const response = await fetch(`${API_BASE}/api/exchange-info?symbols=${symbols}`, {
             headers: getHeaders()
         });
         if (response.ok) {
             const data = await response.json();
             // Backend already returns symbols as object with filters organized
             if (data.symbols) {
-                exchangeInfo = data.symbols;
+                Object.assign(exchangeInfo, data.symbols);
             }
             console.log('Exchange Info loaded:', Object.keys(exchangeInfo).length, 'symbols');
         }
@@ -45,15 +46,55 @@ async function fetchExchangeInfo() {
     }
 }
 
+// Symbols whose prices and filters the form needs
+function trackedSymbols() {
+    const symbols = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT'];
+    const selected = symbolSelect.value.trim().toUpperCase();
+    if (selected && !symbols.includes(selected)) {
+        symbols.push(selected);
+    }
+    return symbols;
+}
+
+// Symbol autocomplete: prefix search served from the cached exchangeInfo index
+const symbolList = document.getElementById('symbolList');
+let symbolSearchTimer = null;
+
+symbolSelect.addEventListener('input', () => {
+    clearTimeout(symbolSearchTimer);
+    symbolSearchTimer = setTimeout(async () => {
+        const prefix = symbolSelect.value.trim().toUpperCase();
+        if (!prefix) return;
+        try {
+            const response = await fetch(
+                `${API_BASE}/api/symbols?q=${encodeURIComponent(prefix)}&limit=20`,
+                { headers: getHeaders() }
+            );
+            if (response.ok) {
+                const data = await response.json();
+                symbolList.innerHTML = '';
+                data.symbols.forEach(symbol => {
+                    const option = document.createElement('option');
+                    option.value = symbol;
+                    symbolList.appendChild(option);
+                });
+            }
+        } catch (error) {
+            console.error('Error searching symbols:', error);
+        }
+    }, 150);
+});
+
 // Fetch current market prices
 async function fetchPrices() {
     try {
-        const response = await fetch(`${API_BASE}/api/prices`, {
+        const symbols = trackedSymbols().join(',');
+        const response = await fetch(`${API_BASE}/api/prices?symbols=${symbols}`, {
             headers: getHeaders()
         });
         if (response.ok) {
             const data = await response.json();
-            marketPrices = data.prices;
+            Object.assign(marketPrices, data.prices);
             updatePriceHints();
         }
     } catch (error) {
@@ -283,7 +324,11 @@ function validateInputs() {
 }
 
 // Update hints when symbol or side changes
-symbolSelect.addEventListener('change', () => {
+symbolSelect.addEventListener('change', async () => {
+    symbolSelect.value = symbolSelect.value.trim().toUpperCase();
+    if (!exchangeInfo[symbolSelect.value]) {
+        await Promise.all([fetchExchangeInfo(), fetchPrices()]);
+    }
     updatePriceHints();
     validateInputs();
 });
@@ -316,12 +361,88 @@ async function fetchBalance() {
     }
 }
 
-// Fetch prices on page load and every 10 seconds
-fetchExchangeInfo(); // Fetch once on load
-fetchBalance(); // Fetch balance once
-fetchPrices();
-setInterval(fetchPrices, 10000);
-setInterval(fetchBalance, 15000); // Update balance every 15 seconds
+// Live state pushed by the server over Server-Sent Events (/api/stream).
+// One server-side refresher feeds every open tab, so upstream calls do not
+// grow with the number of viewers. Falls back to polling where streaming
+// is unavailable (e.g. serverless deployments).
+let latestExposure = null;
+let pollTimers = [];
+
+function applyStreamState(state) {
+    if (state.prices) {
+        for (const [symbol, price] of Object.entries(state.prices)) {
+            if (price === null) {
+                delete marketPrices[symbol];
+            } else {
+                marketPrices[symbol] = price;
+            }
+        }
+    }
+    if (state.balance) {
+        availableBalance = parseFloat(state.balance.availableBalance);
+    }
+    if (state.exposure) {
+        latestExposure = { ...(latestExposure || {}), ...state.exposure };
+    }
+    updatePriceHints();
+}
+
+function startPolling() {
+    if (pollTimers.length) return;
+    console.warn('Live stream unavailable; polling instead');
+    fetchBalance();
+    fetchPrices();
+    pollTimers = [
+        setInterval(fetchPrices, 10000),
+        setInterval(fetchBalance, 15000)
+    ];
+}
+
+function stopPolling() {
+    pollTimers.forEach(clearInterval);
+    pollTimers = [];
+}
+
+let eventSource = null;
+
+function connectStream() {
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+    if (eventSource) {
+        eventSource.close();
+    }
+    
+    const token = dashboardTokenInput.value.trim();
+    const query = token ? `?token=${encodeURIComponent(token)}` : '';
+    let opened = false;
+    eventSource = new EventSource(`${API_BASE}/api/stream${query}`);
+    
+    eventSource.addEventListener('open', () => {
+        opened = true;
+        stopPolling();
+    });
+    eventSource.addEventListener('snapshot', (e) => {
+        marketPrices = {};
+        applyStreamState(JSON.parse(e.data));
+    });
+    eventSource.addEventListener('delta', (e) => {
+        applyStreamState(JSON.parse(e.data));
+    });
+    eventSource.addEventListener('error', () => {
+        // EventSource reconnects by itself; poll only if it never connected
+        if (!opened) {
+            eventSource.close();
+            startPolling();
+        }
+    });
+}
+
+// Load filters once, then follow the live stream
+fetchExchangeInfo();
+connectStream();
+dashboardTokenInput.addEventListener('change', connectStream);
 
 // Show/hide price fields based on order type
 typeSelect.addEventListener('change', () => {
@@ -517,14 +638,9 @@ orderForm.addEventListener('submit', async (e) => {
         (orderData.stopPrice ? `Stop Price:   ${orderData.stopPrice}\n` : '') +
         (orderData.dryRun ? `\n⚠️ DRY RUN MODE - Order will not be sent\n` : '');
     
-    // If dry run, don't call API
+    // If dry run, simulate the fill (nothing is sent to Binance)
     if (orderData.dryRun) {
-        orderResponseSection.style.display = 'block';
-        orderResponse.className = 'result-box warning';
-        orderResponse.textContent = 
-            `✓ Dry run completed\n\n` +
-            `Request validated successfully.\n` +
-            `Remove dry-run checkbox to place the order.`;
+        await simulateOrder(orderData);
         return;
     }
     
@@ -608,6 +724,68 @@ orderForm.addEventListener('submit', async (e) => {
     }
 });
 
+// Dry run: the server simulates the fill from its cached order book and
+// account snapshot, without sending a signed request to Binance
+async function simulateOrder(orderData) {
+    showLoading();
+    orderResponseSection.style.display = 'block';
+    
+    try {
+        const response = await fetch(`${API_BASE}/api/place-order`, {
+            method: 'POST',
+            headers: getHeaders(),
+            body: JSON.stringify(orderData)
+        });
+        const data = await response.json();
+        
+        if (!response.ok) {
+            orderResponse.className = 'result-box error';
+            orderResponse.textContent = `✗ Dry run failed\n\n${data.error || data.message || 'Unknown error'}`;
+            return;
+        }
+        
+        const sim = data.simulation || {};
+        const fmt = (value, digits = 2) => value.toLocaleString('en-US', { maximumFractionDigits: digits });
+        let text = `✓ Dry run completed (simulated, not sent)\n\n`;
+        text += `Status:       ${sim.status}\n`;
+        if (sim.filledQty) {
+            text += `Fill:         ${sim.filledQty} @ $${fmt(sim.avgPrice, 6)} (${sim.levels} levels)\n`;
+        }
+        if (sim.slippageBps !== null && sim.slippageBps !== undefined) {
+            text += `Slippage:     ${sim.slippageBps.toFixed(2)} bps vs mid $${fmt(sim.referencePrice, 6)}\n`;
+        }
+        if (sim.restingQty) {
+            text += `Resting:      ${sim.restingQty} (maker fee if filled: $${sim.restingFee.toFixed(4)})\n`;
+        }
+        if (sim.stopTriggered !== null && sim.stopTriggered !== undefined) {
+            text += `Stop:         ${sim.stopTriggered ? 'already crossed' : 'not yet crossed'}\n`;
+        }
+        if (sim.stopTriggered === false && sim.avgPrice) {
+            text += `If triggered: ~$${fmt(sim.avgPrice, 6)}\n`;
+        }
+        text += `Notional:     $${fmt(sim.notional)}\n`;
+        text += `Fee:          $${sim.fee.toFixed(4)}\n`;
+        if (sim.leverage) {
+            text += `Margin:       $${fmt(sim.marginRequired)} at ${sim.leverage}x\n`;
+        }
+        if (sim.availableAfter !== null && sim.availableAfter !== undefined) {
+            text += `Available:    $${fmt(sim.availableAfter)} after the order\n`;
+        }
+        (sim.warnings || []).forEach(warning => {
+            text += `\n⚠️ ${warning}`;
+        });
+        text += `\n\nRemove dry-run checkbox to place the order.`;
+        
+        orderResponse.className = sim.status === 'REJECTED' ? 'result-box error' : 'result-box warning';
+        orderResponse.textContent = text;
+    } catch (error) {
+        orderResponse.className = 'result-box error';
+        orderResponse.textContent = `✗ Dry run failed\n\n${error.message}`;
+    } finally {
+        hideLoading();
+    }
+}
+
 // Balance check
 const checkBalanceBtn = document.getElementById('checkBalanceBtn');
 const balanceResult = document.getElementById('balanceResult');
@@ -685,6 +863,10 @@ checkPositionsBtn.addEventListener('click', async () => {
                 hasContent = true;
                 text += `✓ Open Positions (${data.positions.length})\n\n`;
                 
+                // Server-computed risk rows (margin ratio, liquidation distance)
+                const riskBySymbol = {};
+                (data.risk || []).forEach(r => { riskBySymbol[r.symbol] = r; });
+                
                 data.positions.forEach(pos => {
                     const amt = parseFloat(pos.positionAmt);
                     const entryPrice = parseFloat(pos.entryPrice);
@@ -696,7 +878,18 @@ checkPositionsBtn.addEventListener('click', async () => {
                     text += `${pos.symbol}:\n`;
                     text += `  Side: ${side} | Qty: ${Math.abs(amt)}\n`;
                     text += `  Entry: $${entryPrice.toFixed(2)} | Now: $${markPrice.toFixed(2)}\n`;
-                    text += `  PnL: ${pnlSign}$${unrealizedPnL.toFixed(2)}\n\n`;
+                    text += `  PnL: ${pnlSign}$${unrealizedPnL.toFixed(2)}\n`;
+                    
+                    const risk = riskBySymbol[pos.symbol];
+                    if (risk && risk.liquidationPrice !== null) {
+                        text += `  Liq: $${risk.liquidationPrice.toFixed(2)} ` +
+                            `(${(risk.liquidationDistance * 100).toFixed(1)}% away)`;
+                        if (risk.marginRatio !== null) {
+                            text += ` | Margin ratio: ${(risk.marginRatio * 100).toFixed(2)}%`;
+                        }
+                        text += `\n`;
+                    }
+                    text += `\n`;
                 });
                 
                 text += `💡 To close: LONG→SELL | SHORT→BUY (same qty)\n\n`;